@@ -10,10 +10,10 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import yaml
-
-from src.core.models.project import Project
+if TYPE_CHECKING:
+    from src.core.models.project import Project
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +63,13 @@ def load_project(path: Path | None = None) -> Project:
     Raises:
         ConfigError: If the file is missing or invalid.
     """
+    # yaml + the pydantic models are imported here, not at module level:
+    # the CLI entry point imports this module for find_project_file()
+    # on every invocation.
+    import yaml
+
+    from src.core.models.project import Project
+
     if path is None:
         path = find_project_file()
 
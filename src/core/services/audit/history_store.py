@@ -0,0 +1,168 @@
+"""
+Incremental git history statistics — persistent, keyed by HEAD.
+
+``l2_repo`` needs commit count, author tally and first/latest commit
+dates.  Walking the whole history for those on every audit
+(``rev-list --count``, ``shortlog -sn``, ``log --reverse``) costs
+seconds on a repo with 100k+ commits.
+
+This store keeps the aggregates in ``.state/git_history.json`` together
+with the HEAD they describe.  On each call:
+
+    HEAD unchanged            → stored stats (one ``rev-parse``)
+    old HEAD is an ancestor   → ingest ``git log OLD..HEAD`` only
+    anything else (rewrite)   → full rebuild from ``git log HEAD``
+
+Scope is HEAD's history.  Merge commits count towards ``total_commits``
+but not towards authors (like ``--no-merges``).  Per-file churn lives
+in the hotspot engine's own store (``audit/hotspots.py``).
+
+Stats dict::
+
+    {
+        "version": 2,
+        "head": str,                       # commit the stats describe
+        "total_commits": int,
+        "authors": {name: commits},        # non-merge commits
+        "first_ts": int, "first_date": str,   # earliest author date (ISO)
+        "latest_date": str,                # HEAD's author date (ISO)
+    }
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+from src.core.services.store_helpers import run_git as _git
+from src.core.services.store_helpers import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+_STORE_FILE = ".state/git_history.json"
+_VERSION = 2
+_LOG_TIMEOUT = 600            # a full rebuild walks every commit
+
+# Record / field separators in the ``git log`` output
+_RS, _FS = "\x1e", "\x1f"
+_LOG_FORMAT = f"--format={_RS}%H{_FS}%P{_FS}%an{_FS}%aI{_FS}%at"
+
+_lock = threading.Lock()
+# Parsed store per project: {root: ((mtime_ns, size), stats)}
+_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _empty(head: str) -> dict:
+    return {
+        "version": _VERSION,
+        "head": head,
+        "total_commits": 0,
+        "authors": {},
+        "first_ts": None,
+        "first_date": None,
+        "latest_date": None,
+    }
+
+
+def _load(project_root: Path) -> dict | None:
+    path = project_root / _STORE_FILE
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(str(project_root))
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError) as e:
+        logger.debug("Cannot load git history store: %s", e)
+        return None
+    if not isinstance(data, dict) or data.get("version") != _VERSION:
+        return None
+    _cache[str(project_root)] = (sig, data)
+    return data
+
+
+def _save(project_root: Path, stats: dict) -> None:
+    path = project_root / _STORE_FILE
+    if write_json_atomic(path, stats, what="git history store"):
+        st = path.stat()
+        _cache[str(project_root)] = ((st.st_mtime_ns, st.st_size), stats)
+
+
+def _ingest(project_root: Path, stats: dict, rev_range: str, head: str) -> bool:
+    """Fold the commits of ``rev_range`` (ending at ``head``) into ``stats``.
+
+    Returns False on git error (``stats`` is then not to be saved).
+    """
+    r = _git(project_root, "log", _LOG_FORMAT, rev_range, timeout=_LOG_TIMEOUT)
+    if r.returncode != 0:
+        logger.warning("git log %s failed: %s", rev_range, r.stderr.strip())
+        return False
+
+    authors: dict[str, int] = stats["authors"]
+    first_ts, first_date = stats["first_ts"], stats["first_date"]
+    count = 0
+    for record in r.stdout.split(_RS):
+        if not record:
+            continue
+        fields = record.rstrip("\n").split(_FS)
+        if len(fields) < 5:
+            continue
+        sha, parents, author, date, ts_s = fields[:5]
+        ts = int(ts_s or 0)
+        count += 1
+        if sha == head:
+            stats["latest_date"] = date
+        if first_ts is None or ts < first_ts:
+            first_ts, first_date = ts, date
+        if len(parents.split()) > 1:
+            continue                          # merge: no author credit
+        authors[author] = authors.get(author, 0) + 1
+
+    stats["total_commits"] += count
+    stats["first_ts"], stats["first_date"] = first_ts, first_date
+    return True
+
+
+def history_stats(project_root: Path) -> dict | None:
+    """Up-to-date history stats for HEAD (see module docstring).
+
+    The returned dict is shared with the store's cache — do not mutate it.
+    Returns None when the project has no commits or is not a git repo.
+    """
+    r = _git(project_root, "rev-parse", "--verify", "-q", "HEAD")
+    head = r.stdout.strip()
+    if r.returncode != 0 or not head:
+        return None
+
+    with _lock:
+        stats = _load(project_root)
+        if stats is not None and stats.get("head") == head:
+            return stats
+        if stats is not None:
+            stats = json.loads(json.dumps(stats))      # don't touch the cached copy
+
+        incremental = False
+        if stats is not None and stats.get("head"):
+            anc = _git(project_root, "merge-base", "--is-ancestor", stats["head"], head)
+            incremental = anc.returncode == 0
+        if incremental:
+            rev_range = f"{stats['head']}..{head}"
+            logger.debug("git history: ingesting %s", rev_range)
+        else:
+            if stats is not None:
+                logger.info("git history: HEAD no longer descends from %s — rebuilding",
+                            stats.get("head", "")[:12])
+            stats = _empty(head)
+            rev_range = head
+
+        if not _ingest(project_root, stats, rev_range, head):
+            return None
+        stats["head"] = head
+        _save(project_root, stats)
+        return stats
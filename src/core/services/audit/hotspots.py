@@ -0,0 +1,335 @@
+"""
+Churn × complexity hotspots — where the complex code keeps changing.
+
+``l2_quality._detect_hotspots`` flags files from static metrics alone; a
+2,000-line module nobody has touched in a year is a smaller risk than a
+400-line one edited every week.  This engine joins the two signals:
+
+    churn        commits and changed lines per file per day, ingested
+                 from ``git log --numstat`` (kept for the last
+                 ``max(WINDOWS)`` days)
+    complexity   nesting-weighted code size from the parser layer's
+                 (mtime-cached) ``FileAnalysis`` results
+
+Churn lives in ``.state/git_churn.json`` with the HEAD it describes and
+follows HEAD the way ``history_store`` does:
+
+    HEAD unchanged            → nothing to read
+    old HEAD is an ancestor   → ingest ``git log --numstat OLD..HEAD``
+    anything else (rewrite)   → rebuild from ``git log --since=<horizon>``
+
+Each window in ``WINDOWS`` keeps running per-file sums: new commits are
+added in place, and the sums are re-totalled from the day buckets once
+a day as the windows slide.  Rankings (sums joined with complexity) are
+materialised on the first query after a change; every other ``top()``
+is a slice of a precomputed list.
+
+Ranking entry::
+
+    {"file", "language", "commits", "lines_changed", "complexity",
+     "score"}            # commits × complexity, normalised to 0-1
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from src.core.services.store_helpers import per_project, write_json_atomic
+from src.core.services.store_helpers import run_git as _git
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = (30, 90, 365)        # days
+DEFAULT_WINDOW = 90
+_STORE_FILE = ".state/git_churn.json"
+_VERSION = 1
+_LOG_TIMEOUT = 600
+_DAY_S = 86_400
+
+# Record / field separators in the ``git log`` output
+_RS, _FS = "\x1e", "\x1f"
+_LOG_FORMAT = f"--format={_RS}%H{_FS}%at"
+
+
+def _today() -> int:
+    return int(time.time()) // _DAY_S
+
+
+def file_complexity(analysis) -> int:
+    """Nesting-weighted size of a parsed file: code lines × max nesting.
+
+    Flat files (config, data, straight-line scripts) count their code
+    lines; each nesting level multiplies, so a deeply branched module
+    outranks a longer flat one.
+    """
+    m = analysis.metrics
+    return m.code_lines * max(1, m.max_nesting_depth)
+
+
+class HotspotEngine:
+    """Per-project churn time series joined with file complexity."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.head: str | None = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        # {day: {path: [commits, lines_changed]}}
+        self._days: dict[int, dict[str, list[int]]] = {}
+        # {path: (complexity, language)}
+        self._complexity: dict[str, tuple[int, str]] = {}
+        # Per-window churn sums {window_days: {path: [commits, lines]}},
+        # valid for ``_totals_day``; new commits are added in place
+        self._totals: dict[int, dict[str, list[int]]] = {}
+        self._totals_day: int | None = None
+        # {window_days: ranked entries}; None once totals/complexity move
+        self._rankings: dict[int, list[dict]] | None = None
+
+    # ── Public API ─────────────────────────────────────────────
+
+    def refresh(self) -> bool:
+        """Bring churn up to HEAD.  Returns False when there is no history
+        to read (not a git repo, no commits, git error).
+        """
+        r = _git(self.project_root, "rev-parse", "--verify", "-q", "HEAD")
+        head = r.stdout.strip()
+        if r.returncode != 0 or not head:
+            return False
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if head == self.head:
+                return True
+
+            horizon = _today() - max(WINDOWS) + 1
+            incremental = False
+            if self.head:
+                anc = _git(self.project_root, "merge-base", "--is-ancestor", self.head, head)
+                incremental = anc.returncode == 0
+            if incremental:
+                rev_args = [f"{self.head}..{head}"]
+            else:
+                if self.head:
+                    logger.info("churn: HEAD no longer descends from %s — rebuilding",
+                                self.head[:12])
+                rev_args = [f"--since={horizon * _DAY_S}", head]
+
+            delta = self._ingest(rev_args, horizon)
+            if delta is None:
+                return False
+            if incremental:
+                _merge(self._days, delta)
+                if self._totals_day is not None:
+                    for w, totals in self._totals.items():
+                        cutoff = self._totals_day - w + 1
+                        for day, files in delta.items():
+                            if day >= cutoff:
+                                _merge_files(totals, files)
+            else:
+                self._days = delta
+                self._totals_day = None
+            for day in [d for d in self._days if d < horizon]:
+                del self._days[day]
+            self.head = head
+            self._rankings = None
+            self._save()
+            return True
+
+    def set_complexity(self, analyses: dict) -> None:
+        """Take per-file complexity from parser results (``{rel_path:
+        FileAnalysis}``, as ``registry.parse_tree`` returns them).
+        """
+        complexity = {
+            rel: (file_complexity(a), a.language)
+            for rel, a in analyses.items() if not a.parse_error
+        }
+        with self._lock:
+            if complexity != self._complexity:
+                self._complexity = complexity
+                self._rankings = None
+
+    def top(self, n: int = 10, days: int = DEFAULT_WINDOW) -> list[dict]:
+        """The ``n`` highest-scoring files over the last ``days`` days
+        (one of ``WINDOWS``).
+        """
+        if days not in WINDOWS:
+            raise ValueError(f"Unsupported window: {days} (expected one of {WINDOWS})")
+        with self._lock:
+            today = _today()
+            if self._totals_day != today:
+                self._sum_windows(today)
+            if self._rankings is None:
+                self._rankings = {w: self._rank(self._totals[w]) for w in WINDOWS}
+            return [dict(e) for e in self._rankings[days][:n]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "head": self.head,
+                "days": len(self._days),
+                "files_with_churn": len({p for files in self._days.values() for p in files}),
+                "files_with_complexity": len(self._complexity),
+            }
+
+    # ── Ranking ────────────────────────────────────────────────
+
+    def _sum_windows(self, today: int) -> None:
+        """Re-sum every window from the day buckets (caller holds the lock)."""
+        self._totals = {w: {} for w in WINDOWS}
+        for day, files in self._days.items():
+            for w, totals in self._totals.items():
+                if day >= today - w + 1:
+                    _merge_files(totals, files)
+        self._totals_day = today
+        self._rankings = None
+
+    def _rank(self, totals: dict[str, list[int]]) -> list[dict]:
+        ranked = []
+        complexity = self._complexity
+        for path, (commits, lines) in totals.items():
+            info = complexity.get(path)
+            if info is None or info[0] == 0:
+                continue                # deleted, unparsed or empty file
+            ranked.append((commits * info[0], path, commits, lines, info))
+        if not ranked:
+            return []
+        ranked.sort(key=lambda r: (-r[0], r[1]))
+        top_raw = ranked[0][0]
+        return [
+            {
+                "file": path,
+                "language": language,
+                "commits": commits,
+                "lines_changed": lines,
+                "complexity": complexity,
+                "score": round(raw / top_raw, 3),
+            }
+            for raw, path, commits, lines, (complexity, language) in ranked
+        ]
+
+    # ── Ingestion ──────────────────────────────────────────────
+
+    def _ingest(self, rev_args: list[str], horizon: int) -> dict | None:
+        """Day buckets for ``git log --numstat`` over ``rev_args`` (None
+        on git error).
+
+        Merges carry no numstat (their changes are counted on the merged
+        branch); binary files count a commit and no lines.
+        """
+        r = _git(
+            self.project_root, "-c", "core.quotePath=false",
+            "log", _LOG_FORMAT, "--numstat", "--no-renames", *rev_args,
+            timeout=_LOG_TIMEOUT,
+        )
+        if r.returncode != 0:
+            logger.warning("git log --numstat %s failed: %s", " ".join(rev_args), r.stderr.strip())
+            return None
+
+        days: dict[int, dict[str, list[int]]] = {}
+        for record in r.stdout.split(_RS):
+            if not record:
+                continue
+            header, _, body = record.partition("\n")
+            _, _, ts_s = header.partition(_FS)
+            day = int(ts_s or 0) // _DAY_S
+            if day < horizon:
+                continue
+            bucket = days.get(day)
+            for line in body.splitlines():
+                added, sep, rest = line.partition("\t")
+                if not sep:
+                    continue
+                deleted, _, path = rest.partition("\t")
+                lines = (int(added) if added.isdigit() else 0) + \
+                        (int(deleted) if deleted.isdigit() else 0)
+                if bucket is None:
+                    bucket = days[day] = {}
+                entry = bucket.get(path)
+                if entry is None:
+                    bucket[path] = [1, lines]
+                else:
+                    entry[0] += 1
+                    entry[1] += lines
+        return days
+
+    # ── Persistence ────────────────────────────────────────────
+
+    def _load(self) -> None:
+        self._loaded = True
+        path = self.project_root / _STORE_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _VERSION:
+            return
+        self.head = data.get("head")
+        self._days = {int(d): files for d, files in data.get("days", {}).items()}
+
+    def _save(self) -> None:
+        """Write the store atomically (temp file + rename)."""
+        path = self.project_root / _STORE_FILE
+        data = {
+            "version": _VERSION,
+            "head": self.head,
+            "days": {str(d): files for d, files in self._days.items()},
+        }
+        write_json_atomic(path, data, what="churn store")
+
+
+def _merge_files(into: dict[str, list[int]], files: dict[str, list[int]]) -> None:
+    for path, (commits, lines) in files.items():
+        acc = into.get(path)
+        if acc is None:
+            into[path] = [commits, lines]
+        else:
+            acc[0] += commits
+            acc[1] += lines
+
+
+def _merge(days: dict[int, dict[str, list[int]]], delta: dict[int, dict[str, list[int]]]) -> None:
+    for day, files in delta.items():
+        _merge_files(days.setdefault(day, {}), files)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Per-project registry
+# ═══════════════════════════════════════════════════════════════════
+
+
+_engines: dict[str, HotspotEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_hotspot_engine(project_root: Path) -> HotspotEngine:
+    """The hotspot engine for ``project_root`` (created on first use)."""
+    return per_project(_engines, _engines_lock, project_root, HotspotEngine)
+
+
+def churn_hotspots(
+    project_root: Path,
+    analyses: dict | None = None,
+    *,
+    n: int = 10,
+) -> dict[str, list[dict]]:
+    """Top ``n`` churn × complexity hotspots for every window.
+
+    ``analyses`` are parser results for the tree; without them the
+    parser registry's mtime cache supplies them.
+
+    Returns:
+        {"30d": [entry, ...], "90d": [...], "365d": [...]}
+    """
+    engine = get_hotspot_engine(project_root)
+    if not engine.refresh():
+        return {f"{w}d": [] for w in WINDOWS}
+    if analyses is None:
+        from src.core.services.audit.parsers import registry
+        analyses = registry.parse_tree(project_root)
+    engine.set_complexity(analyses)
+    return {f"{w}d": engine.top(n, w) for w in WINDOWS}
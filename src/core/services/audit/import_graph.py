@@ -0,0 +1,553 @@
+"""
+Persistent import graph — forward/reverse file edges, cycles, impact.
+
+``l2_structure`` rebuilds its import graph from a full parse on every
+audit.  Questions like "what depends on these files?" (which tests to
+run, who reviews a change) need the same graph, fast and without a full
+parse each time.
+
+``ImportGraph`` keeps file → file edges in ``.state/import_graph.json``
+together with each file's (mtime, size) and import specs.  ``refresh()``
+stats the tree, re-parses only files whose signature moved and re-wires
+only their edges — plus the importers of any module that appeared or
+disappeared, whose imports may now resolve differently.
+
+Imports are resolved against the project's own files:
+
+    Python       ``from a.b import c`` → a/b.py or a/b/__init__.py, and
+                 a/b/c.py when ``c`` is a submodule; relative imports
+                 resolve against the importer's package; under a
+                 ``src/`` or ``lib/`` root both ``src.a.b`` and ``a.b``
+                 resolve
+    JS / TS      relative specifiers (``./x``, ``../y``) → the file with
+                 a known suffix, or its ``index.*``
+
+Strongly connected components (import cycles) are maintained with the
+edges: a new edge u → v merges the components on every v ⇝ u path; a
+removed edge inside a component re-runs Tarjan on that component only.
+Large batches (first build, branch switches) run Tarjan over the graph.
+
+Impact queries (``dependents``) walk the reverse edges — milliseconds
+on 20k-file projects once the graph is loaded.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import logging
+import os
+import posixpath
+import threading
+from pathlib import Path
+
+from src.core.services.store_helpers import per_project, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+_STORE_FILE = ".state/import_graph.json"
+_VERSION = 1
+_PY_SUFFIX = ".py"
+_JS_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+_GRAPH_SUFFIXES = frozenset((_PY_SUFFIX, *_JS_SUFFIXES))
+_SOURCE_ROOTS = ("src", "lib")
+_EXCLUDE_DIRS = frozenset((
+    "__pycache__", ".venv", "venv", "node_modules", ".git", ".tox",
+    ".mypy_cache", ".pytest_cache", "build", "dist", ".eggs", ".agent",
+    ".pages", ".state", ".ledger",
+))
+# Above this many changed edges, recompute SCCs over the whole graph
+_INCREMENTAL_SCC_LIMIT = 64
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Import specs — what a file's imports can resolve to
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _py_module(rel_path: str) -> str | None:
+    if not rel_path.endswith(_PY_SUFFIX):
+        return None
+    parts = rel_path[: -len(_PY_SUFFIX)].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts) if parts else None
+
+
+def _provides(rel_path: str) -> list[str]:
+    """Specs that resolve to ``rel_path``."""
+    mod = _py_module(rel_path)
+    if mod is not None:
+        specs = [f"py:{mod}"]
+        root, _, rest = mod.partition(".")
+        if root in _SOURCE_ROOTS and rest:
+            specs.append(f"py:{rest}")
+        return specs
+    stem, suffix = posixpath.splitext(rel_path)
+    if suffix not in _JS_SUFFIXES:
+        return []
+    specs = [f"path:{rel_path}", f"path:{stem}"]
+    if posixpath.basename(stem) == "index":
+        specs.append(f"path:{posixpath.dirname(stem)}")
+    return specs
+
+
+def import_specs(rel_path: str, analysis) -> list[str]:
+    """Normalised targets of a file's imports (``py:a.b`` / ``path:x/y``),
+    independent of which project files exist.
+    """
+    specs: set[str] = set()
+    is_py = rel_path.endswith(_PY_SUFFIX)
+    module = _py_module(rel_path)
+    package = module.split(".") if module else []
+    if is_py and posixpath.basename(rel_path) != "__init__.py":
+        package = package[:-1]
+    directory = posixpath.dirname(rel_path)
+
+    for imp in analysis.imports:
+        if imp.is_stdlib:
+            continue
+        mod = imp.module
+        if is_py:
+            if mod.startswith("."):
+                dots = len(mod) - len(mod.lstrip("."))
+                if dots - 1 > len(package):
+                    continue
+                base = package[: len(package) - (dots - 1)]
+                rest = mod[dots:]
+                mod = ".".join(base + ([rest] if rest else []))
+                if not mod:
+                    continue
+            specs.add(f"py:{mod}")
+            for name in imp.names:
+                if name != "*":
+                    specs.add(f"py:{mod}.{name}")
+        elif mod.startswith("./") or mod.startswith("../"):
+            target = posixpath.normpath(posixpath.join(directory, mod))
+            if not target.startswith(".."):
+                specs.add(f"path:{target}")
+    return sorted(specs)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Strongly connected components
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _tarjan(nodes, succ) -> list[list[str]]:
+    """SCCs of the subgraph on ``nodes`` (iterative Tarjan)."""
+    nodes = nodes if isinstance(nodes, (set, frozenset, dict)) else set(nodes)
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    result: list[list[str]] = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(succ.get(root, ())))]
+        while work:
+            node, it = work[-1]
+            advanced = False
+            for nxt in it:
+                if nxt not in nodes:
+                    continue
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(succ.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack and index[nxt] < low[node]:
+                    low[node] = index[nxt]
+            if advanced:
+                continue
+            work.pop()
+            if work and low[node] < low[work[-1][0]]:
+                low[work[-1][0]] = low[node]
+            if low[node] == index[node]:
+                comp = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    comp.append(w)
+                    if w == node:
+                        break
+                result.append(comp)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Graph
+# ═══════════════════════════════════════════════════════════════════
+
+
+class ImportGraph:
+    """File-level import graph for one project."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._sigs: dict[str, tuple[int, int]] = {}
+        self._specs: dict[str, list[str]] = {}
+        self._fwd: dict[str, set[str]] = {}
+        self._rev: dict[str, set[str]] = collections.defaultdict(set)
+        self._resolves: dict[str, set[str]] = collections.defaultdict(set)   # spec → files
+        self._users: dict[str, set[str]] = collections.defaultdict(set)      # spec → importers
+        self._comp: dict[str, int] = {}
+        self._members: dict[int, set[str]] = {}
+        self._next_comp = 0
+
+    # ── Public API ─────────────────────────────────────────────
+
+    def refresh(self) -> dict:
+        """Re-parse files whose (mtime, size) changed and re-wire their
+        edges.  Returns ``{"parsed", "removed", "edges_changed"}``.
+        """
+        from src.core.services.audit.parsers import registry
+
+        with self._lock:
+            self._ensure_loaded()
+            sigs = self._scan()
+            changed = [rel for rel, sig in sigs.items() if self._sigs.get(rel) != sig]
+            removed = [rel for rel in self._sigs if rel not in sigs]
+            specs: dict[str, list[str]] = {}
+            for rel in changed:
+                analysis = registry.parse_file(self.project_root / rel, self.project_root)
+                specs[rel] = import_specs(rel, analysis) if analysis else []
+            edges_changed = self._apply(specs, removed)
+            for rel in changed:
+                self._sigs[rel] = sigs[rel]
+            if changed or removed:
+                self._save()
+            return {"parsed": len(changed), "removed": len(removed),
+                    "edges_changed": edges_changed}
+
+    def dependents(self, paths, *, depth: int | None = None) -> dict[str, int]:
+        """Files that import ``paths``, directly or (up to ``depth``
+        hops) transitively: ``{file: hops}``, nearest first.
+        """
+        return self._walk(paths, self._rev, depth)
+
+    def dependencies(self, paths, *, depth: int | None = None) -> dict[str, int]:
+        """Files that ``paths`` import (same shape as ``dependents``)."""
+        return self._walk(paths, self._fwd, depth)
+
+    def edges(self) -> dict[str, list[str]]:
+        """File → imported files, for every file that imports another."""
+        with self._lock:
+            self._ensure_loaded()
+            return {rel: sorted(t) for rel, t in self._fwd.items() if t}
+
+    def cycles(self) -> list[list[str]]:
+        """Import cycles (SCCs of more than one file), largest first."""
+        with self._lock:
+            self._ensure_loaded()
+            cycles = [sorted(m) for m in self._members.values() if len(m) > 1]
+        cycles.sort(key=lambda c: (-len(c), c[0]))
+        return cycles
+
+    def component_of(self, path: str) -> list[str]:
+        """Files in the same cycle as ``path`` (just ``path`` when acyclic)."""
+        with self._lock:
+            self._ensure_loaded()
+            comp = self._comp.get(path)
+            return sorted(self._members[comp]) if comp is not None else []
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                "files": len(self._specs),
+                "edges": sum(len(t) for t in self._fwd.values()),
+                "cycles": sum(1 for m in self._members.values() if len(m) > 1),
+            }
+
+    # ── Queries ────────────────────────────────────────────────
+
+    def _walk(self, paths, adjacency, depth: int | None) -> dict[str, int]:
+        with self._lock:
+            self._ensure_loaded()
+            start = [p for p in dict.fromkeys(paths) if p in self._specs]
+            seen = set(start)
+            result: dict[str, int] = {}
+            frontier = start
+            hops = 0
+            while frontier and (depth is None or hops < depth):
+                hops += 1
+                nxt = []
+                for node in frontier:
+                    for other in adjacency.get(node, ()):
+                        if other not in seen:
+                            seen.add(other)
+                            result[other] = hops
+                            nxt.append(other)
+                frontier = nxt
+            return result
+
+    # ── Updates ────────────────────────────────────────────────
+
+    def _apply(self, specs: dict[str, list[str]], removed: list[str]) -> int:
+        """Install new ``specs`` per file and drop ``removed`` files;
+        re-resolve what they affect and maintain the SCCs.
+        """
+        added_edges: list[tuple[str, str]] = []
+        removed_edges: list[tuple[str, str]] = []
+        affected: set[str] = set()              # specs whose resolution moved
+
+        for rel in removed:
+            self._set_targets(rel, set(), added_edges, removed_edges)
+            for spec in self._specs.pop(rel, ()):
+                self._users[spec].discard(rel)
+            for spec in _provides(rel):
+                self._resolves[spec].discard(rel)
+                affected.add(spec)
+            self._sigs.pop(rel, None)
+            self._fwd.pop(rel, None)
+            self._drop_node(rel)
+
+        dirty: set[str] = set()
+        for rel, new_specs in specs.items():
+            old = self._specs.get(rel)
+            if old is None:
+                for spec in _provides(rel):
+                    self._resolves[spec].add(rel)
+                    affected.add(spec)
+                self._fwd[rel] = set()
+                self._new_node(rel)
+            if old != new_specs:
+                for spec in old or ():
+                    self._users[spec].discard(rel)
+                for spec in new_specs:
+                    self._users[spec].add(rel)
+                self._specs[rel] = new_specs
+                dirty.add(rel)
+
+        for spec in affected:
+            dirty.update(self._users.get(spec, ()))
+        for rel in dirty:
+            if rel in self._specs:
+                self._set_targets(rel, self._resolve(rel), added_edges, removed_edges)
+        for rel in removed:
+            self._rev.pop(rel, None)
+
+        self._update_sccs(added_edges, removed_edges)
+        return len(added_edges) + len(removed_edges)
+
+    def _resolve(self, rel: str) -> set[str]:
+        targets = set()
+        for spec in self._specs[rel]:
+            files = self._resolves.get(spec)
+            if files:
+                targets.add(min(files))
+        targets.discard(rel)
+        return targets
+
+    def _set_targets(self, rel, targets, added_edges, removed_edges) -> None:
+        old = self._fwd.get(rel, set())
+        for t in old - targets:
+            self._rev[t].discard(rel)
+            removed_edges.append((rel, t))
+        for t in targets - old:
+            self._rev[t].add(rel)
+            added_edges.append((rel, t))
+        if rel in self._specs:
+            self._fwd[rel] = set(targets)
+
+    # ── SCC maintenance ────────────────────────────────────────
+
+    def _new_node(self, rel: str) -> None:
+        comp = self._next_comp
+        self._next_comp += 1
+        self._comp[rel] = comp
+        self._members[comp] = {rel}
+
+    def _drop_node(self, rel: str) -> None:
+        comp = self._comp.pop(rel, None)
+        if comp is None:
+            return
+        members = self._members[comp]
+        members.discard(rel)
+        if not members:
+            del self._members[comp]
+        else:
+            self._split(comp)
+
+    def _set_components(self, comps) -> None:
+        for comp_nodes in comps:
+            comp = self._next_comp
+            self._next_comp += 1
+            members = set(comp_nodes)
+            self._members[comp] = members
+            for node in members:
+                self._comp[node] = comp
+
+    def _split(self, comp: int) -> None:
+        members = self._members.pop(comp)
+        self._set_components(_tarjan(members, self._fwd))
+
+    def _update_sccs(self, added_edges, removed_edges) -> None:
+        if len(added_edges) + len(removed_edges) > _INCREMENTAL_SCC_LIMIT:
+            self._recompute_sccs()
+            return
+
+        to_split = {
+            self._comp[u] for u, v in removed_edges
+            if u in self._comp and v in self._comp and self._comp[u] == self._comp[v]
+        }
+        for comp in to_split:
+            if comp in self._members:
+                self._split(comp)
+
+        for u, v in added_edges:
+            if self._comp.get(u) == self._comp.get(v):
+                continue
+            # Nodes reachable from v; if u is among them, every node on a
+            # v ⇝ u path (reachable from v AND reaching u) joins u's SCC.
+            reach = {v}
+            stack = [v]
+            while stack:
+                for nxt in self._fwd.get(stack.pop(), ()):
+                    if nxt not in reach:
+                        reach.add(nxt)
+                        stack.append(nxt)
+            if u not in reach:
+                continue
+            on_path = {u}
+            stack = [u]
+            while stack:
+                for prev in self._rev.get(stack.pop(), ()):
+                    if prev in reach and prev not in on_path:
+                        on_path.add(prev)
+                        stack.append(prev)
+            merged: set[str] = set()
+            for comp in {self._comp[n] for n in on_path}:
+                merged |= self._members.pop(comp)
+            self._set_components([merged])
+
+    def _recompute_sccs(self) -> None:
+        self._comp.clear()
+        self._members.clear()
+        self._set_components(_tarjan(self._specs, self._fwd))
+
+    # ── Scan & persistence ─────────────────────────────────────
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """(mtime_ns, size) of every graphable file under the root."""
+        sigs: dict[str, tuple[int, int]] = {}
+        root = str(self.project_root)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in _EXCLUDE_DIRS]
+            rel_dir = os.path.relpath(dirpath, root)
+            for name in filenames:
+                if os.path.splitext(name)[1] not in _GRAPH_SUFFIXES:
+                    continue
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                rel = name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+                sigs[rel] = (st.st_mtime_ns, st.st_size)
+        return sigs
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        path = self.project_root / _STORE_FILE
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(data, dict) or data.get("version") != _VERSION:
+            return
+        for rel, (sig, specs, targets) in data.get("files", {}).items():
+            self._sigs[rel] = tuple(sig)
+            self._specs[rel] = specs
+            self._fwd[rel] = set(targets)
+            for spec in specs:
+                self._users[spec].add(rel)
+            for spec in _provides(rel):
+                self._resolves[spec].add(rel)
+            for t in targets:
+                self._rev[t].add(rel)
+        in_cycles: set[str] = set()
+        cycles = [c for c in data.get("cycles", []) if all(n in self._specs for n in c)]
+        self._set_components(cycles)
+        for c in cycles:
+            in_cycles.update(c)
+        self._set_components([n] for n in self._specs if n not in in_cycles)
+
+    def _save(self) -> None:
+        """Write the store atomically (temp file + rename)."""
+        path = self.project_root / _STORE_FILE
+        data = {
+            "version": _VERSION,
+            "files": {
+                rel: [list(self._sigs.get(rel, (0, 0))), specs, sorted(self._fwd.get(rel, ()))]
+                for rel, specs in self._specs.items()
+            },
+            "cycles": [sorted(m) for m in self._members.values() if len(m) > 1],
+        }
+        write_json_atomic(path, data, what="import graph")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Per-project registry + impact API
+# ═══════════════════════════════════════════════════════════════════
+
+
+_graphs: dict[str, ImportGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_import_graph(project_root: Path) -> ImportGraph:
+    """The import graph for ``project_root`` (created on first use)."""
+    return per_project(_graphs, _graphs_lock, project_root, ImportGraph)
+
+
+def change_impact(
+    project_root: Path,
+    paths: list[str],
+    *,
+    depth: int | None = None,
+    refresh: bool = True,
+) -> dict:
+    """What depends on ``paths`` (project-relative, ``/``-separated).
+
+    Returns:
+        {
+            "files": [str],                      # inputs known to the graph
+            "unknown": [str],                    # inputs not in the graph
+            "dependents": [{"file", "hops"}],    # nearest first
+            "cycles": [[str]],                   # cycles containing an input
+            "refresh": {"parsed", "removed", "edges_changed"} | None,
+        }
+    """
+    graph = get_import_graph(project_root)
+    refreshed = graph.refresh() if refresh else None
+    paths = [p.replace(os.sep, "/").removeprefix("./") for p in paths]
+    known = [p for p in paths if graph.component_of(p)]
+    hits = graph.dependents(known, depth=depth)
+    cycles = []
+    for p in known:
+        comp = graph.component_of(p)
+        if len(comp) > 1 and comp not in cycles:
+            cycles.append(comp)
+    return {
+        "files": known,
+        "unknown": [p for p in paths if p not in known],
+        "dependents": [{"file": f, "hops": h}
+                       for f, h in sorted(hits.items(), key=lambda kv: (kv[1], kv[0]))],
+        "cycles": cycles,
+        "refresh": refreshed,
+    }
@@ -208,17 +208,20 @@ def _detect_tools() -> list[dict]:
     but `.venv/bin` is NOT on PATH — falls back to checking the venv
     bin directory directly.
     """
+    from src.core.services import tool_inventory
+
     # Pre-compute venv bin path for fallback lookups
     venv_bin: str | None = None
     if sys.prefix != sys.base_prefix:
         venv_bin = os.path.join(sys.prefix, "bin")
 
+    # 1. Standard PATH lookup — one PATH snapshot for all tools
+    found = tool_inventory.which_many(t["cli"] for t in _TOOLS)
+
     results = []
     for tool in _TOOLS:
         cli_name = tool["cli"]
-
-        # 1. Standard PATH lookup
-        path = shutil.which(cli_name)
+        path = found[cli_name]
 
         # 2. Venv bin fallback (covers pip-installed tools not on PATH)
         if path is None and venv_bin:
@@ -228,16 +231,9 @@ def _detect_tools() -> list[dict]:
 
         # 3. Special case: pip via python -m pip
         if path is None and tool["id"] == "pip":
-            import subprocess
-            try:
-                r = subprocess.run(
-                    [sys.executable, "-m", "pip", "--version"],
-                    capture_output=True, timeout=5,
-                )
-                if r.returncode == 0:
-                    path = f"{sys.executable} -m pip"
-            except Exception:
-                pass
+            r = tool_inventory.probe([sys.executable, "-m", "pip", "--version"], timeout=5)
+            if r is not None and r.returncode == 0:
+                path = f"{sys.executable} -m pip"
 
         results.append({
             "id": tool["id"],
@@ -2,7 +2,8 @@
 L2 — Code quality analysis (on-demand, 1-5s).
 
 Computes code health metrics from parsed file data:
-per-language quality scoring, hotspot detection, naming consistency.
+per-language quality scoring, hotspot detection (static metrics and
+churn × complexity), naming consistency.
 Supports ALL languages via the parser registry and rubric system.
 
 Public API:
@@ -214,6 +215,17 @@ def _detect_hotspots(analyses: dict[str, FileAnalysis]) -> list[dict]:
     return hotspots
 
 
+def _churn_hotspots(project_root: Path, analyses: dict[str, FileAnalysis]) -> dict:
+    """Top churn × complexity files per window (empty outside git)."""
+    from src.core.services.audit.hotspots import WINDOWS, churn_hotspots
+
+    try:
+        return churn_hotspots(project_root, analyses)
+    except Exception as e:
+        logger.warning("Churn hotspot analysis failed: %s", e)
+        return {f"{w}d": [] for w in WINDOWS}
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  Naming consistency analysis (language-aware)
 # ═══════════════════════════════════════════════════════════════════
@@ -397,6 +409,7 @@ def l2_quality(project_root: Path) -> dict:
             "summary": {overall_score, dimension_scores, per_language, hotspot_summary},
             "file_scores": [{file, language, rubric, score, breakdown}, ...],
             "hotspots": [{type, severity, file, language, detail}, ...],
+            "churn_hotspots": {"30d"|"90d"|"365d": [{file, commits, complexity, score, ...}]},
             "naming": {total_symbols, correct, wrong_case, consistency_score, violations},
         }
     """
@@ -426,6 +439,9 @@ def l2_quality(project_root: Path) -> dict:
     # Detect hotspots (works across all languages)
     hotspots = _detect_hotspots(analyses)
 
+    # Churn × complexity hotspots (incremental git numstat store)
+    churn = _churn_hotspots(project_root, analyses)
+
     # Naming analysis (language-aware conventions)
     naming = _naming_analysis(analyses)
 
@@ -439,6 +455,7 @@ def l2_quality(project_root: Path) -> dict:
         "summary": summary,
         "file_scores": file_scores,
         "hotspots": hotspots,
+        "churn_hotspots": churn,
         "naming": naming,
     }
     return wrap_result(data, "L2", "quality", started)
@@ -116,6 +116,10 @@ def _git_object_weight(project_root: Path) -> dict:
 def _git_history(project_root: Path) -> dict:
     """Analyze git history: commit count, author count, age.
 
+    Commit count, authors and dates come from the incremental history
+    store (``history_store.py``), which only reads commits added since
+    the last audit.
+
     Returns:
         {
             "total_commits": int,
@@ -127,26 +131,13 @@ def _git_history(project_root: Path) -> dict:
             "tag_count": int,
         }
     """
-    # Total commit count
-    r_count = _run_git("rev-list", "--count", "HEAD", cwd=project_root)
-    total = int(r_count.stdout.strip()) if r_count.returncode == 0 else 0
-
-    # Author count
-    r_authors = _run_git(
-        "shortlog", "-sn", "--all", "--no-merges",
-        cwd=project_root, timeout=15,
-    )
-    authors = 0
-    if r_authors.returncode == 0:
-        authors = len([l for l in r_authors.stdout.strip().splitlines() if l.strip()])
+    from src.core.services.audit.history_store import history_stats
 
-    # First commit date
-    r_first = _run_git("log", "--reverse", "--format=%aI", "-1", cwd=project_root)
-    first_date = r_first.stdout.strip() if r_first.returncode == 0 else None
-
-    # Latest commit date
-    r_latest = _run_git("log", "--format=%aI", "-1", cwd=project_root)
-    latest_date = r_latest.stdout.strip() if r_latest.returncode == 0 else None
+    stats = history_stats(project_root) or {}
+    total = stats.get("total_commits", 0)
+    authors = len(stats.get("authors", {}))
+    first_date = stats.get("first_date")
+    latest_date = stats.get("latest_date")
 
     # Age in days
     age_days = 0
@@ -159,17 +150,18 @@ def _git_history(project_root: Path) -> dict:
         except (ValueError, TypeError):
             pass
 
-    # Branch count
-    r_branches = _run_git("branch", "--list", cwd=project_root)
-    branches = 0
-    if r_branches.returncode == 0:
-        branches = len([l for l in r_branches.stdout.strip().splitlines() if l.strip()])
-
-    # Tag count
-    r_tags = _run_git("tag", "--list", cwd=project_root)
-    tags = 0
-    if r_tags.returncode == 0:
-        tags = len([l for l in r_tags.stdout.strip().splitlines() if l.strip()])
+    # Branch + tag count (one ref listing)
+    r_refs = _run_git(
+        "for-each-ref", "--format=%(refname)", "refs/heads/", "refs/tags/",
+        cwd=project_root,
+    )
+    branches = tags = 0
+    if r_refs.returncode == 0:
+        for ref in r_refs.stdout.splitlines():
+            if ref.startswith("refs/heads/"):
+                branches += 1
+            elif ref.startswith("refs/tags/"):
+                tags += 1
 
     return {
         "total_commits": total,
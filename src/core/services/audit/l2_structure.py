@@ -5,8 +5,10 @@ Builds the import graph, computes module boundaries,
 exposure ratios, and cross-module dependency mapping.
 
 Parses ALL file types via the parser registry.
-Import/dependency data comes from parsers that extract it
-(currently Python; JS/Go/Rust parsers will add more).
+Internal file → file edges, cross-module dependencies and import
+cycles come from the persistent import graph (import_graph.py),
+refreshed incrementally; external dependencies come from parsers
+that extract imports (currently Python; JS/Go/Rust parsers will add more).
 
 Public API:
     l2_structure(project_root)  → import graph + module analysis
@@ -41,14 +43,44 @@ _MODULE_ENTRY_FILES: set[str] = {
 
 
 # ═══════════════════════════════════════════════════════════════════
-#  Import graph construction
+#  Import graph (from the persistent file graph)
 # ═══════════════════════════════════════════════════════════════════
 
 
-def _build_import_graph(
+def _module_of(rel_path: str) -> str:
+    """Dotted directory of a file — the module it belongs to."""
+    parts = Path(rel_path).parts
+    return ".".join(parts[:-1]) if len(parts) > 1 else "__root__"
+
+
+def _persistent_graph(
+    project_root: Path,
+) -> tuple[dict[str, list[str]], list[list[str]]]:
+    """Resolved file → file edges and import cycles.
+
+    Comes from the persistent import graph (``import_graph.py``), which
+    re-parses only the files that changed since the last refresh.
+    """
+    from src.core.services.audit.import_graph import get_import_graph
+
+    try:
+        graph = get_import_graph(project_root)
+        graph.refresh()
+        return graph.edges(), graph.cycles()
+    except Exception as e:
+        logger.warning("Import graph refresh failed: %s", e)
+        return {}, []
+
+
+def _import_graph_view(
     analyses: dict[str, FileAnalysis],
+    file_edges: dict[str, list[str]],
 ) -> dict:
-    """Build the import graph from parse_tree results.
+    """Import graph for the audit: nodes, internal and external edges.
+
+    Internal edges are the persistent graph's resolved file → file
+    edges; nodes and external (third-party) edges come from the parsed
+    files.
 
     Returns:
         {
@@ -56,7 +88,8 @@ def _build_import_graph(
                        "language": "python", ...}],
             "edges": [{"from": "src/ui/web/server.py", "to": "flask",
                        "type": "external"}, ...],
-            "internal_edges": [{"from": "...", "to": "...", "names": [...]}],
+            "internal_edges": [{"from": "src/ui/web/server.py",
+                                "to": "src/core/config.py"}, ...],
             "external_deps": {"flask": {"files": [...], "count": int}},
             "total_nodes": int,
             "internal_edge_count": int,
@@ -65,22 +98,14 @@ def _build_import_graph(
     """
     nodes = []
     edges = []
-    internal_edges = []
     external_deps: dict[str, dict] = collections.defaultdict(
         lambda: {"files": [], "count": 0}
     )
 
     for rel_path, analysis in analyses.items():
-        # Determine module from path
-        parts = Path(rel_path).parts
-        if len(parts) > 1:
-            module = ".".join(parts[:-1])
-        else:
-            module = "__root__"
-
         nodes.append({
             "id": rel_path,
-            "module": module,
+            "module": _module_of(rel_path),
             "language": analysis.language,
             "file_type": analysis.file_type,
             "imports": analysis.metrics.import_count,
@@ -89,14 +114,7 @@ def _build_import_graph(
         })
 
         for imp in analysis.imports:
-            if imp.is_internal:
-                internal_edges.append({
-                    "from": rel_path,
-                    "to": imp.module,
-                    "names": imp.names,
-                    "lineno": imp.lineno,
-                })
-            elif not imp.is_stdlib:
+            if not imp.is_internal and not imp.is_stdlib:
                 top = imp.top_level
                 edges.append({
                     "from": rel_path,
@@ -112,6 +130,12 @@ def _build_import_graph(
         dep_info["files"] = sorted(set(dep_info["files"]))
         dep_info["count"] = len(dep_info["files"])
 
+    internal_edges = [
+        {"from": src, "to": dst}
+        for src, targets in sorted(file_edges.items())
+        for dst in targets
+    ]
+
     return {
         "nodes": nodes,
         "edges": edges,
@@ -222,10 +246,13 @@ def _analyze_modules(
 
 
 def _cross_module_deps(
-    analyses: dict[str, FileAnalysis],
+    file_edges: dict[str, list[str]],
 ) -> list[dict]:
     """Map internal cross-module dependencies.
 
+    Rolls the persistent graph's file → file edges up to modules
+    (directories); ``import_count`` is the number of file edges.
+
     Returns:
         [{
             "from_module": "src.ui.web",
@@ -238,38 +265,16 @@ def _cross_module_deps(
     # Collect edges between modules
     module_edges: dict[tuple[str, str], dict] = {}
 
-    for rel_path, analysis in analyses.items():
-        from_parts = Path(rel_path).parts
-        from_module = ".".join(from_parts[:-1]) if len(from_parts) > 1 else "__root__"
-
-        for imp in analysis.imports:
-            if imp.is_internal:
-                # Resolve the to_module
-                to_mod = imp.module
-                if to_mod.startswith("."):
-                    # Relative import — resolve against from_module
-                    dots = len(to_mod) - len(to_mod.lstrip("."))
-                    remainder = to_mod.lstrip(".")
-                    # Go up 'dots' levels from from_module
-                    base_parts = from_module.split(".")
-                    if dots <= len(base_parts):
-                        base = ".".join(base_parts[: len(base_parts) - dots + 1])
-                    else:
-                        base = from_module
-                    to_mod = f"{base}.{remainder}" if remainder else base
-                # Trim to module level (directory, not individual file)
-                to_parts = to_mod.split(".")
-                # Use parent directory — drop the last segment if it looks
-                # like a file-level module (lowercase, no further children).
-                # Keep the full dotted path to preserve sub-module precision.
-                to_module = ".".join(to_parts[:-1]) if len(to_parts) > 1 else to_mod
-
-                if to_module != from_module:
-                    key = (from_module, to_module)
-                    if key not in module_edges:
-                        module_edges[key] = {"count": 0, "files": set()}
-                    module_edges[key]["count"] += 1
-                    module_edges[key]["files"].add(rel_path)
+    for rel_path, targets in file_edges.items():
+        from_module = _module_of(rel_path)
+        for target in targets:
+            to_module = _module_of(target)
+            if to_module != from_module:
+                key = (from_module, to_module)
+                if key not in module_edges:
+                    module_edges[key] = {"count": 0, "files": set()}
+                module_edges[key]["count"] += 1
+                module_edges[key]["files"].add(rel_path)
 
     result = []
     for (from_mod, to_mod), info in sorted(module_edges.items()):
@@ -393,7 +398,8 @@ def l2_structure(project_root: Path) -> dict:
     """L2: Full structure analysis — import graph, modules, usage map.
 
     Parses ALL file types via the parser registry.
-    Builds import graph from files that report imports
+    Internal edges and cycles come from the persistent import graph;
+    external deps from files that report imports
     (currently Python; future parsers will add JS/Go/Rust imports).
 
     Returns:
@@ -404,6 +410,7 @@ def l2_structure(project_root: Path) -> dict:
             "modules": [{module, files, languages, exposure_ratio, ...}, ...],
             "cross_module_deps": [{from_module, to_module, strength, ...}, ...],
             "library_usage": {flask: {sites: [...], file_count: int}, ...},
+            "import_cycles": [[file, ...], ...],   # largest first
         }
     """
     from src.core.services.audit.parsers import registry
@@ -414,10 +421,13 @@ def l2_structure(project_root: Path) -> dict:
     analyses = registry.parse_tree(project_root)
     parse_time = int((time.time() - started) * 1000)
 
+    # File edges and cycles come from the persistent import graph
+    file_edges, cycles = _persistent_graph(project_root)
+
     # Build all derived data
-    graph = _build_import_graph(analyses)
+    graph = _import_graph_view(analyses, file_edges)
     modules = _analyze_modules(analyses, project_root)
-    cross_deps = _cross_module_deps(analyses)
+    cross_deps = _cross_module_deps(file_edges)
     lib_usage = _library_usage_map(analyses)
     stats = _aggregate_stats(analyses)
     stats["parse_time_ms"] = parse_time
@@ -428,5 +438,6 @@ def l2_structure(project_root: Path) -> dict:
         "modules": modules,
         "cross_module_deps": cross_deps,
         "library_usage": lib_usage,
+        "import_cycles": cycles,
     }
     return wrap_result(data, "L2", "structure", started)
@@ -0,0 +1,416 @@
+"""
+Audit score history — append-only columnar store with rollups.
+
+The old history was one JSON list in ``.state/audit_scores.json``,
+rewritten on every score and capped at 100 snapshots: trends older than
+a few weeks were dropped and each save re-serialised everything.
+
+Here every series is a set of column files (one little-endian array
+per field) under ``.state/audit_scores/``:
+
+    raw      every snapshot: timestamp, complexity, quality, enriched
+    day      UTC-day rollups: count, sums, min/max, last value
+    week     ISO-week (Monday, UTC) rollups, same columns
+
+Column files are only ever appended to.  The rollup tables hold closed
+buckets; the open (newest) day and week rows live in ``open.json``,
+replaced atomically on each snapshot and stamped with the raw row count
+they cover.  When a bucket closes its row is appended to the table.
+Recording a snapshot is O(1) whatever the history length.  Queries
+load the columns as ``array``s (cached until a column grows) and bisect
+the timestamp column, so a years-long trend is a slice at the
+resolution that fits the chart.
+
+Timestamps are kept non-decreasing (a snapshot stamped before the
+previous one is clamped to it) so the timestamp column stays sorted.
+A write interrupted between columns leaves them at different lengths;
+readers use the shortest and the next append trims the rest.  Open rows
+that do not match the raw row count (a crash between the raw append and
+``open.json``) are rebuilt from the raw columns.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from src.core.services.store_helpers import per_project, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+_STORE_DIR = ".state/audit_scores"
+_LEGACY_FILE = ".state/audit_scores.json"
+_OPEN_FILE = "open.json"
+
+RESOLUTIONS = ("raw", "day", "week")
+DEFAULT_MAX_POINTS = 200
+
+_DAY_S = 86_400
+_WEEK_S = 7 * _DAY_S
+_WEEK_OFFSET_S = 4 * _DAY_S          # 1970-01-05, the first Monday of the epoch
+
+_RAW_COLUMNS = (("timestamp", "d"), ("complexity", "d"), ("quality", "d"), ("enriched", "B"))
+_ROLLUP_COLUMNS = (
+    ("start", "d"), ("count", "I"),
+    ("complexity_sum", "d"), ("complexity_min", "d"), ("complexity_max", "d"),
+    ("complexity_last", "d"),
+    ("quality_sum", "d"), ("quality_min", "d"), ("quality_max", "d"),
+    ("quality_last", "d"),
+)
+
+
+def _bucket_start(resolution: str, ts: float) -> float:
+    if resolution == "day":
+        return float(int(ts // _DAY_S) * _DAY_S)
+    return float(int((ts - _WEEK_OFFSET_S) // _WEEK_S) * _WEEK_S + _WEEK_OFFSET_S)
+
+
+def _new_rollup(start: float, c: float, q: float) -> dict:
+    return {
+        "start": start, "count": 1,
+        "complexity_sum": c, "complexity_min": c, "complexity_max": c,
+        "complexity_last": c,
+        "quality_sum": q, "quality_min": q, "quality_max": q,
+        "quality_last": q,
+    }
+
+
+def _fold(row: dict, c: float, q: float) -> None:
+    row["count"] += 1
+    row["complexity_sum"] += c
+    row["complexity_min"] = min(row["complexity_min"], c)
+    row["complexity_max"] = max(row["complexity_max"], c)
+    row["quality_sum"] += q
+    row["quality_min"] = min(row["quality_min"], q)
+    row["quality_max"] = max(row["quality_max"], q)
+    row["complexity_last"], row["quality_last"] = c, q
+
+
+class _ColumnTable:
+    """Fixed-width columns, one file each, rows addressed by index."""
+
+    def __init__(self, directory: Path, name: str, columns: tuple[tuple[str, str], ...]):
+        self.columns = columns
+        self.paths = {col: directory / f"{name}.{col}" for col, _ in columns}
+        self.sizes = {col: array(code).itemsize for col, code in columns}
+
+    def rows(self) -> int:
+        """Row count (shortest column)."""
+        n = None
+        for col, _ in self.columns:
+            try:
+                size = self.paths[col].stat().st_size
+            except OSError:
+                return 0
+            k = size // self.sizes[col]
+            n = k if n is None else min(n, k)
+        return n or 0
+
+    def repair(self) -> int:
+        """Trim every column to the shortest; returns the row count."""
+        n = self.rows()
+        for col, _ in self.columns:
+            path = self.paths[col]
+            want = n * self.sizes[col]
+            try:
+                if path.stat().st_size != want:
+                    os.truncate(path, want)
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.touch()
+        return n
+
+    def read(self, lo: int, hi: int) -> dict[str, array]:
+        """Rows ``lo`` to ``hi - 1`` of every column."""
+        data = {}
+        for col, code in self.columns:
+            size = self.sizes[col]
+            a = array(code)
+            try:
+                with open(self.paths[col], "rb") as f:
+                    f.seek(lo * size)
+                    a.frombytes(f.read((hi - lo) * size))
+            except FileNotFoundError:
+                pass
+            if sys.byteorder == "big":
+                a.byteswap()
+            data[col] = a
+        return data
+
+    def last(self, n: int) -> dict | None:
+        """Row ``n - 1`` (the last of ``n`` rows)."""
+        if n == 0:
+            return None
+        return {col: a[0] for col, a in self.read(n - 1, n).items()}
+
+    def append_row(self, row: dict) -> None:
+        """Append ``row`` to every column (after ``repair``)."""
+        for col, code in self.columns:
+            a = array(code, [row[col]])
+            if sys.byteorder == "big":
+                a.byteswap()
+            with open(self.paths[col], "ab") as f:
+                f.write(a.tobytes())
+
+    def truncate(self, n: int) -> None:
+        """Drop the rows from ``n`` on."""
+        for col, _ in self.columns:
+            os.truncate(self.paths[col], n * self.sizes[col])
+
+
+class ScoreStore:
+    """Score history for one project."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        directory = project_root / _STORE_DIR
+        self._raw = _ColumnTable(directory, "raw", _RAW_COLUMNS)
+        self._rollups = {
+            res: _ColumnTable(directory, res, _ROLLUP_COLUMNS) for res in ("day", "week")
+        }
+        self._open_path = directory / _OPEN_FILE
+        # {"raw_rows": int, "day": row | None, "week": row | None}
+        self._open: dict | None = None
+        self._lock = threading.Lock()
+        self._migrated = False
+        # {table: (rows, columns)} — reloaded when the row count moves
+        self._loaded: dict[str, tuple[int, dict[str, array]]] = {}
+
+    # ── Writing ────────────────────────────────────────────────
+
+    def append(self, snapshot: dict) -> dict:
+        """Record ``{timestamp, complexity, quality, enriched}``.
+
+        Returns the snapshot as stored (timestamp possibly clamped).
+        """
+        with self._lock:
+            self._migrate()
+            return self._append(snapshot)
+
+    def _append(self, snapshot: dict) -> dict:
+        n = self._raw.repair()
+        open_rows = self._open_rows(n)
+        prev = self._raw.last(n)
+        ts = float(snapshot["timestamp"])
+        if prev is not None and ts < prev["timestamp"]:
+            ts = prev["timestamp"]
+        row = {
+            "timestamp": ts,
+            "complexity": float(snapshot["complexity"]),
+            "quality": float(snapshot["quality"]),
+            "enriched": 1 if snapshot.get("enriched") else 0,
+        }
+        self._raw.append_row(row)
+
+        c, q = row["complexity"], row["quality"]
+        for res, table in self._rollups.items():
+            start = _bucket_start(res, ts)
+            current = open_rows[res]
+            if current is not None and current["start"] == start:
+                _fold(current, c, q)
+                continue
+            if current is not None:
+                k = table.repair()
+                last = table.last(k)
+                if last is None or last["start"] < current["start"]:
+                    table.append_row(current)
+            open_rows[res] = _new_rollup(start, c, q)
+        open_rows["raw_rows"] = n + 1
+        write_json_atomic(self._open_path, open_rows, what="open score rollups")
+        return _raw_entry(row)
+
+    def _open_rows(self, n: int) -> dict:
+        """Open day/week rows covering ``n`` raw rows (caller holds the lock)."""
+        if self._open is None or self._open.get("raw_rows") != n:
+            try:
+                self._open = json.loads(self._open_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self._open = None
+            if not isinstance(self._open, dict) or self._open.get("raw_rows") != n:
+                self._open = self._rebuild_open(n)
+        return self._open
+
+    def _rebuild_open(self, n: int) -> dict:
+        """Recompute the open rows — and any unclosed buckets — from raw rows."""
+        open_rows: dict = {"raw_rows": n}
+        raw = self._raw.read(0, n)
+        stamps = raw["timestamp"]
+        for res, table in self._rollups.items():
+            open_rows[res] = None
+            k = table.repair()
+            if not n:
+                table.truncate(0)
+                continue
+            newest = _bucket_start(res, stamps[-1])
+            while k and table.last(k)["start"] >= newest:
+                k -= 1                            # the open bucket is never closed
+            table.truncate(k)
+            last = table.last(k)
+            lo = 0 if last is None else bisect_left(
+                stamps, last["start"] + (_DAY_S if res == "day" else _WEEK_S))
+            current = None
+            for i in range(lo, n):
+                c, q = raw["complexity"][i], raw["quality"][i]
+                start = _bucket_start(res, stamps[i])
+                if current is not None and current["start"] == start:
+                    _fold(current, c, q)
+                    continue
+                if current is not None:
+                    table.append_row(current)
+                current = _new_rollup(start, c, q)
+            open_rows[res] = current
+        return open_rows
+
+    def _migrate(self) -> None:
+        """Import the legacy JSON history once (caller holds the lock)."""
+        if self._migrated:
+            return
+        self._migrated = True
+        legacy = self.project_root / _LEGACY_FILE
+        if not legacy.is_file():
+            return
+        try:
+            history = json.loads(legacy.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.debug("Cannot read legacy score history: %s", e)
+            return
+        if isinstance(history, list) and self._raw.rows() == 0:
+            valid = [h for h in history if isinstance(h, dict)
+                     and {"timestamp", "complexity", "quality"} <= h.keys()]
+            for snapshot in sorted(valid, key=lambda h: h["timestamp"]):
+                self._append(snapshot)
+            logger.info("Migrated %d score snapshots to %s", len(valid), _STORE_DIR)
+        try:
+            legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+        except OSError as e:
+            logger.debug("Cannot rename legacy score history: %s", e)
+
+    # ── Reading ────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._migrate()
+            return self._raw.rows()
+
+    def latest(self, n: int | None = None) -> list[dict]:
+        """The last ``n`` snapshots (all for None), oldest first."""
+        with self._lock:
+            self._migrate()
+            total = self._raw.rows()
+            lo = 0 if n is None else max(0, total - n)
+            cols = self._raw.read(lo, total)
+        return [_raw_entry({k: v[i] for k, v in cols.items()}) for i in range(total - lo)]
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        *,
+        resolution: str = "auto",
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> dict:
+        """Snapshots or rollups with timestamps in ``[start, end]``.
+
+        ``resolution="auto"`` picks the finest of raw / day / week that
+        fits in ``max_points`` (week if none does).
+
+        Returns:
+            {"resolution": str, "points": [...], "total": int}
+
+        Raw points are ``{timestamp, complexity, quality, enriched}``;
+        rollup points are ``{timestamp (bucket start), count,
+        complexity, quality (means), complexity_min/max/last,
+        quality_min/max/last}``.
+        """
+        if resolution != "auto" and resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        with self._lock:
+            self._migrate()
+            tables = {"raw": self._columns("raw", self._raw)}
+            for res, table in self._rollups.items():
+                tables[res] = self._columns(res, table)
+        total = len(tables["raw"]["timestamp"])
+
+        def span(res: str) -> tuple[int, int]:
+            keys = tables[res]["timestamp" if res == "raw" else "start"]
+            lo = 0 if start is None else bisect_left(
+                keys, start if res == "raw" else _bucket_start(res, start))
+            hi = len(keys) if end is None else bisect_right(keys, end)
+            return lo, hi
+
+        if resolution == "auto":
+            resolution = "week"
+            for res in RESOLUTIONS:
+                lo, hi = span(res)
+                if hi - lo <= max_points:
+                    resolution = res
+                    break
+        lo, hi = span(resolution)
+        cols = tables[resolution]
+        if resolution == "raw":
+            points = [_raw_entry({k: v[i] for k, v in cols.items()}) for i in range(lo, hi)]
+        else:
+            points = [_rollup_entry({k: v[i] for k, v in cols.items()}) for i in range(lo, hi)]
+        return {"resolution": resolution, "points": points, "total": total}
+
+    def _columns(self, name: str, table: _ColumnTable) -> dict[str, array]:
+        """Cached column arrays for ``table`` (caller holds the lock).
+
+        Keyed on the raw row count, which grows with every append;
+        rollup columns end with the open row.
+        """
+        key = self._raw.rows()
+        cached = self._loaded.get(name)
+        if cached is None or cached[0] != key:
+            current = None if table is self._raw else self._open_rows(key)[name]
+            cols = table.read(0, table.rows())
+            if current is not None:
+                for col, a in cols.items():
+                    a.append(current[col])
+            cached = self._loaded[name] = (key, cols)
+        return cached[1]
+
+
+def _raw_entry(row: dict) -> dict:
+    return {
+        "timestamp": row["timestamp"],
+        "complexity": row["complexity"],
+        "quality": row["quality"],
+        "enriched": bool(row["enriched"]),
+    }
+
+
+def _rollup_entry(row: dict) -> dict:
+    n = row["count"]
+    return {
+        "timestamp": row["start"],
+        "count": n,
+        "complexity": round(row["complexity_sum"] / n, 2),
+        "complexity_min": row["complexity_min"],
+        "complexity_max": row["complexity_max"],
+        "complexity_last": row["complexity_last"],
+        "quality": round(row["quality_sum"] / n, 2),
+        "quality_min": row["quality_min"],
+        "quality_max": row["quality_max"],
+        "quality_last": row["quality_last"],
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Per-project registry
+# ═══════════════════════════════════════════════════════════════════
+
+
+_stores: dict[str, ScoreStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_score_store(project_root: Path) -> ScoreStore:
+    """The score store for ``project_root`` (created on first use)."""
+    return per_project(_stores, _stores_lock, project_root, ScoreStore)
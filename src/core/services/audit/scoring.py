@@ -2,15 +2,14 @@
 Scoring — compute Complexity and Quality master scores.
 
 Scores are computed from L0+L1 data, optionally enriched with L2
-analysis when available.  Score history is tracked in
-``state/audit_scores.json`` for trend analysis.
+analysis when available.  Score history is tracked in the columnar
+store under ``.state/audit_scores/`` (see ``score_store``) for trend
+analysis.
 """
 
 from __future__ import annotations
 
-import json
 import logging
-import tempfile
 import time
 from pathlib import Path
 
@@ -295,48 +294,18 @@ def _quality_score(
 #  Score History
 # ═══════════════════════════════════════════════════════════════════
 
-_HISTORY_FILE = ".state/audit_scores.json"
-_MAX_HISTORY = 100  # Keep last 100 snapshots
+_SPARKLINE_POINTS = 20  # Snapshots returned with each score
 
 
-def _load_history(project_root: Path) -> list[dict]:
-    """Load score history from state file."""
-    path = project_root / _HISTORY_FILE
-    if not path.is_file():
-        return []
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if isinstance(data, list):
-            return data
-    except (json.JSONDecodeError, OSError) as e:
-        logger.debug("Cannot load score history: %s", e)
-    return []
-
-
-def _save_history(project_root: Path, history: list[dict]) -> None:
-    """Save score history atomically."""
-    path = project_root / _HISTORY_FILE
-    path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Trim to max
-    if len(history) > _MAX_HISTORY:
-        history = history[-_MAX_HISTORY:]
-
-    content = json.dumps(history, indent=2, ensure_ascii=False) + "\n"
+def _load_history(project_root: Path, limit: int | None = None) -> list[dict]:
+    """Load the last ``limit`` score snapshots (all for None), oldest first."""
+    from src.core.services.audit.score_store import get_score_store
 
     try:
-        fd, tmp_path = tempfile.mkstemp(
-            dir=path.parent, prefix=".scores_", suffix=".tmp",
-        )
-        tmp = Path(tmp_path)
-        try:
-            tmp.write_text(content, encoding="utf-8")
-            tmp.rename(path)
-        except Exception:
-            tmp.unlink(missing_ok=True)
-            raise
-    except Exception as e:
-        logger.warning("Cannot save score history: %s", e)
+        return get_score_store(project_root).latest(limit)
+    except OSError as e:
+        logger.debug("Cannot load score history: %s", e)
+        return []
 
 
 def _record_snapshot(
@@ -346,6 +315,8 @@ def _record_snapshot(
     enriched: bool,
 ) -> dict:
     """Record a score snapshot in history and return the snapshot."""
+    from src.core.services.audit.score_store import get_score_store
+
     snapshot = {
         "timestamp": time.time(),
         "complexity": complexity["score"],
@@ -353,15 +324,18 @@ def _record_snapshot(
         "enriched": enriched,
     }
 
-    history = _load_history(project_root)
-    history.append(snapshot)
-    _save_history(project_root, history)
+    try:
+        snapshot = get_score_store(project_root).append(snapshot)
+    except OSError as e:
+        logger.warning("Cannot save score history: %s", e)
 
     return snapshot
 
 
-def _compute_trend(history: list[dict]) -> dict:
-    """Compute score trend from history.
+def _compute_trend(history: list[dict], total: int | None = None) -> dict:
+    """Compute score trend from the most recent snapshots.
+
+    ``total`` is the full history length when ``history`` is its tail.
 
     Returns:
         {
@@ -372,9 +346,10 @@ def _compute_trend(history: list[dict]) -> dict:
             "quality_delta": float,
         }
     """
+    snapshots = len(history) if total is None else total
     if len(history) < 2:
         return {
-            "snapshots": len(history),
+            "snapshots": snapshots,
             "complexity_trend": "new",
             "quality_trend": "new",
             "complexity_delta": 0.0,
@@ -394,7 +369,7 @@ def _compute_trend(history: list[dict]) -> dict:
         return "up" if delta > 0 else "down"
 
     return {
-        "snapshots": len(history),
+        "snapshots": snapshots,
         "complexity_trend": _trend(c_delta),
         "quality_trend": _trend(q_delta),
         "complexity_delta": round(c_delta, 1),
@@ -481,14 +456,20 @@ def audit_scores(
             enriched=quality.get("enriched", False),
         )
 
-    history = _load_history(project_root)
-    trend = _compute_trend(history)
+    from src.core.services.audit.score_store import get_score_store
+
+    history = _load_history(project_root, _SPARKLINE_POINTS)
+    try:
+        total = len(get_score_store(project_root))
+    except OSError:
+        total = len(history)
+    trend = _compute_trend(history, total)
 
     data = {
         "complexity": complexity,
         "quality": quality,
         "trend": trend,
-        "history": history[-20:],  # Last 20 for sparkline rendering
+        "history": history,  # Last 20 for sparkline rendering
     }
     return wrap_result(data, "L1", "scores", started)
 
@@ -5,6 +5,7 @@ Sub-modules::
 
     common.py    — shared helpers (classify, enc key, archive encrypt/decrypt)
     archive.py   — folder scanning, archive CRUD, upload
+    chunkstore.py — dedup snapshots: CDC chunk store, refcount GC, export
     restore.py   — restore, import, wipe, in-place encrypt/decrypt
     extras.py    — git tracking, file tree, release upload/delete
 
@@ -36,11 +37,19 @@ from .archive import (  # noqa: F401
     list_backups,
     preview_backup,
     delete_backup,
+    export_snapshot,
     rename_backup,
     sanitize_backup_name,
     upload_backup,
 )
 
+# ── Dedup snapshots (chunk store) ──
+from .chunkstore import (  # noqa: F401
+    ChunkStoreError,
+    gc_chunk_store,
+    is_snapshot,
+)
+
 # ── Restore / import / wipe / in-place encrypt ──
 from .restore import (  # noqa: F401
     restore_backup,
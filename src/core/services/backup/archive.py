@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextlib
 import io
 import json
 import logging
@@ -10,14 +11,22 @@ import re
 import shutil
 import tarfile
 import tempfile
+from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .chunkstore import (
+    ChunkStoreError, create_snapshot, export_snapshot_tar, gc_chunk_store,
+    is_snapshot, read_snapshot, release_snapshot, snapshot_manifest,
+)
 from .common import (
     classify_file, backup_dir_for, safe_backup_name, resolve_folder,
-    read_manifest, get_enc_key, encrypt_archive,
+    read_manifest, get_enc_key, decrypt_archive,
     SKIP_DIRS, MEDIA_EXT, DOC_EXT,
 )
+from .parallel_gzip import open_tar_gz
+from .seekable import open_tar_reader, read_index
+from .stream_crypto import is_stream_encrypted
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +89,62 @@ def list_folders(project_root: Path) -> list[dict]:
 # ═══════════════════════════════════════════════════════════════════
 
 
+def _write_tar(
+    archive_path: Path,
+    manifest: dict,
+    files: list[tuple[Path, str]],
+    now: datetime,
+    *,
+    decrypt_enc: bool,
+    enc_key: str,
+    encrypt: bool = False,
+) -> None:
+    """Write a classic ``.tar.gz`` backup (manifest first).
+
+    With ``encrypt`` the archive is encrypted while it is written
+    (``.tar.gz.enc``) — the plaintext archive never touches the disk.
+    """
+    with open_tar_gz(archive_path, passphrase=enc_key if encrypt else "") as tar:
+        manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(name="backup_manifest.json")
+        info.size = len(manifest_bytes)
+        info.mtime = int(now.timestamp())
+        tar.addfile(info, io.BytesIO(manifest_bytes))
+
+        for file_path, arcname in files:
+            if decrypt_enc and file_path.suffix.lower() == ".enc" and enc_key:
+                try:
+                    from src.core.services.content.crypto import decrypt_file_to_memory
+                    plain_bytes, _meta = decrypt_file_to_memory(file_path, enc_key)
+                    plain_name = arcname
+                    if plain_name.endswith(".enc"):
+                        plain_name = plain_name[:-4]
+                    member = tarfile.TarInfo(name=plain_name)
+                    member.size = len(plain_bytes)
+                    member.mtime = int(now.timestamp())
+                    tar.addfile(member, io.BytesIO(plain_bytes))
+                except Exception as e:
+                    logger.warning("Could not decrypt %s, adding as-is: %s", arcname, e)
+                    tar.add(str(file_path), arcname=arcname)
+            else:
+                tar.add(str(file_path), arcname=arcname)
+
+
+def _decrypted_reader(enc_key: str):
+    """Snapshot ``read_file`` hook: store ``.enc`` vault files decrypted."""
+    def read(file_path: Path, arcname: str) -> tuple[str, bytes] | None:
+        if file_path.suffix.lower() != ".enc" or not enc_key:
+            return None
+        try:
+            from src.core.services.content.crypto import decrypt_file_to_memory
+            plain_bytes, _meta = decrypt_file_to_memory(file_path, enc_key)
+        except Exception as e:
+            logger.warning("Could not decrypt %s, adding as-is: %s", arcname, e)
+            return None
+        return (arcname[:-4] if arcname.endswith(".enc") else arcname), plain_bytes
+    return read
+
+
 def create_backup(
     project_root: Path,
     target_folder: str,
@@ -89,9 +154,14 @@ def create_backup(
     decrypt_enc: bool = False,
     encrypt_archive_flag: bool = False,
     custom_name: str = "",
+    dedup: bool = False,
 ) -> dict:
     """Create a backup archive from selected files/folders.
 
+    With ``dedup=True`` a snapshot (``.snap`` / ``.snap.enc``) is written
+    instead of a ``.tar.gz``: only chunks not already in the folder's
+    chunk store are stored (see ``chunkstore.py``).
+
     Returns dict with success/error info and manifest.
     """
     if not target_folder:
@@ -132,13 +202,18 @@ def create_backup(
     now = datetime.now(timezone.utc)
     timestamp = now.strftime("%Y%m%dT%H%M%S")
 
+    suffix = ".tar.gz.enc" if encrypt_archive_flag else ".tar.gz"
+    if dedup:
+        suffix = ".snap.enc" if encrypt_archive_flag else ".snap"
     if custom_name:
         safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', custom_name)
-        if not safe_name.endswith(".tar.gz"):
-            safe_name += ".tar.gz"
-        archive_name = safe_name
+        for ext in (".tar.gz.enc", ".tar.gz", ".snap.enc", ".snap"):
+            if safe_name.endswith(ext):
+                safe_name = safe_name[:-len(ext)]
+                break
+        archive_name = safe_name + suffix
     else:
-        archive_name = f"backup_{timestamp}.tar.gz"
+        archive_name = f"backup_{timestamp}{suffix}"
     archive_path = bak_dir / archive_name
 
     # Count by type
@@ -164,38 +239,23 @@ def create_backup(
         "files": [p for _, p in files],
     }
 
+    dedup_stats = None
     try:
-        with tarfile.open(archive_path, "w:gz") as tar:
-            # Manifest
-            manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
-            info = tarfile.TarInfo(name="backup_manifest.json")
-            info.size = len(manifest_bytes)
-            info.mtime = int(now.timestamp())
-            tar.addfile(info, io.BytesIO(manifest_bytes))
-
-            for file_path, arcname in files:
-                if decrypt_enc and file_path.suffix.lower() == ".enc" and enc_key:
-                    try:
-                        from src.core.services.content.crypto import decrypt_file_to_memory
-                        plain_bytes, meta = decrypt_file_to_memory(file_path, enc_key)
-                        plain_name = arcname
-                        if plain_name.endswith(".enc"):
-                            plain_name = plain_name[:-4]
-                        member = tarfile.TarInfo(name=plain_name)
-                        member.size = len(plain_bytes)
-                        member.mtime = int(now.timestamp())
-                        tar.addfile(member, io.BytesIO(plain_bytes))
-                    except Exception as e:
-                        logger.warning("Could not decrypt %s, adding as-is: %s", arcname, e)
-                        tar.add(str(file_path), arcname=arcname)
-                else:
-                    tar.add(str(file_path), arcname=arcname)
+        if dedup:
+            dedup_stats = create_snapshot(
+                archive_path, manifest, files,
+                passphrase=enc_key,
+                encrypt=encrypt_archive_flag,
+                read_file=_decrypted_reader(enc_key) if decrypt_enc else None,
+            )
+        else:
+            _write_tar(
+                archive_path, manifest, files, now,
+                decrypt_enc=decrypt_enc, enc_key=enc_key, encrypt=encrypt_archive_flag,
+            )
 
         final_path = archive_path
         final_name = archive_name
-        if encrypt_archive_flag and enc_key:
-            final_path = encrypt_archive(archive_path, enc_key)
-            final_name = final_path.name
 
         logger.info(
             "Backup created: %s/%s (%d files, %d bytes)",
@@ -211,10 +271,13 @@ def create_backup(
             "encrypted": encrypt_archive_flag,
             "manifest": manifest,
         }
+        if dedup_stats is not None:
+            result["dedup"] = asdict(dedup_stats)
         _audit(
             "📦 Backup Created",
             f"{target_folder} → {final_name} ({len(files)} files, {final_path.stat().st_size:,} B)"
-            + (" · encrypted" if encrypt_archive_flag else ""),
+            + (" · encrypted" if encrypt_archive_flag else "")
+            + (f" · dedup, {dedup_stats.bytes_stored:,} B new" if dedup_stats else ""),
             action="created",
             target=final_name,
             detail={"files": [p for _, p in files]},
@@ -244,6 +307,8 @@ def create_backup(
         )
         if archive_path.exists():
             archive_path.unlink()
+        if dedup:
+            gc_chunk_store(bak_dir)  # drop chunks the failed snapshot wrote
         return {"error": f"Export failed: {e}"}
 
 
@@ -269,7 +334,8 @@ def list_backups(project_root: Path, rel_path: str, *, check_release: bool = Fal
             remote_assets = {a["name"] for a in remote["assets"]}
 
     all_archives: set[Path] = set()
-    for pattern in ("backup_*.tar.gz", "backup_*.tar.gz.enc", "*.tar.gz", "*.tar.gz.enc"):
+    for pattern in ("backup_*.tar.gz", "backup_*.tar.gz.enc", "*.tar.gz", "*.tar.gz.enc",
+                    "*.snap", "*.snap.enc"):
         all_archives.update(backup_dir.glob(pattern))
 
     archives = sorted(
@@ -305,7 +371,12 @@ def list_backups(project_root: Path, rel_path: str, *, check_release: bool = Fal
             "encrypted": is_encrypted,
             "git_tracked": a.name in git_tracked,
         }
-        if not is_encrypted:
+        if is_snapshot(a):
+            entry["dedup"] = True
+            if not is_encrypted:
+                with contextlib.suppress(OSError, ValueError):
+                    entry["manifest"] = snapshot_manifest(read_snapshot(a))
+        elif not is_encrypted:
             manifest = read_manifest(a)
             if manifest:
                 entry["manifest"] = manifest
@@ -367,31 +438,44 @@ def preview_backup(project_root: Path, backup_path: str) -> dict:
     tar_path = file_path
     tmp_dec_path: Path | None = None
 
+    if is_snapshot(file_path):
+        return _preview_snapshot(project_root, backup_path, file_path)
+
+    # Streaming-encrypted archives are read in place; legacy COVAULT ones via a temp copy
+    stream_key = ""
     if is_encrypted:
         enc_key = get_enc_key(project_root)
         if not enc_key:
             return {"error": "CONTENT_VAULT_ENC_KEY not set — cannot preview encrypted backup"}
-        try:
-            tar_path = decrypt_archive(file_path, enc_key)
-            tmp_dec_path = tar_path
-        except Exception as e:
-            return {"error": f"Failed to decrypt archive: {e}"}
+        if is_stream_encrypted(file_path):
+            stream_key = enc_key
+        else:
+            try:
+                tar_path = decrypt_archive(file_path, enc_key)
+                tmp_dec_path = tar_path
+            except Exception as e:
+                return {"error": f"Failed to decrypt archive: {e}"}
 
-    manifest = read_manifest(tar_path)
+    manifest = None
     files: list[dict] = []
 
     try:
-        with tarfile.open(tar_path, "r:gz") as tar:
-            for member in tar.getmembers():
-                if not member.isfile() or member.name == "backup_manifest.json":
-                    continue
-                ftype = classify_file(Path(member.name))
-                files.append({
-                    "name": Path(member.name).name,
-                    "path": member.name,
-                    "type": ftype,
-                    "size": member.size,
-                })
+        manifest = read_manifest(tar_path, passphrase=stream_key)
+        index = read_index(tar_path, passphrase=stream_key)
+        if index is not None:
+            members = [(e["name"], e["size"]) for e in index["members"]]
+        else:
+            with open_tar_reader(tar_path, stream_key) as tar:
+                members = [(m.name, m.size) for m in tar if m.isfile()]
+        for name, size in members:
+            if name == "backup_manifest.json":
+                continue
+            files.append({
+                "name": Path(name).name,
+                "path": name,
+                "type": classify_file(Path(name)),
+                "size": size,
+            })
     except Exception as e:
         return {"error": f"Failed to read archive: {e}"}
     finally:
@@ -410,6 +494,92 @@ def preview_backup(project_root: Path, backup_path: str) -> dict:
     }
 
 
+def _preview_snapshot(project_root: Path, backup_path: str, file_path: Path) -> dict:
+    """``preview_backup`` for dedup snapshots — entries come from the snapshot."""
+    is_encrypted = file_path.name.endswith(".enc")
+    enc_key = get_enc_key(project_root) if is_encrypted else ""
+    if is_encrypted and not enc_key:
+        return {"error": "CONTENT_VAULT_ENC_KEY not set — cannot preview encrypted backup"}
+    try:
+        doc = read_snapshot(file_path, enc_key)
+    except (ChunkStoreError, OSError, ValueError) as e:
+        return {"error": f"Failed to read snapshot: {e}"}
+
+    files = [
+        {
+            "name": Path(e["path"]).name,
+            "path": e["path"],
+            "type": classify_file(Path(e["path"])),
+            "size": e["size"],
+        }
+        for e in doc.get("entries", [])
+    ]
+    return {
+        "backup_path": backup_path,
+        "encrypted": is_encrypted,
+        "dedup": True,
+        "manifest": snapshot_manifest(doc),
+        "files": files,
+        "total": len(files),
+    }
+
+
+def export_snapshot(project_root: Path, backup_path: str) -> dict:
+    """Export a dedup snapshot as a standalone ``.tar.gz`` next to it.
+
+    Encrypted snapshots are exported as ``.tar.gz.enc`` so the plaintext
+    never stays on disk.
+    """
+    if not backup_path:
+        return {"error": "Missing 'backup_path'"}
+
+    file_path = (project_root / backup_path).resolve()
+    try:
+        file_path.relative_to(project_root)
+    except ValueError:
+        return {"error": "Invalid path"}
+
+    if not file_path.exists():
+        return {"error": "File not found", "_status": 404}
+    if not is_snapshot(file_path):
+        return {"error": "Not a dedup snapshot"}
+
+    is_encrypted = file_path.name.endswith(".enc")
+    enc_key = get_enc_key(project_root) if is_encrypted else ""
+    if is_encrypted and not enc_key:
+        return {"error": "CONTENT_VAULT_ENC_KEY not set — cannot export encrypted backup"}
+
+    stem = file_path.name[:-len(".snap.enc" if is_encrypted else ".snap")]
+    dest = file_path.parent / f"{stem}.tar.gz{'.enc' if is_encrypted else ''}"
+    if dest.exists():
+        return {"error": f"A file named '{dest.name}' already exists"}
+
+    try:
+        count = export_snapshot_tar(file_path, dest, enc_key, encrypt=is_encrypted)
+    except Exception as e:
+        logger.exception("Snapshot export failed")
+        dest.unlink(missing_ok=True)
+        return {"error": f"Export failed: {e}"}
+
+    size_bytes = dest.stat().st_size
+    _audit(
+        "📦 Snapshot Exported",
+        f"{file_path.name} → {dest.name} ({count} files, {size_bytes:,} B)",
+        action="exported",
+        target=dest.name,
+        before_state={"snapshot": file_path.name},
+        after_state={"archive": dest.name, "archive_size": f"{size_bytes:,} B"},
+    )
+    return {
+        "success": True,
+        "filename": dest.name,
+        "full_path": str(dest.relative_to(project_root)),
+        "size_bytes": size_bytes,
+        "files": count,
+        "encrypted": is_encrypted,
+    }
+
+
 def delete_backup(project_root: Path, backup_path: str) -> dict:
     """Delete a backup archive."""
     if not backup_path:
@@ -431,6 +601,14 @@ def delete_backup(project_root: Path, backup_path: str) -> dict:
     except (ImportError, Exception):
         pass  # best-effort
 
+    # Snapshots: drop chunk references, delete chunks nobody uses anymore
+    chunks_freed = bytes_freed = 0
+    if is_snapshot(file_path):
+        try:
+            chunks_freed, bytes_freed = release_snapshot(file_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not release chunks of %s: %s", backup_path, e)
+
     file_path.unlink()
 
     # Belt-and-suspenders: remove release sidecar if cleanup missed it
@@ -445,8 +623,15 @@ def delete_backup(project_root: Path, backup_path: str) -> dict:
         action="deleted",
         target=backup_path,
         before_state={"file": backup_path},
+        **({"after_state": {
+            "chunks_freed": chunks_freed,
+            "bytes_freed": f"{bytes_freed:,} B",
+        }} if chunks_freed else {}),
     )
-    return {"ok": True, "deleted": backup_path}
+    result = {"ok": True, "deleted": backup_path}
+    if is_snapshot(file_path):
+        result.update(chunks_freed=chunks_freed, bytes_freed=bytes_freed)
+    return result
 
 
 def rename_backup(project_root: Path, backup_path: str, new_name: str) -> dict:
@@ -0,0 +1,634 @@
+"""
+Deduplicating backup store — content-defined chunks + per-backup snapshots.
+
+A full ``.tar.gz`` per run costs the whole selection in I/O and disk
+every time.  Snapshot backups instead split files into content-defined
+chunks and keep each distinct chunk once, in a content-addressed store
+next to the archives::
+
+    <folder>/.backup/
+        backup_20260301T120000.snap        ← snapshot (JSON manifest)
+        backup_20260302T120000.snap.enc    ← encrypted snapshot
+        .chunks/
+            config.json                    ← KDF salt + key check (encrypted stores)
+            refs.json                      ← chunk id → number of snapshots using it
+            objects/ab/abcdef…             ← one file per chunk
+
+Chunking
+────────
+Boundaries are content-defined so an insertion only disturbs the chunks
+around it.  Every byte is mapped to a pseudo-random 4-bit symbol
+(``translate``) and a boundary is placed after each occurrence of a
+fixed 5-symbol (20-bit) pattern — a fingerprint of the last 5 bytes,
+scanned at C speed with ``bytes.find`` instead of a per-byte rolling
+hash loop.  Chunks are 256 KiB–4 MiB (≈1 MiB avg).
+
+Unchanged files (same path, size and mtime as in the previous snapshot)
+are not read at all — their chunk list is reused.
+
+Chunk objects
+─────────────
+``b"DCK1" + flags + payload`` — flags: bit 0 zlib-compressed, bit 1
+AES-GCM encrypted (nonce + ciphertext, AAD = chunk id).  Chunk ids are
+the sha256 of the plaintext, or an HMAC of it for encrypted chunks so
+ids do not reveal content.  Keys are derived from the content vault key
+(``CONTENT_VAULT_ENC_KEY``).
+
+Snapshots list their chunk ids in clear (even when encrypted) so
+``release_snapshot()`` can drop references without the key.  A chunk is
+deleted when its refcount reaches zero; ``gc_chunk_store()`` recomputes
+all refcounts from the snapshots (mark & sweep).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import json
+import logging
+import os
+import struct
+import tarfile
+import threading
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .parallel_gzip import open_tar_gz
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = ".chunks"
+SNAPSHOT_SUFFIXES = (".snap", ".snap.enc")
+
+MIN_CHUNK = 256 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+_READ_SIZE = 1024 * 1024
+
+# One pseudo-random 4-bit symbol ('A'..'P') per byte value
+_DIGEST = b"".join(
+    hashlib.sha256(b"devops-control-plane/backup-cdc/v1:%d" % i).digest() for i in range(4)
+)
+_SYMBOL_TABLE = bytes.maketrans(
+    bytes(range(256)),
+    bytes(0x41 + ((_DIGEST[i // 2] >> (4 * (i % 2))) & 0x0F) for i in range(256)),
+)
+# 5 symbols = 20 bits → one boundary per ~1 MiB of random data past MIN_CHUNK
+_PATTERN = b"DKAPG"
+
+_OBJ_MAGIC = b"DCK1"
+_FLAG_ZLIB = 0x01
+_FLAG_ENC = 0x02
+_SNAP_MAGIC = b"DCPSNAP1"
+_NONCE_LEN = 12
+
+_store_locks: dict[str, threading.RLock] = {}
+_store_locks_guard = threading.Lock()
+
+
+def is_snapshot(path: Path) -> bool:
+    """True for snapshot files (``*.snap`` / ``*.snap.enc``)."""
+    return path.name.endswith(SNAPSHOT_SUFFIXES)
+
+
+def _store_lock(root: Path) -> threading.RLock:
+    key = str(root.resolve())
+    with _store_locks_guard:
+        return _store_locks.setdefault(key, threading.RLock())
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Content-defined chunking
+# ═══════════════════════════════════════════════════════════════════
+
+
+def iter_chunks(fobj: io.RawIOBase | io.BufferedIOBase) -> Iterator[bytes]:
+    """Split a binary stream into content-defined chunks."""
+    buf = bytearray()
+    syms = bytearray()
+    start = 0                           # Consumed prefix, compacted lazily
+    eof = False
+    while True:
+        while not eof and len(buf) - start < MAX_CHUNK:
+            data = fobj.read(_READ_SIZE)
+            if not data:
+                eof = True
+                break
+            buf += data
+            syms += data.translate(_SYMBOL_TABLE)
+        if start == len(buf):
+            return
+
+        end = min(len(buf), start + MAX_CHUNK)
+        cut = end
+        if end - start > MIN_CHUNK:
+            hit = syms.find(_PATTERN, start + MIN_CHUNK - len(_PATTERN), end)
+            if hit != -1:
+                cut = hit + len(_PATTERN)
+
+        with memoryview(buf) as view:
+            chunk = bytes(view[start:cut])
+        start = cut
+        if start >= 4 * MAX_CHUNK:
+            del buf[:start]
+            del syms[:start]
+            start = 0
+        yield chunk
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Chunk store
+# ═══════════════════════════════════════════════════════════════════
+
+
+class ChunkStoreError(Exception):
+    """Corrupt object, wrong key, or missing chunk."""
+
+
+@dataclass
+class _Keys:
+    enc: bytes
+    ident: bytes
+
+
+class ChunkStore:
+    """Content-addressed chunk objects + refcounts under ``.backup/.chunks``."""
+
+    def __init__(self, backup_dir: Path, passphrase: str = "") -> None:
+        self.backup_dir = backup_dir
+        self.root = backup_dir / STORE_DIR
+        self.objects = self.root / "objects"
+        self._passphrase = passphrase
+        self._keys: _Keys | None = None
+        self.lock = _store_lock(self.root)
+
+    # ── Keys ────────────────────────────────────────────────────
+
+    def keys(self) -> _Keys:
+        """Encryption + id keys derived from the vault passphrase."""
+        if self._keys is not None:
+            return self._keys
+        if not self._passphrase:
+            raise ChunkStoreError("Encryption key required")
+        from src.core.services.content.crypto import KDF_ITERATIONS, _derive_key
+
+        cfg_path = self.root / "config.json"
+        cfg: dict = {}
+        if cfg_path.is_file():
+            cfg = json.loads(cfg_path.read_text(encoding="utf-8"))
+        if "salt" not in cfg:
+            cfg = {"version": 1, "salt": os.urandom(16).hex(), "iterations": KDF_ITERATIONS}
+
+        master = _derive_key(self._passphrase, bytes.fromhex(cfg["salt"]), cfg["iterations"])
+        keys = _Keys(
+            enc=hmac.new(master, b"chunk-encryption", hashlib.sha256).digest(),
+            ident=hmac.new(master, b"chunk-id", hashlib.sha256).digest(),
+        )
+        check = hmac.new(master, b"key-check", hashlib.sha256).hexdigest()
+        if "check" in cfg and not hmac.compare_digest(cfg["check"], check):
+            raise ChunkStoreError("Wrong encryption key for this backup store")
+        if "check" not in cfg:
+            cfg["check"] = check
+            self.root.mkdir(parents=True, exist_ok=True)
+            cfg_path.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+        self._keys = keys
+        return keys
+
+    # ── Objects ─────────────────────────────────────────────────
+
+    def chunk_id(self, data: bytes, *, encrypted: bool) -> str:
+        if encrypted:
+            return hmac.new(self.keys().ident, data, hashlib.sha256).hexdigest()
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, cid: str) -> Path:
+        return self.objects / cid[:2] / cid
+
+    def has(self, cid: str) -> bool:
+        return self._path(cid).is_file()
+
+    def put(self, cid: str, data: bytes, *, encrypted: bool) -> int:
+        """Store a chunk (no-op if present). Returns bytes written to disk."""
+        path = self._path(cid)
+        if path.is_file():
+            return 0
+        flags = 0
+        payload = data
+        # Only compress when a cheap sample says it pays off (media won't)
+        if len(zlib.compress(data[:65536], 1)) < 0.95 * min(len(data), 65536):
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                payload, flags = packed, flags | _FLAG_ZLIB
+        if encrypted:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+            nonce = os.urandom(_NONCE_LEN)
+            payload = nonce + AESGCM(self.keys().enc).encrypt(nonce, payload, cid.encode())
+            flags |= _FLAG_ENC
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(_OBJ_MAGIC + bytes([flags]))
+            fh.write(payload)
+        tmp.replace(path)
+        return len(payload) + len(_OBJ_MAGIC) + 1
+
+    def get(self, cid: str) -> bytes:
+        """Read, decrypt, decompress and verify a chunk."""
+        try:
+            raw = self._path(cid).read_bytes()
+        except OSError as e:
+            raise ChunkStoreError(f"Missing chunk {cid[:12]}…") from e
+        if raw[:4] != _OBJ_MAGIC:
+            raise ChunkStoreError(f"Corrupt chunk {cid[:12]}…")
+        flags, payload = raw[4], raw[5:]
+        encrypted = bool(flags & _FLAG_ENC)
+        if encrypted:
+            from cryptography.exceptions import InvalidTag
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+            try:
+                payload = AESGCM(self.keys().enc).decrypt(
+                    payload[:_NONCE_LEN], payload[_NONCE_LEN:], cid.encode(),
+                )
+            except InvalidTag as e:
+                raise ChunkStoreError(f"Chunk {cid[:12]}… failed authentication") from e
+        if flags & _FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        if self.chunk_id(payload, encrypted=encrypted) != cid:
+            raise ChunkStoreError(f"Chunk {cid[:12]}… failed verification")
+        return payload
+
+    def object_size(self, cid: str) -> int:
+        try:
+            return self._path(cid).stat().st_size
+        except OSError:
+            return 0
+
+    # ── Refcounts ───────────────────────────────────────────────
+
+    def load_refs(self) -> dict[str, int]:
+        try:
+            return json.loads((self.root / "refs.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save_refs(self, refs: dict[str, int]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / "refs.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(refs, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+
+    def incref(self, ids: set[str]) -> None:
+        with self.lock:
+            refs = self.load_refs()
+            for cid in ids:
+                refs[cid] = refs.get(cid, 0) + 1
+            self.save_refs(refs)
+
+    def decref(self, ids: set[str]) -> tuple[int, int]:
+        """Drop one reference per id; delete chunks that reach zero.
+
+        Returns:
+            (chunks_deleted, bytes_freed)
+        """
+        deleted = freed = 0
+        with self.lock:
+            refs = self.load_refs()
+            for cid in ids:
+                left = refs.get(cid, 0) - 1
+                if left > 0:
+                    refs[cid] = left
+                    continue
+                refs.pop(cid, None)
+                size = self.object_size(cid)
+                try:
+                    self._path(cid).unlink()
+                    deleted += 1
+                    freed += size
+                except OSError:
+                    pass
+            self.save_refs(refs)
+        return deleted, freed
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Snapshot files
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _write_snapshot_file(path: Path, doc: dict, store: ChunkStore, *, encrypted: bool) -> None:
+    body = json.dumps(doc, indent=None if encrypted else 2, separators=None).encode("utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    if encrypted:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        header = json.dumps({
+            "format_version": doc["format_version"],
+            "kind": "dedup",
+            "encrypted": True,
+            "created_at": doc["created_at"],
+            "chunks": doc["chunks"],
+        }).encode("utf-8")
+        nonce = os.urandom(_NONCE_LEN)
+        sealed = AESGCM(store.keys().enc).encrypt(nonce, body, header)
+        tmp.write_bytes(_SNAP_MAGIC + struct.pack("<I", len(header)) + header + nonce + sealed)
+    else:
+        tmp.write_bytes(body)
+    tmp.replace(path)
+
+
+def _read_snapshot_header(path: Path) -> dict:
+    """Public part of a snapshot (chunk ids) — no key needed."""
+    raw = path.read_bytes()
+    if raw[:len(_SNAP_MAGIC)] == _SNAP_MAGIC:
+        (hlen,) = struct.unpack_from("<I", raw, len(_SNAP_MAGIC))
+        start = len(_SNAP_MAGIC) + 4
+        return json.loads(raw[start:start + hlen])
+    return json.loads(raw)
+
+
+def read_snapshot(path: Path, passphrase: str = "") -> dict:
+    """Full snapshot document (manifest fields + entries).
+
+    Raises:
+        ChunkStoreError: Encrypted snapshot and no/wrong key.
+    """
+    raw = path.read_bytes()
+    if raw[:len(_SNAP_MAGIC)] != _SNAP_MAGIC:
+        return json.loads(raw)
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    (hlen,) = struct.unpack_from("<I", raw, len(_SNAP_MAGIC))
+    start = len(_SNAP_MAGIC) + 4
+    header = raw[start:start + hlen]
+    nonce = raw[start + hlen:start + hlen + _NONCE_LEN]
+    store = ChunkStore(path.parent, passphrase)
+    try:
+        body = AESGCM(store.keys().enc).decrypt(nonce, raw[start + hlen + _NONCE_LEN:], header)
+    except InvalidTag as e:
+        raise ChunkStoreError("Snapshot failed authentication (wrong key?)") from e
+    return json.loads(body)
+
+
+def snapshot_manifest(doc: dict) -> dict:
+    """Snapshot document without the bulky per-file chunk lists."""
+    return {k: v for k, v in doc.items() if k not in ("entries", "chunks")}
+
+
+def _previous_entries(backup_dir: Path, passphrase: str, *, encrypted: bool) -> dict[str, dict]:
+    """Entries of the newest readable snapshot of the same kind (files cache)."""
+    suffix = ".snap.enc" if encrypted else ".snap"
+    candidates = sorted(
+        (p for p in backup_dir.iterdir() if p.name.endswith(suffix)),
+        key=lambda p: p.stat().st_mtime, reverse=True,
+    ) if backup_dir.is_dir() else []
+    for snap in candidates:
+        try:
+            doc = read_snapshot(snap, passphrase)
+        except Exception:
+            continue
+        return {e["path"]: e for e in doc.get("entries", []) if not e.get("transformed")}
+    return {}
+
+
+@dataclass
+class SnapshotStats:
+    """What one snapshot run had to do."""
+
+    files_unchanged: int = 0            # Reused via the files cache (not read)
+    chunks_new: int = 0
+    chunks_reused: int = 0
+    bytes_read: int = 0                 # Plaintext bytes chunked
+    bytes_stored: int = 0               # Bytes written to the chunk store
+    bytes_deduplicated: int = 0         # Plaintext bytes already in the store
+    missing: list[str] = field(default_factory=list)
+
+
+def create_snapshot(
+    snapshot_path: Path,
+    manifest: dict,
+    files: list[tuple[Path, str]],
+    *,
+    passphrase: str = "",
+    encrypt: bool = False,
+    read_file: Callable[[Path, str], tuple[str, bytes] | None] | None = None,
+) -> SnapshotStats:
+    """Write a dedup snapshot of ``files`` into ``snapshot_path``'s store.
+
+    Args:
+        snapshot_path: ``.backup/<name>.snap`` (``.snap.enc`` if encrypting).
+        manifest: Manifest fields (same as the ``.tar.gz`` manifest).
+        files: (absolute path, archive name) pairs.
+        passphrase: Vault key (required when ``encrypt``).
+        encrypt: Encrypt chunks and the snapshot body.
+        read_file: Optional override returning (archive name, content) for
+            a file that must be transformed (e.g. decrypted ``.enc``);
+            None falls back to streaming the file as-is.
+
+    Returns:
+        SnapshotStats for the run.
+    """
+    backup_dir = snapshot_path.parent
+    store = ChunkStore(backup_dir, passphrase)
+    stats = SnapshotStats()
+
+    with store.lock:
+        previous = _previous_entries(backup_dir, passphrase, encrypted=encrypt)
+        entries: list[dict] = []
+        used: set[str] = set()
+
+        def add_chunks(chunks: Iterator[bytes]) -> list[str]:
+            ids = []
+            for data in chunks:
+                cid = store.chunk_id(data, encrypted=encrypt)
+                stats.bytes_read += len(data)
+                if store.has(cid):
+                    stats.chunks_reused += 1
+                    stats.bytes_deduplicated += len(data)
+                else:
+                    stats.bytes_stored += store.put(cid, data, encrypted=encrypt)
+                    stats.chunks_new += 1
+                ids.append(cid)
+            return ids
+
+        for file_path, arcname in files:
+            try:
+                st = file_path.stat()
+            except OSError:
+                stats.missing.append(arcname)
+                continue
+
+            transformed = read_file(file_path, arcname) if read_file else None
+            if transformed is not None:
+                name, content = transformed
+                ids = add_chunks(iter_chunks(io.BytesIO(content)))
+                entries.append({
+                    "path": name, "size": len(content), "mtime": int(st.st_mtime),
+                    "mode": st.st_mode & 0o777, "chunks": ids, "transformed": True,
+                })
+                used.update(ids)
+                continue
+
+            prev = previous.get(arcname)
+            if (
+                prev
+                and prev.get("size") == st.st_size
+                and prev.get("mtime_ns") == st.st_mtime_ns
+                and all(store.has(c) for c in prev["chunks"])
+            ):
+                ids = list(prev["chunks"])
+                stats.files_unchanged += 1
+                stats.chunks_reused += len(ids)
+                stats.bytes_deduplicated += st.st_size
+            else:
+                with open(file_path, "rb") as fh:
+                    ids = add_chunks(iter_chunks(fh))
+            entries.append({
+                "path": arcname, "size": st.st_size, "mtime": int(st.st_mtime),
+                "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o777, "chunks": ids,
+            })
+            used.update(ids)
+
+        doc = {
+            **manifest,
+            "format_version": 3,
+            "kind": "dedup",
+            "encrypted": encrypt,
+            "dedup": {
+                "files_unchanged": stats.files_unchanged,
+                "chunks_new": stats.chunks_new,
+                "chunks_reused": stats.chunks_reused,
+                "bytes_stored": stats.bytes_stored,
+                "bytes_deduplicated": stats.bytes_deduplicated,
+            },
+            "chunks": sorted(used),
+            "entries": entries,
+        }
+        _write_snapshot_file(snapshot_path, doc, store, encrypted=encrypt)
+        store.incref(used)
+    return stats
+
+
+def missing_chunks(path: Path, passphrase: str = "") -> list[str]:
+    """Chunk ids a snapshot references that are not in its store.
+
+    Raises:
+        ChunkStoreError: Encrypted snapshot and no/wrong key.
+    """
+    doc = read_snapshot(path, passphrase)
+    store = ChunkStore(path.parent, passphrase)
+    referenced = {c for entry in doc.get("entries", []) for c in entry["chunks"]}
+    return sorted(c for c in referenced if not store.has(c))
+
+
+def iter_snapshot_files(
+    path: Path, passphrase: str = "",
+) -> Iterator[tuple[dict, Callable[[], Iterator[bytes]]]]:
+    """Yield (entry, chunks) for every file in a snapshot.
+
+    ``chunks()`` yields the file's plaintext chunk by chunk, so at most one
+    chunk of a large file is held in memory at a time.
+    """
+    doc = read_snapshot(path, passphrase)
+    store = ChunkStore(path.parent, passphrase)
+    for entry in doc.get("entries", []):
+        def chunks(e: dict = entry) -> Iterator[bytes]:
+            return (store.get(c) for c in e["chunks"])
+        yield entry, chunks
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over a chunk iterator (for ``tarfile.addfile``)."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buf = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[no-untyped-def]
+        while not self._buf:
+            nxt = next(self._chunks, None)
+            if nxt is None:
+                return 0
+            self._buf = memoryview(nxt)
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+def release_snapshot(path: Path) -> tuple[int, int]:
+    """Drop a snapshot's chunk references (before deleting the file).
+
+    Returns:
+        (chunks_deleted, bytes_freed)
+    """
+    header = _read_snapshot_header(path)
+    return ChunkStore(path.parent).decref(set(header.get("chunks", [])))
+
+
+def gc_chunk_store(backup_dir: Path) -> dict:
+    """Recompute refcounts from all snapshots and delete unreferenced chunks."""
+    store = ChunkStore(backup_dir)
+    with store.lock:
+        refs: dict[str, int] = {}
+        for snap in backup_dir.iterdir():
+            if not is_snapshot(snap):
+                continue
+            try:
+                for cid in set(_read_snapshot_header(snap).get("chunks", [])):
+                    refs[cid] = refs.get(cid, 0) + 1
+            except (OSError, ValueError) as e:
+                # An unreadable snapshot must not lose its chunks — abort
+                return {"error": f"Unreadable snapshot {snap.name}: {e}"}
+        deleted = freed = 0
+        if store.objects.is_dir():
+            for obj in store.objects.glob("*/*"):
+                if obj.name.endswith(".tmp") or obj.name not in refs:
+                    freed += obj.stat().st_size
+                    obj.unlink()
+                    deleted += 1
+        store.save_refs(refs)
+    return {"chunks": len(refs), "deleted": deleted, "bytes_freed": freed}
+
+
+def export_snapshot_tar(path: Path, dest: Path, passphrase: str = "", *, encrypt: bool = False) -> int:
+    """Write a snapshot as a standard ``.tar.gz`` (format_version 2 manifest).
+
+    With ``encrypt`` the tarball is stream-encrypted as it is written.
+
+    Returns:
+        Number of files exported.
+    """
+    doc = read_snapshot(path, passphrase)
+    manifest = snapshot_manifest(doc)
+    manifest["format_version"] = 2
+    manifest.pop("kind", None)
+    manifest.pop("dedup", None)
+    manifest["encrypt_archive"] = bool(doc.get("encrypted"))
+    manifest["exported_from"] = path.name
+
+    count = 0
+    with open_tar_gz(dest, passphrase=passphrase if encrypt else "") as tar:
+        mb = json.dumps(manifest, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(name="backup_manifest.json")
+        info.size = len(mb)
+        info.mtime = int(path.stat().st_mtime)
+        tar.addfile(info, io.BytesIO(mb))
+        for entry, chunks in iter_snapshot_files(path, passphrase):
+            member = tarfile.TarInfo(name=entry["path"])
+            member.size = entry["size"]
+            member.mtime = entry.get("mtime", 0)
+            member.mode = entry.get("mode", 0o644)
+            # buffered: tarfile needs full-length reads
+            tar.addfile(member, io.BufferedReader(_ChunkReader(chunks())))
+            count += 1
+    return count
@@ -9,14 +9,10 @@ Extracted from ``src/ui/web/routes_backup*.py``.
 
 from __future__ import annotations
 
-import io
 import json
 import logging
 import re
-import subprocess
-import tarfile
 import tempfile
-from datetime import datetime, timezone
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -80,17 +76,30 @@ def resolve_folder(project_root: Path, rel_path: str) -> Path | None:
     return target
 
 
-def read_manifest(archive_path: Path) -> dict | None:
-    """Read backup_manifest.json from a tar.gz archive."""
+def read_manifest(archive_path: Path, *, passphrase: str = "") -> dict | None:
+    """Read backup_manifest.json from a tar.gz archive.
+
+    Seekable archives read it through the member index; older archives
+    are scanned, stopping at the manifest (normally the first member).
+    ``passphrase`` reads streaming-encrypted archives without a temp copy.
+    """
+    from .seekable import ArchiveIndexError, open_tar_reader, read_index, read_member
+
+    index = read_index(archive_path, passphrase=passphrase)
+    if index is not None:
+        for entry in index["members"]:
+            if entry["name"] == "backup_manifest.json":
+                try:
+                    data = read_member(archive_path, index, entry, passphrase=passphrase)
+                    return json.loads(data.decode("utf-8"))
+                except (ArchiveIndexError, OSError, ValueError):
+                    break
     try:
-        with tarfile.open(archive_path, "r:gz") as tar:
-            try:
-                member = tar.getmember("backup_manifest.json")
-                fobj = tar.extractfile(member)
-                if fobj:
-                    return json.loads(fobj.read().decode("utf-8"))
-            except KeyError:
-                return None
+        with open_tar_reader(archive_path, passphrase) as tar:
+            for member in tar:
+                if member.name == "backup_manifest.json":
+                    fobj = tar.extractfile(member)
+                    return json.loads(fobj.read().decode("utf-8")) if fobj else None
     except Exception:
         return None
     return None
@@ -112,19 +121,32 @@ def get_enc_key(project_root: Path) -> str:
 
 
 def encrypt_archive(archive_path: Path, passphrase: str) -> Path:
-    """Encrypt a .tar.gz archive using COVAULT format. Returns path to .tar.gz.enc."""
-    from src.core.services.content.crypto import encrypt_file
-    enc_path = encrypt_file(archive_path, passphrase)
+    """Encrypt a .tar.gz archive (streaming segments). Returns path to .tar.gz.enc."""
+    from .stream_crypto import encrypt_stream
+    enc_path = archive_path.parent / (archive_path.name + ".enc")
+    try:
+        encrypt_stream(archive_path, enc_path, passphrase)
+    except BaseException:
+        enc_path.unlink(missing_ok=True)
+        raise
     archive_path.unlink()
     return enc_path
 
 
-def decrypt_archive(enc_path: Path, passphrase: str) -> Path:
-    """Decrypt a .tar.gz.enc archive to a temp file.
+def decrypt_archive(enc_path: Path, passphrase: str, output_path: Path | None = None) -> Path:
+    """Decrypt a .tar.gz.enc archive (streaming or legacy COVAULT format).
 
-    Caller is responsible for cleaning up the returned temp file.
+    Without ``output_path`` the result is a temp file the caller must
+    clean up.
     """
+    from .stream_crypto import decrypt_stream, is_stream_encrypted
+    if output_path is None:
+        output_path = Path(tempfile.mktemp(suffix=".tar.gz"))
+    if is_stream_encrypted(enc_path):
+        try:
+            return decrypt_stream(enc_path, output_path, passphrase)
+        except BaseException:
+            output_path.unlink(missing_ok=True)
+            raise
     from src.core.services.content.crypto import decrypt_file
-    tmp_path = Path(tempfile.mktemp(suffix=".tar.gz"))
-    dec_path = decrypt_file(enc_path, passphrase, output_path=tmp_path)
-    return dec_path
+    return decrypt_file(enc_path, passphrase, output_path=output_path)
@@ -31,11 +31,19 @@ from .archive import (  # noqa: F401
     list_backups,
     preview_backup,
     delete_backup,
+    export_snapshot,
     rename_backup,
     sanitize_backup_name,
     upload_backup,
 )
 
+# ── Dedup snapshots (chunk store) ──
+from .chunkstore import (  # noqa: F401
+    ChunkStoreError,
+    gc_chunk_store,
+    is_snapshot,
+)
+
 # ── Restore / import / wipe / in-place encrypt ──
 from .restore import (  # noqa: F401
     restore_backup,
@@ -0,0 +1,184 @@
+"""
+Block-parallel gzip writer for backup archives.
+
+``tarfile.open(path, "w:gz")`` deflates on one core.  ``ParallelGzipWriter``
+cuts the uncompressed stream into fixed-size blocks and compresses each
+block as a complete gzip member in a thread pool (zlib releases the GIL
+while deflating).  Members are written in order, so the output is a
+standard multi-member gzip file::
+
+    [gzip member: block 0][gzip member: block 1] … [gzip member: block n]
+
+Every gzip reader (``gzip``, ``tarfile`` ``r:gz``, ``gzip -d``, ``tar xz``)
+decompresses concatenated members as one stream — existing archives and
+readers are unaffected.  Independent blocks cost ~0.1–1 % of ratio
+versus a single deflate stream (no shared window across boundaries).
+
+Because every block starts a fresh member, the writer also records a
+block table (compressed offset → uncompressed offset); ``open_tar_gz``
+appends it with a member index so single files can be read by seeking
+(see ``seekable.py``).
+
+Usage::
+
+    with open_tar_gz(archive_path) as tar:
+        tar.add(...)
+"""
+
+from __future__ import annotations
+
+import os
+import tarfile
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from .seekable import INDEX_VERSION, IndexingTarFile, index_trailer
+from .stream_crypto import EncryptingWriter
+
+BLOCK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 6
+MAX_WORKERS = 8
+
+
+def default_workers() -> int:
+    """Compression threads to use (bounded by CPU count)."""
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+def compress_block(data: bytes, level: int = COMPRESS_LEVEL) -> bytes:
+    """Compress ``data`` into one self-contained gzip member."""
+    co = zlib.compressobj(level, zlib.DEFLATED, 31)  # 16 + 15 → gzip wrapper
+    return co.compress(data) + co.flush()
+
+
+class ParallelGzipWriter:
+    """Write-only file object producing concatenated gzip members.
+
+    Args:
+        path: Output file.
+        level: zlib compression level.
+        block_size: Uncompressed bytes per gzip member.
+        workers: Compression threads; 1 compresses inline (no pool).
+        passphrase: Encrypt the compressed stream as it is written
+            (``stream_crypto.EncryptingWriter``).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        level: int = COMPRESS_LEVEL,
+        block_size: int = BLOCK_SIZE,
+        workers: int | None = None,
+        passphrase: str = "",
+    ) -> None:
+        self._fh = EncryptingWriter(path, passphrase) if passphrase else open(path, "wb")  # noqa: SIM115 — closed by close()
+        self._level = level
+        self._block_size = block_size
+        self._workers = workers or default_workers()
+        self._pool = ThreadPoolExecutor(self._workers) if self._workers > 1 else None
+        self._pending: deque[tuple[int, Future[bytes]]] = deque()
+        self._buf = bytearray()
+        self._pos = 0
+        self._submitted = 0
+        self.compressed_bytes = 0
+        self.blocks: list[tuple[int, int]] = []     # (compressed, uncompressed) offsets
+        self.closed = False
+
+    # ── File-object protocol (what tarfile needs) ───────────────
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        self._pos += len(data)
+        while len(self._buf) >= self._block_size:
+            block = bytes(self._buf[:self._block_size])
+            del self._buf[:self._block_size]
+            self._submit(block)
+        return len(data)
+
+    def tell(self) -> int:
+        """Uncompressed position (tarfile tracks member offsets with it)."""
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def finish(self) -> None:
+        """Compress and write everything buffered so far (block table complete)."""
+        if self._buf:
+            self._submit(bytes(self._buf))
+            self._buf.clear()
+        while self._pending:
+            self._write_out(*self._pending.popleft())
+
+    def write_raw(self, data: bytes) -> None:
+        """Append bytes after ``finish()`` (e.g. the index trailer)."""
+        self._fh.write(data)
+        self.compressed_bytes += len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self.finish()
+        finally:
+            self.closed = True
+            if self._pool:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._fh.close()
+
+    def __enter__(self) -> ParallelGzipWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ── Internals ───────────────────────────────────────────────
+
+    def _submit(self, block: bytes) -> None:
+        u_off = self._submitted
+        self._submitted += len(block)
+        if self._pool is None:
+            self._write_out(u_off, compress_block(block, self._level))
+            return
+        self._pending.append((u_off, self._pool.submit(compress_block, block, self._level)))
+        # Bound memory: at most two blocks in flight per worker
+        while len(self._pending) >= 2 * self._workers:
+            self._write_out(*self._pending.popleft())
+
+    def _write_out(self, u_off: int, member: bytes | Future[bytes]) -> None:
+        if isinstance(member, Future):
+            member = member.result()
+        self.blocks.append((self.compressed_bytes, u_off))
+        self._fh.write(member)
+        self.compressed_bytes += len(member)
+
+
+@contextmanager
+def open_tar_gz(
+    path: Path,
+    *,
+    level: int = COMPRESS_LEVEL,
+    workers: int | None = None,
+    index: bool = True,
+    passphrase: str = "",
+) -> Iterator[tarfile.TarFile]:
+    """``tarfile.open(path, "w:gz")`` replacement compressing on all cores.
+
+    With ``index`` the archive ends with a member index (seekable reads).
+    With ``passphrase`` it is encrypted in the same pass (``.tar.gz.enc``).
+    """
+    with ParallelGzipWriter(path, level=level, workers=workers, passphrase=passphrase) as gz:
+        with IndexingTarFile.open(fileobj=gz, mode="w") as tar:  # type: ignore[arg-type]
+            yield tar
+        if index:
+            gz.finish()
+            gz.write_raw(index_trailer({
+                "version": INDEX_VERSION,
+                "blocks": gz.blocks,
+                "members": tar.index_members,
+            }, gz.compressed_bytes))
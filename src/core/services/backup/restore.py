@@ -9,13 +9,18 @@ import os
 import shutil
 import tarfile
 import tempfile
+from collections.abc import Callable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .chunkstore import is_snapshot, iter_snapshot_files, missing_chunks
 from .common import (
     backup_dir_for, resolve_folder, read_manifest,
     get_enc_key, encrypt_archive, decrypt_archive,
 )
+from .parallel_gzip import open_tar_gz
+from .seekable import open_tar_reader, read_index, read_member
+from .stream_crypto import DecryptingReader, is_stream_encrypted
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,71 @@ _PROTECTED_DIRS = frozenset({
     "node_modules", ".mypy_cache", ".ruff_cache", ".pytest_cache",
 })
 
+
+def _archive_members(
+    archive: Path, passphrase: str = "", names: set[str] | None = None,
+) -> Iterator[tuple[str, Callable[[], bytes | None]]]:
+    """Yield (name, read) for each file in a tar archive or dedup snapshot.
+
+    With ``names`` (selective restore) and a seekable archive, only those
+    members are yielded and each is read by seeking — no full scan.
+    Streaming-encrypted archives are decrypted on the fly with ``passphrase``;
+    ``read`` must be called before advancing (sequential ``r|gz`` reader).
+    """
+    if is_snapshot(archive):
+        # restore writes (and may re-encrypt) whole files
+        for entry, chunks in iter_snapshot_files(archive, passphrase):
+            yield entry["path"], lambda c=chunks: b"".join(c())
+        return
+    index = read_index(archive, passphrase=passphrase) if names else None
+    if index is not None:
+        for entry in index["members"]:
+            if entry["name"] in names:  # type: ignore[operator]
+                yield entry["name"], lambda e=entry: read_member(
+                    archive, index, e, passphrase=passphrase,
+                )
+        return
+    with open_tar_reader(archive, passphrase) as tar:
+        for member in tar:
+            if not member.isfile() or member.name == "backup_manifest.json":
+                continue
+
+            def read(m: tarfile.TarInfo = member) -> bytes | None:
+                fobj = tar.extractfile(m)
+                return fobj.read() if fobj else None
+
+            yield member.name, read
+
+
+def _open_encrypted(file_path: Path, passphrase: str) -> Path:
+    """Path to read an encrypted archive from.
+
+    Streaming-encrypted archives are read in place (after checking the
+    key on the first segment); legacy COVAULT archives are decrypted to a
+    temp file the caller must remove.
+    """
+    if is_stream_encrypted(file_path):
+        with DecryptingReader(file_path, passphrase) as reader:
+            reader.read(1)
+        return file_path
+    return decrypt_archive(file_path, passphrase)
+
+
+def _check_snapshot(file_path: Path, passphrase: str) -> str | None:
+    """Why a snapshot cannot be restored in full (None when it can).
+
+    Checks the key and that every referenced chunk is in the store, so
+    a restore fails before ``wipe_first`` touches anything.
+    """
+    try:
+        missing = missing_chunks(file_path, passphrase)
+    except Exception as e:
+        return f"Failed to decrypt archive: {e}"
+    if missing:
+        return f"Snapshot references {len(missing)} missing chunk(s)"
+    return None
+
+
 def restore_backup(
     project_root: Path,
     backup_path: str,
@@ -63,18 +133,25 @@ def restore_backup(
         if not enc_key:
             return {"error": "CONTENT_VAULT_ENC_KEY not set — cannot encrypt/decrypt during restore"}
 
-    # Handle encrypted archives
+    # Handle encrypted archives (snapshots decrypt chunk by chunk)
     is_encrypted = file_path.name.endswith(".enc")
     tar_path = file_path
+    archive_key = ""
 
     if is_encrypted:
         archive_key = get_enc_key(root)
         if not archive_key:
             return {"error": "CONTENT_VAULT_ENC_KEY not set — cannot restore encrypted backup"}
-        try:
-            tar_path = decrypt_archive(file_path, archive_key)
-        except Exception as e:
-            return {"error": f"Failed to decrypt archive: {e}"}
+        if not is_snapshot(file_path):
+            try:
+                tar_path = _open_encrypted(file_path, archive_key)
+            except Exception as e:
+                return {"error": f"Failed to decrypt archive: {e}"}
+
+    if is_snapshot(file_path):
+        problem = _check_snapshot(file_path, archive_key)
+        if problem:
+            return {"error": problem}
 
     # Wipe before restore
     wiped_count = 0
@@ -99,7 +176,7 @@ def restore_backup(
             safety_name = f"backup_{now.strftime('%Y%m%dT%H%M%S')}_pre_wipe.tar.gz"
             safety_path = safety_dir / safety_name
             try:
-                with tarfile.open(safety_path, "w:gz") as tar:
+                with open_tar_gz(safety_path) as tar:
                     manifest = {
                         "format_version": 2,
                         "created_at": now.isoformat(),
@@ -146,62 +223,57 @@ def restore_backup(
     skipped: list[str] = []
 
     try:
-        with tarfile.open(tar_path, "r:gz") as tar:
-            for member in tar.getmembers():
-                if not member.isfile() or member.name == "backup_manifest.json":
-                    continue
-
-                if selected_paths and member.name not in selected_paths:
-                    continue
+        for name, read in _archive_members(tar_path, archive_key, selected_paths or None):
+            if selected_paths and name not in selected_paths:
+                continue
 
-                dest = root / member.name
-                try:
-                    dest.resolve().relative_to(root)
-                except ValueError:
-                    skipped.append(member.name)
-                    continue
+            dest = root / name
+            try:
+                dest.resolve().relative_to(root)
+            except ValueError:
+                skipped.append(name)
+                continue
 
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                fobj = tar.extractfile(member)
-                if fobj:
-                    content = fobj.read()
-                    final_dest = dest
-
-                    if decrypt_restored and member.name.endswith(".enc") and enc_key:
-                        try:
-                            tmp_enc = Path(tempfile.mktemp(suffix=".enc"))
-                            tmp_enc.write_bytes(content)
-                            from src.core.services.content.crypto import decrypt_file_to_memory
-                            plaintext, _meta = decrypt_file_to_memory(tmp_enc, enc_key)
-                            content = plaintext
-                            final_dest = root / member.name[:-4]
-                            final_dest.parent.mkdir(parents=True, exist_ok=True)
-                            tmp_enc.unlink(missing_ok=True)
-                        except Exception:
-                            pass
-
-                    elif encrypt_restored and not member.name.endswith(".enc") and enc_key:
-                        try:
-                            tmp_plain = Path(tempfile.mktemp(suffix=Path(member.name).suffix))
-                            tmp_plain.write_bytes(content)
-                            from src.core.services.content.crypto import encrypt_file
-                            enc_result = encrypt_file(tmp_plain, enc_key)
-                            content = enc_result.read_bytes()
-                            enc_result.unlink(missing_ok=True)
-                            tmp_plain.unlink(missing_ok=True)
-                            final_dest = root / (member.name + ".enc")
-                            final_dest.parent.mkdir(parents=True, exist_ok=True)
-                        except Exception:
-                            pass
-
-                    was_override = final_dest.exists()
-                    final_dest.write_bytes(content)
-                    rel = str(final_dest.relative_to(root))
-                    restored.append(rel)
-                    if was_override:
-                        overridden.append(rel)
-                else:
-                    skipped.append(member.name)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            content = read()
+            if content is not None:
+                final_dest = dest
+
+                if decrypt_restored and name.endswith(".enc") and enc_key:
+                    try:
+                        tmp_enc = Path(tempfile.mktemp(suffix=".enc"))
+                        tmp_enc.write_bytes(content)
+                        from src.core.services.content.crypto import decrypt_file_to_memory
+                        plaintext, _meta = decrypt_file_to_memory(tmp_enc, enc_key)
+                        content = plaintext
+                        final_dest = root / name[:-4]
+                        final_dest.parent.mkdir(parents=True, exist_ok=True)
+                        tmp_enc.unlink(missing_ok=True)
+                    except Exception:
+                        pass
+
+                elif encrypt_restored and not name.endswith(".enc") and enc_key:
+                    try:
+                        tmp_plain = Path(tempfile.mktemp(suffix=Path(name).suffix))
+                        tmp_plain.write_bytes(content)
+                        from src.core.services.content.crypto import encrypt_file
+                        enc_result = encrypt_file(tmp_plain, enc_key)
+                        content = enc_result.read_bytes()
+                        enc_result.unlink(missing_ok=True)
+                        tmp_plain.unlink(missing_ok=True)
+                        final_dest = root / (name + ".enc")
+                        final_dest.parent.mkdir(parents=True, exist_ok=True)
+                    except Exception:
+                        pass
+
+                was_override = final_dest.exists()
+                final_dest.write_bytes(content)
+                rel = str(final_dest.relative_to(root))
+                restored.append(rel)
+                if was_override:
+                    overridden.append(rel)
+            else:
+                skipped.append(name)
 
         logger.info(
             "Restore: %d restored (%d overrides), %d skipped from %s",
@@ -288,42 +360,41 @@ def import_backup(project_root: Path, backup_path: str) -> dict:
     is_encrypted = file_path.name.endswith(".enc")
     tar_path = file_path
 
+    enc_key = ""
+
     if is_encrypted:
         enc_key = get_enc_key(root)
         if not enc_key:
             return {"error": "CONTENT_VAULT_ENC_KEY not set"}
-        try:
-            tar_path = decrypt_archive(file_path, enc_key)
-        except Exception as e:
-            return {"error": f"Failed to decrypt archive: {e}"}
+        if not is_snapshot(file_path):
+            try:
+                tar_path = _open_encrypted(file_path, enc_key)
+            except Exception as e:
+                return {"error": f"Failed to decrypt archive: {e}"}
 
     imported: list[str] = []
     skipped: list[str] = []
 
     try:
-        with tarfile.open(tar_path, "r:gz") as tar:
-            for member in tar.getmembers():
-                if not member.isfile() or member.name == "backup_manifest.json":
-                    continue
-
-                dest = root / member.name
-                try:
-                    dest.resolve().relative_to(root)
-                except ValueError:
-                    skipped.append(f"{member.name} (path traversal)")
-                    continue
+        for name, read in _archive_members(tar_path, enc_key):
+            dest = root / name
+            try:
+                dest.resolve().relative_to(root)
+            except ValueError:
+                skipped.append(f"{name} (path traversal)")
+                continue
 
-                if dest.exists():
-                    skipped.append(f"{member.name} (exists)")
-                    continue
+            if dest.exists():
+                skipped.append(f"{name} (exists)")
+                continue
 
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                fobj = tar.extractfile(member)
-                if fobj:
-                    dest.write_bytes(fobj.read())
-                    imported.append(member.name)
-                else:
-                    skipped.append(f"{member.name} (empty)")
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            content = read()
+            if content is not None:
+                dest.write_bytes(content)
+                imported.append(name)
+            else:
+                skipped.append(f"{name} (empty)")
 
         logger.info("Import: %d imported, %d skipped from %s", len(imported), len(skipped), backup_path)
         _audit(
@@ -412,7 +483,7 @@ def wipe_folder(
         }
 
         try:
-            with tarfile.open(archive_path, "w:gz") as tar:
+            with open_tar_gz(archive_path) as tar:
                 manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
                 info = tarfile.TarInfo(name="backup_manifest.json")
                 info.size = len(manifest_bytes)
@@ -544,9 +615,8 @@ def decrypt_backup_inplace(project_root: Path, backup_path: str) -> dict:
         return {"error": "Not an encrypted archive"}
 
     try:
-        dec_tmp = decrypt_archive(file_path, passphrase)
         dec_final = file_path.parent / file_path.name[:-4]
-        dec_tmp.rename(dec_final)
+        decrypt_archive(file_path, passphrase, output_path=dec_final)
         file_path.unlink()
         _audit(
             "🔓 Backup Decrypted",
@@ -0,0 +1,204 @@
+"""
+Seekable backup archives — trailing member index over independent gzip blocks.
+
+Archives written by ``open_tar_gz()`` are a sequence of self-contained
+gzip members (one per 1 MiB of tar stream), followed by two *empty*
+gzip members that carry the index::
+
+    [block 0][block 1] … [block n][index member][footer member]
+                                   │              │
+                                   │              └─ FEXTRA "DX": offset + length
+                                   │                 of the index member (fixed size,
+                                   │                 always the last FOOTER_SIZE bytes)
+                                   └─ FCOMMENT: base64(zlib(JSON index))
+
+Empty members decompress to nothing, so ``tarfile``, ``gzip -d`` and
+``tar xz`` read these archives exactly like any other ``.tar.gz``.
+
+Index (JSON)::
+
+    {"version": 1,
+     "blocks":  [[compressed_offset, uncompressed_offset], …],
+     "members": [{"name", "offset", "size", "sha256"}, …]}   # offset = tar data offset
+
+Reading one member = seek to the block containing its data offset and
+decompress from there — at most one block of overhead instead of the
+whole archive.  Archives without a footer (older backups, uploads) are
+read sequentially by the callers.
+
+Streaming-encrypted archives (``stream_crypto.py``) sit *under* the gzip
+layer, so the same index works on them given the passphrase: the footer,
+index and the one block needed are the only segments decrypted.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import gzip
+import hashlib
+import json
+import struct
+import tarfile
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+from .stream_crypto import DecryptingReader, is_stream_encrypted
+
+INDEX_VERSION = 1
+
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+_FLAG_FEXTRA = 0x04
+_FLAG_FCOMMENT = 0x10
+_EMPTY_DEFLATE = b"\x03\x00"
+_EMPTY_TRAILER = struct.pack("<II", 0, 0)          # crc32(b"") + isize
+_FOOTER_ID = b"DX"
+_FOOTER_MAGIC = b"DCPIDX1\x00"
+_FOOTER_PAYLOAD = struct.Struct("<8sQQ")            # magic, index offset, index length
+FOOTER_SIZE = 10 + 2 + 4 + _FOOTER_PAYLOAD.size + len(_EMPTY_DEFLATE) + len(_EMPTY_TRAILER)
+
+
+class ArchiveIndexError(Exception):
+    """Index present but inconsistent with the archive."""
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Writing
+# ═══════════════════════════════════════════════════════════════════
+
+
+class _HashingReader:
+    """Wraps a source file so tarfile's copy also computes its sha256."""
+
+    def __init__(self, fobj) -> None:  # type: ignore[no-untyped-def]
+        self._fobj = fobj
+        self.sha = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fobj.read(size)
+        self.sha.update(data)
+        return data
+
+
+class IndexingTarFile(tarfile.TarFile):
+    """Write-mode TarFile that records each regular member's data offset + sha256."""
+
+    def __init__(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        super().__init__(*args, **kwargs)
+        self.index_members: list[dict] = []
+
+    def addfile(self, tarinfo: tarfile.TarInfo, fileobj=None) -> None:  # type: ignore[no-untyped-def, override]
+        if fileobj is None or not tarinfo.isreg():
+            super().addfile(tarinfo, fileobj)
+            return
+        reader = _HashingReader(fileobj)
+        super().addfile(tarinfo, reader)
+        padded = -(-tarinfo.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        self.index_members.append({
+            "name": tarinfo.name,
+            "offset": self.offset - padded,
+            "size": tarinfo.size,
+            "sha256": reader.sha.hexdigest(),
+        })
+
+
+def _empty_member(flags: int, fields: bytes) -> bytes:
+    header = _GZIP_MAGIC + bytes([flags]) + b"\x00\x00\x00\x00" + b"\x00\xff"
+    return header + fields + _EMPTY_DEFLATE + _EMPTY_TRAILER
+
+
+def index_trailer(index: dict, start: int) -> bytes:
+    """Index + footer members to append at compressed offset ``start``."""
+    packed = base64.b64encode(zlib.compress(json.dumps(index, separators=(",", ":")).encode(), 6))
+    index_member = _empty_member(_FLAG_FCOMMENT, packed + b"\x00")
+    payload = _FOOTER_PAYLOAD.pack(_FOOTER_MAGIC, start, len(index_member))
+    extra = _FOOTER_ID + struct.pack("<H", len(payload)) + payload
+    footer = _empty_member(_FLAG_FEXTRA, struct.pack("<H", len(extra)) + extra)
+    assert len(footer) == FOOTER_SIZE
+    return index_member + footer
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Reading
+# ═══════════════════════════════════════════════════════════════════
+
+
+def open_archive(archive: Path, passphrase: str = "") -> BinaryIO:
+    """Open the (plaintext) gzip stream of an archive, decrypting if needed."""
+    if passphrase and is_stream_encrypted(archive):
+        return DecryptingReader(archive, passphrase)  # type: ignore[return-value]
+    return open(archive, "rb")
+
+
+@contextmanager
+def open_tar_reader(archive: Path, passphrase: str = "") -> Iterator[tarfile.TarFile]:
+    """Sequential reader — members must be read as they are reached.
+
+    ``GzipFile`` rather than ``r|gz``: tarfile's stream mode stops after
+    the first gzip member, and these archives have one per block.
+    """
+    with (
+        open_archive(archive, passphrase) as fh,
+        gzip.GzipFile(fileobj=fh, mode="rb") as gz,
+        tarfile.open(fileobj=gz, mode="r|") as tar,  # type: ignore[call-overload]
+    ):
+        yield tar
+
+
+def read_index(archive: Path, *, passphrase: str = "") -> dict | None:
+    """Return the member index of a seekable archive, or None."""
+    try:
+        with open_archive(archive, passphrase) as fh:
+            fh.seek(0, 2)
+            end = fh.tell()
+            if end < FOOTER_SIZE:
+                return None
+            fh.seek(end - FOOTER_SIZE)
+            footer = fh.read(FOOTER_SIZE)
+            if footer[:3] != _GZIP_MAGIC or footer[3] != _FLAG_FEXTRA or footer[12:14] != _FOOTER_ID:
+                return None
+            magic, start, length = _FOOTER_PAYLOAD.unpack_from(footer, 16)
+            if magic != _FOOTER_MAGIC or start + length + FOOTER_SIZE != end:
+                return None
+            fh.seek(start)
+            member = fh.read(length)
+    except (OSError, ValueError):
+        return None
+
+    if member[:3] != _GZIP_MAGIC or member[3] != _FLAG_FCOMMENT:
+        return None
+    comment = member[10:member.index(b"\x00", 10)]
+    try:
+        index = json.loads(zlib.decompress(base64.b64decode(comment)))
+    except (ValueError, zlib.error):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def read_member(
+    archive: Path, index: dict, entry: dict, *, verify: bool = True, passphrase: str = "",
+) -> bytes:
+    """Read one member's bytes by seeking to the block that holds them.
+
+    Raises:
+        ArchiveIndexError: Short read or sha256 mismatch.
+    """
+    blocks = index["blocks"]
+    offset, size = entry["offset"], entry["size"]
+    i = bisect.bisect_right([u for _, u in blocks], offset) - 1
+    if i < 0:
+        raise ArchiveIndexError(f"No block for offset {offset}")
+    c_off, u_off = blocks[i]
+    with open_archive(archive, passphrase) as fh:
+        fh.seek(c_off)
+        with gzip.GzipFile(fileobj=fh, mode="rb") as gz:
+            gz.read(offset - u_off)
+            data = gz.read(size)
+    if len(data) != size:
+        raise ArchiveIndexError(f"Short read for {entry['name']}")
+    if verify and hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise ArchiveIndexError(f"Checksum mismatch for {entry['name']}")
+    return data
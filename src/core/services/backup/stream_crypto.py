@@ -0,0 +1,248 @@
+"""
+Streaming archive encryption — segmented AES-GCM (STREAM construction).
+
+The COVAULT envelope (``content/crypto.py``) encrypts a whole file in one
+AES-GCM call, so encrypting a backup meant: write the plaintext
+``.tar.gz``, read it back into memory, write the ``.enc``.  This format
+encrypts fixed-size segments as they are written, so ``open_tar_gz`` can
+go tar → gzip → AEAD → file in one pass with bounded memory, and readers
+can decrypt any segment independently (seekable reads, streaming restore)::
+
+    COVSTREAM1 | salt(16) | iterations(u32) | segment_size(u32) | nonce_prefix(7)
+    segment 0:  AES-GCM(plaintext[0:S])        + tag(16)
+    segment 1:  AES-GCM(plaintext[S:2S])       + tag(16)
+    …
+    segment n:  AES-GCM(plaintext[nS:])        + tag(16)   ← last (may be empty)
+
+Nonce = prefix(7) ‖ counter(u32, big-endian) ‖ last-flag(1), and the
+header is the AAD of every segment — reordering, truncation (the new
+last segment was not sealed as last) and header tampering all fail
+authentication.  Keys come from the vault passphrase via PBKDF2.
+
+Archives in the older whole-file COVAULT format remain readable through
+``common.decrypt_archive``.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+from pathlib import Path
+
+MAGIC = b"COVSTREAM1"
+SEGMENT_SIZE = 1024 * 1024
+TAG_LEN = 16
+_SALT_LEN = 16
+_PREFIX_LEN = 7
+_HEADER = struct.Struct(f"<{len(MAGIC)}s{_SALT_LEN}sII{_PREFIX_LEN}s")
+HEADER_LEN = _HEADER.size
+
+
+class StreamDecryptError(ValueError):
+    """Wrong key, truncated or tampered stream."""
+
+
+def is_stream_encrypted(path: Path) -> bool:
+    """True if ``path`` starts with the streaming-encryption magic."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    return prefix + struct.pack(">I", counter) + (b"\x01" if last else b"\x00")
+
+
+def _aead(passphrase: str, salt: bytes, iterations: int):  # type: ignore[no-untyped-def]
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    from src.core.services.content.crypto import _derive_key
+
+    return AESGCM(_derive_key(passphrase, salt, iterations))
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Writer
+# ═══════════════════════════════════════════════════════════════════
+
+
+class EncryptingWriter:
+    """Write-only file object that encrypts segment by segment.
+
+    One segment is held back so the final one can be sealed as *last*.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        passphrase: str,
+        *,
+        segment_size: int = SEGMENT_SIZE,
+        iterations: int | None = None,
+    ) -> None:
+        from src.core.services.content.crypto import KDF_ITERATIONS
+
+        if not passphrase or len(passphrase) < 4:
+            raise ValueError("Passphrase must be at least 4 characters")
+        iterations = iterations or KDF_ITERATIONS
+        salt = os.urandom(_SALT_LEN)
+        self._prefix = os.urandom(_PREFIX_LEN)
+        self._header = _HEADER.pack(MAGIC, salt, iterations, segment_size, self._prefix)
+        self._aead = _aead(passphrase, salt, iterations)
+        self._segment_size = segment_size
+        self._fh = open(path, "wb")  # noqa: SIM115 — closed by close()
+        self._fh.write(self._header)
+        self._buf = bytearray()
+        self._counter = 0
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        self._pos += len(data)
+        # Keep at least one byte buffered: the last segment is sealed on close
+        while len(self._buf) > self._segment_size:
+            self._seal(bytes(self._buf[:self._segment_size]), last=False)
+            del self._buf[:self._segment_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._seal(bytes(self._buf), last=True)
+            self._buf.clear()
+        finally:
+            self.closed = True
+            self._fh.close()
+
+    def __enter__(self) -> EncryptingWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _seal(self, plaintext: bytes, *, last: bool) -> None:
+        nonce = _nonce(self._prefix, self._counter, last)
+        self._fh.write(self._aead.encrypt(nonce, plaintext, self._header))
+        self._counter += 1
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Reader
+# ═══════════════════════════════════════════════════════════════════
+
+
+class DecryptingReader(io.RawIOBase):
+    """Seekable read-only view of the plaintext of a streaming-encrypted file.
+
+    Raises:
+        StreamDecryptError: On open (bad header) or on reading a segment
+            that fails authentication.
+    """
+
+    def __init__(self, path: Path, passphrase: str) -> None:
+        super().__init__()
+        self._fh = open(path, "rb")  # noqa: SIM115 — closed by close()
+        self._header = self._fh.read(HEADER_LEN)
+        try:
+            magic, salt, iterations, seg, prefix = _HEADER.unpack(self._header)
+        except struct.error as e:
+            self._fh.close()
+            raise StreamDecryptError("Truncated stream header") from e
+        if magic != MAGIC or seg <= 0:
+            self._fh.close()
+            raise StreamDecryptError("Not a streaming-encrypted archive")
+        self._aead = _aead(passphrase, salt, iterations)
+        self._seg = seg
+        self._prefix = prefix
+
+        body = os.fstat(self._fh.fileno()).st_size - HEADER_LEN
+        self._segments = max(1, -(-body // (seg + TAG_LEN)))
+        self.size = body - self._segments * TAG_LEN
+        if self.size < 0:
+            self._fh.close()
+            raise StreamDecryptError("Truncated stream")
+        self._pos = 0
+        self._cache: tuple[int, bytes] | None = None
+
+    def _segment(self, k: int) -> bytes:
+        if self._cache and self._cache[0] == k:
+            return self._cache[1]
+        self._fh.seek(HEADER_LEN + k * (self._seg + TAG_LEN))
+        sealed = self._fh.read(self._seg + TAG_LEN)
+        nonce = _nonce(self._prefix, k, k == self._segments - 1)
+        try:
+            plain = self._aead.decrypt(nonce, sealed, self._header)
+        except Exception as e:
+            raise StreamDecryptError(
+                f"Segment {k} failed authentication (wrong key or corrupted archive)",
+            ) from e
+        self._cache = (k, plain)
+        return plain
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = {0: 0, 1: self._pos, 2: self.size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.size - self._pos
+        out = bytearray()
+        while size > 0 and self._pos < self.size:
+            k, off = divmod(self._pos, self._seg)
+            piece = self._segment(k)[off:off + size]
+            out += piece
+            self._pos += len(piece)
+            size -= len(piece)
+        return bytes(out)
+
+    def readinto(self, b) -> int:  # type: ignore[no-untyped-def]
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fh.close()
+        super().close()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Whole-file helpers
+# ═══════════════════════════════════════════════════════════════════
+
+
+def encrypt_stream(source: Path, dest: Path, passphrase: str) -> Path:
+    """Encrypt ``source`` into ``dest`` reading it once, in segments."""
+    with open(source, "rb") as src, EncryptingWriter(dest, passphrase) as out:
+        for block in iter(lambda: src.read(SEGMENT_SIZE), b""):
+            out.write(block)
+    return dest
+
+
+def decrypt_stream(source: Path, dest: Path, passphrase: str) -> Path:
+    """Decrypt a streaming-encrypted ``source`` into ``dest``."""
+    with DecryptingReader(source, passphrase) as reader, open(dest, "wb") as out:
+        for block in iter(lambda: reader.read(SEGMENT_SIZE), b""):
+            out.write(block)
+    return dest
@@ -101,12 +101,15 @@ def _append_thread_message(project_root: Path, thread_id: str, msg: ChatMessage)
     with messages_file.open("a", encoding="utf-8") as f:
         f.write(msg.to_jsonl() + "\n")
 
-    # Commit to ledger branch
+    # Commit to ledger branch — group commit: a burst of messages shares a
+    # handful of commits, and the sender still waits for its batch, so a
+    # missing git identity reaches the caller (and the UI's prompt for it)
     rel_path = f"chat/threads/{thread_id}/messages.jsonl"
     ledger_add_and_commit(
         project_root,
         paths=[rel_path],
         message=f"chat: message in {thread_id}",
+        durability="group",
     )
 
 
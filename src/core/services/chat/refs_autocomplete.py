@@ -7,7 +7,10 @@ dicts for the frontend autocomplete dropdown.
 
 Each entity type has its own internal autocompleter that knows how to query
 its backing store (runs.jsonl, threads, traces, git log, content vault, etc.)
-and format results with labels, details, and icons.
+and format results with labels, details, and icons.  Code files, commits,
+runs, threads, traces and saved audits are looked up in the resident
+``refs_index`` (caught up from the store on each call) rather than read
+from the store per keystroke.
 """
 
 from __future__ import annotations
@@ -20,6 +23,16 @@ from src.core.services.chat.refs_parse import _relative_time, _VALID_TYPES
 logger = logging.getLogger(__name__)
 
 _MAX_SUGGESTIONS = 50
+_MAX_COMMITS = 30
+
+
+def _indexed(kind: str, partial_id: str, project_root: Path, *,
+             limit: int = _MAX_SUGGESTIONS, **opts) -> list:
+    """Matches for ``partial_id`` from the resident autocomplete index."""
+    from src.core.services.chat.refs_index import get_autocomplete_index
+    return get_autocomplete_index(project_root).search(
+        kind, partial_id, limit=limit, **opts,
+    )
 
 
 def autocomplete(prefix: str, project_root: Path) -> list[dict | str]:
@@ -77,27 +90,16 @@ def autocomplete(prefix: str, project_root: Path) -> list[dict | str]:
 def _autocomplete_runs(partial_id: str, project_root: Path) -> list[dict]:
     """Autocomplete run references from local ephemeral storage."""
     try:
-        from src.core.services.run_tracker import load_runs
-        runs = load_runs(project_root, n=50)
+        # id prefix, or keyword in summary / type / subtype
+        runs = _indexed("run", partial_id, project_root)
     except Exception as e:
         logger.debug("Failed to autocomplete runs: %s", e)
         return []
 
     results: list[dict] = []
-    partial_lower = partial_id.lower() if partial_id else ""
 
     for run in runs:
         run_id = run.get("run_id", "")
-        if partial_id:
-            hit = (
-                run_id.startswith(partial_id)
-                or partial_lower in run.get("summary", "").lower()
-                or partial_lower in run.get("type", "").lower()
-                or partial_lower in run.get("subtype", "").lower()
-            )
-            if not hit:
-                continue
-
         run_type = run.get("subtype") or run.get("type") or "run"
         label = run_type
         summary = run.get("summary", "")
@@ -135,8 +137,6 @@ def _autocomplete_runs(partial_id: str, project_root: Path) -> list[dict]:
             "icon": "\U0001f680",
             "status": status,
         })
-        if len(results) >= _MAX_SUGGESTIONS:
-            break
 
     return results
 
@@ -148,25 +148,14 @@ def _autocomplete_threads(partial_id: str, project_root: Path) -> list[dict]:
     Supports keyword match on title and tags.
     """
     try:
-        from src.core.services.chat.chat_ops import list_threads
-        threads = list_threads(project_root)
+        threads = _indexed("thread", partial_id, project_root)
     except Exception as e:
         logger.debug("Failed to autocomplete threads: %s", e)
         return []
 
     results: list[dict] = []
-    partial_lower = partial_id.lower() if partial_id else ""
 
     for t in threads:
-        if partial_id:
-            hit = (
-                t.thread_id.startswith(partial_id)
-                or partial_lower in t.title.lower()
-                or any(partial_lower in tag.lower() for tag in t.tags)
-            )
-            if not hit:
-                continue
-
         label = t.title or t.thread_id
 
         detail_parts = []
@@ -186,8 +175,6 @@ def _autocomplete_threads(partial_id: str, project_root: Path) -> list[dict]:
             "detail": detail,
             "icon": "\U0001f4ac",
         })
-        if len(results) >= _MAX_SUGGESTIONS:
-            break
 
     return results
 
@@ -199,25 +186,14 @@ def _autocomplete_traces(partial_id: str, project_root: Path) -> list[dict]:
     icon.  Supports keyword match on name and classification.
     """
     try:
-        from src.core.services.trace.trace_recorder import list_traces
-        traces = list_traces(project_root, n=50)
+        traces = _indexed("trace", partial_id, project_root)
     except Exception as e:
         logger.debug("Failed to autocomplete traces: %s", e)
         return []
 
     results: list[dict] = []
-    partial_lower = partial_id.lower() if partial_id else ""
 
     for t in traces:
-        if partial_id:
-            hit = (
-                t.trace_id.startswith(partial_id)
-                or partial_lower in t.name.lower()
-                or partial_lower in t.classification.lower()
-            )
-            if not hit:
-                continue
-
         label = t.name or t.trace_id
 
         detail_parts = []
@@ -240,8 +216,6 @@ def _autocomplete_traces(partial_id: str, project_root: Path) -> list[dict]:
             "detail": detail,
             "icon": "\U0001f4cb",
         })
-        if len(results) >= _MAX_SUGGESTIONS:
-            break
 
     return results
 
@@ -253,9 +227,9 @@ def _autocomplete_commits(partial_id: str, project_root: Path) -> list[dict]:
     icon, hash.
 
     If partial_id looks like a hex hash prefix, filter by hash.
-    Otherwise treat it as a keyword and search commit messages.
+    Otherwise treat it as a keyword and search commit subjects.
     """
-    import subprocess
+    from datetime import UTC, datetime
 
     is_hash = (
         all(c in "0123456789abcdef" for c in partial_id)
@@ -263,48 +237,25 @@ def _autocomplete_commits(partial_id: str, project_root: Path) -> list[dict]:
         else True
     )
 
-    if partial_id and not is_hash:
-        # Keyword search in commit messages
-        cmd = [
-            "git", "-C", str(project_root), "log", "-30",
-            "--grep", partial_id, "-i",
-            "--format=%h%x00%s%x00%an%x00%ar",
-        ]
-    else:
-        # Show recent commits (optionally filtered by hash prefix)
-        cmd = [
-            "git", "-C", str(project_root), "log", "-30",
-            "--format=%h%x00%s%x00%an%x00%ar",
-        ]
-
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-        if r.returncode != 0:
-            return []
+        commits = _indexed(
+            "commit", partial_id, project_root, limit=_MAX_COMMITS,
+            key_prefix=is_hash, substring=not is_hash,
+        )
     except Exception as e:
         logger.debug("Failed to autocomplete commits: %s", e)
         return []
 
     results: list[dict] = []
-    for line in r.stdout.strip().splitlines():
-        parts = line.split("\x00")
-        if len(parts) < 4:
-            continue
-        short_hash, subject, author, date_rel = (
-            parts[0], parts[1], parts[2], parts[3],
-        )
-        # Hash prefix filter
-        if partial_id and is_hash and not short_hash.startswith(partial_id):
-            continue
+    for c in commits:
+        when = datetime.fromtimestamp(c["time"], UTC).isoformat()
         results.append({
-            "ref": f"@commit:{short_hash}",
-            "label": subject,
-            "detail": f"{author} \u00b7 {date_rel}",
+            "ref": f"@commit:{c['short']}",
+            "label": c["subject"],
+            "detail": f"{c['author']} \u00b7 {_relative_time(when)}",
             "icon": "\U0001f4dd",
-            "hash": short_hash,
+            "hash": c["short"],
         })
-        if len(results) >= _MAX_SUGGESTIONS:
-            break
 
     return results
 
@@ -372,19 +323,12 @@ def _autocomplete_audits(partial_id: str, project_root: Path) -> list[dict]:
 
     # ── 1. Saved scan snapshots from ledger ─────────────────────
     try:
-        from src.core.services.ledger.ledger_ops import list_saved_audits
-        for snap in list_saved_audits(project_root, n=30):
+        # keyword in snapshot id / card key / summary
+        saved = _indexed("audit", partial_id, project_root, limit=_MAX_AUDIT)
+        for snap in saved:
             sid = snap.get("snapshot_id", "")
             if not sid:
                 continue
-            if partial_id:
-                hit = (
-                    partial_lower in sid.lower()
-                    or partial_lower in (snap.get("card_key", "")).lower()
-                    or partial_lower in (snap.get("summary", "")).lower()
-                )
-                if not hit:
-                    continue
 
             card_key = snap.get("card_key", "?")
             summary = snap.get("summary", "")
@@ -594,40 +538,23 @@ _CODE_EXTS = frozenset(
 
 
 def _autocomplete_code(partial_id: str, project_root: Path) -> list[dict]:
-    """Autocomplete code file references via git ls-files.
+    """Autocomplete code file references (tracked files, git ls-files).
 
     Only returns files with code/script/config extensions.
     Returns dicts with: ref, label (filename), detail (directory), icon.
     """
-    import subprocess
-
-    cmd = ["git", "-C", str(project_root), "ls-files"]
-
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
-        if r.returncode != 0:
-            return []
+        # keyword anywhere in the path; near-misses fill a short list
+        paths = _indexed("code", partial_id, project_root, key_prefix=False, fuzzy=True)
     except Exception as e:
         logger.debug("Failed to autocomplete code: %s", e)
         return []
 
     results: list[dict] = []
-    partial_lower = partial_id.lower() if partial_id else ""
-
-    for filepath in r.stdout.strip().splitlines():
-        filepath = filepath.strip()
-        if not filepath:
-            continue
 
+    for filepath in paths:
         p = Path(filepath)
         ext = p.suffix.lower()
-
-        if ext not in _CODE_EXTS:
-            continue
-
-        if partial_lower and partial_lower not in filepath.lower():
-            continue
-
         icon = _CODE_EXT_ICONS.get(ext, "\U0001f4c4")
 
         results.append({
@@ -637,8 +564,6 @@ def _autocomplete_code(partial_id: str, project_root: Path) -> list[dict]:
             "icon": icon,
             "extension": ext,
         })
-        if len(results) >= _MAX_SUGGESTIONS:
-            break
 
     return results
 
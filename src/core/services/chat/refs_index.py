@@ -0,0 +1,623 @@
+"""
+Chat @-reference autocomplete index — resident, incrementally updated.
+
+Every keystroke in the composer calls ``autocomplete()``.  Asking the
+backing stores directly (``git ls-files``, ``git log``, parsing
+runs.jsonl and every thread/trace/audit JSON) costs tens to hundreds of
+milliseconds per keystroke on a large repo.  Instead, one
+``AutocompleteIndex`` per project root keeps every entity in memory and
+only catches up when its backing store changed:
+
+    source   change signal (stat only)        catch-up
+    code     .git/index                       git ls-files → add/remove diff
+    commit   HEAD, its ref, packed-refs       git log OLD..NEW (full on rewrite)
+    run      .state/runs.jsonl                parse appended lines (full on trim)
+    thread   <ledger>/chat/threads/*/thread.json   re-parse changed files
+    trace    ledger + local traces/*/trace.json    re-parse changed files
+    audit    <ledger>/audits/*.json           re-parse changed files
+
+Lookup (``RefIndex.search``) keeps the autocompleters' matching rules —
+id prefix and/or case-insensitive substring — and answers them from a
+sorted key list (prefix) and trigram postings (substring).  Callers may
+opt in to trigram-overlap ("fuzzy") hits when exact matches run short.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.core.services.store_helpers import per_project
+from src.core.services.store_helpers import run_git as _git
+
+logger = logging.getLogger(__name__)
+
+# Above this share of entries a trigram is "common": scanning entries in
+# rank order finds enough hits sooner than walking its posting list.
+_COMMON_GRAM_SHARE = 0.05
+_FUZZY_MIN_QUERY = 4
+_FUZZY_MIN_SHARE = 0.6
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  RefIndex — one searchable entity set
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class _Entry:
+    __slots__ = ("item", "key", "rank", "text")
+
+    def __init__(self, key: str, text: str, item: Any, rank: Any):
+        self.key = key
+        self.text = text
+        self.item = item
+        self.rank = rank
+
+
+class RefIndex:
+    """Entities searchable by key prefix and text substring, in rank order.
+
+    ``key`` is the entity id (``run_id``, commit hash, path…), ``text``
+    the lowercased searchable fields (joined with ``\\x00``), ``rank``
+    any sortable value giving the result order (ascending — newest-first
+    sources use a negative timestamp).  Removed entries leave tombstones in the posting lists
+    until the next compaction.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _Entry] = {}
+        self._by_key: dict[str, int] = {}
+        self._grams: dict[str, list[int]] = {}
+        self._next_id = 0
+        self._dead = 0
+        self._ordered: list[_Entry] | None = None
+        self._sorted_keys: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> set[str]:
+        return set(self._by_key)
+
+    def upsert(self, key: str, text: str, item: Any, rank: Any) -> None:
+        eid = self._by_key.get(key)
+        if eid is not None:
+            entry = self._entries[eid]
+            if entry.text == text:
+                entry.item = item
+                if entry.rank != rank:
+                    entry.rank = rank
+                    self._ordered = None
+                return
+            self.remove(key)
+        eid = self._next_id
+        self._next_id += 1
+        self._entries[eid] = _Entry(key, text, item, rank)
+        self._by_key[key] = eid
+        for gram in _grams(text):
+            self._grams.setdefault(gram, []).append(eid)
+        self._ordered = None
+        self._sorted_keys = None
+
+    def set_rank(self, key: str, rank: Any) -> None:
+        eid = self._by_key.get(key)
+        if eid is not None and self._entries[eid].rank != rank:
+            self._entries[eid].rank = rank
+            self._ordered = None
+
+    def remove(self, key: str) -> None:
+        eid = self._by_key.pop(key, None)
+        if eid is None:
+            return
+        del self._entries[eid]
+        self._dead += 1
+        self._ordered = None
+        self._sorted_keys = None
+        if self._dead > 1000 and self._dead > len(self._entries):
+            self._compact()
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def _compact(self) -> None:
+        grams: dict[str, list[int]] = {}
+        for eid, entry in self._entries.items():
+            for gram in _grams(entry.text):
+                grams.setdefault(gram, []).append(eid)
+        self._grams = grams
+        self._dead = 0
+
+    def _in_order(self) -> list[_Entry]:
+        if self._ordered is None:
+            self._ordered = sorted(self._entries.values(), key=lambda e: e.rank)
+        return self._ordered
+
+    def _prefix_range(self, query: str) -> tuple[list[str], int, int]:
+        """Sorted keys and the ``[lo, hi)`` slice that starts with ``query``."""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._by_key)
+        keys = self._sorted_keys
+        lo = bisect.bisect_left(keys, query)
+        return keys, lo, bisect.bisect_left(keys, query + "\U0010ffff", lo)
+
+    def prepare(self) -> None:
+        """Build the lazy rank order and key order now, not on a keystroke."""
+        self._in_order()
+        self._prefix_range("")
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int,
+        key_prefix: bool = True,
+        substring: bool = True,
+        fuzzy: bool = False,
+    ) -> list[Any]:
+        """Items whose key starts with ``query`` (case-sensitive) or whose
+        text contains ``query.lower()``, in rank order, at most ``limit``.
+
+        With ``fuzzy``, when fewer than ``limit`` match exactly, items
+        sharing most of the query's trigrams follow (typo tolerance).
+        """
+        if not query:
+            return [e.item for e in self._in_order()[:limit]]
+        q = query.lower()
+
+        # Candidates from the key range and the rarest trigram's postings —
+        # unless either is large, when a rank-order scan stops sooner.
+        budget = max(limit * 20, len(self._entries) * _COMMON_GRAM_SHARE)
+        keys, lo, hi = self._prefix_range(query) if key_prefix else ([], 0, 0)
+        posting: Iterable[int] = ()
+        scan = hi - lo > budget or (substring and len(q) < 3)
+        if substring and not scan:
+            posting = min((self._grams.get(g, ()) for g in _grams(q)), key=len)
+            scan = len(posting) > budget
+
+        if scan:
+            exact: list[_Entry] = []
+            for entry in self._in_order():
+                if (key_prefix and entry.key.startswith(query)) or (substring and q in entry.text):
+                    exact.append(entry)
+                    if len(exact) >= limit:
+                        break
+        else:
+            hits = {self._by_key[k]: self._entries[self._by_key[k]] for k in keys[lo:hi]}
+            for eid in posting:
+                if eid not in hits and eid in self._entries and q in self._entries[eid].text:
+                    hits[eid] = self._entries[eid]
+            exact = sorted(hits.values(), key=lambda e: e.rank)[:limit]
+
+        results = [e.item for e in exact]
+        if fuzzy and substring and len(results) < limit and len(q) >= _FUZZY_MIN_QUERY:
+            seen = {id(e) for e in exact}
+            results += [
+                e.item for e in self._fuzzy(q, limit - len(results)) if id(e) not in seen
+            ]
+        return results
+
+    def _fuzzy(self, q: str, limit: int) -> list[_Entry]:
+        """Entries sharing ≥60% of the query's (non-common) trigrams."""
+        cap = max(1000, len(self._entries) * _COMMON_GRAM_SHARE)
+        counted = [p for p in (self._grams.get(g, ()) for g in _grams(q)) if len(p) <= cap]
+        if len(counted) < 2:
+            return []
+        votes = Counter(eid for posting in counted for eid in posting)
+        need = max(2, round(len(counted) * _FUZZY_MIN_SHARE))
+        hits = [
+            (-n, self._entries[eid].rank, eid) for eid, n in votes.items()
+            if n >= need and eid in self._entries
+        ]
+        hits.sort()
+        return [self._entries[eid] for _, _, eid in hits[:limit]]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  Sources — keep one RefIndex in step with its backing store
+# ═══════════════════════════════════════════════════════════════════════
+
+
+def _stat_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _iso_rank(value: Any) -> float:
+    """Negative epoch seconds (newest first) for an ISO string or number."""
+    if isinstance(value, (int, float)):
+        return -float(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return -dt.timestamp()
+
+
+def _git_dirs(project_root: Path) -> tuple[Path, Path] | None:
+    """``(git_dir, common_dir)`` for a checkout or linked worktree."""
+    dot_git = project_root / ".git"
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        try:
+            line = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if not line.startswith("gitdir:"):
+            return None
+        git_dir = (project_root / line[len("gitdir:"):].strip()).resolve()
+    else:
+        return None
+    common = git_dir
+    try:
+        rel = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        common = (git_dir / rel).resolve()
+    except OSError:
+        pass
+    return git_dir, common
+
+
+class _CodeSource:
+    """Tracked files with code/config extensions (``git ls-files``)."""
+
+    def __init__(self, project_root: Path, exts: frozenset[str]):
+        self.root = project_root
+        self.exts = exts
+        self.sig: Any = None
+
+    def refresh(self, index: RefIndex) -> None:
+        dirs = _git_dirs(self.root)
+        sig = _stat_sig(dirs[0] / "index") if dirs else None
+        if sig == self.sig:
+            return
+        self.sig = sig
+        r = _git(self.root, "ls-files", "-z", timeout=30) if dirs else None
+        if r is None or r.returncode != 0:
+            index.clear()
+            return
+        paths = {
+            p for p in r.stdout.split("\0")
+            if p and os.path.splitext(p)[1].lower() in self.exts
+        }
+        current = index.keys()
+        for path in current - paths:
+            index.remove(path)
+        for path in paths - current:
+            index.upsert(path, path.lower(), path, rank=path)   # ls-files order
+
+
+class _CommitSource:
+    """Commits reachable from HEAD (``git log``), newest first."""
+
+    _FORMAT = "--format=%H%x00%h%x00%s%x00%an%x00%ct"
+
+    def __init__(self, project_root: Path):
+        self.root = project_root
+        self.sig: Any = None
+        self.head: str | None = None
+        self.newest_rank = 0.0
+
+    def _signature(self) -> Any:
+        dirs = _git_dirs(self.root)
+        if not dirs:
+            return None
+        git_dir, common = dirs
+        ref_sig = None
+        try:
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if head.startswith("ref:"):
+            ref_sig = _stat_sig(common / head[4:].strip())
+        return head, ref_sig, _stat_sig(common / "packed-refs")
+
+    def refresh(self, index: RefIndex) -> None:
+        sig = self._signature()
+        if sig == self.sig:
+            return
+        self.sig = sig
+        r = _git(self.root, "rev-parse", "--verify", "-q", "HEAD", timeout=30) if sig else None
+        new_head = r.stdout.strip() if r is not None and r.returncode == 0 else None
+        if new_head == self.head:
+            return
+        if new_head is None:
+            index.clear()
+            self.head = None
+            return
+
+        incremental = False
+        if self.head:
+            anc = _git(self.root, "merge-base", "--is-ancestor", self.head, new_head, timeout=30)
+            incremental = anc.returncode == 0
+        rev_range = f"{self.head}..{new_head}" if incremental else new_head
+        r = _git(self.root, "log", self._FORMAT, rev_range, timeout=60)
+        if r.returncode != 0:
+            return
+        rows = [line.split("\x00") for line in r.stdout.splitlines()]
+        rows = [row for row in rows if len(row) >= 5]
+
+        if incremental:
+            base = self.newest_rank - len(rows)
+        else:
+            index.clear()
+            base = 0.0
+        for i, (full, short, subject, author, ct) in enumerate(row[:5] for row in rows):
+            item = {
+                "hash": full, "short": short, "subject": subject,
+                "author": author, "time": int(ct or 0),
+            }
+            index.upsert(full, subject.lower(), item, rank=base + i)
+        self.newest_rank = base
+        self.head = new_head
+
+
+class _RunsSource:
+    """``.state/runs.jsonl`` — append-only, trimmed from the front."""
+
+    _HEAD_BYTES = 256
+
+    def __init__(self, project_root: Path):
+        self.path = project_root / ".state" / "runs.jsonl"
+        self.sig: Any = None
+        self.head = b""
+        self.offset = 0
+        self.seq = 0
+
+    def refresh(self, index: RefIndex) -> None:
+        sig = _stat_sig(self.path)
+        if sig == self.sig:
+            return
+        self.sig = sig
+        if sig is None:
+            index.clear()
+            self.head, self.offset = b"", 0
+            return
+        try:
+            with open(self.path, "rb") as f:
+                head = f.read(self._HEAD_BYTES)
+                appended = (
+                    self.head and head[:len(self.head)] == self.head
+                    and sig[1] >= self.offset
+                )
+                if not appended:
+                    index.clear()
+                    self.offset = 0
+                f.seek(self.offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1          # only complete lines
+        self.head = head
+        self.offset += end
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            run_id = run.get("run_id", "")
+            if not run_id:
+                continue
+            self.seq += 1
+            text = "\x00".join(
+                str(run.get(k) or "") for k in ("summary", "type", "subtype")
+            ).lower()
+            index.upsert(run_id, text, run, rank=-float(self.seq))
+
+
+class _JsonDirSource:
+    """One JSON file per entity under one or more roots.
+
+    ``files(root)`` lists ``(key, path)`` pairs; earlier roots win on
+    duplicate keys.  Only files whose stat changed are re-parsed.
+    """
+
+    def __init__(
+        self,
+        roots: Callable[[], Iterable[Path]],
+        files: Callable[[Path], Iterable[tuple[str, Path]]],
+        parse: Callable[[str, Path], tuple[str, Any, float] | None],
+        hidden: Callable[[], set[str]] | None = None,
+    ):
+        self._roots = roots
+        self._files = files
+        self._parse = parse
+        self._hidden = hidden
+        self._known: dict[str, tuple[Path, Any]] = {}
+
+    def refresh(self, index: RefIndex) -> bool:
+        """Sync ``index`` with the files; True when anything changed."""
+        hidden = self._hidden() if self._hidden else set()
+        changed = False
+        wanted: dict[str, tuple[Path, Any]] = {}
+        for root in self._roots():
+            if not root.is_dir():
+                continue
+            try:
+                for key, path in self._files(root):
+                    if key in wanted or key in hidden:
+                        continue
+                    sig = _stat_sig(path)
+                    if sig is not None:
+                        wanted[key] = (path, sig)
+            except OSError as e:
+                logger.debug("Autocomplete index: cannot list %s: %s", root, e)
+
+        for key in list(self._known):
+            if key not in wanted:
+                del self._known[key]
+                index.remove(key)
+                changed = True
+        for key, (path, sig) in wanted.items():
+            if self._known.get(key) == (path, sig):
+                continue
+            self._known[key] = (path, sig)
+            changed = True
+            try:
+                parsed = self._parse(key, path)
+            except Exception as e:
+                logger.debug("Autocomplete index: skipping %s: %s", path, e)
+                parsed = None
+            if parsed is None:
+                index.remove(key)
+                continue
+            text, item, rank = parsed
+            index.upsert(key, text, item, rank)
+        return changed
+
+
+def _subdir_files(name: str) -> Callable[[Path], Iterable[tuple[str, Path]]]:
+    def files(root: Path) -> Iterable[tuple[str, Path]]:
+        with os.scandir(root) as it:
+            for de in it:
+                if de.is_dir():
+                    yield de.name, Path(de.path) / name
+    return files
+
+
+def _json_files(root: Path) -> Iterable[tuple[str, Path]]:
+    with os.scandir(root) as it:
+        for de in it:
+            if de.name.endswith(".json") and de.is_file():
+                yield de.name[:-5], Path(de.path)
+
+
+def _parse_thread(key: str, path: Path) -> tuple[str, Any, float]:
+    from src.core.services.chat.models import Thread
+
+    t = Thread.model_validate(json.loads(path.read_text(encoding="utf-8")))
+    text = "\x00".join([t.title, *t.tags]).lower()
+    return text, t, _iso_rank(t.created_at)
+
+
+def _parse_trace(key: str, path: Path) -> tuple[str, Any, float]:
+    from src.core.services.trace.models import SessionTrace
+
+    t = SessionTrace.model_validate(json.loads(path.read_text(encoding="utf-8")))
+    text = f"{t.name}\x00{t.classification}".lower()
+    return text, t, _iso_rank(t.started_at)
+
+
+def _parse_saved_audit(key: str, path: Path) -> tuple[str, Any, float]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    card_key = data.get("card_key", "")
+    snap = {
+        "snapshot_id": data.get("snapshot_id", key),
+        "card_key": card_key,
+        "audit_type": data.get("audit_type") or ("project" if card_key.startswith("audit:") else "devops"),
+        "computed_at": data.get("computed_at"),
+        "iso": data.get("iso"),
+        "status": data.get("status"),
+        "summary": data.get("summary"),
+        "duration_s": data.get("duration_s"),
+    }
+    text = "\x00".join(
+        str(snap.get(k) or "") for k in ("snapshot_id", "card_key", "summary")
+    ).lower()
+    return text, snap, 0            # ranked by _SavedAuditSource
+
+
+class _SavedAuditSource(_JsonDirSource):
+    """Saved audit snapshots, ranked by file name, newest first."""
+
+    def __init__(self, audits_dir: Path):
+        super().__init__(lambda: [audits_dir], _json_files, _parse_saved_audit)
+
+    def refresh(self, index: RefIndex) -> bool:
+        changed = super().refresh(index)
+        if changed:
+            for rank, key in enumerate(sorted(self._known, reverse=True)):
+                index.set_rank(key, rank)
+        return changed
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  AutocompleteIndex — all sources for one project
+# ═══════════════════════════════════════════════════════════════════════
+
+
+class AutocompleteIndex:
+    """Resident autocomplete data for one project root."""
+
+    KINDS = ("code", "commit", "run", "thread", "trace", "audit")
+
+    def __init__(self, project_root: Path):
+        from src.core.services.chat.refs_autocomplete import _CODE_EXTS
+        from src.core.services.ledger.worktree import worktree_path
+
+        self.project_root = project_root
+        ledger = worktree_path(project_root)
+        hidden_file = project_root / ".state" / "traces_hidden.json"
+        hidden_cache: dict[str, Any] = {"sig": None, "ids": set()}
+
+        def hidden_traces() -> set[str]:
+            sig = _stat_sig(hidden_file)
+            if sig != hidden_cache["sig"]:
+                from src.core.services.trace.trace_recorder import _get_hidden_traces
+                hidden_cache["sig"] = sig
+                hidden_cache["ids"] = _get_hidden_traces(project_root)
+            return hidden_cache["ids"]
+
+        self._sources: dict[str, Any] = {
+            "code": _CodeSource(project_root, _CODE_EXTS),
+            "commit": _CommitSource(project_root),
+            "run": _RunsSource(project_root),
+            "thread": _JsonDirSource(
+                lambda: [ledger / "chat" / "threads"],
+                _subdir_files("thread.json"), _parse_thread,
+            ),
+            "trace": _JsonDirSource(
+                lambda: [ledger / "traces", project_root / ".state" / "traces"],
+                _subdir_files("trace.json"), _parse_trace, hidden=hidden_traces,
+            ),
+            "audit": _SavedAuditSource(ledger / "audits"),
+        }
+        self._indexes = {kind: RefIndex() for kind in self.KINDS}
+        self._lock = threading.Lock()
+
+    def search(self, kind: str, query: str, *, limit: int, **opts: Any) -> list[Any]:
+        """Catch ``kind`` up with its store, then ``RefIndex.search``."""
+        with self._lock:
+            index = self._indexes[kind]
+            self._sources[kind].refresh(index)
+            return index.search(query, limit=limit, **opts)
+
+    def refresh(self) -> None:
+        """Catch every source up (e.g. to warm the index in the background)."""
+        with self._lock:
+            for kind, source in self._sources.items():
+                source.refresh(self._indexes[kind])
+                self._indexes[kind].prepare()
+
+    def stats(self) -> dict[str, int]:
+        return {kind: len(index) for kind, index in self._indexes.items()}
+
+
+_indexes: dict[str, AutocompleteIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_autocomplete_index(project_root: Path) -> AutocompleteIndex:
+    """The resident index for ``project_root`` (created on first use)."""
+    return per_project(_indexes, _indexes_lock, project_root, AutocompleteIndex)
@@ -10,6 +10,7 @@ Sub-modules::
     listing.py          — folder detection, file listing, size formatting
     optimize.py         — image/text optimization, storage classification
     optimize_video.py   — video/audio optimization with ffmpeg
+    media_jobs.py       — background media optimization queue + worker pool
     release.py          — GitHub release upload/cleanup, sidecar management
     release_sync.py     — restore large files from releases, release inventory
 
@@ -50,6 +51,7 @@ from .file_ops import (  # noqa: F401
     list_all_project_folders,
     check_release_sidecar,
     save_encrypted_content,
+    store_optimized_upload,
 )
 
 # ── Listing ──
@@ -66,6 +68,15 @@ from .optimize import (  # noqa: F401
     cancel_active_optimization,
 )
 
+# ── Media jobs ──
+from .media_jobs import (  # noqa: F401
+    enqueue_media_job,
+    get_media_job,
+    list_media_jobs,
+    cancel_media_job,
+    resume_media_jobs,
+)
+
 # ── Release ──
 from .release import (  # noqa: F401
     upload_to_release_bg,
@@ -0,0 +1,288 @@
+"""
+Content listing — per-directory aggregate index.
+
+Listings used to ``rglob`` every subfolder twice (once to count, once to
+sum sizes), and ``_scan_folder`` walked the whole tree again.  This module
+keeps subtree aggregates — file count, total bytes, newest mtime, category
+counts — per directory, built in one bottom-up ``os.scandir`` pass and
+patched incrementally after content operations (see ``file_ops``).
+
+Counting rules match what the listing shows:
+    - hidden files and ``*.release.json`` sidecars are not counted
+    - hidden directories are skipped, except ``.large/`` (merged tier)
+    - ``__pycache__`` is skipped
+
+Staleness
+─────────
+Content may also change outside the UI.  Each node remembers its
+directory's ``st_mtime_ns``; ``dir_stats()`` re-scans a directory whose
+mtime moved (direct entries only — child aggregates are reused) and
+rebuilds a subtree once it is older than ``_MAX_AGE_S``.  Deltas are
+propagated to indexed ancestors so parents stay consistent.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .crypto import classify_file
+
+logger = logging.getLogger(__name__)
+
+# Full subtree rebuild after this many seconds (safety net for changes
+# below a directory that did not touch the directory's own mtime).
+_MAX_AGE_S = 300.0
+
+
+@dataclass
+class DirStats:
+    """Aggregate counters for a directory (direct or whole subtree)."""
+
+    file_count: int = 0
+    total_bytes: int = 0
+    newest_mtime: float = 0.0
+    encrypted_count: int = 0
+    categories: dict[str, int] = field(default_factory=dict)
+
+    def add_file(self, name: str, size: int, mtime: float) -> None:
+        self.file_count += 1
+        self.total_bytes += size
+        self.newest_mtime = max(self.newest_mtime, mtime)
+        cat = classify_file(Path(name))
+        self.categories[cat] = self.categories.get(cat, 0) + 1
+        if cat == "encrypted":
+            self.encrypted_count += 1
+
+    def merge(self, other: DirStats, sign: int = 1) -> None:
+        """Add (``sign=1``) or subtract (``sign=-1``) another aggregate.
+
+        ``newest_mtime`` only ever grows: removing a file is itself a
+        change, so the subtree's last-change time cannot go backwards.
+        """
+        self.file_count += sign * other.file_count
+        self.total_bytes += sign * other.total_bytes
+        self.encrypted_count += sign * other.encrypted_count
+        self.newest_mtime = max(self.newest_mtime, other.newest_mtime)
+        for cat, n in other.categories.items():
+            left = self.categories.get(cat, 0) + sign * n
+            if left > 0:
+                self.categories[cat] = left
+            else:
+                self.categories.pop(cat, None)
+
+    def copy(self) -> DirStats:
+        return DirStats(
+            self.file_count, self.total_bytes, self.newest_mtime,
+            self.encrypted_count, dict(self.categories),
+        )
+
+
+@dataclass
+class _Node:
+    own: DirStats
+    total: DirStats
+    children: set[str]
+    mtime_ns: int
+    built_at: float
+
+
+def _counted_dir(name: str) -> bool:
+    if name == "__pycache__":
+        return False
+    return not name.startswith(".") or name == ".large"
+
+
+def _counted_file(name: str) -> bool:
+    return not name.startswith(".") and not name.endswith(".release.json")
+
+
+class DirIndex:
+    """Thread-safe map of absolute directory path → subtree aggregates."""
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, _Node] = {}
+        self._lock = threading.RLock()
+
+    # ── Queries ─────────────────────────────────────────────────
+
+    def stats(self, folder: Path) -> DirStats:
+        """Subtree aggregate for ``folder`` (built or refreshed on demand)."""
+        key = os.path.abspath(folder)
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is None or time.time() - node.built_at > _MAX_AGE_S:
+                self._rebuild(key)
+            else:
+                try:
+                    mtime_ns = os.stat(key).st_mtime_ns
+                except OSError:
+                    self._forget(key)
+                    return DirStats()
+                if mtime_ns != node.mtime_ns:
+                    self._rescan(key)
+            return self._nodes[key].total.copy()
+
+    # ── Incremental maintenance ─────────────────────────────────
+
+    def refresh(self, folder: Path) -> None:
+        """Re-scan ``folder``'s direct entries after a content operation.
+
+        No-op when the folder is not indexed yet (it will be built on
+        first query).  A folder that no longer exists is dropped.
+        """
+        key = os.path.abspath(folder)
+        with self._lock:
+            if key not in self._nodes:
+                return
+            if not os.path.isdir(key):
+                self._forget(key)
+                return
+            self._rescan(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+    # ── Internals (lock held) ───────────────────────────────────
+
+    def _build(self, key: str) -> _Node:
+        """One bottom-up pass over ``key``'s subtree."""
+        own = DirStats()
+        children: set[str] = set()
+        child_totals: list[DirStats] = []
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+            with os.scandir(key) as it:
+                entries = list(it)
+        except OSError:
+            return _Node(DirStats(), DirStats(), set(), 0, time.time())
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _counted_dir(entry.name):
+                        continue
+                    child = self._build(entry.path)
+                    self._nodes[entry.path] = child
+                    children.add(entry.path)
+                    child_totals.append(child.total)
+                elif entry.is_file() and _counted_file(entry.name):
+                    st = entry.stat()
+                    own.add_file(entry.name, st.st_size, st.st_mtime)
+            except OSError:
+                continue
+
+        total = own.copy()
+        for t in child_totals:
+            total.merge(t)
+        return _Node(own, total, children, mtime_ns, time.time())
+
+    def _rebuild(self, key: str) -> None:
+        old = self._nodes.get(key)
+        if old is not None:
+            for c in old.children:
+                self._drop_subtree(c)
+        self._replace(key, self._build(key))
+
+    def _rescan(self, key: str) -> None:
+        """Recompute ``key``'s direct files; reuse indexed child aggregates."""
+        old = self._nodes[key]
+        own = DirStats()
+        children: set[str] = set()
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+            with os.scandir(key) as it:
+                entries = list(it)
+        except OSError:
+            self._forget(key)
+            return
+
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _counted_dir(entry.name):
+                        continue
+                    if entry.path not in self._nodes:
+                        self._nodes[entry.path] = self._build(entry.path)
+                    children.add(entry.path)
+                elif entry.is_file() and _counted_file(entry.name):
+                    st = entry.stat()
+                    own.add_file(entry.name, st.st_size, st.st_mtime)
+            except OSError:
+                continue
+
+        for gone in old.children - children:
+            self._drop_subtree(gone)
+
+        total = own.copy()
+        for c in children:
+            total.merge(self._nodes[c].total)
+        self._replace(key, _Node(own, total, children, mtime_ns, old.built_at))
+
+    def _replace(self, key: str, node: _Node) -> None:
+        """Install ``node`` and push the total's delta to indexed ancestors."""
+        old = self._nodes.get(key)
+        self._nodes[key] = node
+        if old is None:
+            return
+        delta = node.total.copy()
+        delta.merge(old.total, sign=-1)
+        child = key
+        parent = os.path.dirname(child)
+        while parent != child and parent in self._nodes:
+            pnode = self._nodes[parent]
+            if child not in pnode.children:
+                break
+            pnode.total.merge(delta)
+            child, parent = parent, os.path.dirname(parent)
+
+    def _forget(self, key: str) -> None:
+        """Remove ``key`` (deleted directory) and subtract it from ancestors."""
+        node = self._nodes.get(key)
+        if node is None:
+            return
+        self._replace(key, _Node(DirStats(), DirStats(), set(), 0, 0.0))
+        parent = self._nodes.get(os.path.dirname(key))
+        if parent is not None:
+            parent.children.discard(key)
+        self._drop_subtree(key)
+
+    def _drop_subtree(self, key: str) -> None:
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return
+        for c in node.children:
+            self._drop_subtree(c)
+
+
+# ── Singleton ───────────────────────────────────────────────────
+
+_index = DirIndex()
+
+
+def get_dir_index() -> DirIndex:
+    """Return the process-wide directory aggregate index."""
+    return _index
+
+
+def dir_stats(folder: Path) -> DirStats:
+    """Subtree aggregate (files, bytes, newest mtime, categories) for a folder."""
+    return _index.stats(folder)
+
+
+def refresh_dir_index(*folders: Path) -> None:
+    """Patch the index after files were added/removed/changed in ``folders``.
+
+    Pass the *parent* directory of every touched path (and for a deleted
+    directory, the directory itself — it is dropped).
+    """
+    for folder in folders:
+        try:
+            _index.refresh(folder)
+        except Exception as exc:  # index upkeep must never fail an operation
+            logger.debug("dir index refresh failed for %s: %s", folder, exc)
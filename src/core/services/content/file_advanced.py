@@ -217,6 +217,10 @@ def save_encrypted_content(
     finally:
         tmp_path.unlink(missing_ok=True)
 
+    from .dir_index import refresh_dir_index
+
+    refresh_dir_index(target.parent)
+
     new_enc_size = target.stat().st_size
     new_size = len(content.encode("utf-8"))
     new_lines = content.count("\n") + (1 if content else 0)
@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .dir_index import refresh_dir_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +64,7 @@ def create_content_folder(project_root: Path, name: str) -> dict:
 
     folder.mkdir(parents=True, exist_ok=True)
     (folder / ".gitkeep").touch()
+    refresh_dir_index(project_root)
 
     logger.info("Created content folder: %s", name)
 
@@ -142,6 +145,7 @@ def delete_content_file(project_root: Path, rel_path: str) -> dict:
     else:
         target.unlink()
         logger.info("Deleted file: %s", rel_path)
+    refresh_dir_index(target.parent)
 
     _audit(
         "🗑️ File Deleted",
@@ -170,6 +174,8 @@ def upload_content_file(
     folder_rel: str,
     filename: str,
     raw_data: bytes,
+    *,
+    background: bool = False,
 ) -> dict:
     """Upload a file to a content folder with automatic optimization.
 
@@ -188,13 +194,14 @@ def upload_content_file(
         folder_rel: Relative path to target folder.
         filename: Original filename (sanitized by caller).
         raw_data: Raw file bytes.
+        background: Queue video/audio optimization as a media job and
+            return immediately with its ``job_id`` (see ``media_jobs``).
 
     Returns:
-        {"success": True, "name": ..., ...} or {"error": ...}.
+        {"success": True, "name": ..., ...}, {"success": True, "job_id": ...}
+        or {"error": ...}.
     """
-    import mimetypes
-
-    from .optimize import classify_storage, optimize_media
+    from .optimize import optimize_media
 
     if not folder_rel:
         return {"error": "Missing 'folder'"}
@@ -209,13 +216,55 @@ def upload_content_file(
     if not safe_name:
         safe_name = "upload"
 
-    original_size = len(raw_data)
     mime = _guess_mime(safe_name)
 
+    if background and mime.startswith(("video/", "audio/")):
+        from .media_jobs import enqueue_media_job
+
+        job = enqueue_media_job(project_root, folder_rel, safe_name, raw_data, mime)
+        return {
+            "success": True,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "original_name": safe_name,
+            "original_size": len(raw_data),
+        }
+
     # Optimize
     opt_data, opt_mime, opt_ext, was_optimized = optimize_media(
         raw_data, mime, safe_name,
     )
+    return store_optimized_upload(
+        project_root, folder_rel, safe_name, len(raw_data),
+        opt_data, opt_mime, opt_ext, was_optimized,
+    )
+
+
+def store_optimized_upload(
+    project_root: Path,
+    folder_rel: str,
+    safe_name: str,
+    original_size: int,
+    opt_data: bytes,
+    opt_mime: str,
+    opt_ext: str,
+    was_optimized: bool,
+) -> dict:
+    """Write an already-optimized upload to its storage tier.
+
+    Second half of ``upload_content_file`` — shared with the media job
+    workers, which optimize out of band and store on completion.
+
+    Returns:
+        {"success": True, "name": ..., ...} or {"error": ...}.
+    """
+    from .optimize import classify_storage
+
+    folder = resolve_safe_path(project_root, folder_rel)
+    if folder is None:
+        return {"error": "Invalid folder path"}
+    folder.mkdir(parents=True, exist_ok=True)
+
     final_size = len(opt_data)
 
     # Keep original filename when format didn't change
@@ -245,6 +294,7 @@ def upload_content_file(
 
     # Write optimized file
     dest.write_bytes(opt_data)
+    refresh_dir_index(dest.parent, folder)
 
     rel_result = str(dest.relative_to(project_root))
 
@@ -451,6 +501,7 @@ def save_content_file(
 
     # Write
     target.write_text(file_content, encoding="utf-8")
+    refresh_dir_index(target.parent)
     new_size = len(file_content.encode("utf-8"))
     new_lines = file_content.count("\n") + (1 if file_content else 0)
 
@@ -537,6 +588,7 @@ def rename_content_file(
         except Exception:
             old_meta.rename(new_meta)
 
+    refresh_dir_index(source.parent)
     logger.info("Renamed: %s → %s", rel_path, new_name)
 
     new_path = str(dest.relative_to(project_root))
@@ -605,6 +657,7 @@ def move_content_file(
         new_meta = dest.parent / f"{dest.name}.release.json"
         shutil.move(str(old_meta), str(new_meta))
 
+    refresh_dir_index(source.parent, dest_dir)
     logger.info("Moved: %s → %s", rel_path, str(dest.relative_to(project_root)))
 
     new_path = str(dest.relative_to(project_root))
@@ -3,6 +3,10 @@ Content listing — folder detection, scanning, and file listing.
 
 Detects content folders, scans file metadata, lists folder contents
 with encryption status and release artifact tracking.
+
+Folder summaries and subfolder card counts come from the aggregate
+index in ``dir_index`` — a listing costs O(entries shown), not a walk
+of every subtree.
 """
 
 from __future__ import annotations
@@ -15,6 +19,7 @@ from .crypto import (
     is_covault_file,
     read_metadata,
 )
+from .dir_index import dir_stats
 
 
 DEFAULT_CONTENT_DIRS = ["docs", "content", "media", "assets", "archive"]
@@ -60,31 +65,29 @@ def detect_content_folders(project_root: Path) -> list[dict]:
 
 
 def _scan_folder(folder: Path, project_root: Path) -> dict:
-    """Scan a folder and return summary metadata."""
-    file_count = 0
-    total_size = 0
-    categories: dict[str, int] = {}
-    encrypted_count = 0
-
-    for f in folder.rglob("*"):
-        if f.is_file():
-            # Skip hidden files and __pycache__
-            if any(part.startswith(".") or part == "__pycache__" for part in f.parts):
-                continue
-            file_count += 1
-            total_size += f.stat().st_size
-            cat = classify_file(f)
-            categories[cat] = categories.get(cat, 0) + 1
-            if cat == "encrypted":
-                encrypted_count += 1
-
+    """Summary metadata for a folder (from the aggregate index)."""
+    agg = dir_stats(folder)
     return {
         "name": folder.name,
         "path": str(folder.relative_to(project_root)),
-        "file_count": file_count,
-        "total_size": total_size,
-        "encrypted_count": encrypted_count,
-        "categories": categories,
+        "file_count": agg.file_count,
+        "total_size": agg.total_bytes,
+        "encrypted_count": agg.encrypted_count,
+        "categories": agg.categories,
+        "newest_mtime": agg.newest_mtime,
+    }
+
+
+def _dir_entry(d: Path, project_root: Path) -> dict:
+    """Navigable subfolder entry with subtree counts from the index."""
+    agg = dir_stats(d)
+    return {
+        "name": d.name,
+        "path": str(d.relative_to(project_root)),
+        "is_dir": True,
+        "file_count": agg.file_count,
+        "size": agg.total_bytes,
+        "newest_mtime": agg.newest_mtime,
     }
 
 
@@ -195,14 +198,7 @@ def list_folder_contents(
                 continue
 
             # Regular subdirectories — include as entries
-            sub_count = sum(1 for _ in f.rglob("*") if _.is_file())
-            files.append({
-                "name": f.name,
-                "path": str(f.relative_to(project_root)),
-                "is_dir": True,
-                "file_count": sub_count,
-                "size": sum(x.stat().st_size for x in f.rglob("*") if x.is_file()),
-            })
+            files.append(_dir_entry(f, project_root))
             continue
 
         _add_file(f)
@@ -308,17 +304,7 @@ def list_folder_contents_recursive(
                 else:
                     # Include immediate child dirs as navigable entries
                     if rel_prefix == "":
-                        sub_count = sum(1 for _ in item.rglob("*") if _.is_file())
-                        files.append({
-                            "name": item.name,
-                            "path": str(item.relative_to(project_root)),
-                            "is_dir": True,
-                            "file_count": sub_count,
-                            "size": sum(
-                                x.stat().st_size
-                                for x in item.rglob("*") if x.is_file()
-                            ),
-                        })
+                        files.append(_dir_entry(item, project_root))
                     sub = (rel_prefix + "/" + item.name) if rel_prefix else item.name
                     _walk(item, sub)
             elif item.is_file():
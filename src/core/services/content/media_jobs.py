@@ -0,0 +1,391 @@
+"""
+Content — media optimization job queue.
+
+Video and audio re-encodes can take minutes.  Instead of optimizing inside
+the upload request, ``upload_content_file(..., background=True)`` hands the
+raw bytes to this module and returns a job id immediately.  A bounded pool
+of workers (sized to the CPU count) drives one ffmpeg process each.
+
+Persistence (under ``<project>/.state/media_jobs/``)::
+
+    <job_id>.json    — job record (status, progress, result)
+    <job_id>.input   — raw upload bytes, removed once the job finishes
+
+Lifecycle: ``queued → running → done | failed | cancelled``.
+Jobs left ``queued``/``running`` by a previous server process are picked
+up again by ``resume_media_jobs()``, run when the web app starts (and
+on first enqueue, for other entry points).
+
+Events (EventBus, ``key`` = job id)::
+
+    media:queued  media:progress  media:done  media:failed  media:cancelled
+
+Exports:
+    enqueue_media_job()   — persist input + record, schedule on the pool
+    get_media_job()       — read one job record
+    list_media_jobs()     — all job records, newest first
+    cancel_media_job()    — cancel a queued job or kill its ffmpeg process
+    resume_media_jobs()   — re-queue unfinished jobs after a restart
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from src.core.services.audit_helpers import make_auditor
+
+logger = logging.getLogger(__name__)
+
+_audit = make_auditor("content")
+
+_JOBS_SUBDIR = "media_jobs"
+_FINAL_STATUSES = {"done", "failed", "cancelled"}
+
+
+def _worker_count() -> int:
+    """Number of concurrent ffmpeg workers (half the cores, at least 1)."""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _threads_per_job(workers: int) -> int:
+    """Split the cores between concurrent encodes instead of oversubscribing."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+# ═════════════════════════════════════════════════════════════════
+#  Job records (on disk)
+# ═════════════════════════════════════════════════════════════════
+
+
+_record_lock = threading.Lock()
+
+
+def _jobs_dir(project_root: Path) -> Path:
+    d = project_root / ".state" / _JOBS_SUBDIR
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def _record_path(project_root: Path, job_id: str) -> Path:
+    return _jobs_dir(project_root) / f"{job_id}.json"
+
+
+def _input_path(project_root: Path, job_id: str) -> Path:
+    return _jobs_dir(project_root) / f"{job_id}.input"
+
+
+def _write_record(project_root: Path, job: dict) -> None:
+    """Atomically write a job record (temp file + rename)."""
+    path = _record_path(project_root, job["job_id"])
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(job, indent=2, default=str))
+    tmp.replace(path)
+
+
+def _update_record(project_root: Path, job_id: str, **fields: Any) -> dict | None:
+    """Merge ``fields`` into a job record and persist it."""
+    with _record_lock:
+        job = get_media_job(project_root, job_id)
+        if job is None:
+            return None
+        job.update(fields)
+        job["updated_at"] = time.time()
+        _write_record(project_root, job)
+        return job
+
+
+def get_media_job(project_root: Path, job_id: str) -> dict | None:
+    """Load a job record, or None if unknown/corrupt."""
+    if not job_id or "/" in job_id or "\\" in job_id or ".." in job_id:
+        return None
+    path = _record_path(project_root, job_id)
+    if not path.is_file():
+        return None
+    try:
+        return json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.warning("Corrupt media job record %s: %s", job_id, exc)
+        return None
+
+
+def list_media_jobs(project_root: Path) -> list[dict]:
+    """Return all job records, newest first."""
+    jobs: list[dict] = []
+    for f in _jobs_dir(project_root).glob("*.json"):
+        try:
+            jobs.append(json.loads(f.read_text()))
+        except (json.JSONDecodeError, OSError):
+            logger.debug("Skipping corrupt media job file: %s", f)
+    jobs.sort(key=lambda j: j.get("created_at", 0), reverse=True)
+    return jobs
+
+
+def _finish_cancelled(project_root: Path, job_id: str) -> None:
+    """Drop a job's input and mark it cancelled."""
+    _input_path(project_root, job_id).unlink(missing_ok=True)
+    job = _update_record(
+        project_root, job_id, status="cancelled", finished_at=time.time(), progress=None,
+    )
+    if job:
+        _publish("media:cancelled", job)
+
+
+def _publish(event_type: str, job: dict) -> None:
+    """Publish a job lifecycle event. Fail-safe — never raises."""
+    try:
+        from src.core.services.event_bus import bus
+
+        bus.publish(event_type, key=job.get("job_id", ""), data=job)
+    except Exception:
+        pass  # SSE failure must never break optimization
+
+
+# ═════════════════════════════════════════════════════════════════
+#  Worker pool
+# ═════════════════════════════════════════════════════════════════
+
+
+class _MediaJobPool:
+    """Bounded pool of daemon workers fed from a FIFO queue.
+
+    Workers are started lazily on first submit.  Each running job keeps
+    a handle to its ffmpeg process so it can be cancelled individually.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._queue: queue.Queue[tuple[Path, str]] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._procs: dict[str, subprocess.Popen] = {}
+        self._cancelled: set[str] = set()
+
+    def submit(self, project_root: Path, job_id: str) -> None:
+        self._ensure_started()
+        self._queue.put((project_root, job_id))
+
+    def cancel(self, job_id: str) -> bool:
+        """Flag a job as cancelled and kill its ffmpeg process if running."""
+        with self._lock:
+            self._cancelled.add(job_id)
+            proc = self._procs.get(job_id)
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            return True
+        return False
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                t = threading.Thread(
+                    target=self._worker,
+                    name=f"media-job-{len(self._threads)}",
+                    daemon=True,
+                )
+                t.start()
+                self._threads.append(t)
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _worker(self) -> None:
+        while True:
+            project_root, job_id = self._queue.get()
+            try:
+                self._run(project_root, job_id)
+            except Exception as exc:  # never let a worker die
+                logger.error("Media job %s crashed: %s", job_id, exc, exc_info=True)
+                job = _update_record(project_root, job_id, status="failed", error=str(exc))
+                if job:
+                    _publish("media:failed", job)
+            finally:
+                with self._lock:
+                    self._procs.pop(job_id, None)
+                    self._cancelled.discard(job_id)
+                self._queue.task_done()
+
+    def _run(self, project_root: Path, job_id: str) -> None:
+        from .file_ops import store_optimized_upload
+        from .optimize import optimize_media
+
+        job = get_media_job(project_root, job_id)
+        if job is None or job.get("status") in _FINAL_STATUSES:
+            return
+        if self._is_cancelled(job_id):
+            _finish_cancelled(project_root, job_id)
+            return
+
+        input_path = _input_path(project_root, job_id)
+        if not input_path.is_file():
+            job = _update_record(
+                project_root, job_id, status="failed", error="Job input missing",
+            )
+            if job:
+                _publish("media:failed", job)
+            return
+
+        job = _update_record(project_root, job_id, status="running", started_at=time.time())
+        if job:
+            _publish("media:progress", job)
+
+        def on_process(proc: subprocess.Popen) -> None:
+            with self._lock:
+                self._procs[job_id] = proc
+                cancelled = job_id in self._cancelled
+            if cancelled:
+                proc.kill()
+
+        def on_progress(state: dict) -> None:
+            updated = _update_record(project_root, job_id, progress=state)
+            if updated:
+                _publish("media:progress", updated)
+
+        raw = input_path.read_bytes()
+        opt_data, opt_mime, opt_ext, was_optimized = optimize_media(
+            raw, job["mime"], job["original_name"],
+            threads=_threads_per_job(self.workers),
+            on_progress=on_progress,
+            on_process=on_process,
+        )
+
+        if self._is_cancelled(job_id):
+            _finish_cancelled(project_root, job_id)
+            return
+
+        result = store_optimized_upload(
+            project_root, job["folder"], job["original_name"], len(raw),
+            opt_data, opt_mime, opt_ext, was_optimized,
+        )
+        input_path.unlink(missing_ok=True)
+
+        if "error" in result:
+            job = _update_record(project_root, job_id, status="failed", error=result["error"])
+            if job:
+                _publish("media:failed", job)
+            return
+
+        job = _update_record(
+            project_root, job_id,
+            status="done", finished_at=time.time(), result=result, progress=None,
+        )
+        if job:
+            _publish("media:done", job)
+
+
+_pool = _MediaJobPool(_worker_count())
+_resumed: set[str] = set()
+
+
+# ═════════════════════════════════════════════════════════════════
+#  Public API
+# ═════════════════════════════════════════════════════════════════
+
+
+def enqueue_media_job(
+    project_root: Path,
+    folder_rel: str,
+    filename: str,
+    raw_data: bytes,
+    mime_type: str,
+) -> dict:
+    """Persist an upload and schedule its optimization.
+
+    Args:
+        project_root: Project root directory.
+        folder_rel: Relative destination folder.
+        filename: Sanitized original filename.
+        raw_data: Raw upload bytes.
+        mime_type: Guessed MIME type of the upload.
+
+    Returns:
+        The new job record (``status == "queued"``).
+    """
+    resume_media_jobs(project_root)
+
+    job_id = f"media_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    _input_path(project_root, job_id).write_bytes(raw_data)
+
+    now = time.time()
+    job = {
+        "job_id": job_id,
+        "status": "queued",
+        "folder": folder_rel,
+        "original_name": filename,
+        "original_size": len(raw_data),
+        "mime": mime_type,
+        "created_at": now,
+        "updated_at": now,
+        "progress": None,
+        "result": None,
+        "error": None,
+    }
+    with _record_lock:
+        _write_record(project_root, job)
+
+    _pool.submit(project_root, job_id)
+    _publish("media:queued", job)
+    logger.info("Media job queued: %s (%s, %s bytes)", job_id, filename, f"{len(raw_data):,}")
+    return job
+
+
+def cancel_media_job(project_root: Path, job_id: str) -> dict:
+    """Cancel a queued or running job.
+
+    Returns:
+        {"success": True, "job_id": ..., "killed": bool} or {"error": ...}.
+    """
+    job = get_media_job(project_root, job_id)
+    if job is None:
+        return {"error": f"Unknown job: {job_id}", "_status": 404}
+    if job.get("status") in _FINAL_STATUSES:
+        return {"error": f"Job already {job['status']}", "_status": 409}
+
+    killed = _pool.cancel(job_id)
+    if job.get("status") == "queued":
+        # Worker will skip it; record the outcome now for pollers.
+        _finish_cancelled(project_root, job_id)
+
+    _audit(
+        "⏹️ Media Job Cancelled",
+        f"Optimization of {job.get('original_name', job_id)} cancelled",
+        action="cancelled",
+        target=job_id,
+    )
+    return {"success": True, "job_id": job_id, "killed": killed}
+
+
+def resume_media_jobs(project_root: Path) -> int:
+    """Re-queue jobs a previous process left unfinished.
+
+    Runs once per project root per process.
+
+    Returns:
+        Number of jobs re-queued.
+    """
+    key = str(project_root.resolve())
+    if key in _resumed:
+        return 0
+    _resumed.add(key)
+    if not (project_root / ".state" / _JOBS_SUBDIR).is_dir():
+        return 0                                # never queued anything here
+
+    count = 0
+    for job in reversed(list_media_jobs(project_root)):
+        if job.get("status") in ("queued", "running"):
+            _update_record(project_root, job["job_id"], status="queued", progress=None)
+            _pool.submit(project_root, job["job_id"])
+            count += 1
+    if count:
+        logger.info("Resumed %d unfinished media job(s)", count)
+    return count
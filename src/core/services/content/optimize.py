@@ -36,7 +36,7 @@ import gzip
 import io
 import logging
 from pathlib import Path
-from typing import Tuple
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +98,7 @@ def optimize_image(
     max_dimension: int = MAX_DIMENSION,
     quality: int = WEBP_QUALITY,
     target_format: str = TARGET_FORMAT,
-) -> Tuple[bytes, str, str]:
+) -> tuple[bytes, str, str]:
     """
     Optimize an image: resize + convert to WebP.
 
@@ -202,7 +202,7 @@ def optimize_text(
     data: bytes,
     mime_type: str,
     original_name: str = "",
-) -> Tuple[bytes, str, str, bool]:
+) -> tuple[bytes, str, str, bool]:
     """Gzip compress text/document files."""
     original_size = len(data)
 
@@ -244,11 +244,14 @@ def optimize_media(
     data: bytes,
     mime_type: str,
     original_name: str = "",
-) -> Tuple[bytes, str, str, bool]:
+    **media_opts: Any,
+) -> tuple[bytes, str, str, bool]:
     """
     Universal optimization dispatcher — picks the best optimizer.
 
     Nothing escapes without a compression attempt if it's large enough.
+    ``media_opts`` (``threads``, ``on_progress``, ``on_process``) are
+    forwarded to the ffmpeg optimizers — used by the media job workers.
 
     Returns:
         Tuple of (optimized_bytes, new_mime_type, new_extension, was_optimized).
@@ -262,13 +265,17 @@ def optimize_media(
 
         # ── Video ──
         if mime_type.startswith("video/"):
-            opt_data, opt_mime, opt_ext = optimize_video(data, mime_type)
+            opt_data, opt_mime, opt_ext = optimize_video(
+                data, mime_type, **media_opts,
+            )
             was_optimized = len(opt_data) < len(data)
             return opt_data, opt_mime, opt_ext, was_optimized
 
         # ── Audio ──
         if mime_type.startswith("audio/"):
-            opt_data, opt_mime, opt_ext = optimize_audio(data, mime_type)
+            opt_data, opt_mime, opt_ext = optimize_audio(
+                data, mime_type, on_process=media_opts.get("on_process"),
+            )
             was_optimized = len(opt_data) < len(data)
             return opt_data, opt_mime, opt_ext, was_optimized
 
@@ -11,19 +11,23 @@ Exports:
     cancel_active_optimization() — kill active ffmpeg process
     get_optimization_status()    — frontend polling for progress
     extend_optimization()        — extend encoding deadline
+    probe_media_cached()         — ffprobe once per content hash (LRU cache)
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import time as _time
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
-from typing import Optional, Tuple
 
 from .optimize import (
     VIDEO_MAX_HEIGHT,
@@ -48,7 +52,7 @@ _audit = make_auditor("content")
 _hw_encoder_cache: dict = {}
 
 # Active ffmpeg process reference for cancellation
-_active_ffmpeg_proc: Optional[subprocess.Popen] = None
+_active_ffmpeg_proc: subprocess.Popen | None = None
 
 # Optimization state for frontend polling
 # { "status": "encoding"|"done"|"idle", "elapsed": float, "deadline": float,
@@ -56,6 +60,13 @@ _active_ffmpeg_proc: Optional[subprocess.Popen] = None
 #   "time": str, "duration_sec": float }
 _optimization_state: dict = {"status": "idle"}
 
+# ffprobe results keyed by sha256 of the media bytes (bounded LRU).
+# The same upload is probed for the reencode decision, the scale filter
+# and the adaptive timeout — and re-queued jobs probe it again.
+_PROBE_CACHE_MAX = 256
+_probe_cache: OrderedDict[str, dict] = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
 
 # ═════════════════════════════════════════════════════════════════
 #  Public API — status / cancellation
@@ -138,7 +149,7 @@ def _ffmpeg_available() -> bool:
     return shutil.which("ffmpeg") is not None
 
 
-def _detect_hw_encoder() -> Optional[str]:
+def _detect_hw_encoder() -> str | None:
     """Detect if NVIDIA NVENC is available for H.264 encoding.
 
     Tests by running a tiny encode — some systems have the encoder listed
@@ -182,7 +193,7 @@ def _detect_hw_encoder() -> Optional[str]:
         return None
 
 
-def _probe_media(file_path: Path) -> Optional[dict]:
+def _probe_media(file_path: Path) -> dict | None:
     """Probe a media file for codec, resolution, bitrate info."""
     try:
         proc = subprocess.run(
@@ -203,6 +214,58 @@ def _probe_media(file_path: Path) -> Optional[dict]:
         return None
 
 
+def probe_media_cached(file_path: Path, digest: str = "") -> dict | None:
+    """Probe a media file, reusing a prior result for identical content.
+
+    Args:
+        file_path: Media file on disk.
+        digest: sha256 hex of the file content. Computed if empty.
+
+    Returns:
+        The ffprobe JSON dict, or None if probing failed (failures are
+        not cached so a transient ffprobe error can be retried).
+    """
+    if not digest:
+        digest = _file_sha256(file_path)
+
+    with _probe_cache_lock:
+        hit = _probe_cache.get(digest)
+        if hit is not None:
+            _probe_cache.move_to_end(digest)
+            return hit
+
+    probe = _probe_media(file_path)
+    if probe is None:
+        return None
+
+    with _probe_cache_lock:
+        _probe_cache[digest] = probe
+        _probe_cache.move_to_end(digest)
+        while len(_probe_cache) > _PROBE_CACHE_MAX:
+            _probe_cache.popitem(last=False)
+    return probe
+
+
+def _file_sha256(file_path: Path) -> str:
+    """Stream a file through sha256."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _video_height(probe: dict) -> int:
+    """Height of the first video stream in an ffprobe result (0 if none)."""
+    for s in probe.get("streams", []):
+        if s.get("codec_type") == "video":
+            try:
+                return int(s.get("height") or 0)
+            except (TypeError, ValueError):
+                return 0
+    return 0
+
+
 def _needs_video_reencode(
     probe: dict,
     file_size: int,
@@ -240,8 +303,20 @@ def _needs_video_reencode(
     )
 
 
-def _build_scale_filter(input_path: Path, max_height: int) -> Optional[str]:
-    """Probe video dimensions and return an ffmpeg scale filter if needed."""
+def _build_scale_filter(
+    input_path: Path,
+    max_height: int,
+    probe: dict | None = None,
+) -> str | None:
+    """Return an ffmpeg scale filter if the video exceeds ``max_height``.
+
+    Uses the already-collected ``probe`` when given; only falls back to
+    a dedicated ffprobe call when the full probe failed.
+    """
+    if probe is not None:
+        height = _video_height(probe)
+        return f"scale=-2:{max_height}" if height > max_height else None
+
     try:
         result = subprocess.run(
             [
@@ -303,7 +378,10 @@ def optimize_video(
     video_bitrate: str = VIDEO_BITRATE,
     audio_bitrate: str = AUDIO_BITRATE,
     crf: int = VIDEO_CRF,
-) -> Tuple[bytes, str, str]:
+    threads: int = 0,
+    on_progress: Callable[[dict], None] | None = None,
+    on_process: Callable[[subprocess.Popen], None] | None = None,
+) -> tuple[bytes, str, str]:
     """
     Optimize a video: probe first, then re-encode only if needed.
 
@@ -313,6 +391,11 @@ def optimize_video(
     3. If codec is fine but container is wrong → fast stream copy
     4. Otherwise → full re-encode (GPU NVENC if available, else CPU libx264)
 
+    When ``on_progress``/``on_process`` are given (media job workers), the
+    encode reports through them instead of the module-level polling state,
+    so several encodes can run side by side.  ``threads`` caps libx264
+    threads (0 = all cores).
+
     Returns:
         Tuple of (optimized_bytes, new_mime_type, new_extension).
     """
@@ -332,8 +415,8 @@ def optimize_video(
 
         in_path.write_bytes(data)
 
-        # ── Probe first ──
-        probe = _probe_media(in_path)
+        # ── Probe first (one ffprobe per distinct content) ──
+        probe = probe_media_cached(in_path, hashlib.sha256(data).hexdigest())
         if probe:
             needs_reencode, reason = _needs_video_reencode(probe, original_size, max_height)
             if not needs_reencode:
@@ -371,7 +454,7 @@ def optimize_video(
             logger.info("Could not probe video — attempting full re-encode")
 
         # ── Full re-encode needed ──
-        scale_filter = _build_scale_filter(in_path, max_height)
+        scale_filter = _build_scale_filter(in_path, max_height, probe)
 
         # Adaptive timeout using video duration
         size_mb = original_size / (1024 * 1024)
@@ -425,7 +508,7 @@ def optimize_video(
             cmd.extend([
                 "-c:v", "libx264",
                 "-preset", "fast",
-                "-threads", "0",      # use all CPU cores
+                "-threads", str(threads),  # 0 = use all CPU cores
                 "-crf", str(crf),
                 "-maxrate", video_bitrate,
                 "-bufsize", "3M",
@@ -454,7 +537,7 @@ def optimize_video(
         # Initialize optimization state for frontend polling
         global _active_ffmpeg_proc, _optimization_state
 
-        _optimization_state = {
+        state = {
             "status": "encoding",
             "encoder": encoder_label,
             "deadline": timeout_secs,
@@ -466,6 +549,11 @@ def optimize_video(
             "size_mb": size_mb,
             "duration_sec": duration_sec,
         }
+        tracked = on_progress is None
+        if tracked:
+            _optimization_state = state
+        else:
+            on_progress(dict(state))
 
         proc = subprocess.Popen(
             cmd,
@@ -473,7 +561,10 @@ def optimize_video(
             stderr=subprocess.PIPE,
             text=True,
         )
-        _active_ffmpeg_proc = proc
+        if tracked:
+            _active_ffmpeg_proc = proc
+        if on_process is not None:
+            on_process(proc)
 
         stderr_lines: list = []
         start_time = _time.monotonic()
@@ -493,12 +584,14 @@ def optimize_video(
 
                     progress = _parse_ffmpeg_progress(line)
                     if progress and (now - last_state_update >= 2.0):
-                        _optimization_state.update({
+                        state.update({
                             "elapsed": round(elapsed, 1),
-                            "fps": progress.get("fps", _optimization_state.get("fps", "")),
-                            "speed": progress.get("speed", _optimization_state.get("speed", "")),
-                            "time": progress.get("time", _optimization_state.get("time", "")),
+                            "fps": progress.get("fps", state.get("fps", "")),
+                            "speed": progress.get("speed", state.get("speed", "")),
+                            "time": progress.get("time", state.get("time", "")),
                         })
+                        if on_progress is not None:
+                            on_progress(dict(state))
                         last_state_update = now
 
                     if now - last_log_time >= 5.0:
@@ -516,11 +609,11 @@ def optimize_video(
 
                 # ── Soft deadline with grace period ──
                 elapsed = _time.monotonic() - start_time
-                current_deadline = _optimization_state.get("deadline", timeout_secs)
+                current_deadline = state.get("deadline", timeout_secs)
 
                 if elapsed > current_deadline:
-                    if not _optimization_state.get("deadline_warning"):
-                        _optimization_state["deadline_warning"] = True
+                    if not state.get("deadline_warning"):
+                        state["deadline_warning"] = True
                         grace_deadline = _time.monotonic() + 60
                         logger.warning(
                             f"Optimization deadline reached ({current_deadline:.0f}s). "
@@ -536,14 +629,15 @@ def optimize_video(
                         proc.wait()
                         raise subprocess.TimeoutExpired(cmd, current_deadline)
 
-                    if not _optimization_state.get("deadline_warning"):
+                    if not state.get("deadline_warning"):
                         grace_deadline = None
 
         except subprocess.TimeoutExpired:
             raise
 
-        _active_ffmpeg_proc = None
-        _optimization_state = {"status": "idle"}
+        if tracked:
+            _active_ffmpeg_proc = None
+            _optimization_state = {"status": "idle"}
         stderr_text = '\n'.join(stderr_lines)
         elapsed_total = _time.monotonic() - start_time
         logger.info(f"ffmpeg finished in {elapsed_total:.0f}s (rc={proc.returncode})")
@@ -606,8 +700,12 @@ def optimize_audio(
     mime_type: str,
     *,
     bitrate: str = AUDIO_BITRATE,
-) -> Tuple[bytes, str, str]:
-    """Optimize audio: re-encode to AAC in M4A container."""
+    on_process: Callable[[subprocess.Popen], None] | None = None,
+) -> tuple[bytes, str, str]:
+    """Optimize audio: re-encode to AAC in M4A container.
+
+    ``on_process`` receives the ffmpeg process so a media job can cancel it.
+    """
     if not _ffmpeg_available():
         logger.info("ffmpeg not available — storing audio as-is")
         ext = _ext_for_audio_mime(mime_type)
@@ -632,9 +730,22 @@ def optimize_audio(
             str(out_path),
         ]
 
-        proc = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=120,
-        )
+        if on_process is None:
+            proc = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=120,
+            )
+        else:
+            popen = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            on_process(popen)
+            try:
+                _out, err = popen.communicate(timeout=120)
+            except subprocess.TimeoutExpired:
+                popen.kill()
+                popen.communicate()
+                raise
+            proc = subprocess.CompletedProcess(cmd, popen.returncode, _out, err)
 
         if proc.returncode != 0:
             logger.warning(
@@ -4,9 +4,6 @@
 from __future__ import annotations
 
 import logging
-import re
-import shutil
-import subprocess
 from pathlib import Path
 
 from .common import _SKIP_DIRS, _MANIFEST_DIRS, _parse_k8s_yaml, _kubectl_available
@@ -37,28 +34,26 @@ def _detect_cli(name: str) -> dict:
     Returns:
         {"available": bool, "version": str | None}
     """
-    if shutil.which(name) is None:
-        return {"available": False, "version": None}
+    return _detect_clis([name])[name]
 
-    spec = _CLI_VERSION_SPECS.get(name)
-    if spec is None:
-        # Unknown tool — available but no version extractor
-        return {"available": True, "version": None}
 
-    args, pattern = spec
-    try:
-        result = subprocess.run(
-            args, capture_output=True, text=True, timeout=10,
-        )
-        if result.returncode == 0:
-            match = re.search(pattern, result.stdout)
-            if match:
-                return {"available": True, "version": match.group(1)}
-    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
-        pass
+def _detect_clis(names: list[str]) -> dict[str, dict]:
+    """``_detect_cli`` for several tools — version commands run concurrently.
+
+    Lookups and version output are cached per binary by ``tool_inventory``.
+    """
+    from src.core.services import tool_inventory
+
+    found = tool_inventory.which_many(names)
+    specs = {n: _CLI_VERSION_SPECS[n] for n in names if found[n] and n in _CLI_VERSION_SPECS}
+    versions = tool_inventory.probe_versions(
+        specs, include_stderr=False, require_success=True,
+    )
+    return {
+        n: {"available": found[n] is not None, "version": versions.get(n)}
+        for n in names
+    }
 
-    # Binary exists but version extraction failed
-    return {"available": True, "version": None}
 
 def k8s_status(project_root: Path) -> dict:
     """Detect Kubernetes manifests and kubectl availability.
@@ -208,17 +203,14 @@ def k8s_status(project_root: Path) -> dict:
     tool_availability = {
         # Core K8s tool
         "kubectl": kubectl,
-        # K8s deployment tools
-        "helm": _detect_cli("helm"),
-        "kustomize": _detect_cli("kustomize"),
-        "skaffold": _detect_cli("skaffold"),
-        # Local cluster tools
-        "minikube": _detect_cli("minikube"),
-        "kind": _detect_cli("kind"),
-        # Cloud CLIs (authentication for managed clusters)
-        "az": _detect_cli("az"),
-        "aws": _detect_cli("aws"),
-        "gcloud": _detect_cli("gcloud"),
+        **_detect_clis([
+            # K8s deployment tools
+            "helm", "kustomize", "skaffold",
+            # Local cluster tools
+            "minikube", "kind",
+            # Cloud CLIs (authentication for managed clusters)
+            "az", "aws", "gcloud",
+        ]),
     }
 
     # ── Deployment readiness ──────────────────────────────────────
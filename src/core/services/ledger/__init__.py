@@ -11,6 +11,9 @@ Storage:
     - Audit metadata is also stored as annotated tags at
       ``refs/tags/scp/audit/<snapshot_id>``.
 
+Writes are committed through a per-project ``LedgerCommitQueue``
+(``commit_queue.py``) that coalesces concurrent writes into one commit.
+
 Runs are ephemeral and stored locally in ``.state/runs.jsonl``.
 See ``run_tracker.py`` for run storage.
 """
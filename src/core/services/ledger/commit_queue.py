@@ -0,0 +1,262 @@
+"""
+Ledger commit queue — coalesce small ledger writes into fewer commits.
+
+Every chat message, audit snapshot and shared trace ends in
+``ledger_add_and_commit``: a ``git add`` + ``git commit`` fork pair and
+an index rewrite per write.  Under a burst (a busy chat thread, a batch
+of audits) the worktree spends its time committing one line at a time.
+
+``LedgerCommitQueue`` (one per project) takes writes and commits them
+in batches: every write that is pending when a commit starts goes into
+that commit, with one ``git add`` for all paths and one trailer per
+write in the message.  Durability modes, per write:
+
+    sync     commit now (with anything already pending); return its result
+    group    wait for the batch that carries this write (group commit):
+             commits right away when the worktree is idle, otherwise
+             rides along with the writes that queued up meanwhile
+    async    return at once; a background flusher commits the batch
+
+``window_s`` (default 0) makes group and async leaders wait that long
+before taking a batch, to gather more writes at the cost of latency.
+Both are set per project through ``get_commit_queue(root, durability=,
+window_s=)``.
+Push, pull and rebase call ``flush_ledger_writes`` first, so no pending
+write is stashed or left out of a push.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from src.core.services.store_helpers import per_project
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("sync", "group", "async")
+DEFAULT_DURABILITY = "group"
+COMMIT_WINDOW_S = 0.0
+MAX_BATCH = 500            # writes per commit
+_FLUSHER_IDLE_S = 30.0     # async flusher thread exits after this long idle
+
+
+class _Write:
+    __slots__ = ("done", "error", "message", "ok", "paths")
+
+    def __init__(self, paths: list[str], message: str):
+        self.paths = paths
+        self.message = message
+        self.done = threading.Event()
+        self.ok = False
+        self.error: Exception | None = None
+
+
+def _batch_message(batch: list[_Write]) -> str:
+    """One write: its own message.  Several: a summary subject plus one
+    ``Ledger-Write:`` trailer per write, in arrival order.
+
+        ledger: 3 writes (chat ×2, audit ×1)
+
+        Ledger-Write: chat: message in thread_a
+        Ledger-Write: chat: message in thread_a
+        Ledger-Write: audit: security security_20260218_150300
+    """
+    if len(batch) == 1:
+        return batch[0].message
+    kinds = Counter(w.message.split(":", 1)[0].strip() or "?" for w in batch)
+    summary = ", ".join(f"{kind} ×{n}" for kind, n in kinds.most_common())
+    trailers = "\n".join(
+        "Ledger-Write: " + " ".join(w.message.split()) for w in batch
+    )
+    return f"ledger: {len(batch)} writes ({summary})\n\n{trailers}"
+
+
+class LedgerCommitQueue:
+    """Batches ledger writes for one project into shared commits."""
+
+    def __init__(
+        self,
+        project_root: Path,
+        *,
+        durability: str = DEFAULT_DURABILITY,
+        window_s: float = COMMIT_WINDOW_S,
+        max_batch: int = MAX_BATCH,
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.project_root = project_root
+        self.durability = durability
+        self.window_s = window_s
+        self.max_batch = max_batch
+        self.commits = 0
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._pending: list[_Write] = []
+        self._committing = False
+        self._flusher: threading.Thread | None = None
+
+    # ── Public API ─────────────────────────────────────────────
+
+    def submit(
+        self, paths: list[str], message: str, *, durability: str | None = None,
+    ) -> bool:
+        """Queue ``paths`` for commit with ``message``.
+
+        Returns the commit result (True for ``async``, which does not wait).
+
+        Raises:
+            GitIdentityError: If git user.name/email are not configured
+                (``sync`` / ``group`` only; ``async`` logs it).
+        """
+        mode = durability or self.durability
+        if mode not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {mode}")
+        write = _Write(list(paths), message)
+        with self._cond:
+            self._pending.append(write)
+            self._cond.notify_all()
+            if mode == "async":
+                self._ensure_flusher()
+                return True
+
+        self._commit_until(write, gather=mode == "group")
+        if write.error is not None:
+            raise write.error
+        return write.ok
+
+    def flush(self) -> None:
+        """Commit every pending write now."""
+        self._commit_until(None, gather=False)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    # ── Batching ───────────────────────────────────────────────
+
+    def _commit_until(self, target: _Write | None, *, gather: bool) -> None:
+        """Commit batches until ``target`` is committed (or, for None,
+        until nothing is pending).  Only one caller commits at a time;
+        the others wait and usually find their write already done.
+        """
+        with self._cond:
+            while True:
+                if target is not None and target.done.is_set():
+                    return
+                if target is None and not self._pending and not self._committing:
+                    return
+                if not self._committing:
+                    break
+                self._cond.wait()
+            self._committing = True
+
+        try:
+            if gather and self.window_s > 0:
+                time.sleep(self.window_s)
+            while True:
+                with self._cond:
+                    batch = self._pending[:self.max_batch]
+                    del self._pending[:len(batch)]
+                if not batch:
+                    break
+                self._commit_batch(batch)
+                if target is not None and target.done.is_set():
+                    break
+        finally:
+            with self._cond:
+                self._committing = False
+                self._cond.notify_all()
+
+    def _commit_batch(self, batch: list[_Write]) -> None:
+        from src.core.services.ledger.worktree import GitIdentityError, _commit_paths
+
+        paths = list(dict.fromkeys(p for w in batch for p in w.paths))
+        ok, error = False, None
+        try:
+            ok = _commit_paths(self.project_root, paths, _batch_message(batch))
+        except GitIdentityError as e:
+            error = e
+        except Exception as e:                       # never strand the waiters
+            logger.error("Ledger batch commit failed: %s", e)
+        self.commits += 1
+        self.writes += len(batch)
+        for w in batch:
+            w.ok, w.error = ok, error
+            w.done.set()
+
+    # ── Async flusher ──────────────────────────────────────────
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher (caller holds ``_cond``)."""
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="ledger-commit-flusher", daemon=True,
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(timeout=_FLUSHER_IDLE_S)
+                    if not self._pending:
+                        self._flusher = None
+                        return
+            try:
+                self._commit_until(None, gather=True)
+            except Exception as e:
+                logger.error("Ledger async flush failed: %s", e)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  Per-project registry
+# ═══════════════════════════════════════════════════════════════════════
+
+
+_queues: dict[str, LedgerCommitQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_commit_queue(
+    project_root: Path,
+    *,
+    durability: str | None = None,
+    window_s: float | None = None,
+) -> LedgerCommitQueue:
+    """The commit queue for ``project_root`` (created on first use).
+
+    ``durability`` / ``window_s``, when given, configure the queue —
+    on creation or, for an existing queue, from then on.
+    """
+    if durability is not None and durability not in DURABILITY_MODES:
+        raise ValueError(f"Unknown durability mode: {durability}")
+    if window_s is not None and window_s < 0:
+        raise ValueError(f"Commit window must be >= 0, got {window_s}")
+    queue = per_project(_queues, _queues_lock, project_root, LedgerCommitQueue)
+    if durability is not None:
+        queue.durability = durability
+    if window_s is not None:
+        queue.window_s = window_s
+    return queue
+
+
+def flush_ledger_writes(project_root: Path | None = None) -> None:
+    """Commit pending writes for ``project_root`` (or every project)."""
+    if project_root is None:
+        queues = list(_queues.values())
+    else:
+        queue = _queues.get(str(Path(project_root).resolve()))
+        queues = [queue] if queue else []
+    for queue in queues:
+        try:
+            queue.flush()
+        except Exception as e:
+            logger.error("Ledger flush failed for %s: %s", queue.project_root, e)
+
+
+atexit.register(flush_ledger_writes)
@@ -218,23 +218,14 @@ def list_saved_audits(
     if not audits_dir.is_dir():
         return []
 
+    from src.core.services.chat.refs_index import _parse_saved_audit
+
     results: list[dict[str, Any]] = []
     for path in sorted(audits_dir.glob("*.json"), reverse=True):
         if len(results) >= n:
             break
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            card_key = data.get("card_key", "")
-            results.append({
-                "snapshot_id": data.get("snapshot_id", path.stem),
-                "card_key": card_key,
-                "audit_type": data.get("audit_type") or ("project" if card_key.startswith("audit:") else "devops"),
-                "computed_at": data.get("computed_at"),
-                "iso": data.get("iso"),
-                "status": data.get("status"),
-                "summary": data.get("summary"),
-                "duration_s": data.get("duration_s"),
-            })
+            results.append(_parse_saved_audit(path.stem, path)[1])
         except (json.JSONDecodeError, OSError):
             continue
 
@@ -107,6 +107,10 @@ def _safe_rebase(project_root: Path, *, label: str = "rebase") -> bool:
     if _rebase_fail_ts and (_time.time() - _rebase_fail_ts) < _REBASE_COOLDOWN:
         return False
 
+    # Commit queued writes rather than stash them
+    from src.core.services.ledger.commit_queue import flush_ledger_writes
+    flush_ledger_writes(project_root)
+
     # Stash uncommitted changes (modified tracked files only —
     # local traces now live outside the worktree in .state/traces/)
     stash_r = _run_ledger_git(
@@ -956,13 +960,39 @@ def current_user(project_root: Path) -> str:
 # ═══════════════════════════════════════════════════════════════════════
 
 
-def ledger_add_and_commit(project_root: Path, paths: list[str], message: str) -> bool:
+def ledger_add_and_commit(
+    project_root: Path,
+    paths: list[str],
+    message: str,
+    *,
+    durability: str | None = None,
+) -> bool:
     """Stage and commit files in the ledger worktree.
 
+    Goes through the project's ``LedgerCommitQueue``, which folds writes
+    that arrive while a commit is running into one commit (see
+    ``commit_queue.py``).
+
     Args:
         project_root: Main project root.
         paths: Paths relative to the worktree root to stage (e.g. ``ledger/runs/...``).
         message: Commit message.
+        durability: ``"sync"``, ``"group"`` or ``"async"`` (default: the
+            queue's mode, ``"group"``).
+
+    Returns:
+        True if commit succeeded (always True for ``"async"``).
+
+    Raises:
+        GitIdentityError: If git user.name/email are not configured.
+    """
+    from src.core.services.ledger.commit_queue import get_commit_queue
+
+    return get_commit_queue(project_root).submit(paths, message, durability=durability)
+
+
+def _commit_paths(project_root: Path, paths: list[str], message: str) -> bool:
+    """``git add`` + ``git commit`` in the ledger worktree (one batch).
 
     Returns:
         True if commit succeeded.
@@ -970,10 +1000,13 @@ def ledger_add_and_commit(project_root: Path, paths: list[str], message: str) ->
     Raises:
         GitIdentityError: If git user.name/email are not configured.
     """
-    for p in paths:
-        r = _run_ledger_git("add", p, project_root=project_root)
-        if r.returncode != 0:
-            logger.warning("git add failed for %s: %s", p, r.stderr.strip())
+    r = _run_ledger_git("add", "--", *paths, project_root=project_root) if paths else None
+    if r is not None and r.returncode != 0:
+        # One bad pathspec fails the whole add — fall back to path by path
+        for p in paths:
+            r = _run_ledger_git("add", p, project_root=project_root)
+            if r.returncode != 0:
+                logger.warning("git add failed for %s: %s", p, r.stderr.strip())
 
     r = _run_ledger_git(
         "commit", "-m", message,
@@ -1076,6 +1109,9 @@ def push_ledger_branch(project_root: Path) -> bool:
       2. ``git -C .ledger rebase origin/ledger``
       3. ``git -C .ledger push origin ledger``
     """
+    from src.core.services.ledger.commit_queue import flush_ledger_writes
+    flush_ledger_writes(project_root)
+
     # Fetch first
     r = _run_ledger_git(
         "fetch", "origin",
@@ -0,0 +1,99 @@
+"""
+Name matcher — which of a fixed set of names occur in a text (Aho-Corasick).
+
+Peek's index-driven scan asks, for every document, which known file and
+directory names appear in it.  Testing each name with ``name in content``
+costs O(names × content); on a large repo that loop dominates peek time.
+
+``NameMatcher`` compiles the names once into an Aho-Corasick automaton
+and then answers in one linear pass over the text, independent of how
+many names there are.  Matches are plain substrings (overlapping, like
+``in``), so the result is exactly the set of names with ``name in text``.
+
+Automaton layout (flat, to keep 50k+ names affordable in memory):
+
+    state ids        multiples of ``_SHIFT`` (state 0 = root)
+    _goto            {state | ord(ch): next_state}
+    _fail            fail link per state (indexed by ``state >> 21``)
+    _out             {state: (name indices ending here, incl. via fail)}
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+
+_BITS = 21                      # enough for any code point (≤ 0x10FFFF)
+_SHIFT = 1 << _BITS
+
+
+class NameMatcher:
+    """Aho-Corasick automaton over ``names``; immutable once built."""
+
+    __slots__ = ("_fail", "_goto", "_out", "names")
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = list(dict.fromkeys(n for n in names if n))
+        goto: dict[int, int] = {}
+        out: dict[int, tuple[int, ...]] = {}
+        children: list[list[tuple[int, int]]] = [[]]
+
+        # ── Trie ──
+        for i, name in enumerate(self.names):
+            state = 0
+            for ch in name:
+                key = state | ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = len(children) << _BITS
+                    goto[key] = nxt
+                    children[state >> _BITS].append((ord(ch), nxt))
+                    children.append([])
+                state = nxt
+            out[state] = (*out.get(state, ()), i)
+
+        # ── Fail links (BFS) + output merge along them ──
+        fail = [0] * len(children)
+        queue = deque(child for _, child in children[0])
+        while queue:
+            state = queue.popleft()
+            for code, child in children[state >> _BITS]:
+                queue.append(child)
+                f = fail[state >> _BITS]
+                while f and (f | code) not in goto:
+                    f = fail[f >> _BITS]
+                target = goto.get(f | code, 0)
+                fail[child >> _BITS] = target
+                if target in out:
+                    out[child] = out.get(child, ()) + out[target]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, text: str) -> list[int]:
+        """Indices (into ``names``) of every name occurring in ``text``, sorted."""
+        goto_get = self._goto.get
+        fail = self._fail
+        out = self._out
+        hits: set[int] = set()
+        state = 0
+        for code in map(ord, text):
+            nxt = goto_get(state | code)
+            while nxt is None:
+                if not state:
+                    nxt = 0
+                    break
+                state = fail[state >> _BITS]
+                nxt = goto_get(state | code)
+            state = nxt
+            if state in out:
+                hits.update(out[state])
+        return sorted(hits)
+
+    def find_names(self, text: str) -> list[str]:
+        """The names occurring in ``text``, in ``names`` order."""
+        return [self.names[i] for i in self.find(text)]
@@ -12,7 +12,7 @@ import shutil
 import time
 from pathlib import Path
 
-from src.core.services.pages_builders import get_builder
+from src.core.services.pages_builders import get_builder, staging_detail
 from .engine import (
     PAGES_WORKSPACE,
     ensure_gitignore,
@@ -106,6 +106,7 @@ def build_segment_stream(
         yield {"type": "stage_start", "stage": si.name, "label": si.label}
 
         stage_start = time.monotonic()
+        stage_wall = time.time()
         error = ""
 
         try:
@@ -128,12 +129,14 @@ def build_segment_stream(
             "status": status,
             "duration_ms": stage_ms,
             "error": error,
+            "detail": staging_detail(workspace, si.name, stage_wall),
         })
 
         if status == "done":
             yield {
                 "type": "stage_done", "stage": si.name,
                 "label": si.label, "duration_ms": stage_ms,
+                "detail": stage_results[-1]["detail"],
             }
         else:
             yield {
@@ -31,6 +31,8 @@ _audit = make_auditor("pages")
 # ── Constants ───────────────────────────────────────────────────────
 
 PAGES_WORKSPACE = ".pages"
+_MERGE_MANIFEST = ".merge.json"      # Merge manifest (next to _merged/, not deployed)
+_DEPLOY_GIT_DIR = ".deploy.git"      # Persistent git dir for gh-pages deploys
 
 
 # ── Config I/O ──────────────────────────────────────────────────────
@@ -260,16 +262,29 @@ def get_build_status(project_root: Path, name: str) -> dict | None:
 # ── Merge ───────────────────────────────────────────────────────────
 
 
-def merge_segments(project_root: Path) -> dict:
+def merge_segments(project_root: Path, *, incremental: bool = True) -> dict:
     """Merge all built segment outputs into _merged/.
 
+    Incremental by default: unchanged files are kept, new/changed files
+    are reflinked or hardlinked from the segment build output (copied
+    only when the filesystem can't share them) and stale files are
+    pruned.  See ``pages/merge.py``.
+
+    Args:
+        project_root: Project root directory.
+        incremental: False wipes ``_merged/`` and copies everything.
+
     Returns:
-        Dict with {ok, merged_dir, segments_merged, errors}.
+        Dict with {ok, merged_dir, segments_merged, errors, report}.
     """
-    merged_dir = project_root / PAGES_WORKSPACE / "_merged"
-    if merged_dir.exists():
-        shutil.rmtree(merged_dir)
-    merged_dir.mkdir(parents=True)
+    from .merge import collect_files, merge_tree
+
+    workspace = project_root / PAGES_WORKSPACE
+    merged_dir = workspace / "_merged"
+    manifest = workspace / _MERGE_MANIFEST
+    if not incremental:
+        shutil.rmtree(merged_dir, ignore_errors=True)
+        manifest.unlink(missing_ok=True)
 
     segments = get_segments(project_root)
     pages_meta = get_pages_meta(project_root)
@@ -277,6 +292,7 @@ def merge_segments(project_root: Path) -> dict:
 
     merged = []
     errors = []
+    plan: dict[str, Path] = {}
 
     for seg in segments:
         build_meta = get_build_status(project_root, seg.name)
@@ -291,24 +307,36 @@ def merge_segments(project_root: Path) -> dict:
 
         # Determine target path
         if root_segment and seg.name == root_segment:
-            target = merged_dir
+            prefix = ""
         else:
-            path = seg.path.strip("/") or seg.name
-            target = merged_dir / path
+            prefix = seg.path.strip("/") or seg.name
 
-        target.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(str(output), str(target), dirs_exist_ok=True)
+        # Later segments win on overlapping paths (as copytree did)
+        plan.update(collect_files(output, prefix))
         merged.append(seg.name)
 
+    # Hub page is generated, not merged — keep it out of the prune
+    keep = set() if root_segment else {"index.html"}
+    report = merge_tree(
+        plan, merged_dir, manifest_path=manifest, keep=keep,
+        link=_get_pages_config(project_root).get("merge_links", True),
+    )
+
     # Generate hub page if no root segment
     if not root_segment:
         _generate_hub_page(merged_dir, segments)
 
+    logger.info(
+        "Merged %d segment(s): %d linked, %d copied (%s bytes), %d unchanged, %d removed",
+        len(merged), report.linked + report.reflinked, report.copied,
+        f"{report.bytes_copied:,}", report.unchanged, report.removed,
+    )
     return {
         "ok": len(errors) == 0,
         "merged_dir": str(merged_dir),
         "segments_merged": merged,
         "errors": errors,
+        "report": report.to_dict(),
     }
 
 
@@ -356,36 +384,43 @@ def _generate_hub_page(merged_dir: Path, segments: list[SegmentConfig]) -> None:
     </div>
 </body>
 </html>"""
-    (merged_dir / "index.html").write_text(html, encoding="utf-8")
+    from .merge import write_merged_file
+
+    write_merged_file(merged_dir / "index.html", html)
 
 
 # ── Deploy ──────────────────────────────────────────────────────────
 
 
+def _deploy_git(git_dir: Path, work_tree: Path, *args: str, **kwargs) -> subprocess.CompletedProcess:
+    """Run git against the persistent deploy repo with ``_merged/`` as work tree."""
+    return subprocess.run(
+        ["git", f"--git-dir={git_dir}", f"--work-tree={work_tree}", *args],
+        capture_output=True, text=True, **kwargs,
+    )
+
+
 def deploy_to_ghpages(project_root: Path) -> dict:
-    """Force-push _merged/ to the gh-pages branch.
+    """Push _merged/ to the gh-pages branch, sending only changed entries.
+
+    A persistent git dir (``.pages/.deploy.git``) keeps the index between
+    deploys, so ``git add`` only re-hashes files whose stat changed.  The
+    remote branch tip is fetched (depth 1) and used as parent, so the
+    push transfers just the new blobs/trees.  Nothing is pushed when the
+    tree is identical to the last deploy.
 
     Returns:
-        Dict with {ok, output, error}.
+        Dict with {ok, output, changed, commit} or {ok: False, error}.
     """
-    merged_dir = project_root / PAGES_WORKSPACE / "_merged"
+    workspace = project_root / PAGES_WORKSPACE
+    merged_dir = workspace / "_merged"
     if not merged_dir.is_dir():
         return {"ok": False, "error": "No merged output. Run build-all first."}
 
-    try:
-        # Create a temporary orphan branch approach using git worktree
-        # or a simpler approach: init a fresh repo in _merged and push
-        cwd = str(merged_dir)
-
-        # Init fresh git repo in merged dir
-        subprocess.run(["git", "init"], cwd=cwd, capture_output=True, check=True)
-        subprocess.run(["git", "checkout", "-b", "gh-pages"], cwd=cwd, capture_output=True, check=True)
-        subprocess.run(["git", "add", "-A"], cwd=cwd, capture_output=True, check=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Deploy to GitHub Pages"],
-            cwd=cwd, capture_output=True, check=True,
-        )
+    git_dir = workspace / _DEPLOY_GIT_DIR
+    branch = get_pages_meta(project_root)["deploy_branch"] or "gh-pages"
 
+    try:
         # Get the remote URL from the main repo
         r = subprocess.run(
             ["git", "remote", "get-url", "origin"],
@@ -393,24 +428,56 @@ def deploy_to_ghpages(project_root: Path) -> dict:
         )
         if r.returncode != 0:
             return {"ok": False, "error": "No 'origin' remote configured"}
-
         remote_url = r.stdout.strip()
 
-        # Force push
-        r_push = subprocess.run(
-            ["git", "push", "--force", remote_url, "gh-pages"],
-            cwd=cwd, capture_output=True, text=True, timeout=120,
+        # Leftover from the old init-in-place deploy
+        shutil.rmtree(merged_dir / ".git", ignore_errors=True)
+
+        if not (git_dir / "HEAD").is_file():
+            subprocess.run(
+                ["git", "init", "--quiet", "--bare", str(git_dir)],
+                capture_output=True, check=True,
+            )
+            _deploy_git(git_dir, merged_dir, "config", "core.bare", "false", check=True)
+        _deploy_git(git_dir, merged_dir, "symbolic-ref", "HEAD", f"refs/heads/{branch}", check=True)
+
+        # Parent = current remote tip (if the branch exists), index untouched
+        fetched = _deploy_git(
+            git_dir, merged_dir, "fetch", "--quiet", "--depth", "1",
+            remote_url, f"refs/heads/{branch}", timeout=120,
         )
+        if fetched.returncode == 0:
+            _deploy_git(git_dir, merged_dir, "update-ref", f"refs/heads/{branch}", "FETCH_HEAD", check=True)
+        has_head = _deploy_git(git_dir, merged_dir, "rev-parse", "--verify", "--quiet", "HEAD").returncode == 0
+
+        _deploy_git(git_dir, merged_dir, "add", "--all", check=True)
+        if has_head:
+            diff = _deploy_git(git_dir, merged_dir, "diff", "--cached", "--name-only", "HEAD", check=True)
+            changed = len([ln for ln in diff.stdout.splitlines() if ln])
+            if changed == 0:
+                return {"ok": True, "output": "gh-pages already up to date", "changed": 0, "commit": None}
+        else:
+            ls = _deploy_git(git_dir, merged_dir, "ls-files", "--cached", check=True)
+            changed = len([ln for ln in ls.stdout.splitlines() if ln])
 
-        # Clean up the temp git repo
-        shutil.rmtree(merged_dir / ".git", ignore_errors=True)
+        _deploy_git(
+            git_dir, merged_dir, "commit", "--quiet", "--no-verify", "-m", "Deploy to GitHub Pages",
+            check=True,
+        )
+        commit = _deploy_git(git_dir, merged_dir, "rev-parse", "HEAD", check=True).stdout.strip()
 
+        r_push = _deploy_git(
+            git_dir, merged_dir, "push", "--force", remote_url, f"HEAD:refs/heads/{branch}",
+            timeout=120,
+        )
         if r_push.returncode != 0:
             return {"ok": False, "error": f"Push failed: {r_push.stderr.strip()}"}
 
         return {
             "ok": True,
             "output": r_push.stdout.strip() or r_push.stderr.strip(),
+            "changed": changed,
+            "commit": commit,
         }
 
     except subprocess.CalledProcessError as e:
@@ -0,0 +1,244 @@
+"""
+Pages — incremental segment merge.
+
+``merge_segments`` used to delete ``.pages/_merged`` and ``copytree``
+every segment output into it on each deploy.  This module makes
+``_merged/`` mirror a *plan* (merged relative path → source file)
+incrementally:
+
+    - unchanged files (same source, size+mtime, or same sha256) are kept
+    - new/changed files are materialized by reflink (copy-on-write clone,
+      btrfs/XFS), then hardlink, then a plain copy as last resort
+    - files no longer in the plan are pruned
+
+State lives next to the merged tree (never inside it — ``_merged/`` is
+what gets deployed)::
+
+    .pages/.merge.json
+        {"version": 1, "files": {rel: {"src", "size", "mtime_ns",
+                                       "sha256", "method"}}}
+
+Hardlinked files share their inode with the segment build output, so
+anything that writes into ``_merged/`` must replace files (unlink +
+create), never rewrite them in place — see ``write_merged_file()``.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_MERGE_VERSION = 1
+
+# Linux FICLONE ioctl — _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+@dataclass
+class MergeReport:
+    """Outcome of one merge pass."""
+
+    reflinked: int = 0                  # New/changed files cloned copy-on-write
+    linked: int = 0                     # New/changed files hardlinked
+    copied: int = 0                     # New/changed files copied byte-for-byte
+    unchanged: int = 0                  # Files kept from the previous merge
+    removed: int = 0                    # Stale files pruned
+    bytes_linked: int = 0               # Bytes shared via reflink/hardlink
+    bytes_copied: int = 0               # Bytes actually written
+    full: bool = False                  # True when no usable manifest existed
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone ``src`` to ``dst`` copy-on-write. False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:  # non-POSIX
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _materialize(src: Path, dst: Path, size: int, link: bool, report: MergeReport) -> str:
+    """Place ``src`` at ``dst`` as cheaply as possible. Returns the method used."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    # Never write through an existing (possibly hardlinked) file
+    dst.unlink(missing_ok=True)
+
+    if link:
+        if _reflink(src, dst):
+            report.reflinked += 1
+            report.bytes_linked += size
+            return "reflink"
+        try:
+            os.link(src, dst)
+            report.linked += 1
+            report.bytes_linked += size
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                logger.debug("hardlink %s → %s failed: %s", src, dst, e)
+
+    shutil.copy2(src, dst)
+    report.copied += 1
+    report.bytes_copied += size
+    return "copy"
+
+
+def _same_inode(a: os.stat_result, b: Path) -> bool:
+    try:
+        st = b.stat()
+    except OSError:
+        return False
+    return st.st_ino == a.st_ino and st.st_dev == a.st_dev
+
+
+def write_merged_file(path: Path, content: str) -> None:
+    """Write a generated file into ``_merged/`` without touching link targets.
+
+    Skips the write when the content is identical, so the file's stat
+    (and therefore the deploy index) stays stable across merges.
+    """
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.unlink(missing_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def merge_tree(
+    plan: dict[str, Path],
+    dest: Path,
+    *,
+    manifest_path: Path,
+    keep: set[str] | None = None,
+    link: bool = True,
+) -> MergeReport:
+    """Make ``dest`` contain exactly the files in ``plan``.
+
+    Args:
+        plan: Merged relative POSIX path → source file.  Later segments
+            overriding earlier ones must already be resolved by the caller.
+        dest: The merged output directory.
+        manifest_path: Where the merge manifest is persisted.
+        keep: Extra relative paths to leave alone (generated files).
+        link: Allow reflinks/hardlinks; False forces plain copies.
+
+    Returns:
+        MergeReport with per-method counts and bytes copied vs linked.
+    """
+    report = MergeReport()
+
+    prev: dict[str, dict] = {}
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if data.get("version") == _MERGE_VERSION and dest.is_dir():
+            prev = data.get("files", {})
+        else:
+            report.full = True
+    except (OSError, ValueError):
+        report.full = True
+
+    dest.mkdir(parents=True, exist_ok=True)
+    files: dict[str, dict] = {}
+
+    for rel, src in sorted(plan.items()):
+        try:
+            st = src.stat()
+        except OSError:
+            continue
+        target = dest / rel
+        old = prev.get(rel)
+
+        if old and target.is_file() and old.get("src") == str(src):
+            if _same_inode(st, target):
+                files[rel] = {**old, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                report.unchanged += 1
+                continue
+            if old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+                files[rel] = old
+                report.unchanged += 1
+                continue
+
+        digest = _file_sha256(src)
+        if old and target.is_file() and old.get("sha256") == digest:
+            files[rel] = {**old, "src": str(src), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            report.unchanged += 1
+            continue
+
+        method = _materialize(src, target, st.st_size, link, report)
+        files[rel] = {
+            "src": str(src),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest,
+            "method": method,
+        }
+
+    # Prune everything that is neither planned nor explicitly kept
+    wanted = set(files) | (keep or set())
+    for dirpath, dirnames, filenames in os.walk(dest, topdown=False):
+        base = Path(dirpath)
+        for name in filenames:
+            path = base / name
+            if path.relative_to(dest).as_posix() not in wanted:
+                path.unlink(missing_ok=True)
+                report.removed += 1
+        for d in dirnames:
+            sub = base / d
+            try:
+                if sub.is_symlink():
+                    sub.unlink()
+                elif not any(sub.iterdir()):
+                    sub.rmdir()
+            except OSError:
+                pass
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({
+        "version": _MERGE_VERSION,
+        "updated_at": time.time(),
+        "report": report.to_dict(),
+        "files": files,
+    }), encoding="utf-8")
+    return report
+
+
+def collect_files(output: Path, prefix: str) -> dict[str, Path]:
+    """Map every file under ``output`` to ``prefix/<rel>`` (POSIX)."""
+    found: dict[str, Path] = {}
+    for dirpath, dirnames, filenames in os.walk(output, followlinks=True):
+        dirnames.sort()
+        base = Path(dirpath)
+        for name in filenames:
+            path = base / name
+            rel = path.relative_to(output).as_posix()
+            found[f"{prefix}/{rel}" if prefix else rel] = path
+    return found
@@ -17,7 +17,10 @@ from src.core.services.pages_builders.base import (
     SegmentConfig,
     StageInfo,
     StageResult,
+    StagingReport,
     run_pipeline,
+    stage_incremental,
+    staging_detail,
 )
 from src.core.services.pages_builders.custom import CustomBuilder
 from src.core.services.pages_builders.docusaurus import DocusaurusBuilder
@@ -68,7 +71,10 @@ __all__ = [
     "SegmentConfig",
     "StageInfo",
     "StageResult",
+    "StagingReport",
     "get_builder",
     "list_builders",
     "run_pipeline",
+    "stage_incremental",
+    "staging_detail",
 ]
@@ -29,17 +29,31 @@ Stage conventions
 Every pipeline implicitly ends with a "serve" stage handled by Flask
 (not by the builder) — static files from output_dir() are served at
 /pages/site/<segment>/.
+
+Incremental staging
+───────────────────
+Builders that copy (or copy + transform) the source tree into the
+workspace call ``PageBuilder.stage_source_incremental()`` instead of
+wiping and re-copying.  A manifest per stage (``.staging/<stage>.json``)
+records, for every source file, its size, mtime, sha256 and the
+transform version; only new or changed files are copied/transformed,
+outputs of removed sources are deleted, and the counts are surfaced on
+``StageResult.detail`` by ``run_pipeline()`` (see ``staging_detail()``).
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import shutil
 import subprocess
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections.abc import Callable, Generator
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Generator
+from typing import Any
 
 
 # ── Data Models ─────────────────────────────────────────────────────
@@ -140,6 +154,22 @@ class BuildResult:
     log: list[str] = field(default_factory=list)
 
 
+@dataclass
+class StagingReport:
+    """Outcome of one incremental staging pass."""
+
+    copied: int = 0                     # Changed/new files copied verbatim
+    transformed: int = 0                # Changed/new files run through the transform
+    unchanged: int = 0                  # Files reused from the previous build
+    removed: int = 0                    # Stale outputs deleted
+    skipped: int = 0                    # Hidden / __pycache__ entries ignored
+    full: bool = False                  # True when no usable manifest existed
+
+
+StagingTransform = Callable[[Path, str], "tuple[str, bytes] | None"]
+"""``(source_file, rel_posix) → (output_rel_posix, content)`` or None to copy."""
+
+
 # ── Log line type alias ─────────────────────────────────────────────
 
 LogStream = Generator[str, None, None]
@@ -261,6 +291,42 @@ class PageBuilder(ABC):
             f"Builder '{self.info().name}' does not support live preview"
         )
 
+    def stage_source_incremental(
+        self,
+        segment: SegmentConfig,
+        workspace: Path,
+        dest: Path,
+        *,
+        stage: str = "source",
+        transform: StagingTransform | None = None,
+        transform_version: str = "",
+    ) -> LogStream:
+        """Sync ``segment.source`` into ``dest``, touching only changes.
+
+        Falls back to a full re-stage when ``segment.config["clean"]`` is
+        set or ``segment.config["incremental"]`` is False.  See
+        ``stage_incremental()`` for the manifest semantics.
+        """
+        source = Path(segment.source).resolve()
+        manifest = _staging_manifest_path(workspace, stage)
+        if segment.config.get("clean") or segment.config.get("incremental") is False:
+            manifest.unlink(missing_ok=True)
+            if dest.exists():
+                shutil.rmtree(dest)
+
+        report = stage_incremental(
+            source, dest,
+            manifest_path=manifest,
+            transform=transform,
+            transform_version=transform_version,
+        )
+        mode = "full" if report.full else "incremental"
+        yield (
+            f"Staged ({mode}): {report.copied} copied, "
+            f"{report.transformed} transformed, {report.unchanged} unchanged, "
+            f"{report.removed} removed (skipped {report.skipped} hidden)"
+        )
+
     # ── Legacy methods (backward compat) ────────────────────────────
 
     def scaffold(self, segment: SegmentConfig, workspace: Path) -> None:
@@ -291,6 +357,182 @@ class PageBuilder(ABC):
         )
 
 
+# ── Incremental Staging ─────────────────────────────────────────────
+
+_STAGING_DIR = ".staging"
+_STAGING_VERSION = 1
+
+
+def _staging_manifest_path(workspace: Path, stage: str) -> Path:
+    return workspace / _STAGING_DIR / f"{stage}.json"
+
+
+def _staging_excluded(name: str) -> bool:
+    return name.startswith(".") or name == "__pycache__"
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_incremental(
+    source: Path,
+    dest: Path,
+    *,
+    manifest_path: Path,
+    transform: StagingTransform | None = None,
+    transform_version: str = "",
+) -> StagingReport:
+    """Make ``dest`` mirror ``source`` (optionally transformed) incrementally.
+
+    Manifest entry per source file (relative POSIX path)::
+
+        {"size": int, "mtime_ns": int, "sha256": str, "outputs": [rel, ...]}
+
+    A file is reused when size+mtime match (or, failing that, the sha256
+    matches), the transform version is unchanged and its outputs still
+    exist.  After the pass ``dest`` contains exactly the manifest outputs:
+    outputs of deleted sources and any untracked files (e.g. generated by
+    a later stage of the previous build) are removed, so later stages can
+    regenerate them deterministically.
+
+    Args:
+        source: Source directory (hidden entries and ``__pycache__`` skipped).
+        dest: Destination directory inside the workspace.
+        manifest_path: Where the manifest is persisted.
+        transform: Optional per-file transform; returning None copies the file.
+        transform_version: Changing this invalidates every transformed output.
+
+    Returns:
+        StagingReport with copied/transformed/unchanged/removed counts.
+    """
+    report = StagingReport()
+
+    prev: dict[str, dict] = {}
+    try:
+        data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if (
+            data.get("version") == _STAGING_VERSION
+            and data.get("transform_version") == transform_version
+            and dest.is_dir()
+        ):
+            prev = data.get("files", {})
+        else:
+            report.full = True
+    except (OSError, ValueError):
+        report.full = True
+
+    dest.mkdir(parents=True, exist_ok=True)
+    files: dict[str, dict] = {}
+
+    if source.is_dir():
+        for dirpath, dirnames, filenames in os.walk(source):
+            kept = []
+            for d in dirnames:
+                if _staging_excluded(d):
+                    report.skipped += 1
+                else:
+                    kept.append(d)
+            dirnames[:] = sorted(kept)
+
+            base = Path(dirpath)
+            for name in sorted(filenames):
+                if _staging_excluded(name):
+                    report.skipped += 1
+                    continue
+                src_file = base / name
+                rel = src_file.relative_to(source).as_posix()
+                try:
+                    st = src_file.stat()
+                except OSError:
+                    continue
+
+                old = prev.get(rel)
+                if old and all((dest / o).is_file() for o in old.get("outputs", [])):
+                    if old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+                        files[rel] = old
+                        report.unchanged += 1
+                        continue
+                    digest = _file_sha256(src_file)
+                    if old.get("sha256") == digest:
+                        files[rel] = {**old, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+                        report.unchanged += 1
+                        continue
+                else:
+                    digest = _file_sha256(src_file)
+
+                produced = transform(src_file, rel) if transform else None
+                if produced is None:
+                    out_rel = rel
+                    (dest / out_rel).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(src_file, dest / out_rel)
+                    report.copied += 1
+                else:
+                    out_rel, content = produced
+                    (dest / out_rel).parent.mkdir(parents=True, exist_ok=True)
+                    (dest / out_rel).write_bytes(content)
+                    report.transformed += 1
+
+                if old:
+                    for stale in old.get("outputs", []):
+                        if stale != out_rel:
+                            (dest / stale).unlink(missing_ok=True)
+                files[rel] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": digest,
+                    "outputs": [out_rel],
+                }
+
+    # Prune everything in dest that is not a current output
+    wanted = {o for entry in files.values() for o in entry["outputs"]}
+    for dirpath, dirnames, filenames in os.walk(dest, topdown=False):
+        base = Path(dirpath)
+        for name in filenames:
+            path = base / name
+            if path.relative_to(dest).as_posix() not in wanted:
+                path.unlink(missing_ok=True)
+                report.removed += 1
+        for d in dirnames:
+            sub = base / d
+            try:
+                if sub.is_symlink():
+                    sub.unlink()
+                elif not any(sub.iterdir()):
+                    sub.rmdir()
+            except OSError:
+                pass
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({
+        "version": _STAGING_VERSION,
+        "transform_version": transform_version,
+        "updated_at": time.time(),
+        "report": asdict(report),
+        "files": files,
+    }), encoding="utf-8")
+    return report
+
+
+def staging_detail(workspace: Path, stage: str, since: float) -> dict:
+    """Return the staging report written by ``stage`` after ``since``.
+
+    Used by pipeline runners to fill ``StageResult.detail``; empty when
+    the stage did not stage incrementally in this run.
+    """
+    try:
+        data = json.loads(_staging_manifest_path(workspace, stage).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("updated_at", 0) < since:
+        return {}
+    return dict(data.get("report", {}))
+
+
 # ── Pipeline Runner Utility ─────────────────────────────────────────
 
 
@@ -323,6 +565,7 @@ def run_pipeline(
     for si in stages_info:
         sr = StageResult(name=si.name, label=si.label, status="running")
         stage_start = time.monotonic()
+        stage_wall = time.time()
 
         try:
             for line in builder.run_stage(si.name, segment, workspace):
@@ -338,6 +581,7 @@ def run_pipeline(
             all_ok = False
 
         sr.duration_ms = int((time.monotonic() - stage_start) * 1000)
+        sr.detail = staging_detail(workspace, si.name, stage_wall)
         result.stages.append(sr)
 
         # Stop pipeline on first error
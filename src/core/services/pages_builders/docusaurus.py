@@ -2,8 +2,10 @@
 Docusaurus builder — React-based documentation framework.
 
 Pipeline stages:
-  1. source     — Copy source files, filter hidden dirs/files
-  2. transform  — MD → MDX (admonitions, frontmatter, link rewriting, rename)
+  1. source     — Stage source files (incremental: changed files only,
+                  MD → MDX applied while staging), filter hidden dirs/files
+  2. transform  — MD → MDX for files still in .md (generated landing page,
+                  smart folder docs; everything on a full re-stage)
   3. scaffold   — Generate config from templates + feature registry
   4. install    — npm install (cached — skips if package.json unchanged)
   5. build      — npx docusaurus build (with smart skip + Rspack recovery)
@@ -37,6 +39,7 @@ from .base import (
     PageBuilder,
     SegmentConfig,
     StageInfo,
+    _staging_manifest_path,
 )
 from .docusaurus_transforms import (
     convert_admonitions,
@@ -57,6 +60,39 @@ from .template_engine import (
 )
 
 
+def _transform_version(segment: SegmentConfig) -> str:
+    """Fingerprint of everything that affects a staged MD → MDX output.
+
+    Editing ``docusaurus_transforms.py`` or the segment's path/base_url
+    invalidates every previously transformed file.
+    """
+    h = hashlib.sha256()
+    h.update((Path(__file__).parent / "docusaurus_transforms.py").read_bytes())
+    h.update(segment.path.encode())
+    h.update(str(segment.config.get("base_url", "")).encode())
+    return h.hexdigest()[:16]
+
+
+def _has_smart_folders(source: Path) -> bool:
+    """True if a smart folder targets (or is) this segment's source folder."""
+    try:
+        from src.core.services.config_ops import read_config
+
+        project_root = source
+        for parent in [source, *source.parents]:
+            if (parent / "project.yml").is_file():
+                project_root = parent
+                break
+        cfg = read_config(project_root).get("config", {})
+        seg_source_rel = str(source.relative_to(project_root))
+        for smart in cfg.get("smart_folders", []):
+            if seg_source_rel in (smart.get("target", ""), smart.get("name", "")):
+                return True
+    except Exception:
+        pass
+    return False
+
+
 class DocusaurusBuilder(PageBuilder):
     """Build docs with Docusaurus v3 + MD → MDX transform pipeline."""
 
@@ -130,16 +166,54 @@ class DocusaurusBuilder(PageBuilder):
     # ── Stage 1: Source ──────────────────────────────────────────────
 
     def _stage_source(self, segment: SegmentConfig, workspace: Path) -> LogStream:
-        """Copy source files into workspace/docs/, excluding hidden dirs."""
+        """Copy source files into workspace/docs/, excluding hidden dirs.
+
+        Plain docs segments are staged incrementally: source ``.md`` files
+        are transformed straight to ``.mdx`` and only changed files are
+        rewritten (see ``PageBuilder.stage_source_incremental``).  Segments
+        fed by smart folders keep the full wipe-and-copy, because the
+        enrichment pass rewrites and renames staged files in place.
+        """
         source = Path(segment.source).resolve()
         docs_dir = workspace / "docs"
 
+        yield f"Source: {source}"
+
+        if source.is_dir() and not _has_smart_folders(source):
+            yield from self.stage_source_incremental(
+                segment, workspace, docs_dir,
+                transform=self._staging_transform(segment, docs_dir),
+                transform_version=_transform_version(segment),
+            )
+        else:
+            yield from self._stage_source_full(source, docs_dir)
+
+        yield from self._stage_source_extras(segment, workspace, source, docs_dir)
+
+    def _staging_transform(self, segment: SegmentConfig, docs_dir: Path):  # type: ignore[no-untyped-def]
+        """Per-file MD → MDX transform used by incremental staging."""
+        base_url = segment.config.get("base_url", "")
+
+        def _transform(src_file: Path, rel: str) -> tuple[str, bytes] | None:
+            if not rel.endswith(".md"):
+                return None
+            out_rel = rel[:-3] + ".mdx"
+            content = src_file.read_text(encoding="utf-8")
+            content = convert_admonitions(content)
+            content = enrich_frontmatter(content, docs_dir / rel)
+            content = rewrite_links(content, segment.path, base_url)
+            content = escape_jsx_angles(content)
+            return out_rel, content.encode("utf-8")
+
+        return _transform
+
+    def _stage_source_full(self, source: Path, docs_dir: Path) -> LogStream:
+        """Wipe docs/ and copy every source file (smart-folder segments)."""
         # Clean and recreate docs dir
         if docs_dir.exists():
             shutil.rmtree(docs_dir)
         docs_dir.mkdir(parents=True)
-
-        yield f"Source: {source}"
+        _staging_manifest_path(docs_dir.parent, "source").unlink(missing_ok=True)
 
         file_count = 0
         skip_count = 0
@@ -174,6 +248,14 @@ class DocusaurusBuilder(PageBuilder):
             docs_dir.mkdir(parents=True, exist_ok=True)
             yield f"Virtual source (standalone smart folder)"
 
+    def _stage_source_extras(
+        self,
+        segment: SegmentConfig,
+        workspace: Path,
+        source: Path,
+        docs_dir: Path,
+    ) -> LogStream:
+        """Generated landing page + smart folder staging (every build)."""
         # Ensure a root index page exists — Docusaurus needs it for the landing
         index_candidates = [
             docs_dir / "index.md",
@@ -181,12 +263,15 @@ class DocusaurusBuilder(PageBuilder):
             docs_dir / "intro.md",
             docs_dir / "intro.mdx",
             docs_dir / "README.md",
+            docs_dir / "README.mdx",
         ]
         if not any(c.exists() for c in index_candidates):
             title = segment.config.get("title", segment.name.title())
             # Build a simple index from top-level .md files
+            # (already .mdx when staged incrementally)
             links = []
-            for f in sorted(docs_dir.glob("*.md")):
+            top_docs = list(docs_dir.glob("*.md")) + list(docs_dir.glob("*.mdx"))
+            for f in sorted(top_docs, key=lambda p: p.stem):
                 name = f.stem
                 label = name.replace("_", " ").replace("-", " ").title()
                 links.append(f"- [{label}](./{name}.md)")
@@ -2,7 +2,8 @@
 Raw builder — copies static files into the build output.
 
 Pipeline stages:
-  1. source  — Copy files from source dir (excluding hidden dirs, __pycache__)
+  1. source  — Sync files from source dir (excluding hidden dirs, __pycache__),
+               copying only what changed since the last build
   2. build   — (no-op for raw; the copy IS the build)
 
 This is the simplest builder and the only one guaranteed to work
@@ -12,7 +13,6 @@ to the output directory.
 
 from __future__ import annotations
 
-import shutil
 import subprocess
 from pathlib import Path
 
@@ -62,47 +62,19 @@ class RawBuilder(PageBuilder):
     # ── Stage implementations ───────────────────────────────────────
 
     def _stage_source(self, segment: SegmentConfig, workspace: Path) -> LogStream:
-        """Copy source files to workspace/build/, excluding hidden dirs."""
+        """Sync source files to workspace/build/, excluding hidden dirs.
+
+        Incremental: only new/changed files are copied and files whose
+        source was deleted are removed (``segment.config["clean"]`` forces
+        a full copy).
+        """
         source = Path(segment.source).resolve()
         output = workspace / "build"
 
-        if output.exists():
-            shutil.rmtree(output)
-        output.mkdir(parents=True, exist_ok=True)
-
         yield f"Source: {source}"
         yield f"Output: {output}"
 
-        # Use rsync to exclude hidden dirs; fall back to cp
-        if shutil.which("rsync"):
-            cmd = [
-                "rsync", "-rv",
-                "--exclude", ".*",
-                "--exclude", "__pycache__",
-                str(source) + "/", str(output) + "/",
-            ]
-        else:
-            cmd = ["cp", "-rv", str(source) + "/.", str(output)]
-
-        yield f"▶ {' '.join(cmd)}"
-
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-        if proc.stdout:
-            for line in proc.stdout:
-                yield line.rstrip()
-        proc.wait()
-
-        if proc.returncode != 0:
-            raise RuntimeError(f"Copy failed (exit code {proc.returncode})")
-
-        # Count output files
-        file_count = sum(1 for _ in output.rglob("*") if _.is_file())
-        yield f"Copied {file_count} files"
+        yield from self.stage_source_incremental(segment, workspace, output)
 
     # ── Output dir ──────────────────────────────────────────────────
 
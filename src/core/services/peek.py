@@ -24,10 +24,14 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from src.core.services.name_matcher import NameMatcher
+
 log = logging.getLogger(__name__)
 
 # ── Known extensions (mirrors crypto.py sets) ────────────────────────
@@ -863,6 +867,44 @@ def build_symbol_index(
 # for any occurrence of those known names. This catches everything
 # the regex misses — because the index IS the truth.
 
+_index_names_lock = threading.Lock()
+# (id(index), index.name_generation, matcher, kinds) — kinds[i] is "T2"/"T6"
+_index_names_cache: tuple[int, int, NameMatcher, list[str]] | None = None
+
+
+def _index_name_matcher(idx: Any) -> tuple[NameMatcher, list[str]]:
+    """Aho-Corasick matcher over the index's searchable names.
+
+    Names are the trailing-``/`` directory keys of ``dir_map`` followed
+    by the known-extension filenames of ``file_map`` (dict order, so
+    hits come out in the order the old per-name loop produced them).
+    Compiled once per ``ProjectIndex.name_generation`` — a rebuild with
+    the same file/dir names reuses it.
+    """
+    global _index_names_cache
+
+    key = (id(idx), idx.name_generation)
+    cached = _index_names_cache
+    if cached is not None and cached[:2] == key:
+        return cached[2], cached[3]
+
+    with _index_names_lock:
+        cached = _index_names_cache
+        if cached is not None and cached[:2] == key:
+            return cached[2], cached[3]
+        t0 = time.perf_counter()
+        dir_names = [d for d in idx.dir_map if d.endswith("/")]
+        file_names = [f for f in idx.file_map if _has_known_ext(f)]
+        matcher = NameMatcher([*dir_names, *file_names])
+        kinds = ["T2"] * len(dir_names) + ["T6"] * len(file_names)
+        _index_names_cache = (*key, matcher, kinds)
+        log.debug(
+            "[Peek] Name matcher: %d names compiled in %.0fms",
+            len(matcher), (time.perf_counter() - t0) * 1000,
+        )
+        return matcher, kinds
+
+
 def _index_driven_scan(
     content: str,
     doc_path: str,
@@ -873,7 +915,8 @@ def _index_driven_scan(
 
     This is a second-pass scanner that finds references the regex
     scanner missed. It uses the ProjectIndex's file_map and dir_map
-    to know what exists, then searches the content for those names.
+    to know what exists, then searches the content for those names
+    in a single pass (``_index_name_matcher``).
 
     Args:
         content: Raw markdown text.
@@ -897,82 +940,37 @@ def _index_driven_scan(
     if doc_dir == ".":
         doc_dir = ""
 
+    matcher, kinds = _index_name_matcher(idx)
+
     extra: list[PeekCandidate] = []
     seen: set[str] = set(already_found)
 
-    # ── Directory references: search for "name/" ──
-    # Only check directory names that actually exist as children
-    # of the document's directory (or project root).
-    for dir_name, dir_paths in idx.dir_map.items():
-        # dir_map stores with and without trailing /; only use the
-        # trailing-/ variant to avoid double-processing.
-        if not dir_name.endswith("/"):
-            continue
-
-        search_text = dir_name  # e.g. "k8s/"
-
-        if search_text in seen:
-            continue
-
-        # Match if this directory exists anywhere within the doc's subtree
-        # (the resolver handles proximity-based disambiguation)
-        has_local = False
-        for dp in dir_paths:
-            if doc_dir and dp.startswith(doc_dir + "/"):
-                has_local = True
-                break
-            elif not doc_dir:
-                has_local = True
-                break
-
-        if not has_local:
+    for i in matcher.find(content):
+        name = matcher.names[i]
+        if name in seen:
             continue
 
-        # Search for this directory name in the content
-        if search_text in content:
-            seen.add(search_text)
-            extra.append(PeekCandidate(
-                text=search_text,
-                type="T2",
-                candidate_path=search_text,
-                line_number=None,
-                in_code_fence=False,
-            ))
-
-    # ── File references: search for known filenames ──
-    # Only check files in the same directory as the document.
-    for filename, file_paths in idx.file_map.items():
-        if filename in seen:
-            continue
-
-        # Must have a known extension
-        if not _has_known_ext(filename):
-            continue
-
-        # Must exist in the same directory subtree
-        has_local = False
-        for fp in file_paths:
-            if doc_dir and fp.startswith(doc_dir):
-                has_local = True
-                break
-            elif not doc_dir:
-                has_local = True
-                break
-
-        if not has_local:
+        # Match if this name exists anywhere within the doc's subtree
+        # (the resolver handles proximity-based disambiguation).
+        # Directory references: "name/" under a child of doc_dir.
+        # File references: any path under doc_dir.
+        if kinds[i] == "T2":
+            prefix = doc_dir + "/" if doc_dir else ""
+            paths = idx.dir_map.get(name, ())
+        else:
+            prefix = doc_dir
+            paths = idx.file_map.get(name, ())
+        if not any(p.startswith(prefix) for p in paths):
             continue
 
-        # Search in content — check for word-boundary-ish match
-        # (preceded by space, backtick, pipe, bracket, or start of line)
-        if filename in content:
-            seen.add(filename)
-            extra.append(PeekCandidate(
-                text=filename,
-                type="T6",
-                candidate_path=filename,
-                line_number=None,
-                in_code_fence=False,
-            ))
+        seen.add(name)
+        extra.append(PeekCandidate(
+            text=name,
+            type=kinds[i],
+            candidate_path=name,
+            line_number=None,
+            in_code_fence=False,
+        ))
 
     return extra
 
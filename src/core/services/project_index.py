@@ -105,6 +105,7 @@ class ProjectIndex:
     last_built: float = 0.0        # Timestamp of last completed build
     build_time_ms: int = 0         # Duration of the last build
     mtime_sig: float = 0.0         # Max mtime at build time
+    name_generation: int = 0       # Bumped when the set of file/dir names changes
 
     # Counts for observability
     file_count: int = 0
@@ -320,8 +321,13 @@ def _build_file_index(project_root: Path, index: ProjectIndex) -> None:
 
     elapsed_ms = int((time.perf_counter() - t0) * 1000)
 
+    names_changed = (file_map.keys() != index.file_map.keys()
+                     or dir_map.keys() != index.dir_map.keys())
     index.file_map = file_map
     index.dir_map = dir_map
+    if names_changed:
+        # after the maps: a matcher built for the new generation must see new names
+        index.name_generation += 1
     index.all_paths = all_paths
     index.file_count = file_count
     index.dir_count = dir_count
@@ -472,6 +478,7 @@ def _build_loop(project_root: Path) -> None:
         # Use the disk cache immediately
         idx.file_map = disk_idx.file_map
         idx.dir_map = disk_idx.dir_map
+        idx.name_generation += 1               # after the maps (see _build_file_index)
         idx.all_paths = disk_idx.all_paths
         idx.symbol_map = disk_idx.symbol_map
         idx.peek_cache = disk_idx.peek_cache
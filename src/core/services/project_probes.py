@@ -22,15 +22,10 @@ logger = logging.getLogger(__name__)
 
 
 def has_cmd(cmd: str) -> bool:
-    """Check if a command is available on PATH."""
-    try:
-        result = subprocess.run(
-            ["which", cmd],
-            capture_output=True, timeout=3,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+    """Check if a command is available on PATH (shared tool inventory)."""
+    from src.core.services.tool_inventory import which
+
+    return which(cmd) is not None
 
 
 def count_glob(root: Path, pattern: str) -> int:
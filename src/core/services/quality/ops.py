@@ -12,15 +12,25 @@ from __future__ import annotations
 
 import json
 import logging
-import shutil
-import subprocess
 from pathlib import Path
 
+from src.core.services import tool_inventory
+
 logger = logging.getLogger(__name__)
 
 
 # ── Quality tool definitions ────────────────────────────────────
+#
+# Optional keys:
+#   exclusive        the tool parallelises itself — run it alone
+#   file_args        argv for checking explicit files (files appended);
+#                    enables the per-file findings cache (pipeline.py)
+#   suffixes         files a file_args run applies to
+#   finding_pattern  regex with a ``path`` group: output line → file
+
 
+# "path:line:col: message" — ruff concise, eslint unix (0:0 = file-level notes, skipped)
+_LINE_COL_FINDING = r"^(?P<path>[^\s:][^:]*):(?!0:0:)\d+:\d+: "
 
 _QUALITY_TOOLS: dict[str, dict] = {
     # Python
@@ -31,6 +41,9 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "cli": "ruff",
         "run_args": ["ruff", "check", "."],
         "fix_args": ["ruff", "check", "--fix", "."],
+        "file_args": ["ruff", "check", "--output-format=concise", "--force-exclude"],
+        "suffixes": [".py", ".pyi"],
+        "finding_pattern": _LINE_COL_FINDING,
         "config_files": ["ruff.toml", ".ruff.toml", "pyproject.toml"],
         "install_hint": "pip install ruff",
     },
@@ -49,6 +62,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["python"],
         "cli": "pytest",
         "run_args": ["pytest", "--tb=short", "-q"],
+        "exclusive": True,
         "config_files": ["pytest.ini", "pyproject.toml", "setup.cfg", "conftest.py"],
         "install_hint": "pip install pytest",
     },
@@ -59,6 +73,9 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "cli": "black",
         "run_args": ["black", "--check", "."],
         "fix_args": ["black", "."],
+        "file_args": ["black", "--check", "--force-exclude"],
+        "suffixes": [".py", ".pyi"],
+        "finding_pattern": r"^would reformat (?P<path>.+)$",
         "config_files": ["pyproject.toml"],
         "install_hint": "pip install black",
     },
@@ -69,6 +86,9 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "cli": "ruff",
         "run_args": ["ruff", "format", "--check", "."],
         "fix_args": ["ruff", "format", "."],
+        "file_args": ["ruff", "format", "--check", "--force-exclude"],
+        "suffixes": [".py", ".pyi"],
+        "finding_pattern": r"^Would reformat: (?P<path>.+)$",
         "config_files": ["ruff.toml", ".ruff.toml", "pyproject.toml"],
         "install_hint": "pip install ruff",
     },
@@ -80,6 +100,9 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "cli": "eslint",
         "run_args": ["npx", "eslint", "."],
         "fix_args": ["npx", "eslint", "--fix", "."],
+        "file_args": ["npx", "eslint", "--format", "unix", "--no-warn-ignored"],
+        "suffixes": [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"],
+        "finding_pattern": _LINE_COL_FINDING,
         "config_files": [
             ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json",
             ".eslintrc.yml", ".eslintrc.yaml", "eslint.config.js",
@@ -94,6 +117,10 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "cli": "prettier",
         "run_args": ["npx", "prettier", "--check", "."],
         "fix_args": ["npx", "prettier", "--write", "."],
+        "file_args": ["npx", "prettier", "--check", "--ignore-unknown"],
+        "suffixes": [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".json", ".css",
+                     ".scss", ".md", ".yaml", ".yml", ".html", ".vue"],
+        "finding_pattern": r"^\[warn\] (?P<path>.+)$",
         "config_files": [
             ".prettierrc", ".prettierrc.json", ".prettierrc.yml",
             ".prettierrc.js", "prettier.config.js",
@@ -115,6 +142,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["node", "typescript"],
         "cli": "jest",
         "run_args": ["npx", "jest", "--passWithNoTests"],
+        "exclusive": True,
         "config_files": ["jest.config.js", "jest.config.ts", "jest.config.json"],
         "install_hint": "npm install -D jest",
     },
@@ -124,6 +152,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["node", "typescript"],
         "cli": "vitest",
         "run_args": ["npx", "vitest", "run"],
+        "exclusive": True,
         "config_files": ["vitest.config.ts", "vitest.config.js", "vite.config.ts"],
         "install_hint": "npm install -D vitest",
     },
@@ -134,6 +163,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["go"],
         "cli": "go",
         "run_args": ["go", "vet", "./..."],
+        "exclusive": True,
         "config_files": [],
     },
     "golangci-lint": {
@@ -142,6 +172,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["go"],
         "cli": "golangci-lint",
         "run_args": ["golangci-lint", "run"],
+        "exclusive": True,
         "config_files": [".golangci.yml", ".golangci.yaml", ".golangci.toml"],
     },
     "go-test": {
@@ -150,6 +181,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["go"],
         "cli": "go",
         "run_args": ["go", "test", "-race", "-count=1", "./..."],
+        "exclusive": True,
         "config_files": [],
     },
     # Rust
@@ -159,6 +191,7 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["rust"],
         "cli": "cargo",
         "run_args": ["cargo", "clippy", "--", "-D", "warnings"],
+        "exclusive": True,
         "config_files": [],
     },
     "rustfmt": {
@@ -176,26 +209,12 @@ _QUALITY_TOOLS: dict[str, dict] = {
         "stacks": ["rust"],
         "cli": "cargo",
         "run_args": ["cargo", "test"],
+        "exclusive": True,
         "config_files": [],
     },
 }
 
 
-def _run(
-    args: list[str],
-    cwd: Path,
-    timeout: int = 120,
-) -> subprocess.CompletedProcess[str]:
-    """Run a command and return the result."""
-    return subprocess.run(
-        args,
-        cwd=str(cwd),
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-    )
-
-
 def _tool_matches_stack(tool: dict, stack_name: str) -> bool:
     """Check if a tool is relevant for a given stack."""
     for s in tool.get("stacks", []):
@@ -224,9 +243,10 @@ def quality_status(project_root: Path, *, stack_names: list[str] | None = None)
     """
     tools: list[dict] = []
     categories: dict[str, int] = {"lint": 0, "typecheck": 0, "test": 0, "format": 0}
+    found = tool_inventory.which_many(spec["cli"] for spec in _QUALITY_TOOLS.values())
 
     for tool_id, spec in _QUALITY_TOOLS.items():
-        cli_available = shutil.which(spec["cli"]) is not None
+        cli_available = found[spec["cli"]] is not None
 
         # Check config files
         config_found = False
@@ -287,24 +307,33 @@ def quality_run(
     tool: str | None = None,
     category: str | None = None,
     fix: bool = False,
+    jobs: int | None = None,
+    cache: bool = True,
 ) -> dict:
     """Run quality checks.
 
+    Tools run concurrently within a CPU budget; tools that take file
+    arguments only check files whose findings are not cached for their
+    current content (see ``pipeline.py``).
+
     Args:
         tool: Specific tool to run (e.g. 'ruff', 'mypy').
         category: Run all tools in a category ('lint', 'typecheck', 'test', 'format').
-        fix: If True, run auto-fix where supported.
+        fix: If True, run auto-fix where supported (whole tree, uncached).
+        jobs: CPU budget in concurrent processes (default: CPU count).
+        cache: Use the per-file findings cache.
 
     Returns:
         {
             "results": [{
                 tool, name, category, passed, exit_code,
-                stdout, stderr, fixable
+                stdout, stderr, fixable, duration_ms,
+                files: {total, checked, cached}   # file-capable tools
             }, ...],
             "all_passed": bool,
         }
     """
-    results: list[dict] = []
+    from .pipeline import run_tools
 
     tools_to_run: list[tuple[str, dict]] = []
 
@@ -323,43 +352,13 @@ def quality_run(
         for tid, spec in _QUALITY_TOOLS.items():
             tools_to_run.append((tid, spec))
 
-    for tool_id, spec in tools_to_run:
-        if not shutil.which(spec["cli"]):
-            continue
+    found = tool_inventory.which_many(spec["cli"] for _, spec in tools_to_run)
+    tools_to_run = [(tid, spec) for tid, spec in tools_to_run if found[spec["cli"]]]
 
-        if fix and spec.get("fix_args"):
-            args = spec["fix_args"]
-        else:
-            args = spec["run_args"]
-
-        try:
-            r = _run(args, cwd=project_root, timeout=120)
-            passed = r.returncode == 0
-            has_fix = "fix_args" in spec
-
-            results.append({
-                "tool": tool_id,
-                "name": spec["name"],
-                "category": spec["category"],
-                "passed": passed,
-                "exit_code": r.returncode,
-                "stdout": r.stdout.strip()[:3000],
-                "stderr": r.stderr.strip()[:1000],
-                "fixable": has_fix and not passed and not fix,
-            })
-        except subprocess.TimeoutExpired:
-            results.append({
-                "tool": tool_id,
-                "name": spec["name"],
-                "category": spec["category"],
-                "passed": False,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": "Timed out",
-                "fixable": False,
-            })
-        except FileNotFoundError:
-            continue
+    try:
+        results = run_tools(project_root, tools_to_run, fix=fix, jobs=jobs, use_cache=cache)
+    except FileNotFoundError as e:
+        return {"error": f"Tool not found: {e.filename}"}
 
     return {
         "results": results,
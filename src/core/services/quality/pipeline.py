@@ -0,0 +1,372 @@
+"""
+Quality pipeline — concurrent tool runs with a per-file findings cache.
+
+``quality_run`` used to run every tool serially over the whole tree.
+Here the selected tools run as jobs on a thread pool under a CPU
+budget (default: one slot per core):
+
+    - tools that parallelise themselves (test runners, cargo, go,
+      golangci-lint) and every ``--fix`` run take the whole budget, so
+      they never overlap with anything else (fixers rewrite files)
+    - other whole-tree tools take one slot
+    - tools that accept file arguments (``file_args`` in the registry)
+      are split into batches of files, one slot per batch
+
+For file-capable tools the findings (output lines attributed to a file
+by the tool's ``finding_pattern``) are cached per file in
+``.state/quality_cache.json``, keyed by the file's content hash and the
+tool key (binary version + hash of its config files + arguments).  A
+run checks only the files whose key is not cached — those changed since
+they were last checked — and reports the rest from the cache, so a
+repeated run on an unchanged tree starts no process at all.
+
+A batch that fails without any attributable finding (crash, bad config)
+is reported as a failure and not cached.
+
+Cache file::
+
+    {
+        "version": 1,
+        "hashes": {path: [mtime_ns, size, digest]},
+        "versions": {binary_key: version},
+        "tools": {tool_id: {"key": str, "files": {path: [digest, [line, ...]]}}},
+    }
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.core.services import tool_inventory
+from src.core.services.store_helpers import run_git, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+_CACHE_FILE = ".state/quality_cache.json"
+_VERSION = 1
+
+_TIMEOUT = 120                   # per job, seconds (as before: per tool)
+_BATCH_SIZE = 200                # files per file-capable tool invocation
+_STDOUT_LIMIT = 3000
+_STDERR_LIMIT = 1000
+
+_SKIP_DIRS = frozenset({
+    ".git", ".venv", "venv", "node_modules", "__pycache__", ".mypy_cache",
+    ".ruff_cache", ".pytest_cache", ".tox", "dist", "build", ".eggs",
+    ".state", "target",
+})
+
+_lock = threading.Lock()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  CPU budget
+# ═══════════════════════════════════════════════════════════════════
+
+
+class _CpuBudget:
+    """Weighted semaphore: a job holds ``weight`` of ``total`` slots."""
+
+    def __init__(self, total: int):
+        self.total = max(1, total)
+        self._free = self.total
+        self._cond = threading.Condition()
+
+    def acquire(self, weight: int) -> int:
+        weight = max(1, min(weight, self.total))
+        with self._cond:
+            self._cond.wait_for(lambda: self._free >= weight)
+            self._free -= weight
+        return weight
+
+    def release(self, weight: int) -> None:
+        with self._cond:
+            self._free += weight
+            self._cond.notify_all()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Cache
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _load_cache(project_root: Path) -> dict:
+    path = project_root / _CACHE_FILE
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        data = None
+    except (json.JSONDecodeError, OSError) as e:
+        logger.debug("Cannot load quality cache: %s", e)
+        data = None
+    if not isinstance(data, dict) or data.get("version") != _VERSION:
+        return {"version": _VERSION, "hashes": {}, "versions": {}, "tools": {}}
+    return data
+
+
+def _save_cache(project_root: Path, data: dict) -> None:
+    write_json_atomic(project_root / _CACHE_FILE, data, what="quality cache")
+
+
+def _project_files(project_root: Path) -> list[str]:
+    """Tracked + untracked-but-not-ignored files (a directory walk outside git)."""
+    r = run_git(project_root, "ls-files", "-co", "--exclude-standard", "-z", timeout=60)
+    if r.returncode == 0:
+        return sorted({p for p in r.stdout.split("\0") if p})
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+        rel_dir = os.path.relpath(dirpath, project_root).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        files.extend(prefix + name for name in filenames)
+    return sorted(files)
+
+
+def _digests(project_root: Path, paths: list[str], hashes: dict) -> dict[str, str]:
+    """Content digest per existing path; re-hashes only files whose
+    (mtime, size) moved since the cached entry.
+    """
+    result: dict[str, str] = {}
+    for rel in paths:
+        full = project_root / rel
+        try:
+            st = full.stat()
+        except OSError:
+            hashes.pop(rel, None)
+            continue
+        cached = hashes.get(rel)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            result[rel] = cached[2]
+            continue
+        try:
+            digest = hashlib.blake2b(full.read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            continue
+        hashes[rel] = [st.st_mtime_ns, st.st_size, digest]
+        result[rel] = digest
+    return result
+
+
+def _tool_key(project_root: Path, spec: dict, versions: dict) -> str:
+    """Binary version + config files + arguments: anything that can
+    change a tool's findings for an unchanged file.
+    """
+    path = tool_inventory.which(spec["cli"]) or spec["cli"]
+    ident = tool_inventory.binary_key(path)
+    ident_key = "|".join(map(str, ident)) if ident else path
+    version = versions.get(ident_key)
+    if version is None:
+        probe = tool_inventory.probe([spec["cli"], "--version"])
+        version = (probe.stdout + probe.stderr).strip() if probe else ""
+        versions[ident_key] = version
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(version.encode())
+    h.update("\0".join(spec["file_args"]).encode())
+    for cf in spec.get("config_files", []):
+        with contextlib.suppress(OSError):
+            h.update(cf.encode() + b"\0" + (project_root / cf).read_bytes())
+    return h.hexdigest()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Jobs
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _run_job(
+    project_root: Path,
+    args: list[str],
+    budget: _CpuBudget,
+    weight: int,
+) -> tuple[int | None, str, str, float]:
+    """(exit code | None on timeout, stdout, stderr, seconds)."""
+    held = budget.acquire(weight)
+    t0 = time.monotonic()
+    try:
+        r = subprocess.run(
+            args, cwd=str(project_root),
+            capture_output=True, text=True, timeout=_TIMEOUT,
+        )
+        return r.returncode, r.stdout, r.stderr, time.monotonic() - t0
+    except subprocess.TimeoutExpired:
+        return None, "", "Timed out", time.monotonic() - t0
+    finally:
+        budget.release(held)
+
+
+def _attribute(
+    project_root: Path,
+    spec: dict,
+    output: str,
+    batch: set[str],
+) -> dict[str, list[str]]:
+    """Output lines per file of ``batch``, via the tool's ``finding_pattern``."""
+    pattern = re.compile(spec["finding_pattern"])
+    root = str(project_root.resolve())
+    findings: dict[str, list[str]] = {}
+    for line in output.splitlines():
+        match = pattern.match(line)
+        if not match:
+            continue
+        path = match.group("path").strip()
+        if os.path.isabs(path):
+            path = os.path.relpath(path, root)
+        path = path.replace(os.sep, "/").removeprefix("./")
+        if path in batch:
+            findings.setdefault(path, []).append(line)
+    return findings
+
+
+def _result(tool_id: str, spec: dict, **fields) -> dict:
+    return {"tool": tool_id, "name": spec["name"], "category": spec["category"], **fields}
+
+
+def run_tools(
+    project_root: Path,
+    tools: list[tuple[str, dict]],
+    *,
+    fix: bool = False,
+    jobs: int | None = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """Run ``tools`` (``(id, spec)`` pairs, all installed) concurrently.
+
+    Returns one ``quality_run`` result per tool, in the given order,
+    with ``duration_ms`` and — for cached file-capable runs —
+    ``files: {"total", "checked", "cached"}``.
+    """
+    budget = _CpuBudget(jobs or os.cpu_count() or 1)
+    cached_run = use_cache and not fix
+
+    cache = _load_cache(project_root) if cached_run else None
+    all_files: list[str] | None = None
+    digests: dict[str, str] = {}
+
+    plans: list[dict] = []
+    for tool_id, spec in tools:
+        plan: dict = {"id": tool_id, "spec": spec, "futures": []}
+        plans.append(plan)
+        if cached_run and spec.get("file_args"):
+            if all_files is None:
+                all_files = _project_files(project_root)
+                digests = _digests(project_root, all_files, cache["hashes"])
+            suffixes = tuple(spec["suffixes"])
+            files = [f for f in all_files if f.endswith(suffixes) and f in digests]
+            key = _tool_key(project_root, spec, cache["versions"])
+            entry = cache["tools"].get(tool_id)
+            if entry is None or entry.get("key") != key:
+                entry = cache["tools"][tool_id] = {"key": key, "files": {}}
+            known = entry["files"]
+            stale = [f for f in files if (known.get(f) or [None])[0] != digests[f]]
+            plan.update(entry=entry, files=files, stale=stale)
+            plan["batches"] = [stale[i:i + _BATCH_SIZE] for i in range(0, len(stale), _BATCH_SIZE)]
+        else:
+            plan["args"] = spec["fix_args"] if fix and spec.get("fix_args") else spec["run_args"]
+
+    t0 = time.monotonic()
+    workers = sum(len(p.get("batches", [None])) for p in plans) or 1
+    with ThreadPoolExecutor(max_workers=min(workers, budget.total * 2)) as pool:
+        for plan in plans:
+            spec = plan["spec"]
+            if "batches" in plan:
+                for batch in plan["batches"]:
+                    plan["futures"].append(pool.submit(
+                        _run_job, project_root, spec["file_args"] + batch, budget, 1))
+            else:
+                weight = budget.total if fix or spec.get("exclusive") else 1
+                plan["futures"].append(pool.submit(
+                    _run_job, project_root, plan["args"], budget, weight))
+
+        results: list[dict] = []
+        for plan in plans:
+            outcomes = [f.result() for f in plan["futures"]]
+            if "batches" in plan:
+                results.append(_merge_file_run(project_root, plan, outcomes, cache))
+            else:
+                results.append(_whole_tree_result(plan, outcomes[0], fix))
+
+    if cache is not None:
+        with _lock:
+            _save_cache(project_root, cache)
+    logger.debug("quality run: %d tools in %.2fs", len(tools), time.monotonic() - t0)
+    return results
+
+
+def _whole_tree_result(plan: dict, outcome: tuple, fix: bool) -> dict:
+    spec = plan["spec"]
+    code, stdout, stderr, seconds = outcome
+    passed = code == 0
+    return _result(
+        plan["id"], spec,
+        passed=passed,
+        exit_code=-1 if code is None else code,
+        stdout=stdout.strip()[:_STDOUT_LIMIT],
+        stderr=stderr.strip()[:_STDERR_LIMIT],
+        fixable="fix_args" in spec and not passed and not fix,
+        duration_ms=int(seconds * 1000),
+    )
+
+
+def _merge_file_run(project_root: Path, plan: dict, outcomes: list[tuple], cache: dict) -> dict:
+    """Fold batch outcomes into the cache and report over all files."""
+    spec = plan["spec"]
+    known = plan["entry"]["files"]
+    errors: list[str] = []
+    failed: set[str] = set()
+    exit_code = 0
+    seconds = 0.0
+
+    for batch, (code, stdout, stderr, took) in zip(plan["batches"], outcomes, strict=True):
+        seconds = max(seconds, took)
+        if code is None:
+            errors.append("Timed out")
+            failed.update(batch)
+            exit_code = -1
+            continue
+        findings = _attribute(project_root, spec, stdout + "\n" + stderr, set(batch))
+        if code != 0 and not findings:
+            # The tool failed but blamed no file — do not cache the batch
+            errors.append(stderr.strip() or stdout.strip() or f"exit code {code}")
+            failed.update(batch)
+            exit_code = code
+            continue
+        hashes = cache["hashes"]
+        for f in batch:
+            known[f] = [hashes[f][2], findings.get(f, [])]
+
+    current = set(plan["files"])
+    for f in [f for f in known if f not in current]:
+        del known[f]
+
+    reported = [f for f in plan["files"] if f not in failed and f in known]
+    lines = [line for f in reported for line in known[f][1]]
+    dirty = sum(1 for f in reported if known[f][1])
+    passed = not errors and not lines
+    if exit_code == 0 and lines:
+        exit_code = 1
+    summary = f"{dirty} file(s) with findings" if dirty else ""
+    return _result(
+        plan["id"], spec,
+        passed=passed,
+        exit_code=exit_code,
+        stdout="\n".join(lines + ([summary] if summary else [])).strip()[:_STDOUT_LIMIT],
+        stderr="\n".join(errors).strip()[:_STDERR_LIMIT],
+        fixable="fix_args" in spec and not passed,
+        duration_ms=int(seconds * 1000),
+        files={
+            "total": len(plan["files"]),
+            "checked": len(plan["stale"]),
+            "cached": len(plan["files"]) - len(plan["stale"]),
+        },
+    )
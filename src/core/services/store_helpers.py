@@ -0,0 +1,94 @@
+"""
+Shared helpers for the persistent ``.state/`` stores.
+
+The incremental stores (git history, churn, import graph, test impact,
+quality cache, score store, refs index, ledger commit queue) all need
+the same three pieces; they live here instead of in a copy per module:
+
+    write_json_atomic(path, data, what=...)   — temp file + rename, never raises
+    run_git(cwd, *args, timeout=...)          — ``git`` that never raises
+    per_project(registry, lock, root, factory)
+                                              — one instance per project root
+
+Usage::
+
+    from src.core.services.store_helpers import per_project, write_json_atomic
+
+    _engines: dict[str, Engine] = {}
+    _engines_lock = threading.Lock()
+
+    def get_engine(project_root: Path) -> Engine:
+        return per_project(_engines, _engines_lock, project_root, Engine)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def write_json_atomic(path: Path, data: Any, *, what: str) -> bool:
+    """Write ``data`` as compact JSON to ``path`` via a temp file + rename.
+
+    Readers see the old file or the new one, never a partial write.
+    Failures are logged as ``Cannot save <what>`` and reported as False.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".tmp")
+        tmp = Path(tmp_path)
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+            tmp.replace(path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+    except Exception as e:
+        logger.warning("Cannot save %s: %s", what, e)
+        return False
+    return True
+
+
+def run_git(cwd: Path, *args: str, timeout: int = 10) -> subprocess.CompletedProcess:
+    """Run ``git *args`` in ``cwd``; a missing binary or timeout is returncode 1."""
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=str(cwd),
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        return subprocess.CompletedProcess(
+            args=["git", *args], returncode=1, stdout="", stderr=str(e),
+        )
+
+
+def per_project(
+    registry: dict[str, T],
+    lock: threading.Lock,
+    project_root: Path,
+    factory: Callable[[Path], T],
+) -> T:
+    """The ``registry`` entry for ``project_root``, created on first use.
+
+    Keyed by the resolved root so ``.`` and its absolute path share one
+    instance; ``factory`` runs at most once per root.
+    """
+    key = str(Path(project_root).resolve())
+    item = registry.get(key)
+    if item is None:
+        with lock:
+            item = registry.get(key)
+            if item is None:
+                item = registry[key] = factory(Path(project_root))
+    return item
@@ -2,6 +2,6 @@
 from __future__ import annotations
 from .ops import (  # noqa: F401
     testing_status,
-    test_inventory, test_coverage, run_tests,
+    test_inventory, test_coverage, run_tests, run_tests_stream,
     generate_test_template, generate_coverage_config,
 )
@@ -0,0 +1,535 @@
+"""
+Test impact selection + duration-balanced sharded runs.
+
+``run_tests`` is one pytest process with a 120 s timeout: big suites
+time out, and every run re-executes tests the change cannot affect.
+This mode:
+
+    1. selects the test files impacted by the working-tree diff
+       (``git diff HEAD`` + untracked files):
+         - changed test files themselves
+         - tests that import a changed file (audit import graph,
+           transitive; deleted files are looked up before the graph
+           drops them, and everything runs if it never knew them)
+         - tests whose recorded coverage touched a changed file
+         - everything, when a conftest / pytest config / requirements
+           file changed
+    2. splits the selection into N shards by historical duration
+       (longest file first onto the lightest shard)
+    3. runs the shards as parallel pytest processes, each with a
+       timeout scaled to its expected duration, and yields one event
+       per shard as it finishes
+    4. records per-test durations (``--durations=0``), the per-test
+       runner overhead those leave out (shard wall time minus the sum
+       of its test durations, spread over its tests) and, with
+       ``record_coverage`` and pytest-cov installed, the per-test-file
+       coverage map (``--cov-context=test``)
+
+History lives in ``.state/test_impact.json``::
+
+    {
+        "version": 1,
+        "durations": {nodeid: seconds},    # setup + call + teardown
+        "overhead": float,                 # seconds per test outside those
+        "coverage": {test_file: [source files]},
+    }
+"""
+
+from __future__ import annotations
+
+import heapq
+import importlib.util
+import json
+import logging
+import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from src.core.services.store_helpers import run_git, write_json_atomic
+
+from .ops import _FRAMEWORK_MARKERS, _SKIP_DIRS
+
+logger = logging.getLogger(__name__)
+
+_STORE_FILE = ".state/test_impact.json"
+_VERSION = 1
+
+DEFAULT_TIMEOUT = 120            # floor for one shard, seconds
+_TIMEOUT_FACTOR = 3              # shard timeout = factor × expected duration
+_DEFAULT_FILE_SECONDS = 1.0      # weight of a test file with no history
+
+# A change to any of these can affect every test
+_GLOBAL_FILES = frozenset({
+    "conftest.py", "pyproject.toml", "setup.cfg", "setup.py", "pytest.ini",
+    "tox.ini", "requirements.txt", "requirements-dev.txt",
+})
+
+# "0.12s call     tests/test_x.py::TestA::test_b"
+_DURATION_LINE = re.compile(r"^\s*([\d.]+)s\s+(setup|call|teardown)\s+(\S+)")
+_DURATIONS_HEADER = re.compile(r"^=+ slowest durations =+$")
+
+_lock = threading.Lock()
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  History store
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _load(project_root: Path) -> dict:
+    path = project_root / _STORE_FILE
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        data = None
+    except (json.JSONDecodeError, OSError) as e:
+        logger.debug("Cannot load test impact store: %s", e)
+        data = None
+    if not isinstance(data, dict) or data.get("version") != _VERSION:
+        return {"version": _VERSION, "durations": {}, "overhead": 0.0, "coverage": {}}
+    return data
+
+
+def _save(project_root: Path, data: dict) -> None:
+    write_json_atomic(project_root / _STORE_FILE, data, what="test impact store")
+
+
+def _record(
+    project_root: Path,
+    files: list[str],
+    durations: dict[str, float],
+    coverage: dict[str, set[str]],
+    *,
+    overhead: float | None,
+    complete: bool,
+) -> None:
+    """Merge one run's measurements into the store.
+
+    ``complete`` means every test of ``files`` ran (no ``-k``), so
+    node ids of those files that did not report are gone.
+    """
+    with _lock:
+        data = _load(project_root)
+        stored = data["durations"]
+        if complete:
+            ran = set(files)
+            for nodeid in [n for n in stored if n.split("::", 1)[0] in ran]:
+                del stored[nodeid]
+        stored.update(durations)
+        if overhead is not None:
+            data["overhead"] = round(overhead, 6)
+        for test_file, sources in coverage.items():
+            data["coverage"][test_file] = sorted(sources)
+        _save(project_root, data)
+
+
+def file_durations(project_root: Path) -> dict[str, float]:
+    """Expected duration per test file: its tests' recorded durations
+    plus the per-test overhead for each of them.
+    """
+    data = _load(project_root)
+    overhead = data.get("overhead", 0.0)
+    totals: dict[str, float] = {}
+    for nodeid, seconds in data["durations"].items():
+        test_file = nodeid.split("::", 1)[0]
+        totals[test_file] = totals.get(test_file, 0.0) + seconds + overhead
+    return totals
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Selection
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _git_lines(project_root: Path, *args: str) -> list[str] | None:
+    """Non-empty stdout lines of a git command (None when it fails)."""
+    result = run_git(project_root, *args, timeout=30)
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def changed_files(project_root: Path, base: str = "HEAD") -> list[str] | None:
+    """Files changed against ``base`` plus untracked files (None outside git).
+
+    ``base`` is resolved to a commit first and only its SHA reaches
+    ``git diff``, so a caller-supplied ref can never act as an option.
+
+    Raises:
+        ValueError: ``base`` is not a commit in this repository.
+    """
+    if _git_lines(project_root, "rev-parse", "--is-inside-work-tree") is None:
+        return None
+    resolved = None
+    if not base.startswith("-"):
+        resolved = _git_lines(project_root, "rev-parse", "--verify", "--quiet",
+                              "--end-of-options", f"{base}^{{commit}}")
+    if not resolved:
+        raise ValueError(f"Unknown base commit: {base!r}")
+
+    changed: set[str] = set()
+    for args in (["diff", "--name-only", "--relative", resolved[0], "--"],
+                 ["ls-files", "--others", "--exclude-standard"]):
+        lines = _git_lines(project_root, *args)
+        if lines is None:
+            return None
+        changed.update(lines)
+    return sorted(changed)
+
+
+def find_test_files(project_root: Path) -> list[str]:
+    """Project-relative pytest files under the pytest test directories."""
+    marker = _FRAMEWORK_MARKERS["pytest"]
+    pattern = marker["test_pattern"]
+    found: list[str] = []
+    for dir_name in marker["dirs"]:
+        top = project_root / dir_name
+        if not top.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+            rel_dir = os.path.relpath(dirpath, project_root).replace(os.sep, "/")
+            found.extend(f"{rel_dir}/{name}" for name in filenames if pattern.match(name))
+    return sorted(found)
+
+
+def select_tests(project_root: Path, changed: list[str]) -> dict:
+    """Test files impacted by ``changed`` (project-relative paths).
+
+    Returns:
+        {
+            "tests": [str],              # selected test files
+            "all": bool,                 # a global file changed
+            "reasons": {test_file: str}, # first reason a file was picked
+        }
+    """
+    universe = find_test_files(project_root)
+    known = set(universe)
+
+    trigger = next((p for p in changed if p.rsplit("/", 1)[-1] in _GLOBAL_FILES), None)
+    if trigger is not None:
+        return {"tests": universe, "all": True,
+                "reasons": {t: f"global: {trigger}" for t in universe}}
+
+    reasons: dict[str, str] = {}
+    for path in changed:
+        if path in known:
+            reasons[path] = "changed"
+
+    from src.core.services.audit.import_graph import _GRAPH_SUFFIXES, get_import_graph
+
+    graph = get_import_graph(project_root)
+
+    # A deleted (or renamed-away) file leaves the graph on refresh, so
+    # its importers are read from the graph as it was.  If the graph
+    # never saw it, nothing can say who imported it: run everything.
+    for path in changed:
+        if (project_root / path).exists():
+            continue
+        if graph.component_of(path):
+            for dependent in graph.dependents([path]):
+                if dependent in known:
+                    reasons.setdefault(dependent, f"imports {path}")
+        elif os.path.splitext(path)[1] in _GRAPH_SUFFIXES:
+            return {"tests": universe, "all": True,
+                    "reasons": {t: f"unresolved: {path}" for t in universe}}
+
+    try:
+        graph.refresh()
+    except Exception as e:
+        logger.warning("Import graph refresh failed: %s", e)
+    for path in changed:
+        for dependent in graph.dependents([path]):
+            if dependent in known:
+                reasons.setdefault(dependent, f"imports {path}")
+
+    changed_set = set(changed)
+    for test_file, sources in _load(project_root)["coverage"].items():
+        if test_file in known and test_file not in reasons:
+            hit = next((s for s in sources if s in changed_set), None)
+            if hit is not None:
+                reasons[test_file] = f"covers {hit}"
+
+    return {"tests": sorted(reasons), "all": False, "reasons": reasons}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Sharding
+# ═══════════════════════════════════════════════════════════════════
+
+
+def plan_shards(
+    tests: list[str],
+    durations: dict[str, float],
+    shards: int,
+) -> list[dict]:
+    """Split test files into at most ``shards`` groups of similar duration.
+
+    Longest-processing-time first: files sorted by expected duration,
+    each onto the currently lightest shard.  Files with no history weigh
+    the median recorded file duration.
+
+    Returns:
+        [{"index": int, "files": [str], "expected_seconds": float}, ...]
+    """
+    known = sorted(durations[t] for t in tests if t in durations)
+    default = known[len(known) // 2] if known else _DEFAULT_FILE_SECONDS
+    weighted = sorted(((durations.get(t, default), t) for t in tests), key=lambda wt: (-wt[0], wt[1]))
+
+    n = max(1, min(shards, len(tests)))
+    heap = [(0.0, i) for i in range(n)]
+    groups: list[list[str]] = [[] for _ in range(n)]
+    for weight, test_file in weighted:
+        load, i = heapq.heappop(heap)
+        groups[i].append(test_file)
+        heapq.heappush(heap, (load + weight, i))
+    loads = dict((i, load) for load, i in heap)
+    return [
+        {"index": i, "files": sorted(groups[i]), "expected_seconds": round(loads[i], 3)}
+        for i in range(n) if groups[i]
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Measurements
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _split_durations(output: str) -> tuple[dict[str, float], str]:
+    """Per-test durations from ``--durations=0`` output, and the output
+    without that block.
+    """
+    durations: dict[str, float] = {}
+    kept: list[str] = []
+    in_block = False
+    for line in output.splitlines():
+        if _DURATIONS_HEADER.match(line):
+            in_block = True
+            continue
+        if in_block:
+            match = _DURATION_LINE.match(line)
+            if match:
+                nodeid = match.group(3)
+                durations[nodeid] = durations.get(nodeid, 0.0) + float(match.group(1))
+                continue
+            if not line.strip() or line.startswith("("):
+                continue
+            in_block = False
+        kept.append(line)
+    return {k: round(v, 4) for k, v in durations.items()}, "\n".join(kept)
+
+
+def _coverage_map(data_file: Path, project_root: Path) -> dict[str, set[str]]:
+    """``{test_file: {source files}}`` from a coverage.py database
+    recorded with test contexts (``--cov-context=test``).
+    """
+    root = str(project_root.resolve())
+    result: dict[str, set[str]] = {}
+    try:
+        conn = sqlite3.connect(f"file:{data_file}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        logger.debug("Cannot open coverage data %s: %s", data_file, e)
+        return result
+    try:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        rows: list[tuple[str, str]] = []
+        for table in ("line_bits", "arc"):
+            if table in tables:
+                rows.extend(conn.execute(
+                    f"SELECT DISTINCT file.path, context.context FROM {table} "
+                    f"JOIN file ON file.id = {table}.file_id "
+                    f"JOIN context ON context.id = {table}.context_id"
+                ))
+    except sqlite3.Error as e:
+        logger.debug("Cannot read coverage data %s: %s", data_file, e)
+        return result
+    finally:
+        conn.close()
+
+    for path, context in rows:
+        test_file = context.split("::", 1)[0]
+        if not test_file or not path.startswith(root + os.sep):
+            continue
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        if rel != test_file:
+            result.setdefault(test_file, set()).add(rel)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Running
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _run_shard(
+    project_root: Path,
+    shard: dict,
+    *,
+    verbose: bool,
+    keyword: str | None,
+    timeout: int | None,
+    cov_file: Path | None,
+) -> dict:
+    from .run import _parse_pytest_output
+
+    cmd = ["python", "-m", "pytest", "-q", "--tb=short", "--durations=0", "--durations-min=0"]
+    if verbose:
+        cmd.append("-v")
+    if keyword:
+        cmd.extend(["-k", keyword])
+    env = None
+    if cov_file is not None:
+        cmd.extend(["--cov=.", "--cov-context=test", "--cov-report="])
+        env = {**os.environ, "COVERAGE_FILE": str(cov_file)}
+    cmd.extend(shard["files"])
+
+    limit = timeout or max(DEFAULT_TIMEOUT, int(_TIMEOUT_FACTOR * shard["expected_seconds"]))
+    t0 = time.monotonic()
+    try:
+        result = subprocess.run(
+            cmd, cwd=str(project_root), env=env,
+            capture_output=True, text=True, timeout=limit,
+        )
+    except subprocess.TimeoutExpired:
+        return {"index": shard["index"], "files": shard["files"], "ok": False,
+                "error": f"Shard timed out after {limit} seconds",
+                "wall_seconds": round(time.monotonic() - t0, 2), "durations": {}}
+    except FileNotFoundError:
+        return {"index": shard["index"], "files": shard["files"], "ok": False,
+                "error": "pytest not found", "wall_seconds": 0.0, "durations": {}}
+
+    durations, output = _split_durations(result.stdout + result.stderr)
+    parsed = _parse_pytest_output(output, result.returncode)
+    # exit code 5: nothing collected (e.g. -k matched no test in this shard)
+    if result.returncode == 5:
+        parsed["ok"] = True
+    parsed.update({
+        "index": shard["index"],
+        "files": shard["files"],
+        "output": output.strip(),
+        "wall_seconds": round(time.monotonic() - t0, 2),
+        "durations": durations,
+    })
+    return parsed
+
+
+def run_tests_stream(
+    project_root: Path,
+    *,
+    shards: int = 1,
+    impacted: bool = False,
+    base: str = "HEAD",
+    keyword: str | None = None,
+    verbose: bool = False,
+    record_coverage: bool = False,
+    timeout: int | None = None,
+) -> Iterator[dict]:
+    """Select, shard and run tests, yielding progress events.
+
+    Yields:
+        {"type": "error", "error": str}             # bad ``base``; nothing else follows
+        {"type": "plan",  "selection": {...}, "shards": [{index, files, expected_seconds}],
+                          "coverage": "recording" | "unavailable" | None}
+        {"type": "shard", "index", "files", "ok", "passed", "failed", "errors",
+                          "skipped", "duration_seconds", "wall_seconds",
+                          "failures", "output"}      # in completion order
+        {"type": "done",  "ok", "passed", "failed", "errors", "skipped", "total",
+                          "duration_seconds", "failures", "shards", "selected"}
+    """
+    if impacted:
+        try:
+            changed = changed_files(project_root, base)
+        except ValueError as e:
+            yield {"type": "error", "error": str(e)}
+            return
+        if changed is None:
+            selection = {"tests": find_test_files(project_root), "all": True,
+                         "reasons": {}, "note": "Not a git repository — running all tests"}
+        else:
+            selection = select_tests(project_root, changed)
+            selection["changed"] = changed
+    else:
+        selection = {"tests": find_test_files(project_root), "all": True, "reasons": {}}
+
+    coverage_state = None
+    if record_coverage:
+        coverage_state = ("recording" if importlib.util.find_spec("pytest_cov")
+                          else "unavailable")
+
+    plan = plan_shards(selection["tests"], file_durations(project_root), shards)
+    yield {"type": "plan", "selection": selection, "shards": plan, "coverage": coverage_state}
+
+    t0 = time.monotonic()
+    totals = {"passed": 0, "failed": 0, "errors": 0, "skipped": 0}
+    failures: list[dict] = []
+    durations: dict[str, float] = {}
+    coverage: dict[str, set[str]] = {}
+    completed: list[str] = []
+    measured = [0.0, 0.0, 0]         # wall seconds, test seconds, tests of finished shards
+    shard_summaries: list[dict] = []
+    ok = True
+
+    with tempfile.TemporaryDirectory(prefix="cp-test-shards-") as tmp:
+        cov_dir = Path(tmp) if coverage_state == "recording" else None
+        with ThreadPoolExecutor(max_workers=max(1, len(plan))) as pool:
+            futures = [
+                pool.submit(
+                    _run_shard, project_root, shard,
+                    verbose=verbose, keyword=keyword, timeout=timeout,
+                    cov_file=cov_dir / f".coverage.{shard['index']}" if cov_dir else None,
+                )
+                for shard in plan
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                shard_durations = result.pop("durations")
+                durations.update(shard_durations)
+                ok = ok and result.get("ok", False)
+                for key in totals:
+                    totals[key] += result.get(key, 0)
+                failures.extend(result.get("failures", []))
+                if "error" in result:
+                    failures.append({"name": f"shard {result['index']}", "output": result["error"]})
+                else:
+                    completed.extend(result["files"])
+                    measured[0] += result["wall_seconds"]
+                    measured[1] += sum(shard_durations.values())
+                    measured[2] += len(shard_durations)
+                shard_summaries.append({
+                    k: result.get(k) for k in
+                    ("index", "ok", "passed", "failed", "errors", "skipped",
+                     "wall_seconds", "error")
+                    if k in result
+                })
+                yield {"type": "shard", **result}
+
+        if cov_dir is not None:
+            for shard in plan:
+                data_file = cov_dir / f".coverage.{shard['index']}"
+                if data_file.is_file():
+                    coverage.update(_coverage_map(data_file, project_root))
+
+    if plan:
+        overhead = None
+        if measured[2] and coverage_state != "recording":     # coverage slows every test
+            overhead = max(0.0, measured[0] - measured[1]) / measured[2]
+        _record(project_root, completed, durations, coverage,
+                overhead=overhead, complete=not keyword)
+
+    yield {
+        "type": "done",
+        "ok": ok,
+        **totals,
+        "total": sum(totals.values()),
+        "duration_seconds": round(time.monotonic() - t0, 2),
+        "failures": failures[:20],
+        "shards": sorted(shard_summaries, key=lambda s: s["index"]),
+        "selected": len(selection["tests"]),
+    }
@@ -329,4 +329,5 @@ from .run import (  # noqa: F401, E402
     generate_test_template,
     generate_coverage_config,
 )
+from .impact import run_tests_stream  # noqa: F401, E402
 
@@ -234,9 +234,16 @@ def run_tests(
     verbose: bool = False,
     file_path: str | None = None,
     keyword: str | None = None,
+    shards: int = 1,
+    impacted: bool = False,
+    base: str = "HEAD",
 ) -> dict:
     """Run tests and return structured results.
 
+    With ``shards > 1`` or ``impacted`` (and no ``file_path``) the run
+    goes through ``impact.run_tests_stream``: only tests affected by the
+    diff against ``base``, split into duration-balanced parallel shards.
+
     Returns:
         {
             "ok": bool,
@@ -247,8 +254,17 @@ def run_tests(
             "duration_seconds": float,
             "output": str,
             "failures": [{name, output}, ...],
+            # sharded / impacted runs also:
+            "shards": [{index, ok, passed, failed, errors, skipped, wall_seconds}],
+            "selected": int,
         }
     """
+    if (shards > 1 or impacted) and not file_path:
+        return _run_tests_sharded(
+            project_root, verbose=verbose, keyword=keyword,
+            shards=shards, impacted=impacted, base=base,
+        )
+
     cmd = ["python", "-m", "pytest", "-q", "--tb=short"]
 
     if verbose:
@@ -293,6 +309,48 @@ def run_tests(
     return parsed
 
 
+def _run_tests_sharded(
+    project_root: Path,
+    *,
+    verbose: bool,
+    keyword: str | None,
+    shards: int,
+    impacted: bool,
+    base: str,
+) -> dict:
+    """Drain ``run_tests_stream`` into one ``run_tests``-shaped result."""
+    from .impact import run_tests_stream
+
+    outputs: list[str] = []
+    result: dict = {}
+    for event in run_tests_stream(
+        project_root, shards=shards, impacted=impacted, base=base,
+        keyword=keyword, verbose=verbose,
+    ):
+        if event["type"] == "error":
+            return {"error": event["error"]}
+        if event["type"] == "shard":
+            outputs.append(f"── shard {event['index']} ──\n{event.get('output') or event.get('error', '')}")
+        elif event["type"] == "done":
+            result = {k: v for k, v in event.items() if k != "type"}
+    result["output"] = "\n\n".join(outputs)
+
+    _audit(
+        "🧪 Tests Run",
+        f"Tests executed ({'impacted, ' if impacted else ''}{len(result['shards'])} shard(s))",
+        action="executed",
+        target="impacted" if impacted else "all",
+        detail={"keyword": keyword, "verbose": verbose, "shards": shards,
+                "impacted": impacted, "base": base, "selected": result["selected"]},
+        after_state={
+            "passed": result.get("passed", 0),
+            "failed": result.get("failed", 0),
+            "errors": result.get("errors", 0),
+        },
+    )
+    return result
+
+
 def _parse_pytest_output(output: str, returncode: int) -> dict:
     """Parse pytest output for structured results."""
     passed = failed = errors = skipped = 0
@@ -719,3 +719,20 @@ def validate_all_recipes(recipes: dict[str, dict]) -> dict[str, list[str]]:
         if errs:
             all_errors[tool_id] = errs
     return all_errors
+
+
+def validate_handler_registry(registry: dict[str, list]) -> dict[str, list[str]]:
+    """Validate a ``{key: [handler, ...]}`` registry (e.g. TOOL_FAILURE_HANDLERS).
+
+    Returns:
+        Dict mapping key → list of errors. Only keys with errors are included.
+    """
+    all_errors: dict[str, list[str]] = {}
+    for key, handlers in registry.items():
+        if not isinstance(handlers, list):
+            all_errors[key] = ["handlers must be a list"]
+            continue
+        errs = _validate_handler_list(handlers, key)
+        if errs:
+            all_errors[key] = errs
+    return all_errors
@@ -2,13 +2,19 @@
 L0 Data — Composite tool recipe registry.
 
 Merges all domain recipe sub-packages into the canonical ``TOOL_RECIPES``
-dict. Every consumer imports this single symbol — the internal split
+registry. Every consumer imports this single symbol — the internal split
 is invisible to them.
 
+``TOOL_RECIPES`` is a ``SnapshotRegistry`` (see ``snapshot_registry.py``):
+importing this module executes none of the sub-packages.  The first
+lookup reads a precompiled snapshot and decodes only the recipes asked
+for; the sub-packages are imported (and the snapshot rebuilt) only when
+a recipe module changed.
+
 Structure::
 
     recipes/
-    ├── __init__.py          ← YOU ARE HERE (merge point)
+    ├── __init__.py          ← YOU ARE HERE (lazy merge point)
     ├── core/                system, shell, terminal, compression
     ├── languages/           python, node, rust, go, jvm, web, other
     ├── devops/              k8s, cloud, iac, containers, cicd, monitoring
@@ -20,22 +26,50 @@ Structure::
 
 from __future__ import annotations
 
-from src.core.services.tool_install.data.recipes.core import _CORE_RECIPES
-from src.core.services.tool_install.data.recipes.data_ml import _DATA_ML_RECIPES
-from src.core.services.tool_install.data.recipes.devops import _DEVOPS_RECIPES
-from src.core.services.tool_install.data.recipes.languages import _LANGUAGE_RECIPES
-from src.core.services.tool_install.data.recipes.network import _NETWORK_RECIPES
-from src.core.services.tool_install.data.recipes.security import _SECURITY_RECIPES
-from src.core.services.tool_install.data.recipes.specialized import (
-    _SPECIALIZED_RECIPES,
-)
+from pathlib import Path
+
+from src.core.services.tool_install.data.snapshot_registry import SnapshotRegistry
+
+
+def _merge_recipes() -> dict[str, dict]:
+    """Import every domain sub-package and merge their recipes."""
+    from src.core.services.tool_install.data.recipes.core import _CORE_RECIPES
+    from src.core.services.tool_install.data.recipes.data_ml import _DATA_ML_RECIPES
+    from src.core.services.tool_install.data.recipes.devops import _DEVOPS_RECIPES
+    from src.core.services.tool_install.data.recipes.languages import _LANGUAGE_RECIPES
+    from src.core.services.tool_install.data.recipes.network import _NETWORK_RECIPES
+    from src.core.services.tool_install.data.recipes.security import _SECURITY_RECIPES
+    from src.core.services.tool_install.data.recipes.specialized import (
+        _SPECIALIZED_RECIPES,
+    )
+
+    return {
+        **_CORE_RECIPES,
+        **_LANGUAGE_RECIPES,
+        **_DEVOPS_RECIPES,
+        **_SECURITY_RECIPES,
+        **_NETWORK_RECIPES,
+        **_DATA_ML_RECIPES,
+        **_SPECIALIZED_RECIPES,
+    }
 
-TOOL_RECIPES: dict[str, dict] = {
-    **_CORE_RECIPES,
-    **_LANGUAGE_RECIPES,
-    **_DEVOPS_RECIPES,
-    **_SECURITY_RECIPES,
-    **_NETWORK_RECIPES,
-    **_DATA_ML_RECIPES,
-    **_SPECIALIZED_RECIPES,
-}
+
+def _validate_recipes(recipes: dict[str, dict]) -> dict[str, list[str]]:
+    from src.core.services.tool_install.data.recipe_schema import validate_all_recipes
+
+    return validate_all_recipes(recipes)
+
+
+_HERE = Path(__file__).resolve().parent
+
+TOOL_RECIPES: SnapshotRegistry = SnapshotRegistry(
+    "recipes",
+    _HERE,
+    _merge_recipes,
+    validate=_validate_recipes,
+    extra_sources=(
+        _HERE.parent / "constants.py",            # _PIP is baked into recipes
+        _HERE.parent / "recipe_schema.py",
+        _HERE.parent / "remediation_handlers" / "constants.py",
+    ),
+)
@@ -0,0 +1,12 @@
+"""
+Build step — ``python -m src.core.services.tool_install.data.recipes``.
+
+Validates every recipe and tool failure handler against ``recipe_schema``
+and writes the precompiled snapshots (see ``snapshot_registry.py``).
+"""
+
+import sys
+
+from src.core.services.tool_install.data.snapshot_registry import build_all
+
+sys.exit(1 if build_all() else 0)
@@ -0,0 +1,243 @@
+"""
+L0 Data — Lazily loaded, precompiled registries.
+
+``TOOL_RECIPES`` and ``TOOL_FAILURE_HANDLERS`` used to be built at import
+time by executing every domain module, and every consumer (CLI, web
+routes, audit cards) paid for that on startup.  A ``SnapshotRegistry``
+is a drop-in ``dict`` replacement that does nothing until first access:
+
+    first access    read the snapshot: one marshal blob per entry, so
+                    the load decodes only the key → blob index
+    registry[key]   decode that one entry (then cached)
+    iteration       keys come from the index; values decode on demand
+
+The snapshot lives next to the bytecode
+(``<package>/__pycache__/<name>.<cache_tag>.snapshot``) and is keyed on
+the mtime + size of every source module.  When it is missing or stale
+the registry imports the domain modules as before, validates the merged
+dict once (errors are logged), and writes a fresh snapshot (best-effort
+— a read-only install just keeps the imported dict).  ``build()`` is the
+explicit build step (``make recipes``).
+
+File I/O is limited to the snapshot; entries stay plain data.
+
+Entries may hold values of the running process rather than of the
+sources — ``_PIP = [sys.executable, "-m", "pip"]`` is in 33 recipes.
+Those are written as placeholders and resolved when an entry is
+decoded, so a snapshot built under one interpreter serves another.
+"""
+
+from __future__ import annotations
+
+import logging
+import marshal
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2
+
+# Placeholder for sys.executable inside a snapshot (exact string matches)
+_EXECUTABLE = "\x00sys.executable\x00"
+_EXECUTABLE_MARK = marshal.dumps(_EXECUTABLE)[1:]     # type code may vary
+
+
+def _swap(value: Any, old: str, new: str) -> Any:
+    """Replace strings equal to ``old`` by ``new`` in nested plain data."""
+    if isinstance(value, str):
+        return new if value == old else value
+    if isinstance(value, dict):
+        return {k: _swap(v, old, new) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_swap(v, old, new) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_swap(v, old, new) for v in value)
+    return value
+
+
+def _decode(blob: bytes) -> Any:
+    value = marshal.loads(blob)
+    if _EXECUTABLE_MARK in blob:
+        value = _swap(value, _EXECUTABLE, sys.executable)
+    return value
+
+
+class _Packed:
+    """An entry still in its marshalled form."""
+
+    __slots__ = ("blob",)
+
+    def __init__(self, blob: bytes):
+        self.blob = blob
+
+
+class SnapshotRegistry(MutableMapping[str, Any]):
+    """``dict``-compatible registry backed by a precompiled snapshot.
+
+    Args:
+        name: Snapshot file stem (``"recipes"``).
+        source_dir: Package directory whose ``*.py`` files define the data.
+        load: Imports the domain modules and returns the merged dict.
+        validate: ``{key: [errors]}`` for a merged dict, run once per
+            rebuild; errors are logged (the data is served as-is).
+        extra_sources: Other files the data or its validation depend on.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source_dir: Path,
+        load: Callable[[], dict[str, Any]],
+        *,
+        validate: Callable[[dict[str, Any]], dict[str, list[str]]] | None = None,
+        extra_sources: tuple[Path, ...] = (),
+    ):
+        self.name = name
+        self.source_dir = source_dir
+        self._load = load
+        self._validate = validate
+        self._extra_sources = extra_sources
+        self._entries: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    # ── Snapshot ────────────────────────────────────────────────
+
+    @property
+    def snapshot_path(self) -> Path:
+        tag = sys.implementation.cache_tag or "py"
+        return self.source_dir / "__pycache__" / f"{self.name}.{tag}.snapshot"
+
+    def _stamp(self) -> tuple:
+        """(relpath, mtime_ns, size) of every source module."""
+        files: list[tuple[str, int, int]] = []
+        for dirpath, dirnames, filenames in os.walk(self.source_dir):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for fn in sorted(filenames):
+                if fn.endswith(".py"):
+                    st = os.stat(os.path.join(dirpath, fn))
+                    rel = os.path.relpath(os.path.join(dirpath, fn), self.source_dir)
+                    files.append((rel, st.st_mtime_ns, st.st_size))
+        for path in self._extra_sources:
+            st = path.stat()
+            files.append((str(path), st.st_mtime_ns, st.st_size))
+        return tuple(files)
+
+    def _read_snapshot(self, stamp: tuple) -> dict[str, bytes] | None:
+        try:
+            data = self.snapshot_path.read_bytes()
+            fmt, snap_stamp, blobs = marshal.loads(data)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if fmt != SNAPSHOT_FORMAT or snap_stamp != stamp:
+            return None
+        return blobs
+
+    def _write_snapshot(self, stamp: tuple, entries: dict[str, Any]) -> bool:
+        path = self.snapshot_path
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            blobs = {
+                key: marshal.dumps(_swap(value, sys.executable, _EXECUTABLE) if sys.executable else value)
+                for key, value in entries.items()
+            }
+            path.parent.mkdir(exist_ok=True)
+            tmp.write_bytes(marshal.dumps((SNAPSHOT_FORMAT, stamp, blobs)))
+            os.replace(tmp, path)
+        except (OSError, ValueError) as exc:      # ValueError: unmarshallable entry
+            logger.debug("%s snapshot not written: %s", self.name, exc)
+            tmp.unlink(missing_ok=True)
+            return False
+        return True
+
+    def _rebuild(self, stamp: tuple) -> tuple[dict[str, Any], dict[str, list[str]]]:
+        """Import the sources, validate once, write the snapshot."""
+        entries = self._load()
+        errors = self._validate(entries) if self._validate else {}
+        if errors:
+            logger.warning(
+                "%s: %d entries fail schema validation: %s",
+                self.name, len(errors), ", ".join(sorted(errors)),
+            )
+        self._write_snapshot(stamp, entries)
+        return entries, errors
+
+    def build(self) -> dict[str, list[str]]:
+        """Explicit build step: rebuild the snapshot, return validation errors."""
+        _, errors = self._rebuild(self._stamp())
+        self.invalidate()
+        return errors
+
+    def _ensure(self) -> dict[str, Any]:
+        entries = self._entries
+        if entries is not None:
+            return entries
+        with self._lock:
+            if self._entries is None:
+                stamp = self._stamp()
+                blobs = self._read_snapshot(stamp)
+                if blobs is not None:
+                    self._entries = {k: _Packed(b) for k, b in blobs.items()}
+                else:
+                    loaded, _ = self._rebuild(stamp)
+                    self._entries = dict(loaded)
+            return self._entries
+
+    def invalidate(self) -> None:
+        """Drop loaded entries; the next access reloads (sources or snapshot)."""
+        with self._lock:
+            self._entries = None
+
+    # ── Mapping protocol ────────────────────────────────────────
+
+    def __getitem__(self, key: str) -> Any:
+        entries = self._ensure()
+        value = entries[key]
+        if isinstance(value, _Packed):
+            value = entries[key] = _decode(value.blob)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._ensure()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._ensure()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ensure()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ensure())
+
+    def __len__(self) -> int:
+        return len(self._ensure())
+
+    def __repr__(self) -> str:
+        state = "unloaded" if self._entries is None else f"{len(self._entries)} entries"
+        return f"<SnapshotRegistry {self.name}: {state}>"
+
+
+def build_all() -> int:
+    """Rebuild every registry snapshot; print schema errors.
+
+    Returns the number of invalid entries (``python -m
+    src.core.services.tool_install.data.recipes`` exits non-zero on any).
+    """
+    from src.core.services.tool_install.data.recipes import TOOL_RECIPES
+    from src.core.services.tool_install.data.tool_failure_handlers import (
+        TOOL_FAILURE_HANDLERS,
+    )
+
+    invalid = 0
+    for registry in (TOOL_RECIPES, TOOL_FAILURE_HANDLERS):
+        errors = registry.build()
+        print(f"{registry.name}: {len(registry)} entries → {registry.snapshot_path}")
+        for key, errs in sorted(errors.items()):
+            for err in errs:
+                print(f"  {key}: {err}")
+        invalid += len(errors)
+    return invalid
@@ -5,16 +5,48 @@ Re-exports TOOL_FAILURE_HANDLERS as the single public symbol.
 Consumers continue to import from:
     src.core.services.tool_install.data.tool_failure_handlers
 exactly as before the refactor.
+
+Like ``TOOL_RECIPES``, this is a lazily loaded ``SnapshotRegistry``:
+``TOOL_FAILURE_HANDLERS.get(tool_id)`` decodes only that tool's handlers.
 """
 
 from __future__ import annotations
 
-from .languages import LANGUAGE_TOOL_HANDLERS
-from .devops import DEVOPS_TOOL_HANDLERS
-from .security import SECURITY_TOOL_HANDLERS
+from pathlib import Path
+
+from src.core.services.tool_install.data.snapshot_registry import SnapshotRegistry
+
+
+def _merge_handlers() -> dict[str, list[dict]]:
+    """Import every domain sub-package and merge their handlers."""
+    from .languages import LANGUAGE_TOOL_HANDLERS
+    from .devops import DEVOPS_TOOL_HANDLERS
+    from .security import SECURITY_TOOL_HANDLERS
+
+    return {
+        **LANGUAGE_TOOL_HANDLERS,
+        **DEVOPS_TOOL_HANDLERS,
+        **SECURITY_TOOL_HANDLERS,
+    }
+
+
+def _validate_handlers(registry: dict[str, list[dict]]) -> dict[str, list[str]]:
+    from src.core.services.tool_install.data.recipe_schema import (
+        validate_handler_registry,
+    )
+
+    return validate_handler_registry(registry)
+
+
+_HERE = Path(__file__).resolve().parent
 
-TOOL_FAILURE_HANDLERS: dict[str, list[dict]] = {
-    **LANGUAGE_TOOL_HANDLERS,
-    **DEVOPS_TOOL_HANDLERS,
-    **SECURITY_TOOL_HANDLERS,
-}
+TOOL_FAILURE_HANDLERS: SnapshotRegistry = SnapshotRegistry(
+    "tool_failure_handlers",
+    _HERE,
+    _merge_handlers,
+    validate=_validate_handlers,
+    extra_sources=(
+        _HERE.parent / "recipe_schema.py",
+        _HERE.parent / "remediation_handlers" / "constants.py",
+    ),
+)
@@ -334,6 +334,7 @@ _TERRAFORM_HANDLERS: list[dict] = [
                     r"checkpoint\.hashicorp\.com.*Failed to connect|"
                     r"checkpoint\.hashicorp\.com.*Could not resolve|"
                     r"checkpoint\.hashicorp\.com.*Connection refused|"
+                    r"Could not resolve host:\s*checkpoint\.hashicorp\.com|"
                     r"Traceback.*json\.decoder\.JSONDecodeError|"
                     r"current_version.*KeyError|"
                     r"TF_VERSION=\s*$"
@@ -16,6 +16,7 @@ _GO_HANDLERS: list[dict] = [
                 "pattern": (
                     r"permission denied.*go(?:path|/bin)|"
                     r"GOPATH.*permission denied|"
+                    r"mkdir \S*/go(?:/bin)?:\s*permission denied|"
                     r"cannot create.*go/bin.*permission denied"
                 ),
                 "failure_id": "go_gopath_permission",
@@ -40,6 +40,9 @@ from src.core.services.tool_install.detection.network import (  # noqa: F401
     check_registry_reachable,
     detect_proxy,
 )
+from src.core.services.tool_install.detection.pkg_index import (  # noqa: F401
+    installed_packages,
+)
 from src.core.services.tool_install.detection.recipe_deps import (  # noqa: F401
     _get_system_deps,
 )
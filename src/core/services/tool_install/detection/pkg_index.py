@@ -0,0 +1,175 @@
+"""
+L3 Detection — Installed-package index.
+
+Reads the package manager's database directly instead of forking a
+query per package:
+
+    apt    → /var/lib/dpkg/status           (parsed, no fork)
+    apk    → /lib/apk/db/installed          (parsed, no fork)
+    pacman → /var/lib/pacman/local/         (directory names, no fork)
+    dnf/yum/zypper → one ``rpm -qa`` dump   (one fork)
+
+Each index is cached against the database's mtime + size, so a lookup
+is a set membership test until the package manager writes again.
+``root`` points the readers at another filesystem root (fixtures,
+chroots).  Returns ``None`` when no database is readable — callers fall
+back to per-package queries.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DPKG_STATUS = "var/lib/dpkg/status"
+DPKG_UPDATES = "var/lib/dpkg/updates"
+APK_INSTALLED = "lib/apk/db/installed"
+PACMAN_LOCAL = "var/lib/pacman/local"
+RPM_DBS = ("usr/lib/sysimage/rpm", "var/lib/rpm")
+
+_lock = threading.Lock()
+_cache: dict[tuple[str, str], tuple[tuple, frozenset[str]]] = {}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Parsers
+# ═══════════════════════════════════════════════════════════════════
+
+
+def parse_dpkg_status(*texts: str) -> set[str]:
+    """Installed package names from a dpkg ``status`` file (+ journal entries).
+
+    A package counts as installed when its ``Status`` contains
+    ``install ok installed`` (what ``dpkg-query -W -f='${Status}'``
+    reports).  Later texts override earlier ones per package, like the
+    ``updates/`` journal over ``status``.  ``name:arch`` is added too, so
+    multi-arch queries match.
+    """
+    state: dict[tuple[str, str], bool] = {}
+    for text in texts:
+        pkg = arch = status = ""
+        for line in [*text.splitlines(), ""]:
+            if not line:
+                if pkg:
+                    state[(pkg, arch)] = "install ok installed" in status
+                pkg = arch = status = ""
+            elif line.startswith("Package: "):
+                pkg = line[9:].strip()
+            elif line.startswith("Status: "):
+                status = line[8:]
+            elif line.startswith("Architecture: "):
+                arch = line[14:].strip()
+
+    names: set[str] = set()
+    for (pkg, arch), installed in state.items():
+        if installed:
+            names.add(pkg)
+            if arch:
+                names.add(f"{pkg}:{arch}")
+    return names
+
+
+def parse_apk_installed(text: str) -> set[str]:
+    """Installed package names from apk's ``installed`` database (``P:`` lines)."""
+    return {line[2:].strip() for line in text.splitlines() if line.startswith("P:")}
+
+
+def parse_pacman_local(entries: list[str]) -> set[str]:
+    """Package names from ``/var/lib/pacman/local`` entries (``name-pkgver-pkgrel``)."""
+    return {e.rsplit("-", 2)[0] for e in entries if e.count("-") >= 2}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Index
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _stamp(path: Path) -> tuple | None:
+    """mtime + size of a database file, or of a database directory's files."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not path.is_dir():
+        return (st.st_mtime_ns, st.st_size)
+    try:
+        children = [c.stat() for c in path.iterdir()]
+    except OSError:
+        return None
+    return (st.st_mtime_ns, len(children), max((c.st_mtime_ns for c in children), default=0))
+
+
+def _rpm_names() -> set[str]:
+    r = subprocess.run(
+        ["rpm", "-qa", "--qf", "%{NAME}\\n"],
+        capture_output=True, text=True, timeout=30,
+    )
+    if r.returncode != 0:
+        raise OSError(f"rpm -qa exited {r.returncode}")
+    return set(r.stdout.split())
+
+
+def _read_dpkg(root: Path) -> set[str]:
+    """``status`` plus any not-yet-merged ``updates/`` journal entries, in order."""
+    texts = [(root / DPKG_STATUS).read_text(errors="replace")]
+    updates = root / DPKG_UPDATES
+    if updates.is_dir():
+        journal = [e for e in updates.iterdir() if e.name.isdigit()]
+        for entry in sorted(journal, key=lambda e: int(e.name)):
+            texts.append(entry.read_text(errors="replace"))
+    return parse_dpkg_status(*texts)
+
+
+def _source(pkg_manager: str, root: Path) -> tuple[tuple | None, Callable[[], set[str]]] | None:
+    """(database stamp, loader) for a package manager, or None if unsupported."""
+    if pkg_manager == "apt":
+        db = root / DPKG_STATUS
+        updates = _stamp(root / DPKG_UPDATES)
+        stamp = _stamp(db)
+        return ((*stamp, updates or ()) if stamp else None), lambda: _read_dpkg(root)
+    if pkg_manager == "apk":
+        db = root / APK_INSTALLED
+        return _stamp(db), lambda: parse_apk_installed(db.read_text(errors="replace"))
+    if pkg_manager == "pacman":
+        db = root / PACMAN_LOCAL
+        return _stamp(db), lambda: parse_pacman_local(os.listdir(db))
+    if pkg_manager in ("dnf", "yum", "zypper") and root == Path("/"):
+        for rel in RPM_DBS:
+            if (root / rel).is_dir():
+                return _stamp(root / rel), _rpm_names
+    return None
+
+
+def installed_packages(pkg_manager: str, *, root: Path = Path("/")) -> frozenset[str] | None:
+    """Names of installed packages, or None if the database can't be read."""
+    source = _source(pkg_manager, root)
+    if source is None:
+        return None
+    stamp, load = source
+    if stamp is None:
+        return None
+    key = (pkg_manager, str(root))
+    with _lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    try:
+        names = frozenset(load())
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("Package index unavailable for pm=%s: %s", pkg_manager, exc)
+        return None
+    with _lock:
+        _cache[key] = (stamp, names)
+    return names
+
+
+def clear_cache() -> None:
+    """Drop all cached indexes."""
+    with _lock:
+        _cache.clear()
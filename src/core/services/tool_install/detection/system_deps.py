@@ -2,7 +2,8 @@
 L3 Detection — System dependency checking.
 
 Read-only probes for package/binary availability.
-Uses subprocess for package manager queries.
+Answers from the package database index (``pkg_index.py``) when it is
+readable; otherwise queries the package manager per package.
 """
 
 from __future__ import annotations
@@ -11,13 +12,16 @@ import logging
 import shutil
 import subprocess
 
+from src.core.services.tool_install.detection.pkg_index import installed_packages
+
 logger = logging.getLogger(__name__)
 
 
 def _is_pkg_installed(pkg: str, pkg_manager: str) -> bool:
     """Check if a single system package is installed.
 
-    Uses the appropriate checker for the given package manager:
+    Looks the package up in the cached database index first (no fork).
+    Without a readable database, uses the package manager's checker:
       apt    → dpkg-query -W -f='${Status}' PKG
       dnf    → rpm -q PKG
       yum    → rpm -q PKG
@@ -33,6 +37,10 @@ def _is_pkg_installed(pkg: str, pkg_manager: str) -> bool:
     Returns:
         True if installed, False if not installed or check failed.
     """
+    index = installed_packages(pkg_manager)
+    if index is not None:
+        return pkg in index
+
     try:
         if pkg_manager == "apt":
             r = subprocess.run(
@@ -109,10 +117,13 @@ def check_system_deps(
     if pkg_manager == "brew" and len(packages) > 1:
         return _check_brew_batch(packages)
 
+    # One database read (cached) answers every package — no per-package fork
+    index = installed_packages(pkg_manager)
     missing: list[str] = []
     installed: list[str] = []
     for pkg in packages:
-        if _is_pkg_installed(pkg, pkg_manager):
+        found = pkg in index if index is not None else _is_pkg_installed(pkg, pkg_manager)
+        if found:
             installed.append(pkg)
         else:
             missing.append(pkg)
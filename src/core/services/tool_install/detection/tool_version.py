@@ -3,15 +3,16 @@ L3 Detection — Tool version checking.
 
 Read-only probes: runs ``--version`` commands and parses output.
 Also provides ``check_updates`` (local version scan).
+
+Lookups and version commands go through ``tool_inventory`` (cached per
+binary, probed concurrently by ``check_updates``).
 """
 
 from __future__ import annotations
 
-import re
-import shutil
-import subprocess
 import sys
 
+from src.core.services import tool_inventory
 from src.core.services.tool_install.data.recipes import TOOL_RECIPES
 from src.core.services.tool_install.resolver.method_selection import get_update_map
 
@@ -90,48 +91,37 @@ def _is_linux_binary(path: str) -> bool:
         return True  # Can't read — assume Linux
 
 
+def _version_spec(tool: str) -> tuple[list[str], str] | None:
+    """(command, pattern) for a tool: ``VERSION_COMMANDS``, else the recipe's."""
+    entry = VERSION_COMMANDS.get(tool)
+    if entry:
+        return entry
+    recipe = TOOL_RECIPES.get(tool, {})
+    vcmd = recipe.get("version_command")
+    vpat = recipe.get("version_pattern")
+    if vcmd and vpat:
+        return (vcmd, vpat)
+    return None
+
+
 def get_tool_version(tool: str) -> str | None:
     """Get the installed version of a tool.
 
     Uses ``VERSION_COMMANDS`` to look up the command and regex pattern.
     Falls back to recipe's ``version_command`` / ``version_pattern``
-    fields if the tool isn't in ``VERSION_COMMANDS``.
+    fields if the tool isn't in ``VERSION_COMMANDS``.  Some tools write
+    their version to stderr (e.g. mypy in some versions), so both
+    streams are searched.
 
     Returns:
         Semver string (e.g. ``"0.5.1"``) or ``None`` if the tool
         is not installed or version can't be determined.
     """
-    # Look up from the static table first
-    entry = VERSION_COMMANDS.get(tool)
-
-    # Fall back to recipe override
-    if not entry:
-        recipe = TOOL_RECIPES.get(tool, {})
-        vcmd = recipe.get("version_command")
-        vpat = recipe.get("version_pattern")
-        if vcmd and vpat:
-            entry = (vcmd, vpat)
-        else:
-            return None
-
-    cmd, pattern = entry
-    cli = cmd[0]
-    if not shutil.which(cli):
+    entry = _version_spec(tool)
+    if entry is None:
         return None
-
-    try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=10,
-        )
-        # Some tools write version to stderr (e.g. mypy in some versions)
-        output = (result.stdout or "") + (result.stderr or "")
-        match = re.search(pattern, output)
-        if match:
-            return match.group(1)
-    except (subprocess.TimeoutExpired, Exception):
-        pass
-
-    return None
+    cmd, pattern = entry
+    return tool_inventory.probe_version(cmd, pattern)
 
 
 def check_updates(
@@ -139,7 +129,8 @@ def check_updates(
 ) -> list[dict]:
     """Check installed tools for their current version.
 
-    Returns a list of status dicts per installed tool.
+    Returns a list of status dicts per installed tool.  Version commands
+    run concurrently and are cached per binary (``tool_inventory``).
 
     Note: Latest-version fetching (comparing with PyPI, apt-cache, etc.)
     is deferred to a later phase — requires network calls and separate
@@ -156,23 +147,19 @@ def check_updates(
     if tools is None:
         tools = list(TOOL_RECIPES.keys())
 
-    results = []
-    for tool_id in tools:
-        recipe = TOOL_RECIPES.get(tool_id, {})
-        cli = recipe.get("cli", tool_id)
-        installed = shutil.which(cli) is not None
+    clis = {t: TOOL_RECIPES.get(t, {}).get("cli", t) for t in tools}
+    found = tool_inventory.which_many(clis.values())
+    installed = [t for t in tools if found[clis[t]] is not None]
 
-        if not installed:
-            continue
+    specs = {t: spec for t in installed if (spec := _version_spec(t)) is not None}
+    versions = tool_inventory.probe_versions(specs)
 
-        version = get_tool_version(tool_id)
-        has_update_cmd = bool(get_update_map(recipe))
-
-        results.append({
+    return [
+        {
             "tool": tool_id,
             "installed": True,
-            "version": version,
-            "has_update": has_update_cmd,
-        })
-
-    return results
+            "version": versions.get(tool_id),
+            "has_update": bool(get_update_map(TOOL_RECIPES.get(tool_id, {}))),
+        }
+        for tool_id in installed
+    ]
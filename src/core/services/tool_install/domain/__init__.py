@@ -7,9 +7,14 @@ NO network calls. Pure input→output.
 
 from src.core.services.tool_install.domain.dag import (  # noqa: F401
     _add_implicit_deps,
+    _batch_key,
+    _coalesce_package_steps,
+    _critical_path_priority,
     _enforce_parallel_safety,
     _get_ready_steps,
     _get_step_pm,
+    _merge_package_steps,
+    _step_cost,
     _validate_dag,
 )
 from src.core.services.tool_install.domain.download_helpers import (  # noqa: F401
@@ -2,12 +2,15 @@
 L1 Domain — DAG utilities (pure).
 
 Functions for step dependency management, cycle detection,
-and parallel execution safety.
+parallel execution safety, and scheduling (critical-path priority,
+package-step batching).
 No I/O, no subprocess.
 """
 
 from __future__ import annotations
 
+from src.core.services.tool_install.domain.risk import _RISK_ORDER
+
 
 def _add_implicit_deps(steps: list[dict]) -> list[dict]:
     """Add implicit linear dependencies for steps missing ``depends_on``.
@@ -176,3 +179,175 @@ def _enforce_parallel_safety(steps: list[dict]) -> list[dict]:
         safe.append(step)
 
     return safe
+
+
+# ── Scheduling ──────────────────────────────────────────────────
+
+# Rough per-type cost (seconds) when a step has no ``estimated_seconds``.
+# Only the relative order matters: it ranks ready steps by critical path.
+_STEP_COST: dict[str, float] = {
+    "build": 300.0,
+    "source": 60.0,
+    "tool": 45.0,
+    "packages": 30.0,
+    "repo_setup": 20.0,
+    "github_release": 20.0,
+    "download": 20.0,
+    "install": 15.0,
+    "post_install": 10.0,
+    "service": 5.0,
+    "config": 2.0,
+    "shell_config": 1.0,
+    "verify": 1.0,
+    "cleanup": 1.0,
+    "notification": 0.0,
+}
+
+
+def _step_cost(step: dict) -> float:
+    """Estimated duration of a step (``estimated_seconds`` or type default)."""
+    est = step.get("estimated_seconds")
+    if isinstance(est, (int, float)):
+        return float(est)
+    return _STEP_COST.get(step.get("type", "tool"), 10.0)
+
+
+def _critical_path_priority(steps: list[dict]) -> dict[str, float]:
+    """Longest remaining path (by ``_step_cost``) from each step to a sink.
+
+    A step on the critical path has the highest value; the scheduler
+    starts it first when several steps are ready.
+
+    Args:
+        steps: A validated DAG (``_validate_dag`` returned no errors).
+
+    Returns:
+        ``{step_id: cost of step + longest chain of its dependents}``.
+    """
+    dependents: dict[str, list[str]] = {s["id"]: [] for s in steps}
+    for s in steps:
+        for dep in s.get("depends_on", []):
+            dependents[dep].append(s["id"])
+    by_id = {s["id"]: s for s in steps}
+
+    priority: dict[str, float] = {}
+    # Iterative post-order: a step is scored after all of its dependents
+    for root in by_id:
+        stack = [(root, False)]
+        while stack:
+            sid, expanded = stack.pop()
+            if sid in priority:
+                continue
+            if expanded:
+                tail = max((priority[d] for d in dependents[sid]), default=0.0)
+                priority[sid] = _step_cost(by_id[sid]) + tail
+                continue
+            stack.append((sid, True))
+            stack.extend((d, False) for d in dependents[sid] if d not in priority)
+    return priority
+
+
+def _batch_key(step: dict) -> tuple[str, str, str, bool] | None:
+    """Package-manager lock, real binary and sudo mode of a ``packages``
+    step, else None.
+
+    Only ``packages`` steps are batched: their command is rebuilt from
+    the ``packages`` list, so several can become one install.  The lock
+    (``key[0]``) is normalised (yum → dnf); batching also needs the same
+    declared ``package_manager`` and command binary, so a merged step
+    runs exactly what each member would have.
+    """
+    if step.get("type") != "packages" or not step.get("packages"):
+        return None
+    if step.get("restart_required"):
+        return None             # pauses the plan — keep it a step of its own
+    pm = step.get("package_manager") or _get_step_pm(step)
+    if not pm:
+        return None
+    cmd = step.get("command") or []
+    binary = (cmd[0] if isinstance(cmd, list) else cmd.split()[0]) if cmd else ""
+    return pm, step.get("package_manager") or "", binary, bool(step.get("needs_sudo", True))
+
+
+def _merge_package_steps(batch: list[dict]) -> dict:
+    """One ``packages`` step installing the union of ``batch``'s packages.
+
+    The merged step keeps the first step's ``id``, command and package
+    manager (members share them — see ``_batch_key``) and records every
+    member in ``batch``.  Its timeout is the sum of the members', its
+    risk the highest, and it backs up every member's ``backup_before``.
+    """
+    if len(batch) == 1:
+        return batch[0]
+    first = batch[0]
+    packages: list[str] = []
+    backups: list[str] = []
+    for step in batch:
+        for pkg in step.get("packages", []):
+            if pkg not in packages:
+                packages.append(pkg)
+        for path in step.get("backup_before") or []:
+            if path not in backups:
+                backups.append(path)
+    merged = dict(first)
+    merged.update({
+        "packages": packages,
+        "label": "Install packages: " + ", ".join(packages),
+        "timeout": sum(s.get("timeout", 120) for s in batch),
+        "batch": [m for s in batch for m in s.get("batch", [s["id"]])],
+    })
+    risks = [s["risk"] for s in batch if s.get("risk")]
+    if risks:
+        merged["risk"] = max(risks, key=lambda r: _RISK_ORDER.get(r, 0))
+    if backups:
+        merged["backup_before"] = backups
+    return merged
+
+
+def _coalesce_package_steps(steps: list[dict]) -> list[dict]:
+    """Fuse chains of ``packages`` steps for the same package manager.
+
+    ``B`` is folded into ``A`` when ``B`` depends only on ``A``, ``A``
+    has no other dependent, and both batch under the same key — the
+    shape linear plans produce for back-to-back package installs.
+    Dependents of ``B`` are rewired to ``A``.  (Siblings that become
+    ready together are batched by the scheduler at dispatch time.)
+
+    Args:
+        steps: Steps with ``id`` and ``depends_on`` populated.
+
+    Returns:
+        A new list; merged steps carry ``batch`` (member IDs).
+    """
+    dependents: dict[str, list[str]] = {s["id"]: [] for s in steps}
+    for s in steps:
+        for dep in s.get("depends_on", []):
+            dependents[dep].append(s["id"])
+
+    absorbed: dict[str, str] = {}            # folded step id → head id
+    groups: dict[str, list[dict]] = {}
+    for s in steps:
+        deps = s.get("depends_on", [])
+        key = _batch_key(s)
+        if key and len(deps) == 1:
+            head = absorbed.get(deps[0], deps[0])
+            prev = deps[0]
+            if (head in groups and len(dependents[prev]) == 1
+                    and _batch_key(groups[head][0]) == key):
+                groups[head].append(s)
+                absorbed[s["id"]] = head
+                continue
+        if key:
+            groups[s["id"]] = [s]
+
+    out: list[dict] = []
+    for s in steps:
+        if s["id"] in absorbed:
+            continue
+        if s["id"] in groups and len(groups[s["id"]]) > 1:
+            s = _merge_package_steps(groups[s["id"]])
+        deps = [absorbed.get(d, d) for d in s.get("depends_on", [])]
+        if deps != s.get("depends_on", []):
+            s = {**s, "depends_on": list(dict.fromkeys(deps))}
+        out.append(s)
+    return out
@@ -0,0 +1,253 @@
+"""
+L1 Domain — Compiled failure classifier (pure).
+
+Precompiled form of the handler patterns used by ``handler_matching``.
+Matching used to run ``re.search(pattern, stderr, re.IGNORECASE)`` for
+every handler in every layer against the full stderr — ~130 regex scans
+per failure, each over up to megabytes of compiler output.  Now:
+
+    compile_pattern(p)   each pattern is compiled once per process and
+                         paired with its required literals — one
+                         lowercase substring per top-level alternative
+                         that any match must contain
+    FailureText(stderr)  one failure's stderr, cut to a bounded window
+                         (head + tail) and case-folded once; a pattern
+                         whose literals are all absent is rejected with
+                         ``in`` checks, shared across handlers, without
+                         running the regex
+    warm_up()            compiles every known handler pattern up front
+
+Literal extraction is conservative: an alternative with no literal of
+``MIN_LITERAL`` plain characters (outside groups, classes and optional
+quantifiers) disables the prefilter for that pattern, which then always
+runs its regex.  Results are identical to the plain ``re.search`` —
+``tests/tool_install/test_failure_classifier.py`` checks this against
+every handler's ``example_stderr``.
+
+No I/O, no subprocess, no imports of L2+ modules.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cache
+
+HEAD_WINDOW = 4 * 1024
+TAIL_WINDOW = 64 * 1024
+MIN_LITERAL = 3
+
+# Escapes that consume more than one character or reference groups
+_COMPLEX_ESCAPE = re.compile(r"\\[xuUN0-9]")
+# Inline flags — (?x) would change how literals read
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux-]+[:)]")
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """A handler pattern, compiled, with its prefilter literals.
+
+    ``regex`` is None for an invalid pattern (never matches).
+    ``literals`` is None when the pattern can't be prefiltered.
+    """
+
+    regex: re.Pattern[str] | None
+    literals: tuple[str, ...] | None
+
+
+# ── Literal extraction ──────────────────────────────────────────
+
+def _split_alternatives(pattern: str) -> list[str]:
+    """Split ``pattern`` on ``|`` outside groups and character classes."""
+    parts: list[str] = []
+    depth = 0
+    in_class = False
+    start = 0
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "]":  # []...] — leading ] is literal
+                i += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def _skip_group(alt: str, i: int) -> int:
+    """Index just past the group or class opening at ``alt[i]``."""
+    depth = 0
+    in_class = False
+    while i < len(alt):
+        c = alt[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+                if depth == 0:
+                    return i + 1
+        elif c == "[":
+            in_class = True
+            if alt[i + 1:i + 2] == "]":
+                i += 1
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _longest_literal(alt: str) -> str:
+    """Longest run of characters every match of ``alt`` must contain."""
+    best = run = ""
+    i = 0
+    while i < len(alt):
+        c = alt[i]
+        if c == "\\":
+            nxt = alt[i + 1:i + 2]
+            i += 2
+            if nxt and not nxt.isalnum():
+                run += nxt                  # escaped punctuation: literal
+                continue
+            best, run = max(best, run, key=len), ""   # \s \d \b \w ...
+        elif c in "([":
+            best, run = max(best, run, key=len), ""
+            i = _skip_group(alt, i)
+        elif c in "?*{":
+            # Previous char (if any) is optional: drop it from the run
+            best, run = max(best, run[:-1], key=len), ""
+            i = alt.find("}", i) + 1 if c == "{" else i + 1
+            if i == 0:
+                return ""
+        elif c in "+.^$":
+            best, run = max(best, run, key=len), ""
+            i += 1
+        else:
+            run += c
+            i += 1
+    return max(best, run, key=len)
+
+
+def required_literals(pattern: str) -> tuple[str, ...] | None:
+    """One lowercase literal per top-level alternative, or None.
+
+    Any match of ``pattern`` (case-insensitive) contains at least one of
+    the returned strings.  None means some alternative has no usable
+    literal, so the pattern can't be prefiltered.
+    """
+    if pattern.startswith("(?i)"):     # no-op: matching is case-insensitive
+        pattern = pattern[4:]
+    if _COMPLEX_ESCAPE.search(pattern) or _INLINE_FLAGS.search(pattern):
+        return None
+    literals: list[str] = []
+    for alt in _split_alternatives(pattern):
+        lit = _longest_literal(alt)
+        if len(lit) < MIN_LITERAL or not lit.isascii():
+            return None
+        literals.append(lit.lower())
+    return tuple(dict.fromkeys(literals))
+
+
+@cache
+def compile_pattern(pattern: str) -> CompiledPattern:
+    """Compile a handler pattern once per process."""
+    try:
+        regex = re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return CompiledPattern(None, ())
+    return CompiledPattern(regex, required_literals(pattern))
+
+
+# ── Failure text ────────────────────────────────────────────────
+
+def failure_window(stderr: str) -> str:
+    """The part of ``stderr`` handlers are matched against.
+
+    Short output is returned unchanged.  Long output (compile logs)
+    keeps the first ``HEAD_WINDOW`` and last ``TAIL_WINDOW`` characters,
+    both cut back to whole lines — where the failing command and the
+    final error are.
+    """
+    if len(stderr) <= HEAD_WINDOW + TAIL_WINDOW:
+        return stderr
+    head = stderr[:HEAD_WINDOW]
+    head = head[:head.rfind("\n") + 1] or head
+    tail = stderr[-TAIL_WINDOW:]
+    nl = tail.find("\n")
+    if 0 <= nl < len(tail) - 1:
+        tail = tail[nl + 1:]
+    return head + "\n" + tail
+
+
+def _fold(text: str) -> str:
+    """Case-fold so every character ``re.IGNORECASE`` equates with an
+    ASCII letter contains that letter (``ſ`` → s, ``K`` → k, ``ı`` → i)."""
+    folded = text.casefold()
+    return folded.replace("\u0131", "i") if "\u0131" in folded else folded
+
+
+class FailureText:
+    """One failure's stderr, windowed and case-folded once for matching."""
+
+    __slots__ = ("_lower", "_seen", "text")
+
+    def __init__(self, stderr: str):
+        self.text = failure_window(stderr)
+        self._lower = _fold(self.text)
+        self._seen: dict[str, bool] = {}
+
+    def _contains(self, literal: str) -> bool:
+        hit = self._seen.get(literal)
+        if hit is None:
+            hit = self._seen[literal] = literal in self._lower
+        return hit
+
+    def search(self, pattern: str) -> bool:
+        """``re.search(pattern, text, re.IGNORECASE)``, prefiltered."""
+        compiled = compile_pattern(pattern)
+        if compiled.regex is None:
+            return False
+        if compiled.literals is not None and not any(
+            self._contains(lit) for lit in compiled.literals
+        ):
+            return False
+        return compiled.regex.search(self.text) is not None
+
+
+def warm_up() -> int:
+    """Compile every known handler pattern; returns how many there are."""
+    from src.core.services.tool_install.data.remediation_handlers import (
+        BOOTSTRAP_HANDLERS,
+        INFRA_HANDLERS,
+        METHOD_FAMILY_HANDLERS,
+    )
+    from src.core.services.tool_install.data.tool_failure_handlers import (
+        TOOL_FAILURE_HANDLERS,
+    )
+
+    layers = [BOOTSTRAP_HANDLERS, INFRA_HANDLERS,
+              *METHOD_FAMILY_HANDLERS.values(), *TOOL_FAILURE_HANDLERS.values()]
+    patterns = {h.get("pattern", "") for layer in layers for h in layer}
+    patterns.discard("")
+    for p in patterns:
+        compile_pattern(p)
+    return len(patterns)
@@ -5,12 +5,15 @@ Pattern matching against stderr and exit codes. Cascades through all
 handler layers and collects every matching option — does NOT stop
 at first match.
 
+Patterns go through ``failure_classifier``: compiled once per process,
+prefiltered by required literals, matched against a bounded
+head + tail window of stderr.
+
 No I/O, no subprocess, no imports of L2+ modules.
 """
 
 from __future__ import annotations
 
-import re
 from typing import Any
 
 from src.core.services.tool_install.data.remediation_handlers import (
@@ -21,11 +24,12 @@ from src.core.services.tool_install.data.remediation_handlers import (
 from src.core.services.tool_install.data.tool_failure_handlers import (
     TOOL_FAILURE_HANDLERS,
 )
+from src.core.services.tool_install.domain.failure_classifier import FailureText
 
 
 # ── Single handler match ────────────────────────────────────────
 
-def _matches(handler: dict, stderr: str, exit_code: int) -> bool:
+def _matches(handler: dict, stderr: str | FailureText, exit_code: int) -> bool:
     """Check if a handler's detection criteria match the failure.
 
     A handler matches when:
@@ -38,7 +42,8 @@ def _matches(handler: dict, stderr: str, exit_code: int) -> bool:
 
     Args:
         handler: Handler dict with ``pattern`` and optional ``exit_code``.
-        stderr: stderr output from the failed command.
+        stderr: stderr output from the failed command (or a
+            ``FailureText`` shared across handlers).
         exit_code: Process exit code.
 
     Returns:
@@ -55,10 +60,9 @@ def _matches(handler: dict, stderr: str, exit_code: int) -> bool:
         # Empty pattern: only match if exit_code was specified AND matched
         return handler_exit is not None
 
-    try:
-        return bool(re.search(pattern, stderr, re.IGNORECASE))
-    except re.error:
-        return False
+    if not isinstance(stderr, FailureText):
+        stderr = FailureText(stderr)
+    return stderr.search(pattern)
 
 
 # ── Cascade through all layers ──────────────────────────────────
@@ -96,6 +100,7 @@ def _collect_all_options(
     matched_handlers: list[dict] = []
     merged_options: list[dict] = []
     seen_option_ids: set[str] = set()
+    text = FailureText(stderr)
 
     def _scan_handlers(
         handlers: list[dict],
@@ -103,7 +108,7 @@ def _collect_all_options(
     ) -> None:
         """Scan a list of handlers, collecting matches."""
         for handler in handlers:
-            if not _matches(handler, stderr, exit_code):
+            if not _matches(handler, text, exit_code):
                 continue
 
             # Tag the handler with its source layer
@@ -0,0 +1,323 @@
+"""
+L4 Execution — Content-addressed artifact store + download manager.
+
+Every artifact download (offline ``cache_plan``, live ``download`` and
+``github_release`` steps) goes through here:
+
+    fetch(url, checksum)     one streaming pass: the body is hashed as it
+                             is written, verified, then renamed into the
+                             store under its sha256 — no re-read to hash
+    already stored           a ``sha256:`` checksum that is in the store
+                             returns immediately (no network)
+    interrupted              the ``.part`` file is kept; the next fetch
+                             resumes with ``Range`` (+ ``If-Range`` so a
+                             changed upstream file restarts from zero)
+    fetch_many(requests)     concurrent, at most ``PER_HOST`` connections
+                             per host and ``MAX_WORKERS`` overall
+
+Store layout (under the offline cache directory)::
+
+    store/
+    ├── sha256/ab/ab12…ef        ← blobs, named by content
+    └── partial/<url-hash>.part  ← in-flight downloads (+ .json validators)
+
+The same bytes fetched from two URLs are stored once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+PER_HOST = 4
+CHUNK = 256 * 1024
+USER_AGENT = "devops-cp/1.0"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one ``fetch``."""
+
+    ok: bool
+    url: str
+    sha256: str = ""
+    path: str = ""
+    size_bytes: int = 0
+    resumed_from: int = 0
+    from_store: bool = False
+    error: str = ""
+
+    def to_dict(self) -> dict:
+        if not self.ok:
+            return {"ok": False, "url": self.url, "error": self.error}
+        return {
+            "ok": True,
+            "url": self.url,
+            "sha256": self.sha256,
+            "path": self.path,
+            "size_bytes": self.size_bytes,
+            "resumed_from": self.resumed_from,
+            "from_store": self.from_store,
+        }
+
+
+def _split_checksum(checksum: str | None) -> tuple[str, str] | None:
+    """``"sha256:AB…"`` → ``("sha256", "ab…")``; bare hex is sha256."""
+    if not checksum:
+        return None
+    algo, sep, digest = checksum.partition(":")
+    if not sep:
+        algo, digest = "sha256", checksum
+    return algo.lower(), digest.strip().lower()
+
+
+class ArtifactStore:
+    """Content-addressed blob store with resumable, hash-while-streaming fetches."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ── Blobs ───────────────────────────────────────────────────
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "sha256" / sha256[:2] / sha256
+
+    def has(self, sha256: str) -> bool:
+        return self.blob_path(sha256).is_file()
+
+    def _commit(self, tmp: Path, sha256: str) -> Path:
+        """Move a fully written + verified file into the store (dedupe)."""
+        dest = self.blob_path(sha256)
+        if dest.exists():
+            tmp.unlink(missing_ok=True)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+        return dest
+
+    def add_file(self, path: Path) -> str:
+        """Hash an existing file into the store (copy); returns its sha256."""
+        tmp = self._partial_path(f"file://{Path(path).resolve()}").with_suffix(".ingest")
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        with open(path, "rb") as src, open(tmp, "wb") as out:
+            for chunk in iter(lambda: src.read(CHUNK), b""):
+                hasher.update(chunk)
+                out.write(chunk)
+        sha = hasher.hexdigest()
+        self._commit(tmp, sha)
+        return sha
+
+    def materialize(self, sha256: str, dest: Path) -> Path:
+        """Copy a blob to ``dest`` (a private copy — blobs are shared)."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+        shutil.copyfile(self.blob_path(sha256), tmp)
+        os.replace(tmp, dest)
+        return dest
+
+    # ── Partial downloads ───────────────────────────────────────
+
+    def _partial_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        return self.root / "partial" / f"{key}.part"
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(url, threading.Lock())
+
+    # ── Fetch ───────────────────────────────────────────────────
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        checksum: str | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: int = 60,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> FetchResult:
+        """Download ``url`` into the store, verifying ``checksum`` (``algo:hex``).
+
+        ``progress(downloaded, total)`` is called per chunk (total may be 0).
+        Concurrent fetches of the same URL are serialized; the second one
+        finds the blob already stored when a ``sha256`` checksum is given.
+        """
+        expected = _split_checksum(checksum)
+        if expected and expected[0] == "sha256" and self.has(expected[1]):
+            blob = self.blob_path(expected[1])
+            return FetchResult(True, url, expected[1], str(blob),
+                               blob.stat().st_size, from_store=True)
+        if expected and expected[0] not in hashlib.algorithms_available:
+            return FetchResult(False, url, error=f"Unsupported checksum algorithm: {expected[0]}")
+
+        with self._lock_for(url):
+            if expected and expected[0] == "sha256" and self.has(expected[1]):
+                blob = self.blob_path(expected[1])
+                return FetchResult(True, url, expected[1], str(blob),
+                                   blob.stat().st_size, from_store=True)
+            try:
+                try:
+                    return self._fetch(url, expected, headers or {}, timeout, progress)
+                except urllib.error.HTTPError as exc:
+                    if exc.code != 416:
+                        raise
+                    # Range not satisfiable: the kept prefix is unusable
+                    self._partial_path(url).unlink(missing_ok=True)
+                    return self._fetch(url, expected, headers or {}, timeout, progress)
+            except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as exc:
+                # .part is kept: the next fetch resumes from where this stopped
+                return FetchResult(False, url, error=f"Download failed: {exc}")
+
+    def _fetch(
+        self,
+        url: str,
+        expected: tuple[str, str] | None,
+        headers: dict[str, str],
+        timeout: int,
+        progress: Callable[[int, int], None] | None,
+    ) -> FetchResult:
+        part = self._partial_path(url)
+        meta_path = part.with_suffix(".json")
+        part.parent.mkdir(parents=True, exist_ok=True)
+
+        offset = part.stat().st_size if part.exists() else 0
+        meta: dict = {}
+        if offset:
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                meta = {}
+
+        req_headers = {"User-Agent": USER_AGENT, **headers}
+        validator = meta.get("etag") or meta.get("last_modified")
+        # Resume only when a splice is detectable: the server confirms the
+        # file is unchanged (If-Range), or the checksum is checked at the end
+        if offset and (validator or expected) and not url.startswith("file:"):
+            req_headers["Range"] = f"bytes={offset}-"
+            if validator:
+                req_headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        req = urllib.request.Request(url, headers=req_headers)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            status = resp.getcode() or 200
+            start = _range_start(resp.headers.get("Content-Range", "")) if status == 206 else 0
+            if status != 206 or start != offset:
+                offset = 0
+            length = int(resp.headers.get("Content-Length") or 0)
+            total = offset + length if length else 0
+
+            sha = hashlib.sha256()
+            extra = (hashlib.new(expected[0])
+                     if expected and expected[0] != "sha256" else None)
+            if offset:
+                # hashlib state can't be persisted: re-hash the kept prefix once
+                with open(part, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK), b""):
+                        sha.update(chunk)
+                        if extra:
+                            extra.update(chunk)
+                logger.info("Resuming %s at %d bytes", url, offset)
+
+            meta_path.write_text(json.dumps({
+                "url": url,
+                "etag": resp.headers.get("ETag", ""),
+                "last_modified": resp.headers.get("Last-Modified", ""),
+            }))
+            done = offset
+            with open(part, "ab" if offset else "wb") as out:
+                while True:
+                    chunk = resp.read(CHUNK)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    sha.update(chunk)
+                    if extra:
+                        extra.update(chunk)
+                    done += len(chunk)
+                    if progress:
+                        progress(done, total)
+
+        if total and done < total:
+            return FetchResult(False, url, error=f"Download incomplete: {done}/{total} bytes")
+
+        digest = sha.hexdigest()
+        if expected:
+            actual = digest if extra is None else extra.hexdigest()
+            if actual != expected[1]:
+                part.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+                return FetchResult(
+                    False, url,
+                    error=f"Checksum mismatch: expected {expected[1]}, got {actual}",
+                )
+
+        blob = self._commit(part, digest)
+        meta_path.unlink(missing_ok=True)
+        return FetchResult(True, url, digest, str(blob), done, resumed_from=offset)
+
+    def fetch_many(
+        self,
+        requests: Iterable[dict],
+        *,
+        workers: int = MAX_WORKERS,
+        per_host: int = PER_HOST,
+    ) -> list[FetchResult]:
+        """``fetch`` many artifacts concurrently, in request order.
+
+        Each request is ``{"url": ..., "checksum"?: ..., "headers"?: ...}``.
+        At most ``per_host`` connections are open to any one host.
+        """
+        reqs = list(requests)
+        if not reqs:
+            return []
+        host_slots: dict[str, threading.BoundedSemaphore] = {}
+        for r in reqs:
+            host = urllib.parse.urlsplit(r["url"]).netloc
+            host_slots.setdefault(host, threading.BoundedSemaphore(per_host))
+
+        def run(r: dict) -> FetchResult:
+            with host_slots[urllib.parse.urlsplit(r["url"]).netloc]:
+                return self.fetch(
+                    r["url"], checksum=r.get("checksum"),
+                    headers=r.get("headers"), timeout=r.get("timeout", 60),
+                )
+
+        with ThreadPoolExecutor(min(workers, len(reqs))) as pool:
+            return list(pool.map(run, reqs))
+
+
+def _range_start(content_range: str) -> int:
+    """First byte of ``Content-Range: bytes 100-199/200`` (-1 if unparseable)."""
+    try:
+        unit, _, spec = content_range.partition(" ")
+        return int(spec.split("-", 1)[0]) if unit == "bytes" else -1
+    except ValueError:
+        return -1
+
+
+def default_store() -> ArtifactStore:
+    """The store shared by ``cache_plan`` and live installs."""
+    from src.core.services.tool_install.execution.offline_cache import get_cache_dir
+
+    return ArtifactStore(get_cache_dir() / "store")
@@ -13,6 +13,9 @@ import platform
 import re
 import subprocess
 from pathlib import Path
+from typing import Any
+
+from src.core.services.tool_install.data.constants import _IARCH_MAP
 
 logger = logging.getLogger(__name__)
 
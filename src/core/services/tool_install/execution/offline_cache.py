@@ -4,24 +4,31 @@ L4 Execution — Offline / airgapped install cache.
 L14: Pre-download plan artifacts to a local cache so installations
 can proceed without network access. Supports binary downloads,
 pip wheels, npm tarballs, and generic URLs.
+
+Downloaded artifacts live in the content-addressed store
+(``<cache>/store``, see ``artifact_store.py``) shared with live
+installs; a plan's downloads are fetched concurrently.
 """
 
 from __future__ import annotations
 
-import hashlib
 import json
 import logging
 import os
 import shutil
-import subprocess
 from pathlib import Path
 from typing import Any
 
+from src.core.services.tool_install.execution.artifact_store import ArtifactStore
+
 logger = logging.getLogger(__name__)
 
 # Default cache directory — under the project's .state directory
 _DEFAULT_CACHE_DIR = Path.home() / ".cache" / "devops-cp" / "install-cache"
 
+# Content-addressed artifact store, inside the cache directory
+STORE_DIR = "store"
+
 
 def get_cache_dir() -> Path:
     """Return (and create if needed) the offline install cache directory."""
@@ -72,6 +79,7 @@ def cache_plan(
 
     artifacts: list[dict] = []
     failed: list[dict] = []
+    downloads: list[tuple[str, dict]] = []
 
     for i, step in enumerate(plan.get("steps", [])):
         step_id = step.get("id", f"step_{i}")
@@ -99,23 +107,11 @@ def cache_plan(
                     failed.append({"step_id": step_id, "error": dl["error"]})
                 continue
 
-        # download steps (data packs, binaries)
+        # download steps (data packs, binaries) — fetched together below
         if step_type == "download":
             url = step.get("url", "")
             if url:
-                dest = tool_cache / f"{step_id}_{Path(url).name}"
-                result = _download_to_cache(url, dest, step.get("checksum"))
-                if result["ok"]:
-                    artifacts.append({
-                        "step_id": step_id,
-                        "type": "download",
-                        "url": url,
-                        "path": str(dest),
-                        "sha256": result["sha256"],
-                        "size_bytes": result["size_bytes"],
-                    })
-                else:
-                    failed.append({"step_id": step_id, "error": result["error"]})
+                downloads.append((step_id, {"url": url, "checksum": step.get("checksum")}))
 
         # github_release steps
         if step_type == "github_release":
@@ -131,6 +127,23 @@ def cache_plan(
                             "use cache_github_release() for explicit versions.",
                 })
 
+    # Concurrent, resumable, hashed while streaming, deduped by sha256
+    if downloads:
+        store = ArtifactStore(cdir / STORE_DIR)
+        results = store.fetch_many(req for _, req in downloads)
+        for (step_id, req), result in zip(downloads, results, strict=True):
+            if result.ok:
+                artifacts.append({
+                    "step_id": step_id,
+                    "type": "download",
+                    "url": req["url"],
+                    "path": result.path,
+                    "sha256": result.sha256,
+                    "size_bytes": result.size_bytes,
+                })
+            else:
+                failed.append({"step_id": step_id, "error": result.error})
+
     # Write manifest
     manifest = {
         "tool": tool,
@@ -208,8 +221,11 @@ def install_from_cache(
         return step
 
     if atype == "download":
-        # Point download step at local file
+        # Point download step at local file; with its sha256 the step is
+        # served straight from the artifact store
         step = {**step, "url": f"file://{path}", "_cached": True}
+        if not step.get("checksum") and cached_artifact.get("sha256"):
+            step["checksum"] = f"sha256:{cached_artifact['sha256']}"
         return step
 
     return step
@@ -221,6 +237,9 @@ def clear_cache(
 ) -> dict:
     """Clear the install cache for a specific tool or all tools.
 
+    Artifact store blobs are shared between tools, so they are only
+    removed when clearing everything.
+
     Args:
         tool: Tool ID to clear, or None to clear everything.
         cache_dir: Override cache directory.
@@ -251,11 +270,13 @@ def cache_status(cache_dir: Path | None = None) -> dict:
         {
             "cache_dir": "/home/user/.cache/devops-cp/install-cache",
             "tools": {"kubectl": {"files": 3, "size_mb": 12.3}, ...},
+            "store": {"files": 5, "size_mb": 40.1},
             "total_size_mb": 45.6,
         }
     """
     cdir = cache_dir or get_cache_dir()
     tools: dict[str, dict] = {}
+    store: dict = {"files": 0, "size_mb": 0.0}
     total_bytes = 0
 
     if cdir.exists():
@@ -263,56 +284,19 @@ def cache_status(cache_dir: Path | None = None) -> dict:
             if item.is_dir():
                 files = list(item.rglob("*"))
                 size = sum(f.stat().st_size for f in files if f.is_file())
-                tools[item.name] = {
+                entry = {
                     "files": len([f for f in files if f.is_file()]),
                     "size_mb": round(size / (1024 * 1024), 1),
                 }
+                if item.name == STORE_DIR:
+                    store = entry
+                else:
+                    tools[item.name] = entry
                 total_bytes += size
 
     return {
         "cache_dir": str(cdir),
         "tools": tools,
+        "store": store,
         "total_size_mb": round(total_bytes / (1024 * 1024), 1),
     }
-
-
-# ── Private helpers ───────────────────────────────────────
-
-def _download_to_cache(
-    url: str,
-    dest: Path,
-    expected_checksum: str | None = None,
-    timeout: int = 60,
-) -> dict:
-    """Download a URL to a local file with optional checksum verification."""
-    try:
-        result = subprocess.run(
-            ["curl", "-fsSL", "--max-time", str(timeout), "-o", str(dest), url],
-            capture_output=True, text=True, timeout=timeout + 10,
-        )
-        if result.returncode != 0:
-            return {"ok": False, "error": f"curl failed: {result.stderr[:200]}"}
-
-        # Compute checksum
-        hasher = hashlib.sha256()
-        with open(dest, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
-        actual_sha = hasher.hexdigest()
-
-        if expected_checksum:
-            expected = expected_checksum.removeprefix("sha256:").lower()
-            if actual_sha != expected:
-                dest.unlink(missing_ok=True)
-                return {
-                    "ok": False,
-                    "error": f"Checksum mismatch: expected {expected}, got {actual_sha}",
-                }
-
-        return {
-            "ok": True,
-            "sha256": actual_sha,
-            "size_bytes": dest.stat().st_size,
-        }
-    except (subprocess.TimeoutExpired, OSError) as exc:
-        return {"ok": False, "error": str(exc)}
@@ -21,6 +21,8 @@ from src.core.services.tool_install.data.recipes import TOOL_RECIPES
 from src.core.services.tool_install.data.undo_catalog import UNDO_COMMANDS
 from src.core.services.tool_install.detection.system_deps import check_system_deps
 from src.core.services.tool_install.detection.tool_version import get_tool_version
+from src.core.services.tool_install.domain.download_helpers import _fmt_size
+from src.core.services.tool_install.execution.download import _resolve_github_release_url
 from src.core.services.tool_install.execution.script_verify import (
     is_curl_pipe_command,
     extract_script_url,
@@ -243,12 +245,14 @@ def _execute_download_step(
 ) -> dict[str, Any]:
     """Download a data pack with disk space check, resume, and checksum verification.
 
-    Supports:
-      - **Resume**: If a partial file exists, attempts to resume via
-        HTTP Range header instead of re-downloading.
+    Goes through the shared artifact store (``artifact_store.py``):
+
+      - **Resume**: An interrupted download is kept as a partial file in
+        the store and resumed via HTTP ``Range`` on the next attempt.
       - **Progress**: Logs download progress every 5%.
       - **Disk check**: Verifies sufficient free disk space.
-      - **Checksum**: Verifies integrity after download.
+      - **Checksum**: Verified while streaming (no second pass); a
+        ``sha256:`` checksum already in the store skips the network.
 
     Step format::
 
@@ -261,7 +265,7 @@ def _execute_download_step(
             "checksum": "sha256:abc123...",
         }
     """
-    import urllib.request
+    from src.core.services.tool_install.execution.artifact_store import default_store
 
     url = step.get("url", "")
     if not url:
@@ -285,97 +289,63 @@ def _execute_download_step(
         except OSError:
             pass  # Can't check — proceed anyway
 
-    # Create dest directory
-    dest.parent.mkdir(parents=True, exist_ok=True)
+    headers: dict[str, str] = {}
+
+    # ── Auth header for gated downloads ──
+    auth_type = step.get("auth_type")  # "bearer", "basic", "header"
+    auth_token = step.get("auth_token", "")
+    auth_env_var = step.get("auth_env_var", "")
+
+    if auth_type and not auth_token and auth_env_var:
+        auth_token = os.environ.get(auth_env_var, "")
+
+    if auth_type and auth_token:
+        if auth_type == "bearer":
+            headers["Authorization"] = f"Bearer {auth_token}"
+        elif auth_type == "basic":
+            headers["Authorization"] = f"Basic {auth_token}"
+        elif auth_type == "header":
+            # Custom header name, e.g. "X-API-Key"
+            header_name = step.get("auth_header_name", "Authorization")
+            headers[header_name] = auth_token
+
+    last_progress = [-5]
+
+    def _progress(downloaded: int, total: int) -> None:
+        # Progress tracking (log every 5%)
+        if total > 0:
+            pct = int(downloaded * 100 / total)
+            if pct >= last_progress[0] + 5:
+                last_progress[0] = pct
+                logger.info(
+                    "Download progress: %d%% (%s / %s)",
+                    pct, _fmt_size(downloaded), _fmt_size(total),
+                )
 
-    # ── Resume support ──
-    resume_offset = 0
-    if dest.exists():
-        resume_offset = dest.stat().st_size
-        logger.info("Partial file found: %s (%s), attempting resume",
-                     dest, _fmt_size(resume_offset))
+    store = default_store()
+    fetched = store.fetch(url, checksum=checksum, headers=headers, progress=_progress)
+    if not fetched.ok:
+        if fetched.error.startswith("Checksum mismatch"):
+            return {"ok": False, "error": "Checksum mismatch — download corrupted"}
+        return {"ok": False, "error": fetched.error}
 
-    # Download
     try:
-        headers = {"User-Agent": "devops-cp/1.0"}
-
-        # ── Auth header for gated downloads ──
-        auth_type = step.get("auth_type")  # "bearer", "basic", "header"
-        auth_token = step.get("auth_token", "")
-        auth_env_var = step.get("auth_env_var", "")
-
-        if auth_type and not auth_token and auth_env_var:
-            auth_token = os.environ.get(auth_env_var, "")
-
-        if auth_type and auth_token:
-            if auth_type == "bearer":
-                headers["Authorization"] = f"Bearer {auth_token}"
-            elif auth_type == "basic":
-                headers["Authorization"] = f"Basic {auth_token}"
-            elif auth_type == "header":
-                # Custom header name, e.g. "X-API-Key"
-                header_name = step.get("auth_header_name", "Authorization")
-                headers[header_name] = auth_token
-
-        if resume_offset > 0:
-            headers["Range"] = f"bytes={resume_offset}-"
-
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            # Check if server supports resume
-            status = resp.getcode()
-            if resume_offset > 0 and status == 206:
-                # Partial content — resume
-                mode = "ab"
-                total = int(resp.headers.get("Content-Length", 0)) + resume_offset
-                logger.info("Resuming download from %s", _fmt_size(resume_offset))
-            else:
-                # Full download (server doesn't support Range, or fresh start)
-                mode = "wb"
-                total = int(resp.headers.get("Content-Length", 0))
-                resume_offset = 0
-
-            with open(dest, mode) as f:
-                downloaded = resume_offset
-                last_progress = -1
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-
-                    # Progress tracking (log every 5%)
-                    if total > 0:
-                        pct = int(downloaded * 100 / total)
-                        if pct >= last_progress + 5:
-                            last_progress = pct
-                            logger.info(
-                                "Download progress: %d%% (%s / %s)",
-                                pct, _fmt_size(downloaded), _fmt_size(total),
-                            )
-
-        # Verify checksum if provided
-        if checksum:
-            if not _verify_checksum(dest, checksum):
-                dest.unlink(missing_ok=True)
-                return {"ok": False, "error": "Checksum mismatch — download corrupted"}
-
-        # Record download timestamp for freshness tracking
-        stamp_dir = Path("~/.cache/devops-cp/data-stamps").expanduser()
-        stamp_dir.mkdir(parents=True, exist_ok=True)
-        step_id = step.get("data_pack_id", dest.stem)
-        (stamp_dir / step_id).write_text(str(int(time.time())))
+        store.materialize(fetched.sha256, dest)
+    except OSError as e:
+        return {"ok": False, "error": f"Download failed: {e}"}
 
-        return {
-            "ok": True,
-            "message": f"Downloaded {_fmt_size(downloaded)} to {dest}",
-            "size_bytes": downloaded,
-        }
+    # Record download timestamp for freshness tracking
+    stamp_dir = Path("~/.cache/devops-cp/data-stamps").expanduser()
+    stamp_dir.mkdir(parents=True, exist_ok=True)
+    step_id = step.get("data_pack_id", dest.stem)
+    (stamp_dir / step_id).write_text(str(int(time.time())))
 
-    except Exception as e:
-        dest.unlink(missing_ok=True)
-        return {"ok": False, "error": f"Download failed: {e}"}
+    return {
+        "ok": True,
+        "message": f"Downloaded {_fmt_size(fetched.size_bytes)} to {dest}",
+        "size_bytes": fetched.size_bytes,
+        "sha256": fetched.sha256,
+    }
 
 
 def _execute_service_step(
@@ -667,7 +637,6 @@ def _execute_github_release_step(
     Returns:
         ``{"ok": True, "version": "...", "path": "..."}``
     """
-    import urllib.request
     import tarfile
     import zipfile
 
@@ -703,33 +672,21 @@ def _execute_github_release_step(
     asset_name = resolved.get("asset_name", "")
     actual_version = resolved.get("version", version)
 
-    # Download to temp
+    # Download into the shared artifact store (checksum verified while streaming)
     tmp_dir = Path(f"/tmp/gh_release_{repo.replace('/', '_')}")
     tmp_dir.mkdir(parents=True, exist_ok=True)
-    tmp_file = tmp_dir / asset_name
 
-    try:
-        req = urllib.request.Request(
-            url, headers={"User-Agent": "devops-cp/1.0"},
-        )
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            with open(tmp_file, "wb") as f:
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-    except Exception as exc:
-        return {"ok": False, "error": f"Download failed: {exc}"}
-
-    # Checksum verify
-    checksum = step.get("checksum", "")
-    if checksum:
-        if not _verify_checksum(tmp_file, checksum):
+    from src.core.services.tool_install.execution.artifact_store import default_store
+
+    fetched = default_store().fetch(url, checksum=step.get("checksum") or None)
+    if not fetched.ok:
+        if fetched.error.startswith("Checksum mismatch"):
             return {
                 "ok": False,
                 "error": f"Checksum mismatch for {asset_name}",
             }
+        return {"ok": False, "error": fetched.error}
+    tmp_file = Path(fetched.path)
 
     # Extract or copy
     extract_dir = tmp_dir / "extracted"
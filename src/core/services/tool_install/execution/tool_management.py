@@ -10,6 +10,7 @@ import logging
 import shutil
 from typing import Any
 
+from src.core.services import tool_inventory
 from src.core.services.tool_install.data.recipes import TOOL_RECIPES
 from src.core.services.tool_install.data.undo_catalog import UNDO_COMMANDS
 from src.core.services.tool_install.detection.tool_version import get_tool_version
@@ -86,7 +87,9 @@ def update_tool(
         )
         return result
 
-    # Record version after update
+    # Record version after update — `python -m pip`-style tools keep the
+    # same binary across upgrades, so don't trust the cached probe
+    tool_inventory.invalidate()
     version_after = get_tool_version(tool)
 
     if version_before and version_after and version_before == version_after:
@@ -20,7 +20,13 @@ from src.core.services.audit_helpers import make_auditor
 
 from src.core.services.tool_install.data.recipes import TOOL_RECIPES
 from src.core.services.tool_install.domain.dag import (
-    _add_implicit_deps, _validate_dag, _get_ready_steps, _enforce_parallel_safety,
+    _add_implicit_deps,
+    _batch_key,
+    _coalesce_package_steps,
+    _critical_path_priority,
+    _get_step_pm,
+    _merge_package_steps,
+    _validate_dag,
 )
 from src.core.services.tool_install.domain.restart import detect_restart_needs, _batch_restarts
 from src.core.services.tool_install.domain.risk import _infer_risk
@@ -56,6 +62,9 @@ logger = logging.getLogger(__name__)
 
 _audit = make_auditor("audit")
 
+# Worker threads shared by all steps of one ``execute_plan_dag`` run.
+DAG_MAX_WORKERS = 4
+
 
 def execute_plan_step(
     step: dict,
@@ -402,12 +411,17 @@ def execute_plan_dag(
     *,
     sudo_password: str = "",
     on_progress: Any = None,
+    max_workers: int = DAG_MAX_WORKERS,
 ) -> dict[str, Any]:
     """Execute a plan with DAG-aware parallel step support.
 
-    Steps with ``depends_on`` run after their dependencies.
-    Independent steps run concurrently (via threads).
-    Package manager steps are serialized to avoid lock conflicts.
+    Steps with ``depends_on`` run after their dependencies.  A step is
+    dispatched to a shared worker pool as soon as its own dependencies
+    finish (no wave barrier); among ready steps the one with the
+    longest remaining critical path goes first.  Steps that use the
+    same package manager never overlap (lock), and ``packages`` steps
+    for the same manager are batched into one install — chains up
+    front (``_coalesce_package_steps``), ready siblings at dispatch.
 
     Falls back to linear execution for plans without ``depends_on``.
 
@@ -418,12 +432,16 @@ def execute_plan_dag(
         sudo_password: Password for sudo steps.
         on_progress: Optional callback ``(step_id, status)`` for
                      progress reporting.
+        max_workers: Upper bound on concurrently running steps.
 
     Returns:
         ``{"ok": True, "completed": [...], ...}`` on full success,
         ``{"ok": False, "failed": [...], ...}`` on any failure.
+        Both carry ``timings`` (``{step_id: {start_ms, end_ms,
+        elapsed_ms}}``, relative to plan start) and ``makespan_ms``.
     """
     import concurrent.futures
+    import heapq
 
     steps = list(plan["steps"])  # Shallow copy
     steps = _add_implicit_deps(steps)
@@ -433,111 +451,176 @@ def execute_plan_dag(
     if dag_errors:
         return {"ok": False, "error": f"Invalid plan: {', '.join(dag_errors)}"}
 
-    # Build step lookup
-    step_by_id = {s["id"]: s for s in steps}
+    nodes = _coalesce_package_steps(steps)
+    node_by_id = {n["id"]: n for n in nodes}
+    priority = _critical_path_priority(nodes)
+    order = {n["id"]: i for i, n in enumerate(nodes)}
+    dependents: dict[str, list[str]] = {n["id"]: [] for n in nodes}
+    waiting: dict[str, int] = {}
+    for n in nodes:
+        waiting[n["id"]] = len(n["depends_on"])
+        for dep in n["depends_on"]:
+            dependents[dep].append(n["id"])
 
     completed: set[str] = set()
     failed: set[str] = set()
     results: dict[str, dict] = {}
+    timings: dict[str, dict[str, float]] = {}
 
     plan_id = plan.get("plan_id", str(_uuid_mod.uuid4()))
+    t0 = time.monotonic()
+
+    def _members(node: dict) -> list[str]:
+        return node.get("batch", [node["id"]])
+
+    def _notify(node: dict, status: str) -> None:
+        if on_progress:
+            for sid in _members(node):
+                on_progress(sid, status)
 
-    while len(completed) + len(failed) < len(steps):
-        ready = _get_ready_steps(steps, completed, set())
+    def _pm(node: dict) -> str | None:
+        key = _batch_key(node)
+        return key[0] if key else _get_step_pm(node)
 
-        if not ready:
-            # All remaining steps are blocked by failures
-            break
+    ready: list[tuple[float, int, str]] = []
 
-        # Filter out steps blocked by failed dependencies
-        runnable: list[dict] = []
-        for step in ready:
-            deps = step.get("depends_on", [])
-            if any(d in failed for d in deps):
-                failed.add(step["id"])
-                results[step["id"]] = {
+    def _push(nid: str) -> None:
+        heapq.heappush(ready, (-priority[nid], order[nid], nid))
+
+    def _skip_dependents(nid: str) -> None:
+        stack = list(dependents[nid])
+        while stack:
+            dep = node_by_id[stack.pop()]
+            if dep["id"] in failed:
+                continue
+            failed.add(dep["id"])
+            for sid in _members(dep):
+                failed.add(sid)
+                results[sid] = {
                     "ok": False, "skipped": True,
                     "reason": "dependency failed",
                 }
-                if on_progress:
-                    on_progress(step["id"], "skipped")
-                continue
-            runnable.append(step)
+            _notify(dep, "skipped")
+            stack.extend(dependents[dep["id"]])
 
-        if not runnable:
-            break
-
-        # Check parallelism safety
-        if len(runnable) > 1:
-            runnable = _enforce_parallel_safety(runnable)
-
-        # Execute: single step → inline, multiple → threaded
-        if len(runnable) == 1:
-            step = runnable[0]
-            if on_progress:
-                on_progress(step["id"], "started")
+    def _run(step: dict) -> tuple[dict, float, float]:
+        started = time.monotonic()
+        try:
             result = execute_plan_step(step, sudo_password=sudo_password)
-            results[step["id"]] = result
-
-            if result.get("ok"):
-                completed.add(step["id"])
-                if on_progress:
-                    on_progress(step["id"], "done")
-            else:
-                failed.add(step["id"])
-                if on_progress:
-                    on_progress(step["id"], "failed")
-
-            # Check restart_required — pause plan
-            if result.get("ok") and step.get("restart_required"):
-                save_plan_state({
-                    "plan_id": plan_id,
-                    "tool": plan.get("tool", ""),
-                    "status": "paused",
-                    "pause_reason": f"{step['restart_required']}_restart",
-                    "current_step": step["id"],
-                    "completed_steps": list(completed),
-                    "steps": steps,
-                })
-                return {
-                    "ok": False,
-                    "paused": True,
-                    "pause_reason": step["restart_required"],
-                    "pause_message": step.get(
-                        "restart_message",
-                        f"A {step['restart_required']} restart is required.",
-                    ),
-                    "plan_id": plan_id,
-                    "completed": list(completed),
-                    "results": results,
-                }
-        else:
-            # Parallel execution via thread pool
-            def _exec_step(s: dict) -> tuple[dict, dict]:
-                """Execute a single step, returning (step, result)."""
-                return s, execute_plan_step(s, sudo_password=sudo_password)
-
-            for step in runnable:
-                if on_progress:
-                    on_progress(step["id"], "started")
-
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=len(runnable),
-            ) as pool:
-                futures = {
-                    pool.submit(_exec_step, s): s for s in runnable
-                }
-                for future in concurrent.futures.as_completed(futures):
-                    step, result = future.result()
-                    results[step["id"]] = result
+        except Exception as exc:
+            logger.exception("DAG step %s raised", step["id"])
+            result = {"ok": False, "error": str(exc)}
+        return result, started, time.monotonic()
+
+    for n in nodes:
+        if not waiting[n["id"]]:
+            _push(n["id"])
+
+    running: dict[concurrent.futures.Future, list[dict]] = {}
+    pm_busy: set[str] = set()
+    paused: dict | None = None
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(nodes))),
+    ) as pool:
+        while True:
+            # ── Dispatch ready steps, highest critical path first ──
+            deferred: list[tuple[float, int, str]] = []
+            while paused is None and ready and len(running) < max_workers:
+                entry = heapq.heappop(ready)
+                node = node_by_id[entry[2]]
+                pm = _pm(node)
+                if pm and pm in pm_busy:
+                    deferred.append(entry)
+                    continue
+                group = [node]
+                key = _batch_key(node)
+                if key:
+                    # Same-manager package steps that are ready now → one install
+                    siblings = [e for e in ready if _batch_key(node_by_id[e[2]]) == key]
+                    if siblings:
+                        group += [node_by_id[e[2]] for e in siblings]
+                        ready[:] = [e for e in ready if e not in siblings]
+                        heapq.heapify(ready)
+                step = _merge_package_steps(group)
+                if pm:
+                    pm_busy.add(pm)
+                for n in group:
+                    _notify(n, "started")
+                running[pool.submit(_run, step)] = group
+            for entry in deferred:
+                heapq.heappush(ready, entry)
+
+            if not running:
+                break
+
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                group = running.pop(future)
+                result, started, ended = future.result()
+                pm = _pm(group[0])
+                if pm:
+                    pm_busy.discard(pm)
+                batch = [sid for n in group for sid in _members(n)]
+                for sid in batch:
+                    timings[sid] = {
+                        "start_ms": round((started - t0) * 1000, 1),
+                        "end_ms": round((ended - t0) * 1000, 1),
+                        "elapsed_ms": round((ended - started) * 1000, 1),
+                    }
+                    results[sid] = (
+                        {**result, "batched_with": batch} if len(batch) > 1 else result
+                    )
+                logger.info(
+                    "DAG step %s %s in %.0f ms",
+                    "+".join(batch), "ok" if result.get("ok") else "failed",
+                    (ended - started) * 1000,
+                )
+
+                for node in group:
                     if result.get("ok"):
-                        completed.add(step["id"])
-                        if on_progress:
-                            on_progress(step["id"], "done")
+                        completed.update(_members(node))
+                        _notify(node, "done")
+                        for dep in dependents[node["id"]]:
+                            waiting[dep] -= 1
+                            if not waiting[dep] and dep not in failed:
+                                _push(dep)
+                        # Check restart_required — stop dispatching, pause plan
+                        if node.get("restart_required") and paused is None:
+                            paused = node
                     else:
-                        failed.add(step["id"])
-                        if on_progress:
-                            on_progress(step["id"], "failed")
+                        failed.update(_members(node))
+                        _notify(node, "failed")
+                        _skip_dependents(node["id"])
+
+    makespan_ms = round((time.monotonic() - t0) * 1000, 1)
+
+    if paused is not None:
+        save_plan_state({
+            "plan_id": plan_id,
+            "tool": plan.get("tool", ""),
+            "status": "paused",
+            "pause_reason": f"{paused['restart_required']}_restart",
+            "current_step": paused["id"],
+            "completed_steps": list(completed),
+            "steps": steps,
+        })
+        return {
+            "ok": False,
+            "paused": True,
+            "pause_reason": paused["restart_required"],
+            "pause_message": paused.get(
+                "restart_message",
+                f"A {paused['restart_required']} restart is required.",
+            ),
+            "plan_id": plan_id,
+            "completed": list(completed),
+            "results": results,
+            "timings": timings,
+            "makespan_ms": makespan_ms,
+        }
 
     # Save final state
     final_status = "done" if not failed else "failed"
@@ -548,6 +631,7 @@ def execute_plan_dag(
         "completed_steps": list(completed),
         "failed_steps": list(failed),
         "steps": steps,
+        "timings": timings,
     })
 
     return {
@@ -556,6 +640,8 @@ def execute_plan_dag(
         "completed": list(completed),
         "failed": list(failed),
         "results": results,
+        "timings": timings,
+        "makespan_ms": makespan_ms,
     }
 
 
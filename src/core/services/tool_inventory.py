@@ -0,0 +1,241 @@
+"""
+Tool inventory — shared tool presence and version probes.
+
+Channel-independent: no Flask, no HTTP, no CLI dependency.
+
+Every card used to probe tools on its own: ``shutil.which`` per tool
+(one ``stat`` per PATH directory each), ``which`` forks, and one
+``--version`` subprocess per tool, run serially and repeated by every
+caller.  This module is the single place those probes go through:
+
+    which(name)             PATH is listed once per snapshot; lookups are
+                            dict hits until PATH or a PATH directory changes
+    probe(cmd)              runs a version-style command once per binary;
+                            cached on the binary's (realpath, inode, mtime)
+    probe_versions(specs)   many probes concurrently in a bounded pool
+
+Invalidation is automatic: the PATH snapshot is the ``PATH`` string plus
+the mtime of each of its directories (installing or removing a binary
+touches its directory), and probe results are keyed on the resolved
+binary's identity (an upgrade replaces or rewrites it).
+
+Used by:
+    - audit/l0_detection.py              (_detect_tools)
+    - tool_install/detection/tool_version.py  (get_tool_version, check_updates)
+    - project_probes.py                  (has_cmd)
+    - k8s/detect.py                      (_detect_cli)
+    - quality/ops.py                     (quality_status)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+PROBE_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Output of one probe command."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+_lock = threading.Lock()
+_path_key: tuple | None = None
+_dir_entries: dict[str, frozenset[str]] = {}
+_resolved: dict[str, str | None] = {}
+_probes: dict[tuple, ProbeResult] = {}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  PATH resolution
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _path_dirs() -> list[str]:
+    return [d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d]
+
+
+def _snapshot() -> tuple:
+    """``PATH`` plus each directory's mtime — changes when a binary is added/removed."""
+    dirs = _path_dirs()
+    mtimes = []
+    for d in dirs:
+        try:
+            mtimes.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            mtimes.append(-1)
+    return (os.environ.get("PATH", ""), tuple(mtimes))
+
+
+def _refresh() -> None:
+    """Drop PATH lookups if the snapshot changed (caller holds ``_lock``)."""
+    global _path_key
+    key = _snapshot()
+    if key != _path_key:
+        _path_key = key
+        _dir_entries.clear()
+        _resolved.clear()
+
+
+def _entries(d: str) -> frozenset[str]:
+    names = _dir_entries.get(d)
+    if names is None:
+        try:
+            names = frozenset(os.listdir(d))
+        except OSError:
+            names = frozenset()
+        _dir_entries[d] = names
+    return names
+
+
+def _lookup(name: str) -> str | None:
+    for d in _path_dirs():
+        if name in _entries(d):
+            candidate = os.path.join(d, name)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+    return None
+
+
+def which(name: str) -> str | None:
+    """Cached ``shutil.which``.
+
+    Names containing a path separator, and Windows (PATHEXT rules), go
+    straight to ``shutil.which``.
+    """
+    if os.sep in name or os.name == "nt":
+        return shutil.which(name)
+    with _lock:
+        _refresh()
+        if name not in _resolved:
+            _resolved[name] = _lookup(name)
+        return _resolved[name]
+
+
+def which_many(names: Iterable[str]) -> dict[str, str | None]:
+    """``which`` for several names under one PATH snapshot."""
+    names = list(names)
+    if os.name == "nt":
+        return {n: shutil.which(n) for n in names}
+    with _lock:
+        _refresh()
+        for n in names:
+            if n not in _resolved:
+                _resolved[n] = shutil.which(n) if os.sep in n else _lookup(n)
+        return {n: _resolved[n] for n in names}
+
+
+def binary_key(path: str) -> tuple[str, int, int] | None:
+    """(realpath, inode, mtime_ns) of a binary, or None if it is gone."""
+    real = os.path.realpath(path)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return None
+    return (real, st.st_ino, st.st_mtime_ns)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Probes
+# ═══════════════════════════════════════════════════════════════════
+
+
+def probe(cmd: list[str], *, timeout: int = PROBE_TIMEOUT) -> ProbeResult | None:
+    """Run a read-only probe command (``tool --version``), cached per binary.
+
+    Returns None if the binary is not installed or the command could
+    not run (timeout, OS error).
+    """
+    path = which(cmd[0])
+    if path is None:
+        return None
+    ident = binary_key(path)
+    if ident is None:
+        return None
+    key = (ident, tuple(cmd))
+    with _lock:
+        if key in _probes:
+            return _probes[key]
+
+    try:
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        result = ProbeResult(r.returncode, r.stdout or "", r.stderr or "")
+    except (subprocess.TimeoutExpired, OSError) as e:
+        # Not cached: a timeout may be transient (cold cache, loaded host)
+        logger.debug("probe %s failed: %s", cmd, e)
+        return None
+
+    with _lock:
+        _probes[key] = result
+    return result
+
+
+def probe_version(
+    cmd: list[str],
+    pattern: str,
+    *,
+    include_stderr: bool = True,
+    require_success: bool = False,
+) -> str | None:
+    """First capture group of ``pattern`` in the probe output, or None."""
+    result = probe(cmd)
+    if result is None or (require_success and result.returncode != 0):
+        return None
+    output = result.stdout + (result.stderr if include_stderr else "")
+    match = re.search(pattern, output)
+    return match.group(1) if match else None
+
+
+def probe_versions(
+    specs: Mapping[str, tuple[list[str], str]],
+    *,
+    workers: int | None = None,
+    include_stderr: bool = True,
+    require_success: bool = False,
+) -> dict[str, str | None]:
+    """``probe_version`` for many tools concurrently.
+
+    Args:
+        specs: ``{key: (cmd, pattern)}``.
+        workers: Pool size (default: one per spec, at most ``MAX_WORKERS``).
+    """
+    if not specs:
+        return {}
+    which_many(cmd[0] for cmd, _ in specs.values())
+    n = min(workers or MAX_WORKERS, len(specs))
+
+    def run(item: tuple[str, tuple[list[str], str]]) -> tuple[str, str | None]:
+        key, (cmd, pattern) = item
+        return key, probe_version(
+            cmd, pattern, include_stderr=include_stderr, require_success=require_success,
+        )
+
+    if n <= 1:
+        return dict(map(run, specs.items()))
+    with ThreadPoolExecutor(n) as pool:
+        return dict(pool.map(run, specs.items()))
+
+
+def invalidate() -> None:
+    """Forget everything (e.g. right after an install step)."""
+    global _path_key
+    with _lock:
+        _path_key = None
+        _dir_entries.clear()
+        _resolved.clear()
+        _probes.clear()
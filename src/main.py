@@ -17,11 +17,60 @@ from pathlib import Path
 import click
 
 from src.core.observability.logging_config import setup_logging
+from src.ui.cli.lazy import LazyGroup
 
 from src import __version__
 
 
-@click.group()
+# ── Sub-command groups from src/ui/cli/ ───────────────────────────
+#
+# Imported only when invoked (see LazyGroup). The help text is what
+# `controlplane --help` lists; keep it in step with each group's
+# docstring (tests/test_cli_startup.py checks it).
+
+_SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "vault": ("src.ui.cli.vault:vault",
+              "Secrets Vault — encrypt, decrypt, and manage secrets."),
+    "content": ("src.ui.cli.content:content",
+                "Content Vault — encrypt, decrypt, optimize, and manage content files."),
+    "pages": ("src.ui.cli.pages:pages",
+              "GitHub Pages — build, deploy, and manage page segments."),
+    "git": ("src.ui.cli.git:git",
+            "Git & GitHub — status, commit, push, pull requests, actions."),
+    "backup": ("src.ui.cli.backup:backup",
+               "Backup & Restore — create, list, preview, and restore archives."),
+    "secrets": ("src.ui.cli.secrets:secrets",
+                "Secrets management — GitHub CLI, environment variables, key generation."),
+    "docker": ("src.ui.cli.docker:docker",
+               "Docker & Compose — status, containers, images, build, up, down."),
+    "ci": ("src.ui.cli.ci:ci",
+           "CI/CD — detect providers, audit workflows, generate configs."),
+    "packages": ("src.ui.cli.packages:packages",
+                 "Packages — status, outdated, audit, install, update."),
+    "infra": ("src.ui.cli.infra:infra",
+              "Infra — environment variables, IaC detection, config generation."),
+    "quality": ("src.ui.cli.quality:quality",
+                "Quality — lint, typecheck, test, format, and config generation."),
+    "metrics": ("src.ui.cli.metrics:metrics",
+                "Metrics — project health score, probes, and recommendations."),
+    "security": ("src.ui.cli.security:security",
+                 "Security — secret scanning, .gitignore management, posture analysis."),
+    "docs": ("src.ui.cli.docs:docs",
+             "Docs — documentation status, coverage, links, and generation."),
+    "testing": ("src.ui.cli.testing:testing",
+                "Testing — frameworks, coverage, inventory, and test generation."),
+    "k8s": ("src.ui.cli.k8s:k8s",
+            "Kubernetes — manifests, validation, cluster status, generation."),
+    "terraform": ("src.ui.cli.terraform:terraform",
+                  "Terraform — IaC status, validate, plan, state, and generation."),
+    "dns": ("src.ui.cli.dns:dns",
+            "DNS & CDN — providers, domains, lookups, SSL, and record generation."),
+    "audit": ("src.ui.cli.audit:audit",
+              "Audit — tool installation, plans, system detection, and change impact."),
+}
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=_SUBCOMMANDS)
 @click.version_option(version=__version__, prog_name="controlplane")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output.")
 @click.option("--quiet", "-q", is_flag=True, help="Suppress non-essential output.")
@@ -442,48 +491,5 @@ def web(ctx: click.Context, host: str, port: int, mock: bool) -> None:
     run_server(app, host=host, port=port, debug=debug)
 
 
-# ── Register sub-command groups from src/ui/cli/ ──────────────────
-
-from src.ui.cli.vault import vault
-from src.ui.cli.content import content
-from src.ui.cli.pages import pages
-from src.ui.cli.git import git
-from src.ui.cli.backup import backup
-from src.ui.cli.secrets import secrets
-from src.ui.cli.docker import docker
-from src.ui.cli.ci import ci
-from src.ui.cli.packages import packages
-from src.ui.cli.infra import infra
-from src.ui.cli.quality import quality
-from src.ui.cli.metrics import metrics
-from src.ui.cli.security import security
-from src.ui.cli.docs import docs
-from src.ui.cli.testing import testing
-from src.ui.cli.k8s import k8s
-from src.ui.cli.terraform import terraform
-from src.ui.cli.dns import dns
-from src.ui.cli.audit import audit
-
-cli.add_command(vault)
-cli.add_command(content)
-cli.add_command(pages)
-cli.add_command(git)
-cli.add_command(backup)
-cli.add_command(secrets)
-cli.add_command(docker)
-cli.add_command(ci)
-cli.add_command(packages)
-cli.add_command(infra)
-cli.add_command(quality)
-cli.add_command(metrics)
-cli.add_command(security)
-cli.add_command(docs)
-cli.add_command(testing)
-cli.add_command(k8s)
-cli.add_command(terraform)
-cli.add_command(dns)
-cli.add_command(audit)
-
-
 if __name__ == "__main__":
     cli()
@@ -1,12 +1,15 @@
 """
-CLI commands for audit tooling — plan-based tool installation.
+CLI commands for audit tooling — plan-based tool installation and
+import-graph impact queries.
 
-Thin wrappers over ``src.core.services.tool_install``.
+Thin wrappers over ``src.core.services.tool_install`` and
+``src.core.services.audit.import_graph``.
 
 Sub-modules:
     install.py — install a tool via plan
     plans.py   — list pending/paused plans
     resume.py  — resume a paused/failed plan
+    impact.py  — files that depend on the given files
 """
 
 from __future__ import annotations
@@ -28,7 +31,7 @@ def _resolve_project_root(ctx: click.Context) -> Path:
 
 @click.group()
 def audit() -> None:
-    """Audit — tool installation, plans, and system detection."""
+    """Audit — tool installation, plans, system detection, and change impact."""
 
 
-from . import install, plans, resume  # noqa: E402, F401
+from . import impact, install, plans, resume  # noqa: E402, F401
@@ -0,0 +1,53 @@
+"""Audit impact — what depends on the given files (import graph)."""
+
+from __future__ import annotations
+
+import json
+
+import click
+
+from . import _resolve_project_root, audit
+
+
+@audit.command("impact")
+@click.argument("files", nargs=-1, required=True)
+@click.option("--depth", type=int, default=None, help="Max import hops (default: transitive).")
+@click.option("--no-refresh", is_flag=True, help="Answer from the stored graph without rescanning.")
+@click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
+@click.pass_context
+def impact(
+    ctx: click.Context,
+    files: tuple[str, ...],
+    depth: int | None,
+    no_refresh: bool,
+    as_json: bool,
+) -> None:
+    """Show the files that import FILES, directly or transitively.
+
+    Example::
+
+        controlplane audit impact src/core/services/audit/models.py --depth 2
+    """
+    from src.core.services.audit.import_graph import change_impact
+
+    project_root = _resolve_project_root(ctx)
+    result = change_impact(project_root, list(files), depth=depth, refresh=not no_refresh)
+
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+
+    for path in result["unknown"]:
+        click.secho(f"⚠️  Not in the import graph: {path}", fg="yellow")
+    dependents = result["dependents"]
+    if not dependents:
+        click.secho("✅ Nothing imports these files", fg="green")
+    else:
+        click.secho(f"\n🔗 {len(dependents)} dependent file(s):\n", fg="cyan", bold=True)
+        for d in dependents:
+            click.echo(f"   {d['hops']:>2}  {d['file']}")
+    for cycle in result["cycles"]:
+        click.secho(f"\n🔁 Import cycle ({len(cycle)} files):", fg="yellow")
+        for path in cycle:
+            click.echo(f"      {path}")
+    click.echo()
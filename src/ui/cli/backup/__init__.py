@@ -35,6 +35,7 @@ def backup() -> None:
 @click.option("--decrypt-enc", is_flag=True, help="Decrypt .enc files into archive.")
 @click.option("--encrypt", is_flag=True, help="Encrypt the entire archive.")
 @click.option("--name", "custom_name", default="", help="Custom archive name.")
+@click.option("--dedup", is_flag=True, help="Store as a deduplicated snapshot (chunk store).")
 @click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
 @click.pass_context
 def create(
@@ -45,6 +46,7 @@ def create(
     decrypt_enc: bool,
     encrypt: bool,
     custom_name: str,
+    dedup: bool,
     as_json: bool,
 ) -> None:
     """Create a backup archive from selected paths.
@@ -57,6 +59,8 @@ def create(
         controlplane backup create docs docs/guides docs/api
 
         controlplane backup create content content/ --encrypt
+
+        controlplane backup create media media/ --dedup
     """
     from src.core.services.backup.ops import create_backup
 
@@ -69,6 +73,7 @@ def create(
         decrypt_enc=decrypt_enc,
         encrypt_archive_flag=encrypt,
         custom_name=custom_name,
+        dedup=dedup,
     )
 
     if as_json:
@@ -89,6 +94,13 @@ def create(
     click.echo(f"   Files: {stats.get('total_files', '?')}")
     if result.get("encrypted"):
         click.echo(f"   🔒 Encrypted")
+    dd = result.get("dedup")
+    if dd:
+        click.echo(
+            f"   Dedup: {dd['bytes_stored']:,} B stored, "
+            f"{dd['bytes_deduplicated']:,} B already present, "
+            f"{dd['files_unchanged']} files unchanged"
+        )
 
 
 @backup.command("list")
@@ -170,6 +182,27 @@ def delete(ctx: click.Context, path: str) -> None:
         sys.exit(1)
 
     click.secho(f"✅ Deleted: {result.get('deleted', '?')}", fg="green")
+    if result.get("chunks_freed"):
+        click.echo(f"   Freed {result['chunks_freed']} chunks ({result['bytes_freed']:,} bytes)")
+
+
+@backup.command("export-archive")
+@click.argument("path")
+@click.pass_context
+def export_archive(ctx: click.Context, path: str) -> None:
+    """Export a dedup snapshot as a standalone .tar.gz archive."""
+    from src.core.services.backup.ops import export_snapshot
+
+    project_root = _resolve_project_root(ctx)
+    result = export_snapshot(project_root, path)
+
+    if "error" in result:
+        click.secho(f"❌ {result['error']}", fg="red")
+        sys.exit(1)
+
+    click.secho(f"✅ Exported: {result['filename']}", fg="green", bold=True)
+    click.echo(f"   Path: {result['full_path']}")
+    click.echo(f"   Size: {result['size_bytes']:,} bytes ({result['files']} files)")
 
 
 @backup.command()
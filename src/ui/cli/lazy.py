@@ -0,0 +1,77 @@
+"""
+Lazy command group — sub-groups resolved from a static manifest.
+
+Importing every domain package up front (and, through them, their core
+services) made each ``controlplane`` invocation pay for all of them.
+``LazyGroup`` keeps a manifest of ``name → (import path, short help)``
+and imports a sub-group's module only when that sub-group is actually
+resolved — invoked, completed, or asked for its own ``--help``.
+
+The root ``--help`` listing is rendered from the manifest's short help,
+so it imports nothing.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group whose sub-commands are imported on first use.
+
+    ``lazy_subcommands`` maps a command name to ``(import_path, help)``,
+    where ``import_path`` is ``"package.module:attribute"`` and ``help``
+    is the short help shown in the parent's command listing.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: dict[str, tuple[str, str]] | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*self.commands, *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.add_command(self._load(cmd_name), cmd_name)
+        return self.commands.get(cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Command:
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, attr = import_path.split(":")
+        cmd = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(cmd, click.Command):
+            raise TypeError(f"{import_path} is not a click command: {cmd!r}")
+        return cmd
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        # Same layout as click.Group.format_commands, but commands that are
+        # not loaded yet take their help from the manifest.
+        rows: list[tuple[str, click.Command | None]] = []
+        for name in self.list_commands(ctx):
+            cmd = self.commands.get(name)
+            if cmd is None:
+                rows.append((name, None))
+            elif not cmd.hidden:
+                rows.append((name, cmd))
+        if not rows:
+            return
+
+        limit = formatter.width - 6 - max(len(name) for name, _ in rows)
+        listing = []
+        for name, cmd in rows:
+            if cmd is None:
+                # Unloaded stand-in: click shortens the manifest text.
+                cmd = click.Command(name, help=self.lazy_subcommands[name][1])
+            text = cmd.get_short_help_str(limit)
+            listing.append((name, text))
+
+        with formatter.section("Commands"):
+            formatter.write_dl(listing)
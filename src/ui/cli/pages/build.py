@@ -45,22 +45,30 @@ def build(ctx: click.Context, name: str, as_json: bool) -> None:
 
 
 @pages.command()
+@click.option("--full", is_flag=True, help="Discard the merge manifest and copy everything.")
 @click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
 @click.pass_context
-def merge(ctx: click.Context, as_json: bool) -> None:
+def merge(ctx: click.Context, full: bool, as_json: bool) -> None:
     """Merge all built segments into the final site output."""
     from src.core.services.pages_engine import merge_segments
 
     project_root = _resolve_project_root(ctx)
 
     try:
-        result = merge_segments(project_root)
+        result = merge_segments(project_root, incremental=not full)
         if as_json:
             click.echo(json.dumps(result, indent=2, default=str))
         else:
             click.secho("✅ Segments merged", fg="green", bold=True)
             if result.get("output_dir"):
                 click.echo(f"   Output: {result['output_dir']}")
+            report = result.get("report")
+            if report:
+                click.echo(
+                    f"   {report['linked'] + report['reflinked']} linked, "
+                    f"{report['copied']} copied ({report['bytes_copied']:,} bytes), "
+                    f"{report['unchanged']} unchanged, {report['removed']} removed"
+                )
     except Exception as e:
         click.secho(f"❌ Merge failed: {e}", fg="red")
         sys.exit(1)
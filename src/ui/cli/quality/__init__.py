@@ -100,14 +100,26 @@ def status(ctx: click.Context, as_json: bool) -> None:
 @click.option("--tool", "-t", default=None, help="Specific tool (e.g. ruff, mypy, pytest).")
 @click.option("--category", "-c", default=None, type=click.Choice(["lint", "typecheck", "test", "format"]))
 @click.option("--fix", is_flag=True, help="Auto-fix where supported.")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Concurrent tool processes (default: CPU count).")
+@click.option("--no-cache", is_flag=True, help="Re-check every file (ignore cached findings).")
 @click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
 @click.pass_context
-def check(ctx: click.Context, tool: str | None, category: str | None, fix: bool, as_json: bool) -> None:
+def check(
+    ctx: click.Context,
+    tool: str | None,
+    category: str | None,
+    fix: bool,
+    as_json: bool,
+    jobs: int | None,
+    no_cache: bool,
+) -> None:
     """Run quality checks (all, by category, or specific tool)."""
     from src.core.services.quality.ops import quality_run
 
     project_root = _resolve_project_root(ctx)
-    result = quality_run(project_root, tool=tool, category=category, fix=fix)
+    result = quality_run(project_root, tool=tool, category=category, fix=fix,
+                         jobs=jobs, cache=not no_cache)
 
     if as_json:
         click.echo(json.dumps(result, indent=2))
@@ -126,7 +138,9 @@ def check(ctx: click.Context, tool: str | None, category: str | None, fix: bool,
 
     for r in results:
         icon = "✅" if r["passed"] else "❌"
-        click.secho(f"{icon} {r['name']} ({r['category']})", fg="green" if r["passed"] else "red")
+        files = r.get("files")
+        scope = f", {files['checked']}/{files['total']} files checked" if files else ""
+        click.secho(f"{icon} {r['name']} ({r['category']}{scope})", fg="green" if r["passed"] else "red")
 
         if not r["passed"]:
             # Show output on failure
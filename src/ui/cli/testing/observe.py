@@ -52,6 +52,12 @@ def inventory(ctx: click.Context, as_json: bool) -> None:
 @click.option("--file", "file_path", default=None, help="Run specific test file.")
 @click.option("-k", "keyword", default=None, help="Run tests matching keyword.")
 @click.option("-v", "verbose", is_flag=True, help="Verbose output.")
+@click.option("--shards", type=click.IntRange(min=1), default=1,
+              help="Split into N parallel pytest processes, balanced by past durations.")
+@click.option("--impacted", is_flag=True, help="Only tests affected by the diff against --base.")
+@click.option("--base", default="HEAD", show_default=True, help="Git ref to diff against.")
+@click.option("--record-coverage", is_flag=True,
+              help="Record the per-test coverage map (needs pytest-cov).")
 @click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
 @click.pass_context
 def run_tests(
@@ -59,13 +65,25 @@ def run_tests(
     file_path: str | None,
     keyword: str | None,
     verbose: bool,
+    shards: int,
+    impacted: bool,
+    base: str,
+    record_coverage: bool,
     as_json: bool,
 ) -> None:
     """Run tests with structured result output."""
     from src.core.services.testing_ops import run_tests as _run_tests
 
+    if record_coverage and (file_path or as_json):
+        raise click.UsageError("--record-coverage cannot be combined with --file or --json.")
+
     project_root = _resolve_project_root(ctx)
 
+    if (shards > 1 or impacted or record_coverage) and not file_path and not as_json:
+        _run_streamed(project_root, shards=shards, impacted=impacted, base=base,
+                      keyword=keyword, verbose=verbose, record_coverage=record_coverage)
+        return
+
     if not as_json:
         click.secho("🧪 Running tests...", fg="cyan")
 
@@ -74,6 +92,9 @@ def run_tests(
         verbose=verbose,
         file_path=file_path,
         keyword=keyword,
+        shards=shards,
+        impacted=impacted,
+        base=base,
     )
 
     if as_json:
@@ -117,6 +138,56 @@ def run_tests(
         sys.exit(1)
 
 
+def _run_streamed(project_root, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    """Sharded / impacted run, printing each shard as it finishes."""
+    from src.core.services.testing_ops import run_tests_stream
+
+    for event in run_tests_stream(project_root, **kwargs):
+        if event["type"] == "error":
+            click.secho(f"❌ {event['error']}", fg="red")
+            sys.exit(1)
+        if event["type"] == "plan":
+            selection = event["selection"]
+            if selection.get("note"):
+                click.secho(f"⚠️  {selection['note']}", fg="yellow")
+            scope = "all" if selection["all"] else "impacted"
+            click.secho(
+                f"🧪 Running {len(selection['tests'])} {scope} test file(s) "
+                f"in {len(event['shards'])} shard(s)...",
+                fg="cyan",
+            )
+            if event["coverage"] == "unavailable":
+                click.secho("   pytest-cov not installed — coverage map not recorded", fg="yellow")
+        elif event["type"] == "shard":
+            if "error" in event:
+                click.secho(f"   ❌ shard {event['index']}: {event['error']}", fg="red")
+                continue
+            icon = "✅" if event["ok"] else "❌"
+            click.echo(
+                f"   {icon} shard {event['index']}: {event['passed']} passed, "
+                f"{event['failed']} failed, {event['errors']} error(s) "
+                f"in {event['wall_seconds']:.1f}s ({len(event['files'])} files)"
+            )
+        elif event["type"] == "done":
+            if event["selected"] == 0:
+                click.secho("✅ No tests affected by the change", fg="green", bold=True)
+                return
+            if event["ok"]:
+                click.secho(
+                    f"✅ {event['passed']} passed in {event['duration_seconds']:.1f}s",
+                    fg="green", bold=True,
+                )
+                return
+            click.secho(
+                f"❌ {event['failed']} failed, {event['errors']} error(s), "
+                f"{event['passed']} passed in {event['duration_seconds']:.1f}s",
+                fg="red", bold=True,
+            )
+            for f in event["failures"][:10]:
+                click.echo(f"      ❌ {f['name']}")
+            sys.exit(1)
+
+
 @testing.command("coverage")
 @click.option("--json-output", "--json", "as_json", is_flag=True, help="Output as JSON.")
 @click.pass_context
@@ -0,0 +1,389 @@
+"""
+Dashboard shell — cached, precompressed HTML + content-hashed script bundles.
+
+``dashboard.html`` pulls in ~60 ``scripts/**`` includes (several MB of
+inline JavaScript).  Rendering that through Jinja on every ``GET /`` is
+wasted work, and inlining it means the browser can never cache it.
+
+``DashboardShell`` builds everything once per template change:
+
+    - every top-level ``{% include 'scripts/…' %}`` of ``dashboard.html``
+      is rendered and its ``<script>`` block(s) become a static bundle
+      served at ``/bundles/<stem>.<sha>.js`` (immutable, long-lived)
+    - ``dashboard.html`` is rendered with those includes replaced by
+      ``<script src>`` tags — same order, same classic-script semantics
+    - gzip / brotli variants are produced on first request and kept
+
+The cache key is the set of template mtimes (``templates/**``), checked
+at most every ``_CHECK_INTERVAL_S``.
+
+Dynamic data (data catalogs + pre-injected card data) is not part of the
+shell — ``DashboardState`` produces a small payload served separately at
+``/dashboard/state.js``, cached on the devops card cache mtime and the
+``stacks/`` definitions.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:  # optional — gzip only when unavailable
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_CHECK_INTERVAL_S = 1.0
+
+_SCRIPT_INCLUDE_RE = re.compile(
+    r"""^[ \t]*\{%-?\s*include\s+['"](scripts/[^'"]+)['"]\s*-?%\}[ \t]*\n?""",
+    re.MULTILINE,
+)
+
+# Keys safe to pre-inject into the dashboard (~10 KB total).
+# Audit L2 keys (audit:l2:*) are excluded — too large (200+ KB).
+INJECT_KEYS = frozenset({
+    # DevOps tab (9 cards)
+    "security", "testing", "quality", "packages", "env", "docs",
+    "k8s", "terraform", "dns",
+    # Integrations tab
+    "git", "github", "ci", "docker",
+    "gh-pulls", "gh-runs", "gh-workflows",
+    # Dashboard
+    "project-status",
+    # Audit L0/L1 (small summaries)
+    "audit:system", "audit:deps", "audit:structure",
+    "audit:clients", "audit:scores",
+    # Wizard detect
+    "wiz:detect",
+})
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Encoded payloads
+# ═══════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class Payload:
+    """A response body with a strong ETag and lazily built encodings."""
+
+    body: bytes
+    etag: str
+    _encoded: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, body: bytes) -> Payload:
+        return cls(body, hashlib.sha256(body).hexdigest()[:20])
+
+    def encoded(self, encoding: str) -> bytes:
+        """Body in ``encoding`` ("br", "gzip" or "identity"), memoized."""
+        if encoding == "identity":
+            return self.body
+        data = self._encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=9)
+            else:
+                data = gzip.compress(self.body, compresslevel=9, mtime=0)
+            self._encoded[encoding] = data
+        return data
+
+
+def pick_encoding(accept_encoding: str) -> str:
+    """Best supported encoding for an ``Accept-Encoding`` header."""
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if part.strip() and not part.strip().endswith("q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def send_payload(payload: Payload, mimetype: str, cache_control: str):  # type: ignore[no-untyped-def]
+    """Flask response for ``payload`` with ETag/304 and content negotiation."""
+    from flask import make_response, request
+
+    encoding = pick_encoding(request.headers.get("Accept-Encoding", ""))
+    etag = payload.etag if encoding == "identity" else f"{payload.etag}-{encoding}"
+
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(payload.encoded(encoding))
+        resp.mimetype = mimetype
+        if encoding != "identity":
+            resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = cache_control
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Shell + bundles
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _script_blocks(html: str) -> list[str] | None:
+    """Split rendered include output into its inline ``<script>`` bodies.
+
+    Mirrors the HTML parser: HTML comments and whitespace between blocks
+    are dropped, a script body ends at the first ``</script``.  Returns
+    None when anything else is present (markup, ``<script src>``,
+    attributes) — such an include stays inline.
+    """
+    blocks: list[str] = []
+    i, n = 0, len(html)
+    lower = html.lower()
+    while True:
+        while i < n and html[i].isspace():
+            i += 1
+        if i >= n:
+            return blocks
+        if html.startswith("<!--", i):
+            end = html.find("-->", i + 4)
+            if end == -1:
+                return None
+            i = end + 3
+        elif lower.startswith("<script>", i):
+            end = lower.find("</script", i + 8)
+            close = lower.find(">", end) if end != -1 else -1
+            if close == -1:
+                return None
+            blocks.append(html[i + 8:end])
+            i = close + 1
+        else:
+            return None
+
+
+@dataclass
+class _Build:
+    signature: tuple
+    shell: Payload
+    bundles: dict[str, Payload]
+
+
+class DashboardShell:
+    """Builds and caches the dashboard HTML and its script bundles."""
+
+    def __init__(self, app: Any, template: str = "dashboard.html") -> None:
+        self._app = app
+        self._template = template
+        self._lock = threading.Lock()
+        self._build: _Build | None = None
+        # Bundles of the previous build — a page loaded just before a
+        # rebuild may still request them.
+        self._retired: dict[str, Payload] = {}
+        self._checked_at = 0.0
+
+    @property
+    def _template_dir(self) -> Path:
+        return Path(self._app.root_path) / self._app.template_folder
+
+    def _signature(self) -> tuple:
+        """(relative path, mtime_ns) for every template file."""
+        root = self._template_dir
+        sig = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if not name.endswith(".html"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    sig.append((os.path.relpath(path, root), os.stat(path).st_mtime_ns))
+                except OSError:
+                    continue
+        return tuple(sig)
+
+    def current(self) -> _Build:
+        """Return the cached build, rebuilding when templates changed.
+
+        Must be called inside a request (``url_for`` in the templates).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._build is not None and now - self._checked_at < _CHECK_INTERVAL_S:
+                return self._build
+            self._checked_at = now
+            sig = self._signature()
+            if self._build is None or self._build.signature != sig:
+                started = time.perf_counter()
+                if self._build is not None:
+                    self._retired = self._build.bundles
+                self._build = self._render(sig)
+                logger.info(
+                    "Dashboard shell built: %d bundles, %s bytes HTML (%.0f ms)",
+                    len(self._build.bundles), f"{len(self._build.shell.body):,}",
+                    (time.perf_counter() - started) * 1000,
+                )
+            return self._build
+
+    def shell(self) -> Payload:
+        return self.current().shell
+
+    def bundle(self, filename: str) -> Payload | None:
+        """Look up a bundle by its hashed filename (current or previous build)."""
+        return self.current().bundles.get(filename) or self._retired.get(filename)
+
+    def _render(self, signature: tuple) -> _Build:
+        from flask import url_for
+
+        # Uncached overlay: always read templates from disk on rebuild
+        env = self._app.jinja_env.overlay(cache_size=0)
+        source = (self._template_dir / self._template).read_text(encoding="utf-8")
+        bundles: dict[str, Payload] = {}
+
+        def replace(match: re.Match) -> str:
+            name = match.group(1)
+            rendered = env.get_template(name).render()
+            blocks = _script_blocks(rendered)
+            if blocks is None:
+                return match.group(0)  # not pure script — keep it inline
+            parts = name[len("scripts/"):].rsplit(".", 1)[0].split("/")
+            stem = ".".join(p.lstrip("_") for p in parts)
+            tags = []
+            for idx, js in enumerate(blocks):
+                payload = Payload.of(js.encode("utf-8"))
+                suffix = f"-{idx}" if len(blocks) > 1 else ""
+                filename = f"{stem}{suffix}.{payload.etag[:12]}.js"
+                bundles[filename] = payload
+                src = url_for("pages.dashboard_bundle", filename=filename)
+                tags.append(f'<script src="{src}"></script>\n')
+            return "".join(tags)
+
+        shell_source = _SCRIPT_INCLUDE_RE.sub(replace, source)
+        html = env.from_string(shell_source).render()
+        return _Build(signature, Payload.of(html.encode("utf-8")), bundles)
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Dynamic state (data catalogs + card data)
+# ═══════════════════════════════════════════════════════════════════
+
+
+class DashboardState:
+    """Data catalogs + cached card data for the dashboard, memoized.
+
+    Rebuilt only when the devops card cache file or a ``stacks/**``
+    definition changes — not on every template render.
+    """
+
+    def __init__(self, project_root: Path, registry: Any) -> None:
+        self._root = Path(project_root)
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._key: tuple | None = None
+        self._context: dict = {}
+        self._payload: Payload | None = None
+
+    def _cache_key(self) -> tuple:
+        from src.core.services.devops.cache import _cache_path
+
+        parts: list[tuple] = []
+        try:
+            parts.append(("cache", os.stat(_cache_path(self._root)).st_mtime_ns))
+        except OSError:
+            parts.append(("cache", 0))
+        stacks = self._root / "stacks"
+        if stacks.is_dir():
+            for dirpath, dirnames, filenames in os.walk(stacks):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        parts.append((path, os.stat(path).st_mtime_ns))
+                    except OSError:
+                        continue
+        return tuple(parts)
+
+    def _compute(self) -> dict:
+        from src.core.config.stack_loader import discover_stacks
+        from src.core.services.devops.cache import _load_cache
+
+        # Build initial state from disk cache (available even on cold start)
+        initial: dict[str, dict] = {}
+        try:
+            cache = _load_cache(self._root)
+            for key in INJECT_KEYS:
+                entry = cache.get(key)
+                if entry and "data" in entry:
+                    initial[key] = {"data": entry["data"]}
+        except Exception:
+            pass  # Degrade gracefully — cards will fall back to API
+
+        # Merge static catalogs with project-level stacks
+        dcp = self._registry.to_js_dict()
+        try:
+            stacks = discover_stacks(self._root / "stacks")
+            dcp["stacks"] = [
+                {
+                    "name": s.name,
+                    "description": s.description,
+                    "detail": s.detail,
+                    "icon": s.icon,
+                    "domain": s.domain,
+                    "parent": s.parent,
+                    "capabilities": [c.name for c in s.capabilities],
+                    "capabilityDetails": [
+                        {"name": c.name, "command": c.command, "description": c.description, "adapter": c.adapter}
+                        for c in s.capabilities
+                    ],
+                    "requires": [
+                        {"adapter": r.adapter, "minVersion": r.min_version}
+                        for r in s.requires
+                    ],
+                    "detection": {
+                        "filesAnyOf": s.detection.files_any_of,
+                        "filesAllOf": s.detection.files_all_of,
+                        "contentContains": s.detection.content_contains,
+                    },
+                }
+                for s in sorted(stacks.values(), key=lambda s: s.name)
+            ]
+        except Exception:
+            dcp["stacks"] = []
+
+        return {"dcp_data": dcp, "initial_state": initial}
+
+    def context(self) -> dict:
+        """Template context (``dcp_data``, ``initial_state``), memoized."""
+        with self._lock:
+            key = self._cache_key()
+            if key != self._key:
+                self._context = self._compute()
+                self._payload = None
+                self._key = key
+            return self._context
+
+    def payload(self) -> Payload:
+        """The context as a small script setting ``window._dcp`` and
+        ``window.__INITIAL_STATE__`` (loaded before the bundles)."""
+        ctx = self.context()
+        with self._lock:
+            if self._payload is None:
+                body = (
+                    "window._dcp = " + json.dumps(ctx["dcp_data"], default=str) + ";\n"
+                    "window.__INITIAL_STATE__ = "
+                    + json.dumps(ctx["initial_state"], default=str) + ";\n"
+                )
+                # Same escaping as Jinja's |tojson — safe if ever inlined
+                body = body.replace("<", "\\u003c").replace(">", "\\u003e")
+                self._payload = Payload.of(body.encode("utf-8"))
+            return self._payload
@@ -11,6 +11,7 @@ Endpoints:
     GET /audit/scores               — aggregate scores
     GET /audit/scores/enriched      — L2-enriched scores
     GET /audit/scores/history       — score trend history
+    GET /audit/impact               — files depending on ?file=...
     GET /audit/structure-analysis   — L2: import graph
     GET /audit/code-health          — L2: code quality
     GET /audit/repo                 — L2: repository health
@@ -139,11 +140,46 @@ def audit_scores_enriched_endpoint():
 
 @audit_bp.route("/audit/scores/history")
 def audit_scores_history():
-    """Score history — last N snapshots for trend rendering."""
-    from src.core.services.audit.scoring import _load_history
+    """Score history for trend rendering.
+
+    Query params (all optional):
+        from, to     — epoch seconds bounding the range
+        resolution   — raw | day | week | auto (default: auto, the
+                       finest that fits in ``points``)
+        points       — max points for auto resolution (default 200)
+    """
+    from src.core.services.audit.score_store import RESOLUTIONS, get_score_store
+
+    root = _project_root()
+    resolution = request.args.get("resolution", "auto")
+    if resolution != "auto" and resolution not in RESOLUTIONS:
+        return jsonify({"error": f"Unknown resolution: {resolution}"}), 400
+    result = get_score_store(root).query(
+        request.args.get("from", type=float),
+        request.args.get("to", type=float),
+        resolution=resolution,
+        max_points=request.args.get("points", 200, type=int),
+    )
+    return jsonify({
+        "history": result["points"],
+        "total": result["total"],
+        "resolution": result["resolution"],
+    })
+
+
+@audit_bp.route("/audit/impact")
+def audit_impact():
+    """Change impact — files that import ``?file=`` (repeatable).
+
+    Optional ``depth`` limits the import hops (default: transitive).
+    """
+    from src.core.services.audit.import_graph import change_impact
+
+    files = request.args.getlist("file")
+    if not files:
+        return jsonify({"error": "No file specified"}), 400
     root = _project_root()
-    history = _load_history(root)
-    return jsonify({"history": history, "total": len(history)})
+    return jsonify(change_impact(root, files, depth=request.args.get("depth", type=int)))
 
 
 # ── L2 Cache-or-Scan Helper ────────────────────────────────────
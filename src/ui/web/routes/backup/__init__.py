@@ -11,7 +11,7 @@ Route handlers are split across sub-modules for maintainability:
     routes_backup.py          — (this file) blueprint, helpers, folder-tree, folders
     routes_backup_ops.py      — upload-release, encrypt, decrypt, delete-release, rename, mark-special
     routes_backup_tree.py     — expandable file tree filtered by type
-    routes_backup_archive.py  — export, list, preview, download, upload
+    routes_backup_archive.py  — export, export-archive, list, preview, download, upload
     routes_backup_restore.py  — restore, import, wipe, delete
 
 Routes (this file):
@@ -29,6 +29,7 @@ def api_export():  # type: ignore[no-untyped-def]
         decrypt_enc=data.get("decrypt_enc", False),
         encrypt_archive_flag=encrypt_flag,
         custom_name=data.get("custom_name", "").strip(),
+        dedup=bool(data.get("dedup", False)),
     )
 
     if "error" in result:
@@ -38,6 +39,21 @@ def api_export():  # type: ignore[no-untyped-def]
     return jsonify(result)
 
 
+# ── Export a dedup snapshot as a standalone .tar.gz ─────────────────
+
+
+@backup_bp.route("/backup/export-archive", methods=["POST"])
+@run_tracked("backup", "backup:export-archive")
+def api_export_archive():  # type: ignore[no-untyped-def]
+    """Materialize a dedup snapshot into a portable .tar.gz(.enc)."""
+    data = request.get_json(silent=True) or {}
+    result = backup_ops.export_snapshot(_project_root(), data.get("backup_path", "").strip())
+    if "error" in result:
+        code = result.pop("_status", 400)
+        return jsonify(result), code
+    return jsonify(result)
+
+
 # ── List backups for a folder ──────────────────────────────────────
 
 
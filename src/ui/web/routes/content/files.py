@@ -13,6 +13,9 @@ Routes:
     /api/content/enc-key-status     — check encryption key status
     /api/content/optimize-status    — poll optimization progress
     /api/content/optimize-cancel    — cancel active optimization
+    /api/content/media-jobs         — list background media optimization jobs
+    /api/content/media-jobs/<id>    — poll one media job
+    /api/content/media-jobs/<id>/cancel — cancel a media job
 """
 
 from __future__ import annotations
@@ -90,7 +93,11 @@ def content_download():  # type: ignore[no-untyped-def]
 
 @content_bp.route("/content/upload", methods=["POST"])
 def content_upload():  # type: ignore[no-untyped-def]
-    """Upload a file to a content folder."""
+    """Upload a file to a content folder.
+
+    Form field ``background=1`` queues video/audio optimization as a
+    media job and returns ``job_id`` immediately.
+    """
     from werkzeug.utils import secure_filename
 
     if "file" not in request.files:
@@ -108,6 +115,7 @@ def content_upload():  # type: ignore[no-untyped-def]
         folder_rel=folder_rel,
         filename=safe_name,
         raw_data=uploaded.read(),
+        background=request.form.get("background", "") in ("1", "true"),
     )
 
     if "error" in result:
@@ -148,3 +156,37 @@ def content_optimize_cancel():  # type: ignore[no-untyped-def]
 
     killed = cancel_active_optimization()
     return jsonify({"cancelled": killed})
+
+
+# ── Background media jobs ───────────────────────────────────────────
+
+
+@content_bp.route("/content/media-jobs")
+def content_media_jobs():  # type: ignore[no-untyped-def]
+    """List background media optimization jobs."""
+    from src.core.services.content.media_jobs import list_media_jobs
+
+    return jsonify({"jobs": list_media_jobs(_project_root())})
+
+
+@content_bp.route("/content/media-jobs/<job_id>")
+def content_media_job(job_id: str):  # type: ignore[no-untyped-def]
+    """Poll a single media job (status, progress, result)."""
+    from src.core.services.content.media_jobs import get_media_job
+
+    job = get_media_job(_project_root(), job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
+
+
+@content_bp.route("/content/media-jobs/<job_id>/cancel", methods=["POST"])
+def content_media_job_cancel(job_id: str):  # type: ignore[no-untyped-def]
+    """Cancel a queued or running media job."""
+    from src.core.services.content.media_jobs import cancel_media_job
+
+    result = cancel_media_job(_project_root(), job_id)
+    if "error" in result:
+        code = result.pop("_status", 400)
+        return jsonify(result), code
+    return jsonify(result)
@@ -274,8 +274,12 @@ def build_all_route():  # type: ignore[no-untyped-def]
 @pages_api_bp.route("/pages/merge", methods=["POST"])
 @run_tracked("build", "build:pages_merge")
 def merge_route():  # type: ignore[no-untyped-def]
-    """Merge all built segments into a single output."""
-    return jsonify(merge_segments(_project_root()))
+    """Merge all built segments into a single output.
+
+    ``?full=1`` discards the merge manifest and copies everything.
+    """
+    full = request.args.get("full", "") == "1"
+    return jsonify(merge_segments(_project_root(), incremental=not full))
 
 
 @pages_api_bp.route("/pages/deploy", methods=["POST"])
@@ -2,7 +2,8 @@
 Page routes — serves the dashboard HTML and built Pages sites.
 
 Two concerns:
-  1. Dashboard: GET / → the admin panel
+  1. Dashboard: GET / → the admin panel (cached shell, see dashboard_shell.py)
+     + its content-hashed script bundles and the dynamic state payload
   2. Pages sites: GET /pages/site/<segment>/<path:filepath> → the built
      static output for a segment (served directly by Flask, no random ports)
 """
@@ -12,15 +13,41 @@ from __future__ import annotations
 import mimetypes
 from pathlib import Path
 
-from flask import Blueprint, abort, current_app, make_response, render_template, send_file
+from flask import Blueprint, abort, current_app, make_response, send_file
+
+from src.ui.web.dashboard_shell import send_payload
 
 pages_bp = Blueprint("pages", __name__)
 
+# Hashed bundle URLs never change content — cache for a year
+_IMMUTABLE = "public, max-age=31536000, immutable"
+
 
 @pages_bp.route("/")
 def dashboard():  # type: ignore[no-untyped-def]
-    """Render the main dashboard."""
-    return render_template("dashboard.html")
+    """Serve the main dashboard shell (rebuilt only when templates change).
+
+    The shell references hashed bundles, so it is revalidated on every
+    load (``no-cache``) — a 304 when nothing changed.
+    """
+    shell = current_app.config["DASHBOARD_SHELL"].shell()
+    return send_payload(shell, "text/html", "no-cache")
+
+
+@pages_bp.route("/bundles/<path:filename>")
+def dashboard_bundle(filename: str):  # type: ignore[no-untyped-def]
+    """Serve a content-hashed dashboard script bundle."""
+    payload = current_app.config["DASHBOARD_SHELL"].bundle(filename)
+    if payload is None:
+        abort(404, description=f"Unknown bundle: {filename}")
+    return send_payload(payload, "application/javascript", _IMMUTABLE)
+
+
+@pages_bp.route("/dashboard/state.js")
+def dashboard_state():  # type: ignore[no-untyped-def]
+    """Serve data catalogs + cached card data for the dashboard."""
+    payload = current_app.config["DASHBOARD_STATE"].payload()
+    return send_payload(payload, "application/javascript", "no-cache")
 
 
 # ── Service Worker (Tab Mesh focus engine) ──────────────────────────
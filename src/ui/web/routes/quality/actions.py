@@ -21,6 +21,8 @@ def quality_check():  # type: ignore[no-untyped-def]
         tool=data.get("tool"),
         category=data.get("category"),
         fix=data.get("fix", False),
+        jobs=data.get("jobs"),
+        cache=data.get("cache", True),
     )
 
     if "error" in result:
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from flask import jsonify, request
+import json
+
+from flask import Response, jsonify, request
 
 from src.core.services.testing import ops as testing_ops
 from src.core.services.run_tracker import run_tracked
@@ -16,12 +18,19 @@ from . import testing_bp
 def testing_run():  # type: ignore[no-untyped-def]
     """Run tests."""
     data = request.get_json(silent=True) or {}
+    try:
+        shards = max(1, int(data.get("shards", 1)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'shards' must be an integer"}), 400
     root = _project_root()
     result = testing_ops.run_tests(
         root,
         verbose=data.get("verbose", False),
         file_path=data.get("file"),
         keyword=data.get("keyword"),
+        shards=shards,
+        impacted=bool(data.get("impacted", False)),
+        base=data.get("base", "HEAD"),
     )
     if "error" in result:
         return jsonify(result), 400
@@ -29,6 +38,35 @@ def testing_run():  # type: ignore[no-untyped-def]
     return jsonify(result)
 
 
+@testing_bp.route("/testing/run/stream", methods=["POST"])
+def testing_run_stream():  # type: ignore[no-untyped-def]
+    """SSE stream of a sharded / impacted test run.
+
+    Emits a ``plan`` event, one ``shard`` event per shard as it
+    finishes, then ``done`` with the merged totals.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        shards = max(1, int(data.get("shards", 4)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'shards' must be an integer"}), 400
+    root = _project_root()
+
+    def sse():  # type: ignore[no-untyped-def]
+        for event in testing_ops.run_tests_stream(
+            root,
+            shards=shards,
+            impacted=bool(data.get("impacted", False)),
+            base=data.get("base", "HEAD"),
+            keyword=data.get("keyword"),
+            verbose=bool(data.get("verbose", False)),
+            record_coverage=bool(data.get("record_coverage", False)),
+        ):
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return Response(sse(), mimetype="text/event-stream")
+
+
 @testing_bp.route("/testing/coverage", methods=["POST"])
 @run_tracked("test", "test:coverage")
 def testing_coverage():  # type: ignore[no-untyped-def]
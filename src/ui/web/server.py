@@ -143,81 +143,27 @@ def create_app(
     _registry = get_registry()
     app.config["DATA_REGISTRY"] = _registry
 
-    # Keys safe to pre-inject into HTML (~10 KB total).
-    # Audit L2 keys (audit:l2:*) are excluded — too large (200+ KB).
-    _INJECT_KEYS = frozenset({
-        # DevOps tab (9 cards)
-        "security", "testing", "quality", "packages", "env", "docs",
-        "k8s", "terraform", "dns",
-        # Integrations tab
-        "git", "github", "ci", "docker",
-        "gh-pulls", "gh-runs", "gh-workflows",
-        # Dashboard
-        "project-status",
-        # Audit L0/L1 (small summaries)
-        "audit:system", "audit:deps", "audit:structure",
-        "audit:clients", "audit:scores",
-        # Wizard detect
-        "wiz:detect",
-    })
+    # Dashboard data (catalogs + pre-injected card data) — memoized on the
+    # card cache / stacks mtimes instead of re-read on every render.
+    # The shell itself is cached + precompressed (see dashboard_shell.py).
+    from src.ui.web.dashboard_shell import DashboardShell, DashboardState
+
+    _dashboard_state = DashboardState(app.config["PROJECT_ROOT"], _registry)
+    app.config["DASHBOARD_STATE"] = _dashboard_state
+    app.config["DASHBOARD_SHELL"] = DashboardShell(app)
 
     @app.context_processor
     def _inject_data_catalogs():  # type: ignore[no-untyped-def]
-        from src.core.services.devops.cache import _load_cache
-        from src.core.config.stack_loader import discover_stacks
-
-        # Build initial state from disk cache (available even on cold start)
-        initial: dict[str, dict] = {}
-        try:
-            cache = _load_cache(Path(project_root))
-            for key in _INJECT_KEYS:
-                entry = cache.get(key)
-                if entry and "data" in entry:
-                    initial[key] = {"data": entry["data"]}
-        except Exception:
-            pass  # Degrade gracefully — cards will fall back to API
-
-        # Merge static catalogs with project-level stacks
-        dcp = _registry.to_js_dict()
-        try:
-            stacks = discover_stacks(Path(project_root) / "stacks")
-            dcp["stacks"] = [
-                {
-                    "name": s.name,
-                    "description": s.description,
-                    "detail": s.detail,
-                    "icon": s.icon,
-                    "domain": s.domain,
-                    "parent": s.parent,
-                    "capabilities": [c.name for c in s.capabilities],
-                    "capabilityDetails": [
-                        {"name": c.name, "command": c.command, "description": c.description, "adapter": c.adapter}
-                        for c in s.capabilities
-                    ],
-                    "requires": [
-                        {"adapter": r.adapter, "minVersion": r.min_version}
-                        for r in s.requires
-                    ],
-                    "detection": {
-                        "filesAnyOf": s.detection.files_any_of,
-                        "filesAllOf": s.detection.files_all_of,
-                        "contentContains": s.detection.content_contains,
-                    },
-                }
-                for s in sorted(stacks.values(), key=lambda s: s.name)
-            ]
-        except Exception:
-            dcp["stacks"] = []
-
-        return {
-            "dcp_data": dcp,
-            "initial_state": initial,
-        }
+        return _dashboard_state.context()
 
     # Start staleness watcher (background mtime polling → state:stale events)
     from src.core.services.staleness_watcher import start_watcher
     start_watcher(app.config["PROJECT_ROOT"])
 
+    # Re-queue media optimization jobs a previous server process left unfinished
+    from src.core.services.content.media_jobs import resume_media_jobs
+    resume_media_jobs(app.config["PROJECT_ROOT"])
+
     # Start project index (background file/symbol/peek indexing)
     # — gated by server setting: when disabled, no background thread
     from src.core.services.server_settings import is_peek_index_enabled
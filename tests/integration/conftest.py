@@ -7,8 +7,8 @@ Many will FAIL until the code is built to satisfy them.
 Run ONLY integration tests:
     pytest tests/integration/ -m integration
 
-Run ONLY unit tests (default):
-    pytest -m "not integration"
+Run ONLY unit tests (default; benchmarks are ``slow``):
+    pytest -m "not integration and not slow"
 
 Run everything:
     pytest -m ""
@@ -0,0 +1,170 @@
+"""
+Tests for the incremental git history store (audit/history_store.py)
+and ``l2_repo._git_history`` on top of it.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_audit_history_store.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.audit import history_store
+from src.core.services.audit.history_store import history_stats
+from src.core.services.audit.l2_repo import _git_history
+
+
+def _git(repo: Path, *args: str, env: dict | None = None) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=True,
+        env={**os.environ, **(env or {})},
+    ).stdout
+
+
+def _commit(repo: Path, files: dict[str, str], *, author: str = "Ada", date: str = "2024-01-01T00:00:00+00:00") -> None:
+    for rel, content in files.items():
+        p = repo / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", f"change {list(files)}",
+         env={"GIT_AUTHOR_NAME": author, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date})
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(history_store, "_cache", {})
+    path = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    _git(path, "config", "user.name", "Ada")
+    _git(path, "config", "user.email", "ada@example.com")
+    _commit(path, {"a.py": "1", "b.py": "1"}, date="2023-03-01T10:00:00+00:00")
+    _commit(path, {"a.py": "2"}, author="Grace", date="2023-06-01T10:00:00+00:00")
+    return path
+
+
+@pytest.fixture()
+def log_ranges(monkeypatch) -> list[str]:
+    """Rev ranges passed to ``git log`` by the store."""
+    ranges: list[str] = []
+    real = history_store._git
+
+    def spy(project_root, *args, **kwargs):
+        if "log" in args:
+            ranges.append(args[-1])
+        return real(project_root, *args, **kwargs)
+
+    monkeypatch.setattr(history_store, "_git", spy)
+    return ranges
+
+
+class TestHistoryStore:
+    def test_full_build(self, repo):
+        stats = history_stats(repo)
+        assert stats["total_commits"] == 2
+        assert stats["authors"] == {"Ada": 1, "Grace": 1}
+        assert stats["first_date"] == "2023-03-01T10:00:00+00:00"
+        assert stats["latest_date"] == "2023-06-01T10:00:00+00:00"
+        assert "files" not in stats                  # per-file churn is the hotspot store's
+        assert (repo / ".state" / "git_history.json").is_file()
+
+    def test_only_new_commits_are_read(self, repo, log_ranges):
+        old_head = history_stats(repo)["head"]
+        assert history_stats(repo)["head"] == old_head
+        assert log_ranges == [old_head]                       # built once
+
+        history_store._cache.clear()                          # survives a restart
+        _commit(repo, {"c.py": "1", "a.py": "3"}, author="Linus",
+                date="2024-02-01T00:00:00+00:00")
+        stats = history_stats(repo)
+        assert log_ranges[1] == f"{old_head}..{stats['head']}"
+        assert stats["total_commits"] == 3
+        assert stats["authors"] == {"Ada": 1, "Grace": 1, "Linus": 1}
+        assert stats["latest_date"] == "2024-02-01T00:00:00+00:00"
+
+    def test_rewrite_triggers_rebuild(self, repo, log_ranges):
+        history_stats(repo)
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")
+        _commit(repo, {"b.py": "2"}, author="Hedy", date="2023-07-01T00:00:00+00:00")
+        stats = history_stats(repo)
+        assert ".." not in log_ranges[-1]
+        assert stats["total_commits"] == 2
+        assert stats["authors"] == {"Ada": 1, "Hedy": 1}
+
+    def test_merges_count_as_commits_only(self, repo):
+        history_stats(repo)
+        _git(repo, "checkout", "-q", "-b", "topic", "HEAD~1")
+        _commit(repo, {"t.py": "1"}, author="Barbara", date="2022-01-01T00:00:00+00:00")
+        _git(repo, "checkout", "-q", "main")
+        _git(repo, "merge", "-q", "--no-ff", "-m", "merge topic", "topic")
+        stats = history_stats(repo)
+        assert stats["total_commits"] == int(_git(repo, "rev-list", "--count", "HEAD"))
+        assert stats["authors"]["Barbara"] == 1 and sum(stats["authors"].values()) == 3
+        assert stats["first_date"] == "2022-01-01T00:00:00+00:00"   # older branch commit
+
+    def test_no_commits(self, tmp_path):
+        subprocess.run(["git", "init", "-q", str(tmp_path / "empty")], check=True)
+        assert history_stats(tmp_path / "empty") is None
+        assert _git_history(tmp_path / "empty")["total_commits"] == 0
+
+
+class TestGitHistory:
+    def test_report(self, repo):
+        _git(repo, "tag", "v1")
+        _git(repo, "branch", "feature")
+        h = _git_history(repo)
+        assert h["total_commits"] == 2 and h["authors"] == 2
+        assert h["first_commit_date"] == "2023-03-01T10:00:00+00:00"
+        assert h["latest_commit_date"] == "2023-06-01T10:00:00+00:00"
+        assert h["branch_count"] == 2 and h["tag_count"] == 1
+        assert h["age_days"] > 365
+
+
+def _bench_repo(path: Path, n_commits: int) -> None:
+    lines = []
+    for i in range(n_commits):
+        ts = 1_600_000_000 + i * 60
+        msg = f"commit {i}"
+        lines += ["commit refs/heads/main", f"author Dev{i % 40} <d@x> {ts} +0000",
+                  f"committer Dev <d@x> {ts} +0000", f"data {len(msg)}", msg,
+                  f"M 100644 inline src/mod_{i % 500}/file_{i % 3000}.py",
+                  f"data {len(str(i))}", str(i), ""]
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "fast-import", "--quiet"],
+                   input="\n".join(lines) + "\n", text=True, check=True)
+
+
+@pytest.mark.slow
+def test_bench_incremental_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "_cache", {})
+    repo = tmp_path / "big"
+    _bench_repo(repo, 100_000)
+
+    def walk_all():
+        start = time.perf_counter()
+        for args in (["rev-list", "--count", "HEAD"], ["shortlog", "-sn", "--all", "--no-merges"],
+                     ["log", "--reverse", "--format=%aI", "-1"], ["log", "--format=%aI", "-1"]):
+            subprocess.run(["git", "-C", str(repo), *args], capture_output=True, check=True)
+        return time.perf_counter() - start
+
+    old_s = walk_all()
+    history_stats(repo)
+    start = time.perf_counter()
+    history_stats(repo)
+    hit_s = time.perf_counter() - start
+
+    subprocess.run(["git", "-C", str(repo), "config", "user.name", "Dev"], check=True)
+    subprocess.run(["git", "-C", str(repo), "config", "user.email", "d@x"], check=True)
+    for i in range(10):
+        subprocess.run(["git", "-C", str(repo), "commit", "-q", "--allow-empty", "-m", f"new {i}"],
+                       check=True)
+    start = time.perf_counter()
+    stats = history_stats(repo)
+    incr_s = time.perf_counter() - start
+    assert stats["total_commits"] == 100_010
+    assert hit_s < old_s / 10 and incr_s < old_s
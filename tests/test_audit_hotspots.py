@@ -0,0 +1,220 @@
+"""
+Tests for the churn × complexity hotspot engine (audit/hotspots.py) and
+its ``churn_hotspots`` section in ``l2_quality``.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_audit_hotspots.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.audit import hotspots
+from src.core.services.audit.hotspots import churn_hotspots, get_hotspot_engine
+from src.core.services.audit.parsers._base import FileAnalysis, FileMetrics
+
+_DAY = 86_400
+
+
+def _git(repo: Path, *args: str, env: dict | None = None) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=True,
+        env={**os.environ, **(env or {})},
+    ).stdout
+
+
+def _commit(repo: Path, files: dict[str, str], *, days_ago: int = 0) -> None:
+    for rel, content in files.items():
+        p = repo / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+    _git(repo, "add", "-A")
+    date = f"@{int(time.time()) - days_ago * _DAY} +0000"
+    _git(repo, "commit", "-q", "-m", f"change {list(files)}",
+         env={"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date})
+
+
+def _analysis(path: str, code_lines: int, nesting: int = 1) -> FileAnalysis:
+    return FileAnalysis(path=path, language="python",
+                        metrics=FileMetrics(code_lines=code_lines, max_nesting_depth=nesting))
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(hotspots, "_engines", {})
+    path = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    _git(path, "config", "user.name", "Ada")
+    _git(path, "config", "user.email", "ada@example.com")
+    _commit(path, {"old.py": "x\n"}, days_ago=200)
+    for i in range(3):
+        _commit(path, {"busy.py": f"{i}\n" * (i + 1)}, days_ago=60 + i)
+    _commit(path, {"busy.py": "a\nb\n", "calm.py": "c\n"}, days_ago=5)
+    return path
+
+
+@pytest.fixture()
+def log_args(monkeypatch) -> list[tuple[str, ...]]:
+    """Arguments of every ``git log`` the engine runs."""
+    calls: list[tuple[str, ...]] = []
+    real = hotspots._git
+
+    def spy(project_root, *args, **kwargs):
+        if "log" in args:
+            calls.append(args)
+        return real(project_root, *args, **kwargs)
+
+    monkeypatch.setattr(hotspots, "_git", spy)
+    return calls
+
+
+ANALYSES = {
+    "old.py": _analysis("old.py", 50),
+    "busy.py": _analysis("busy.py", 100, nesting=2),
+    "calm.py": _analysis("calm.py", 400),
+}
+
+
+class TestHotspotEngine:
+    def test_windows(self, repo):
+        result = churn_hotspots(repo, ANALYSES)
+        assert [e["file"] for e in result["30d"]] == ["calm.py", "busy.py"]
+        assert [e["file"] for e in result["90d"]] == ["busy.py", "calm.py"]
+        assert [e["file"] for e in result["365d"]] == ["busy.py", "calm.py", "old.py"]
+
+        busy = result["90d"][0]
+        assert busy["commits"] == 4 and busy["complexity"] == 200
+        assert busy["score"] == 1.0 and result["90d"][1]["score"] == 0.5
+        assert busy["lines_changed"] == 1 + (1 + 2) + (2 + 3) + (3 + 2)
+
+    def test_deleted_files_drop_out(self, repo):
+        analyses = {k: v for k, v in ANALYSES.items() if k != "calm.py"}
+        result = churn_hotspots(repo, analyses)
+        assert [e["file"] for e in result["30d"]] == ["busy.py"]
+
+    def test_only_new_commits_are_read(self, repo, log_args):
+        churn_hotspots(repo, ANALYSES)
+        churn_hotspots(repo, ANALYSES)
+        assert len(log_args) == 1 and any(a.startswith("--since=") for a in log_args[0])
+
+        head = get_hotspot_engine(repo).head
+        hotspots._engines.clear()                          # survives a restart
+        _commit(repo, {"calm.py": "d\n"})
+        result = churn_hotspots(repo, ANALYSES)
+        assert log_args[1][-1] == f"{head}..{_git(repo, 'rev-parse', 'HEAD').strip()}"
+        top = result["30d"][0]
+        assert (top["file"], top["commits"]) == ("calm.py", 2)
+
+    def test_running_sums_match_a_fresh_engine(self, repo):
+        engine = get_hotspot_engine(repo)
+        churn_hotspots(repo, ANALYSES)
+        _commit(repo, {"old.py": "y\n", "busy.py": "z\n"})
+        _commit(repo, {"old.py": "w\n"}, days_ago=100)
+        incremental = churn_hotspots(repo, ANALYSES)
+        assert get_hotspot_engine(repo) is engine
+
+        hotspots._engines.clear()
+        (repo / ".state" / "git_churn.json").unlink()
+        assert churn_hotspots(repo, ANALYSES) == incremental
+        assert incremental["30d"][0]["file"] == "busy.py"
+
+    def test_rewrite_triggers_rebuild(self, repo, log_args):
+        churn_hotspots(repo, ANALYSES)
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")
+        result = churn_hotspots(repo, ANALYSES)
+        assert any(a.startswith("--since=") for a in log_args[-1])
+        assert result["30d"] == []
+        assert result["90d"][0]["commits"] == 3
+
+    def test_top_is_served_from_rankings(self, repo, monkeypatch):
+        engine = get_hotspot_engine(repo)
+        engine.refresh()
+        engine.set_complexity(ANALYSES)
+        assert engine.top(1, 365)[0]["file"] == "busy.py"
+        monkeypatch.setattr(engine, "_rank", lambda totals: pytest.fail("re-ranked"))
+        assert engine.top(5, 30)[0]["file"] == "calm.py"
+        engine.set_complexity(ANALYSES)                    # unchanged: rankings kept
+        assert len(engine.top(5, 365)) == 3
+        with pytest.raises(ValueError):
+            engine.top(5, 7)
+
+    def test_not_a_repo(self, tmp_path):
+        assert churn_hotspots(tmp_path, {}) == {"30d": [], "90d": [], "365d": []}
+
+
+class TestL2Quality:
+    def test_report_has_churn_section(self, repo):
+        from src.core.services.audit.l2_quality import l2_quality
+
+        (repo / "calm.py").write_text("def f(x):\n    if x:\n        return 1\n")
+        _commit(repo, {"calm.py": (repo / "calm.py").read_text()}, days_ago=1)
+        report = l2_quality(repo)
+        assert set(report["churn_hotspots"]) == {"30d", "90d", "365d"}
+        assert report["churn_hotspots"]["30d"][0]["file"] == "calm.py"
+
+
+def _bench_repo(path: Path, n_commits: int, n_files: int) -> None:
+    now = int(time.time())
+    lines = []
+    for i in range(n_commits):
+        ts = now - (n_commits - i) * 600          # one commit every 10 minutes
+        msg = f"commit {i}"
+        lines += ["commit refs/heads/main", f"author Dev <d@x> {ts} +0000",
+                  f"committer Dev <d@x> {ts} +0000", f"data {len(msg)}", msg]
+        for k in range(3):
+            lines += [f"M 100644 inline src/mod_{(i + k) % 200}/file_{(i * 7 + k) % n_files}.py",
+                      f"data {len(str(i)) + 1}", f"{i}\n"]
+        lines.append("")
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "fast-import", "--quiet"],
+                   input="\n".join(lines) + "\n", text=True, check=True)
+    subprocess.run(["git", "-C", str(path), "read-tree", "main"], check=True)
+
+
+@pytest.mark.slow
+def test_bench_hotspot_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(hotspots, "_engines", {})
+    repo = tmp_path / "big"
+    n_commits, n_files = 60_000, 20_000
+    _bench_repo(repo, n_commits, n_files)
+    tracked = _git(repo, "ls-tree", "-r", "--name-only", "main").splitlines()
+    analyses = {rel: _analysis(rel, 50 + i % 700, 1 + i % 5) for i, rel in enumerate(tracked)}
+
+    def numstat_per_request():
+        start = time.perf_counter()
+        subprocess.run(["git", "-C", str(repo), "log", "--numstat", "--format=%H %at",
+                        "--since=365 days ago"], capture_output=True, check=True)
+        return time.perf_counter() - start
+
+    old_s = numstat_per_request()
+    engine = get_hotspot_engine(repo)
+    engine.refresh()
+    engine.set_complexity(analyses)
+    engine.top(10, 90)
+
+    timings = []
+    for _ in range(200):
+        for w in (30, 90, 365):
+            start = time.perf_counter()
+            engine.top(10, w)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    subprocess.run(["git", "-C", str(repo), "config", "user.name", "Dev"], check=True)
+    subprocess.run(["git", "-C", str(repo), "config", "user.email", "d@x"], check=True)
+    for i in range(10):
+        subprocess.run(["git", "-C", str(repo), "commit", "-q", "--allow-empty", "-m", f"n{i}"],
+                       check=True)
+    start = time.perf_counter()
+    engine.refresh()
+    engine.top(10, 90)
+    incr_s = time.perf_counter() - start
+
+    assert engine.stats()["files_with_churn"] > 0
+    assert timings[len(timings) // 2] < old_s / 100       # query vs a numstat walk
+    assert incr_s < old_s
@@ -0,0 +1,240 @@
+"""
+Tests for the persistent import graph (audit/import_graph.py): import
+resolution, incremental re-wiring, SCC maintenance, impact queries and
+the ``controlplane audit impact`` command.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_audit_import_graph.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from src.core.services.audit import import_graph
+from src.core.services.audit.import_graph import (
+    ImportGraph,
+    _tarjan,
+    change_impact,
+    get_import_graph,
+)
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, content in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+        # distinct mtimes even on coarse-grained filesystems
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(import_graph, "_graphs", {})
+    _write(tmp_path, {
+        "src/__init__.py": "",
+        "src/core/__init__.py": "",
+        "src/core/models.py": "import json\n",
+        "src/core/ops.py": "from src.core.models import Thing\n",
+        "src/core/helpers.py": "from . import models\n",
+        "src/ui/views.py": "from src.core import ops\nimport flask\n",
+        "web/app.ts": "import { x } from './lib/util';\nimport React from 'react';\n",
+        "web/lib/util.ts": "export const x = 1;\n",
+        "web/lib/index.ts": "import { x } from './util';\nexport { x };\n",
+    })
+    return tmp_path
+
+
+class TestResolution:
+    def test_edges(self, project):
+        graph = get_import_graph(project)
+        graph.refresh()
+        assert graph.edges() == {
+            "src/core/ops.py": ["src/core/models.py"],
+            "src/core/helpers.py": ["src/core/__init__.py", "src/core/models.py"],
+            "src/ui/views.py": ["src/core/__init__.py", "src/core/ops.py"],
+            "web/app.ts": ["web/lib/util.ts"],
+            "web/lib/index.ts": ["web/lib/util.ts"],
+        }
+
+    def test_dependents(self, project):
+        graph = get_import_graph(project)
+        graph.refresh()
+        assert graph.dependents(["src/core/models.py"]) == {
+            "src/core/ops.py": 1, "src/core/helpers.py": 1, "src/ui/views.py": 2}
+        assert graph.dependents(["src/core/models.py"], depth=1) == {
+            "src/core/ops.py": 1, "src/core/helpers.py": 1}
+        assert graph.dependencies(["src/ui/views.py"]) == {
+            "src/core/__init__.py": 1, "src/core/ops.py": 1, "src/core/models.py": 2}
+
+
+class TestIncremental:
+    def test_only_changed_files_are_parsed(self, project):
+        graph = get_import_graph(project)
+        assert graph.refresh()["parsed"] == 9
+        assert graph.refresh() == {"parsed": 0, "removed": 0, "edges_changed": 0}
+
+        _write(project, {"src/ui/views.py": "from src.core.models import Thing\n"})
+        assert graph.refresh() == {"parsed": 1, "removed": 0, "edges_changed": 3}
+        assert graph.edges()["src/ui/views.py"] == ["src/core/models.py"]
+        assert "src/ui/views.py" not in graph.dependents(["src/core/ops.py"])
+
+    def test_new_module_resolves_waiting_imports(self, project):
+        graph = get_import_graph(project)
+        _write(project, {"src/ui/forms.py": "from src.core.validators import check\n"})
+        graph.refresh()
+        assert "src/ui/forms.py" not in graph._fwd or not graph._fwd["src/ui/forms.py"]
+
+        _write(project, {"src/core/validators.py": ""})
+        assert graph.refresh()["parsed"] == 1            # forms.py is not re-parsed
+        assert graph.dependents(["src/core/validators.py"]) == {"src/ui/forms.py": 1}
+
+        (project / "src/core/validators.py").unlink()
+        assert graph.refresh()["removed"] == 1
+        assert graph._fwd["src/ui/forms.py"] == set()
+
+    def test_store_survives_restart(self, project):
+        get_import_graph(project).refresh()
+        import_graph._graphs.clear()
+        graph = get_import_graph(project)
+        assert graph.refresh()["parsed"] == 0
+        assert graph.dependents(["web/lib/util.ts"]) == {"web/app.ts": 1, "web/lib/index.ts": 1}
+
+
+class TestCycles:
+    def test_cycle_created_and_broken(self, project):
+        graph = get_import_graph(project)
+        graph.refresh()
+        assert graph.cycles() == []
+
+        _write(project, {"src/core/models.py": "from src.ui import views\n"})
+        graph.refresh()
+        assert graph.cycles() == [["src/core/models.py", "src/core/ops.py", "src/ui/views.py"]]
+        saved = json.loads((project / ".state/import_graph.json").read_text())
+        assert saved["cycles"] == graph.cycles()
+
+        _write(project, {"src/ui/views.py": "import flask\n"})
+        graph.refresh()
+        assert graph.cycles() == []
+        assert graph.component_of("src/ui/views.py") == ["src/ui/views.py"]
+
+    def test_incremental_sccs_match_tarjan(self, tmp_path):
+        rnd = random.Random(3)
+        graph = ImportGraph(tmp_path)
+        graph._loaded = True
+        names = [f"m{i}.py" for i in range(40)]
+        specs = {n: [] for n in names}
+        graph._apply(dict(specs), [])
+        for step in range(300):
+            n = rnd.choice(names)
+            if step % 50 == 49:                                  # occasionally a big batch
+                batch = {m: [f"py:m{rnd.randrange(40)}"] for m in rnd.sample(names, 30)}
+            else:
+                batch = {n: sorted({f"py:m{rnd.randrange(40)}" for _ in range(rnd.randint(0, 3))})}
+            graph._apply(batch, [])
+            expected = sorted(sorted(c) for c in _tarjan(set(graph._specs), graph._fwd))
+            got = sorted(sorted(m) for m in graph._members.values())
+            assert got == expected, step
+
+
+class TestImpactApi:
+    def test_change_impact(self, project):
+        result = change_impact(project, ["src/core/models.py", "./missing.py"], depth=1)
+        assert result["files"] == ["src/core/models.py"]
+        assert result["unknown"] == ["missing.py"]
+        assert result["dependents"] == [{"file": "src/core/helpers.py", "hops": 1},
+                                        {"file": "src/core/ops.py", "hops": 1}]
+        assert result["refresh"]["parsed"] == 9
+
+    def test_cli(self, project):
+        from src.ui.cli.audit import audit
+
+        runner = CliRunner()
+        out = runner.invoke(audit, ["impact", "src/core/ops.py", "--json"],
+                            obj={"config_path": project / "project.yml"})
+        assert out.exit_code == 0, out.output
+        assert json.loads(out.output)["dependents"] == [{"file": "src/ui/views.py", "hops": 1}]
+
+        out = runner.invoke(audit, ["impact", "web/lib/util.ts"],
+                            obj={"config_path": project / "project.yml"})
+        assert "2 dependent file(s)" in out.output and "web/app.ts" in out.output
+
+
+class TestL2Structure:
+    def test_structure_uses_persistent_graph(self, project, monkeypatch):
+        from src.core.services.audit.l2_structure import l2_structure
+
+        data = l2_structure(project)
+        graph = data["import_graph"]
+        assert {"from": "src/ui/views.py", "to": "src/core/ops.py"} in graph["internal_edges"]
+        assert graph["internal_edge_count"] == 7
+        assert graph["external_deps"]["flask"]["files"] == ["src/ui/views.py"]
+        assert {(d["from_module"], d["to_module"], d["import_count"])
+                for d in data["cross_module_deps"]} == {("src.ui", "src.core", 2),
+                                                        ("web", "web.lib", 1)}
+
+        # A second audit re-parses nothing for the graph
+        parsed = []
+        refresh = ImportGraph.refresh
+        monkeypatch.setattr(ImportGraph, "refresh",
+                            lambda self: parsed.append(refresh(self)["parsed"]))
+        l2_structure(project)
+        assert parsed == [0]
+
+
+def _bench_project(root: Path, n: int) -> None:
+    """``n`` modules in 200 packages, each importing ~5 lower-numbered ones."""
+    rnd = random.Random(7)
+    for i in range(n):
+        deps = {rnd.randrange(i) for _ in range(5)} if i else set()
+        body = "".join(f"from pkg{d % 200}.mod{d} import f\n" for d in sorted(deps))
+        p = root / f"pkg{i % 200}" / f"mod{i}.py"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(body + "def f():\n    pass\n")
+
+
+@pytest.mark.slow
+def test_bench_impact_queries(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_graph, "_graphs", {})
+    n = 20_000
+    _bench_project(tmp_path, n)
+
+    graph = get_import_graph(tmp_path)
+    start = time.perf_counter()
+    graph.refresh()
+    build_s = time.perf_counter() - start
+
+    import_graph._graphs.clear()
+    graph = get_import_graph(tmp_path)
+    start = time.perf_counter()
+    graph.stats()
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    graph.refresh()
+    noop_s = time.perf_counter() - start
+
+    rnd = random.Random(1)
+    timings = []
+    for _ in range(200):
+        target = f"pkg{(i := rnd.randrange(n)) % 200}/mod{i}.py"
+        start = time.perf_counter()
+        graph.dependents([target])
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    _write(tmp_path, {"pkg3/mod3.py": "from pkg150.mod19950 import f\n"})    # creates a cycle
+    start = time.perf_counter()
+    result = graph.refresh()
+    edit_s = time.perf_counter() - start
+    assert result["parsed"] == 1 and graph.cycles()
+
+    assert max(load_s, noop_s, edit_s) < build_s
+    assert timings[190] < build_s / 100
@@ -0,0 +1,189 @@
+"""
+Tests for the columnar audit score history (audit/score_store.py) and
+the scoring helpers on top of it.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_audit_score_store.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.audit import score_store
+from src.core.services.audit.score_store import ScoreStore, get_score_store
+from src.core.services.audit.scoring import _compute_trend, _load_history, _record_snapshot
+
+_DAY = 86_400
+_MONDAY = 1_704_067_200              # 2024-01-01T00:00:00Z, a Monday
+
+
+def _snap(ts: float, c: float, q: float, enriched: bool = False) -> dict:
+    return {"timestamp": ts, "complexity": c, "quality": q, "enriched": enriched}
+
+
+@pytest.fixture()
+def store(tmp_path: Path, monkeypatch) -> ScoreStore:
+    monkeypatch.setattr(score_store, "_stores", {})
+    return get_score_store(tmp_path)
+
+
+class TestScoreStore:
+    def test_append_and_latest(self, store):
+        for i in range(5):
+            store.append(_snap(_MONDAY + i * 3600, i, 10 - i, enriched=i % 2 == 1))
+        assert len(store) == 5
+        assert store.latest(2) == [_snap(_MONDAY + 3 * 3600, 3.0, 7.0, True),
+                                   _snap(_MONDAY + 4 * 3600, 4.0, 6.0, False)]
+        assert len(store.latest()) == 5
+
+    def test_rollups(self, store):
+        # Mon: 2 snapshots, Tue: 1, next Mon: 1
+        for ts, c, q in ((_MONDAY + 10, 2, 8), (_MONDAY + 20, 4, 6),
+                         (_MONDAY + _DAY, 6, 4), (_MONDAY + 7 * _DAY, 1, 9)):
+            store.append(_snap(ts, c, q))
+
+        day = store.query(resolution="day")
+        assert day["resolution"] == "day" and day["total"] == 4
+        assert [p["timestamp"] for p in day["points"]] == [
+            _MONDAY, _MONDAY + _DAY, _MONDAY + 7 * _DAY]
+        first = day["points"][0]
+        assert (first["count"], first["complexity"], first["quality"]) == (2, 3.0, 7.0)
+        assert (first["complexity_min"], first["complexity_max"], first["complexity_last"]) == (2, 4, 4)
+
+        week = store.query(resolution="week")["points"]
+        assert [(p["timestamp"], p["count"]) for p in week] == [
+            (_MONDAY, 3), (_MONDAY + 7 * _DAY, 1)]
+        assert week[0]["complexity"] == 4.0
+
+    def test_range_and_auto_resolution(self, store):
+        for d in range(60):
+            for h in range(4):
+                store.append(_snap(_MONDAY + d * _DAY + h * 3600, d % 10, 5))
+
+        r = store.query(_MONDAY + 10 * _DAY, _MONDAY + 12 * _DAY - 1, resolution="raw")
+        assert len(r["points"]) == 8 and r["total"] == 240
+
+        assert store.query(max_points=500)["resolution"] == "raw"
+        assert store.query(max_points=100)["resolution"] == "day"
+        auto = store.query(max_points=20)
+        assert auto["resolution"] == "week" and len(auto["points"]) == 9
+        # a range inside one day still starts at that day's bucket
+        assert store.query(_MONDAY + 5 * _DAY + 7200, resolution="day")["points"][0][
+            "timestamp"] == _MONDAY + 5 * _DAY
+        with pytest.raises(ValueError):
+            store.query(resolution="month")
+
+    def test_timestamps_stay_sorted(self, store):
+        store.append(_snap(_MONDAY + 100, 1, 1))
+        stored = store.append(_snap(_MONDAY + 50, 2, 2))          # clock went back
+        assert stored["timestamp"] == _MONDAY + 100
+        assert [p["complexity"] for p in store.query(_MONDAY + 100)["points"]] == [1, 2]
+
+    def test_torn_write_is_repaired(self, store, tmp_path):
+        store.append(_snap(_MONDAY, 1, 1))
+        store.append(_snap(_MONDAY + 1, 2, 2))
+        with open(tmp_path / ".state" / "audit_scores" / "raw.timestamp", "ab") as f:
+            f.write(b"\0" * 8)                                     # only one column grew
+        assert len(store) == 2
+        store.append(_snap(_MONDAY + 2, 3, 3))
+        assert [p["complexity"] for p in store.latest()] == [1, 2, 3]
+
+    def test_rollup_columns_are_append_only(self, store, tmp_path):
+        directory = tmp_path / ".state" / "audit_scores"
+        store.append(_snap(_MONDAY, 1, 1))
+        store.append(_snap(_MONDAY + 10, 3, 3))
+        assert (directory / "day.count").stat().st_size == 0      # bucket still open
+        store.append(_snap(_MONDAY + _DAY, 5, 5))
+        assert (directory / "day.count").stat().st_size == 4       # Monday closed once
+        store.append(_snap(_MONDAY + _DAY + 10, 7, 7))
+        assert (directory / "day.count").stat().st_size == 4
+        day = store.query(resolution="day")["points"]
+        assert [(p["count"], p["complexity"]) for p in day] == [(2, 2.0), (2, 6.0)]
+
+    def test_stale_open_rows_are_rebuilt(self, store, tmp_path):
+        open_file = tmp_path / ".state" / "audit_scores" / "open.json"
+        for ts, c in ((_MONDAY, 1), (_MONDAY + 10, 3), (_MONDAY + _DAY, 5)):
+            store.append(_snap(ts, c, c))
+        stale = open_file.read_text()
+        store.append(_snap(_MONDAY + 8 * _DAY, 9, 9))             # closes Tuesday + week 1
+        open_file.write_text(stale)                                # crash before the rename
+        fresh = ScoreStore(tmp_path)
+        day = fresh.query(resolution="day")["points"]
+        assert [(p["timestamp"], p["count"]) for p in day] == [
+            (_MONDAY, 2), (_MONDAY + _DAY, 1), (_MONDAY + 8 * _DAY, 1)]
+        week = fresh.query(resolution="week")["points"]
+        assert [(p["timestamp"], p["count"]) for p in week] == [(_MONDAY, 3), (_MONDAY + 7 * _DAY, 1)]
+        open_file.unlink()
+        fresh = ScoreStore(tmp_path)
+        fresh.append(_snap(_MONDAY + 8 * _DAY + 1, 1, 1))
+        assert [p["count"] for p in fresh.query(resolution="day")["points"]] == [2, 1, 2]
+
+    def test_legacy_history_is_migrated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(score_store, "_stores", {})
+        legacy = tmp_path / ".state" / "audit_scores.json"
+        legacy.parent.mkdir()
+        legacy.write_text(json.dumps([_snap(_MONDAY + 2, 5, 5), _snap(_MONDAY + 1, 4, 4, True),
+                                      {"bogus": 1}]))
+        store = get_score_store(tmp_path)
+        assert store.latest() == [_snap(_MONDAY + 1, 4, 4, True), _snap(_MONDAY + 2, 5, 5)]
+        assert not legacy.exists() and legacy.with_name("audit_scores.json.migrated").exists()
+
+    def test_persists_across_instances(self, store, tmp_path):
+        store.append(_snap(_MONDAY, 1, 2))
+        assert ScoreStore(tmp_path).latest() == [_snap(_MONDAY, 1, 2)]
+
+
+class TestScoringHistory:
+    def test_record_and_trend(self, store, tmp_path):
+        _record_snapshot(tmp_path, {"score": 4.0}, {"score": 6.0}, enriched=False)
+        _record_snapshot(tmp_path, {"score": 5.0}, {"score": 6.1}, enriched=True)
+        history = _load_history(tmp_path, 20)
+        assert [h["complexity"] for h in history] == [4.0, 5.0]
+        trend = _compute_trend(history[-2:], total=len(store))
+        assert trend["snapshots"] == 2
+        assert trend["complexity_trend"] == "up" and trend["quality_trend"] == "stable"
+
+    def test_history_is_not_capped(self, store, tmp_path):
+        for i in range(150):
+            store.append(_snap(_MONDAY + i, i % 10, 5))
+        assert len(_load_history(tmp_path)) == 150
+        assert len(_load_history(tmp_path, 20)) == 20
+
+
+@pytest.mark.slow
+def test_bench_score_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_store, "_stores", {})
+    n = 100_000                                  # ~5 years at one audit every 25 min
+    store = get_score_store(tmp_path)
+    start_ts = time.time() - n * 1500
+    for i in range(n):
+        store.append(_snap(start_ts + i * 1500, (i % 97) / 10, (i % 89) / 10))
+
+    appends = []
+    for i in range(200):
+        start = time.perf_counter()
+        store.append(_snap(time.time() + i, 5, 5))
+        appends.append(time.perf_counter() - start)
+    appends.sort()
+
+    fresh = ScoreStore(tmp_path)
+    start = time.perf_counter()
+    years = fresh.query()
+    cold_s = time.perf_counter() - start
+    start = time.perf_counter()
+    fresh.query(time.time() - 90 * _DAY)
+    warm_s = time.perf_counter() - start
+
+    # the old store: rewrite one JSON list per save
+    legacy = [_snap(start_ts + i * 1500, 5, 5) for i in range(n)]
+    start = time.perf_counter()
+    json.dumps(legacy, indent=2)
+    json_save_s = time.perf_counter() - start
+
+    assert years["points"]
+    assert appends[100] < json_save_s / 10
+    assert warm_s < cold_s < json_save_s
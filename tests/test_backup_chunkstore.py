@@ -0,0 +1,201 @@
+"""
+Tests for deduplicating snapshot backups (content-defined chunk store).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import random
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from src.core.services.backup import chunkstore
+from src.core.services.backup.archive import (
+    create_backup,
+    delete_backup,
+    export_snapshot,
+    list_backups,
+    preview_backup,
+)
+from src.core.services.backup.chunkstore import ChunkStoreError, iter_chunks, read_snapshot
+from src.core.services.backup.restore import import_backup, restore_backup
+
+
+def _blob(size: int, seed: int) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch) -> Path:
+    import src.core.services.content.crypto as crypto
+
+    monkeypatch.setattr(crypto, "KDF_ITERATIONS", 1000)
+    (tmp_path / "media").mkdir()
+    (tmp_path / "media" / "big.bin").write_bytes(_blob(3 * 1024 * 1024, 1))
+    (tmp_path / "media" / "note.md").write_text("hello\n")
+    return tmp_path
+
+
+def _objects(root: Path) -> set[str]:
+    return {p.name for p in (root / "media" / ".backup" / ".chunks" / "objects").glob("*/*")}
+
+
+class TestChunking:
+    def test_sizes_and_roundtrip(self):
+        data = _blob(9 * 1024 * 1024, 2)
+        chunks = list(iter_chunks(io.BytesIO(data)))
+        assert b"".join(chunks) == data
+        assert all(len(c) <= chunkstore.MAX_CHUNK for c in chunks)
+        assert all(len(c) >= chunkstore.MIN_CHUNK for c in chunks[:-1])
+
+    def test_insertion_only_disturbs_nearby_chunks(self):
+        data = _blob(12 * 1024 * 1024, 3)
+        edited = data[:5_000_000] + b"inserted" + data[5_000_000:]
+        before = set(iter_chunks(io.BytesIO(data)))
+        after = list(iter_chunks(io.BytesIO(edited)))
+        assert len([c for c in after if c not in before]) <= 2
+
+    def test_empty_stream(self):
+        assert list(iter_chunks(io.BytesIO(b""))) == []
+
+
+class TestSnapshots:
+    def test_second_backup_stores_only_new_chunks(self, project):
+        first = create_backup(project, "media", ["media"], dedup=True)
+        assert first["success"], first
+        assert first["filename"].endswith(".snap")
+        assert first["dedup"]["bytes_stored"] > 0
+
+        (project / "media" / "new.md").write_text("new file\n")
+        second = create_backup(project, "media", ["media"], dedup=True, custom_name="second")
+        assert second["filename"] == "second.snap"
+        assert second["dedup"]["files_unchanged"] == 2
+        assert second["dedup"]["bytes_stored"] < 100
+
+        listed = list_backups(project, "media")["backups"]
+        assert {b["filename"] for b in listed} == {first["filename"], "second.snap"}
+        assert all(b["dedup"] and b["manifest"]["stats"]["total_files"] for b in listed)
+
+    def test_restore_import_and_preview(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True)
+        original = (project / "media" / "big.bin").read_bytes()
+        (project / "media" / "big.bin").write_bytes(b"clobbered")
+        (project / "media" / "note.md").unlink()
+
+        preview = preview_backup(project, result["full_path"])
+        assert preview["dedup"] and preview["total"] == 2
+
+        imported = import_backup(project, result["full_path"])
+        assert imported["imported"] == ["media/note.md"]
+        restored = restore_backup(project, result["full_path"], paths=["media/big.bin"])
+        assert restored["restored"] == ["media/big.bin"]
+        assert (project / "media" / "big.bin").read_bytes() == original
+
+    def test_delete_frees_only_unshared_chunks(self, project):
+        first = create_backup(project, "media", ["media"], dedup=True, custom_name="a")
+        (project / "media" / "other.bin").write_bytes(_blob(600_000, 9))
+        second = create_backup(project, "media", ["media"], dedup=True, custom_name="b")
+        shared = _objects(project)
+
+        gone = delete_backup(project, second["full_path"])
+        assert gone["chunks_freed"] >= 1
+        remaining = _objects(project)
+        assert remaining < shared
+
+        # The first snapshot is still fully restorable
+        (project / "media" / "big.bin").unlink()
+        assert restore_backup(project, first["full_path"])["success"]
+
+        delete_backup(project, first["full_path"])
+        assert _objects(project) == set()
+
+    def test_corrupt_chunk_is_detected(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True)
+        victim = next((project / "media" / ".backup" / ".chunks" / "objects").glob("*/*"))
+        raw = bytearray(victim.read_bytes())
+        raw[-1] ^= 0xFF
+        victim.write_bytes(bytes(raw))
+        assert "error" in restore_backup(project, result["full_path"])
+
+    def test_missing_chunk_fails_before_wipe(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True)
+        next((project / "media" / ".backup" / ".chunks" / "objects").glob("*/*")).unlink()
+        restored = restore_backup(project, result["full_path"], wipe_first=True,
+                                  target_folder="media")
+        assert "missing chunk" in restored["error"]
+        assert (project / "media" / "note.md").exists()
+
+    def test_export_tar(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True)
+        exported = export_snapshot(project, result["full_path"])
+        assert exported["success"], exported
+        with tarfile.open(project / exported["full_path"], "r:gz") as tar:
+            assert tar.getnames()[0] == "backup_manifest.json"
+            data = tar.extractfile("media/big.bin").read()
+        assert data == (project / "media" / "big.bin").read_bytes()
+        assert export_snapshot(project, result["full_path"])["error"].startswith("A file named")
+
+    def test_files_are_streamed_chunk_by_chunk(self, project, monkeypatch):
+        (project / "media" / "big.bin").write_bytes(_blob(9 * 1024 * 1024, 4))
+        result = create_backup(project, "media", ["media"], dedup=True)
+        snap = project / result["full_path"]
+        entry, chunks = next((e, c) for e, c in chunkstore.iter_snapshot_files(snap)
+                             if e["path"] == "media/big.bin")
+        pieces = list(chunks())
+        assert len(pieces) == len(entry["chunks"]) > 1
+        assert max(map(len, pieces)) <= chunkstore.MAX_CHUNK
+
+        joined = []
+        real_get = chunkstore.ChunkStore.get
+        monkeypatch.setattr(chunkstore.ChunkStore, "get",
+                            lambda self, cid: joined.append(cid) or real_get(self, cid))
+        reader = io.BufferedReader(chunkstore._ChunkReader(iter([b"ab", b"", b"cde"])))
+        assert reader.read(4) == b"abcd" and reader.read() == b"e" and reader.read() == b""
+        exported = export_snapshot(project, result["full_path"])
+        assert len(joined) == len(read_snapshot(snap)["chunks"])
+        with tarfile.open(project / exported["full_path"], "r:gz") as tar:
+            assert tar.extractfile("media/big.bin").read() == (project / "media" / "big.bin").read_bytes()
+
+
+class TestEncryptedSnapshots:
+    @pytest.fixture(autouse=True)
+    def _key(self, project):
+        (project / ".env").write_text("CONTENT_VAULT_ENC_KEY=s3cret\n")
+
+    def test_chunks_and_snapshot_are_opaque(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True, encrypt_archive_flag=True)
+        assert result["filename"].endswith(".snap.enc")
+        snap = project / result["full_path"]
+        assert b"note.md" not in snap.read_bytes()
+        for obj in (project / "media" / ".backup" / ".chunks" / "objects").glob("*/*"):
+            assert b"hello" not in obj.read_bytes()
+
+        with pytest.raises(ChunkStoreError):
+            read_snapshot(snap, "wrong")
+        assert read_snapshot(snap, "s3cret")["stats"]["total_files"] == 2
+
+        (project / "media" / "note.md").unlink()
+        assert import_backup(project, result["full_path"])["imported"] == ["media/note.md"]
+
+    def test_wrong_key_fails_before_wipe(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True, encrypt_archive_flag=True)
+        (project / ".env").write_text("CONTENT_VAULT_ENC_KEY=wrong\n")
+        restored = restore_backup(project, result["full_path"], wipe_first=True,
+                                  target_folder="media")
+        assert restored["error"].startswith("Failed to decrypt archive")
+        assert (project / "media" / "note.md").exists()
+
+    def test_delete_without_key(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True, encrypt_archive_flag=True)
+        os.remove(project / ".env")
+        assert delete_backup(project, result["full_path"])["ok"]
+        assert _objects(project) == set()
+
+    def test_export_stays_encrypted(self, project):
+        result = create_backup(project, "media", ["media"], dedup=True, encrypt_archive_flag=True)
+        exported = export_snapshot(project, result["full_path"])
+        assert exported["filename"].endswith(".tar.gz.enc")
+        assert not (project / "media" / ".backup" / exported["filename"][:-4]).exists()
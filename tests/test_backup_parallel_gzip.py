@@ -0,0 +1,104 @@
+"""
+Tests for the block-parallel gzip writer used by backup archives.
+
+The benchmark at the bottom is ``slow`` (opt in with ``pytest -m slow``):
+it compresses a mixed corpus with 1…N workers.
+"""
+
+from __future__ import annotations
+
+import gzip
+import random
+import shutil
+import subprocess
+import tarfile
+import time
+
+import pytest
+
+from src.core.services.backup import parallel_gzip
+from src.core.services.backup.archive import create_backup
+from src.core.services.backup.common import read_manifest
+from src.core.services.backup.parallel_gzip import ParallelGzipWriter, open_tar_gz
+from src.core.services.backup.restore import wipe_folder
+
+
+def _mixed(size: int, seed: int = 0) -> bytes:
+    """Half text-like (compressible), half random (media-like)."""
+    rng = random.Random(seed)
+    words = [rng.randbytes(rng.randint(2, 9)).hex() for _ in range(500)]
+    text = " ".join(rng.choice(words) for _ in range(size // 10)).encode()[: size // 2]
+    return text + rng.randbytes(size - len(text))
+
+
+class TestParallelGzipWriter:
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_multi_member_roundtrip(self, tmp_path, workers):
+        data = _mixed(700_000)
+        out = tmp_path / "x.gz"
+        with ParallelGzipWriter(out, block_size=64 * 1024, workers=workers) as gz:
+            for i in range(0, len(data), 10_000):
+                gz.write(data[i:i + 10_000])
+            assert gz.tell() == len(data)
+
+        raw = out.read_bytes()
+        assert raw.count(b"\x1f\x8b\x08") >= len(data) // (64 * 1024)
+        assert gzip.decompress(raw) == data
+
+    @pytest.mark.skipif(shutil.which("gzip") is None, reason="gzip not installed")
+    def test_gzip_cli_reads_output(self, tmp_path):
+        data = _mixed(300_000, 1)
+        out = tmp_path / "x.gz"
+        with ParallelGzipWriter(out, block_size=50_000, workers=3) as gz:
+            gz.write(data)
+        assert subprocess.run(["gzip", "-dc", str(out)], capture_output=True).stdout == data
+
+    def test_tar_readable_by_tarfile(self, tmp_path):
+        src = tmp_path / "f.bin"
+        src.write_bytes(_mixed(2_500_000, 2))
+        with open_tar_gz(tmp_path / "a.tar.gz", workers=4) as tar:
+            tar.add(str(src), arcname="f.bin")
+        with tarfile.open(tmp_path / "a.tar.gz", "r:gz") as tar:
+            assert tar.extractfile("f.bin").read() == src.read_bytes()
+
+
+class TestBackupArchives:
+    def test_create_and_wipe_use_parallel_writer(self, tmp_path, monkeypatch):
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "a.md").write_bytes(_mixed(1_500_000, 3))
+        calls = []
+        real = parallel_gzip.compress_block
+        monkeypatch.setattr(parallel_gzip, "compress_block", lambda *a: calls.append(1) or real(*a))
+
+        result = create_backup(tmp_path, "docs", ["docs"])
+        assert result["success"]
+        assert len(calls) >= 2
+        archive = tmp_path / result["full_path"]
+        assert read_manifest(archive)["files"] == ["docs/a.md"]
+
+        wiped = wipe_folder(tmp_path, "docs", ["docs/a.md"])
+        assert wiped["backup"]["size_bytes"] > 0
+        with tarfile.open(tmp_path / wiped["backup"]["full_path"], "r:gz") as tar:
+            assert tar.getnames() == ["backup_manifest.json", "docs/a.md"]
+
+
+@pytest.mark.slow
+def test_benchmark_scaling(tmp_path):
+    """Throughput of ``tarfile w:gz`` vs the parallel writer at 1…N workers."""
+    total = 2048 * 1024 * 1024
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    piece = 64 * 1024 * 1024
+    for i in range(max(1, total // piece)):
+        (corpus / f"part{i:03d}.bin").write_bytes(_mixed(piece, i))
+
+    def run(open_tar) -> float:
+        start = time.perf_counter()
+        with open_tar(tmp_path / "bench.tar.gz") as tar:
+            tar.add(str(corpus), arcname="corpus")
+        return time.perf_counter() - start
+
+    baseline = run(lambda p: tarfile.open(p, "w:gz", compresslevel=6))
+    counts = sorted({1, 2, 4, parallel_gzip.default_workers()})
+    timings = {n: run(lambda p, n=n: open_tar_gz(p, workers=n)) for n in counts}
+    assert timings[counts[-1]] <= min(baseline, timings[1]) * 1.1
@@ -0,0 +1,115 @@
+"""
+Tests for seekable backup archives (trailing member index).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import tarfile
+from pathlib import Path
+
+import pytest
+
+from src.core.services.backup import common
+from src.core.services.backup.archive import create_backup, list_backups, preview_backup
+from src.core.services.backup.parallel_gzip import open_tar_gz
+from src.core.services.backup.restore import restore_backup
+from src.core.services.backup.seekable import (
+    FOOTER_SIZE,
+    ArchiveIndexError,
+    read_index,
+    read_member,
+)
+
+
+@pytest.fixture()
+def project(tmp_path: Path) -> Path:
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(4):
+        (docs / f"f{i}.bin").write_bytes(os.urandom(600_000))
+    (docs / "readme.md").write_text("# readme\n")
+    return tmp_path
+
+
+def _no_sequential_reads(monkeypatch) -> None:
+    def refuse(*args, **kwargs):
+        raise AssertionError("archive was scanned sequentially")
+    monkeypatch.setattr(tarfile, "open", refuse)
+
+
+class TestIndex:
+    def test_index_matches_members(self, project):
+        archive = project / create_backup(project, "docs", ["docs"])["full_path"]
+        index = read_index(archive)
+        names = [e["name"] for e in index["members"]]
+        assert names[0] == "backup_manifest.json"
+        assert "docs/readme.md" in names
+        assert len(index["blocks"]) >= 2
+
+        entry = next(e for e in index["members"] if e["name"] == "docs/f2.bin")
+        assert read_member(archive, index, entry) == (project / "docs" / "f2.bin").read_bytes()
+
+        # Standard readers see a normal tar.gz
+        with tarfile.open(archive, "r:gz") as tar:
+            assert tar.getnames() == names
+
+    def test_checksum_mismatch(self, project):
+        archive = project / create_backup(project, "docs", ["docs"])["full_path"]
+        index = read_index(archive)
+        entry = dict(index["members"][1], sha256="0" * 64)
+        with pytest.raises(ArchiveIndexError):
+            read_member(archive, index, entry)
+
+    def test_truncated_archive_has_no_index(self, project):
+        archive = project / create_backup(project, "docs", ["docs"])["full_path"]
+        data = archive.read_bytes()
+        archive.write_bytes(data[:-FOOTER_SIZE])
+        assert read_index(archive) is None
+
+
+class TestSeekingReaders:
+    def test_manifest_preview_and_single_file_restore(self, project, monkeypatch):
+        result = create_backup(project, "docs", ["docs"])
+        original = (project / "docs" / "f3.bin").read_bytes()
+        (project / "docs" / "f3.bin").write_bytes(b"changed")
+
+        _no_sequential_reads(monkeypatch)
+        assert list_backups(project, "docs")["backups"][0]["manifest"]["stats"]["total_files"] == 5
+        assert preview_backup(project, result["full_path"])["total"] == 5
+
+        restored = restore_backup(project, result["full_path"], paths=["docs/f3.bin"])
+        assert restored["restored"] == ["docs/f3.bin"]
+        assert (project / "docs" / "f3.bin").read_bytes() == original
+
+
+class TestLegacyArchives:
+    @pytest.fixture()
+    def legacy(self, project) -> Path:
+        """A pre-index archive written with plain tarfile."""
+        archive = project / "docs" / ".backup" / "backup_20250101T000000.tar.gz"
+        archive.parent.mkdir()
+        manifest = json.dumps({"format_version": 2, "files": ["docs/readme.md"]}).encode()
+        with tarfile.open(archive, "w:gz") as tar:
+            info = tarfile.TarInfo("backup_manifest.json")
+            info.size = len(manifest)
+            tar.addfile(info, io.BytesIO(manifest))
+            tar.add(str(project / "docs" / "readme.md"), arcname="docs/readme.md")
+        return archive
+
+    def test_fallback_to_sequential_scan(self, project, legacy):
+        assert read_index(legacy) is None
+        assert common.read_manifest(legacy)["files"] == ["docs/readme.md"]
+        rel = str(legacy.relative_to(project))
+        assert preview_backup(project, rel)["total"] == 1
+
+        (project / "docs" / "readme.md").write_text("changed")
+        restore_backup(project, rel, paths=["docs/readme.md"])
+        assert (project / "docs" / "readme.md").read_text() == "# readme\n"
+
+    def test_unindexed_writer_option(self, tmp_path):
+        with open_tar_gz(tmp_path / "x.tar.gz", index=False) as tar:
+            tar.addfile(tarfile.TarInfo("empty"), io.BytesIO())
+        assert read_index(tmp_path / "x.tar.gz") is None
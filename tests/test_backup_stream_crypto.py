@@ -0,0 +1,231 @@
+"""
+Tests for streaming (segmented AES-GCM) backup archive encryption.
+
+The benchmark at the bottom is ``slow`` (opt in with ``pytest -m slow``):
+it compares disk traffic of the old write → read → encrypt pipeline with
+the single-pass encrypted writer (reads ``/proc/self/io``).
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tarfile
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.core.services.backup import stream_crypto
+from src.core.services.backup.archive import create_backup, list_backups, preview_backup
+from src.core.services.backup.common import decrypt_archive, encrypt_archive, read_manifest
+from src.core.services.backup.parallel_gzip import open_tar_gz
+from src.core.services.backup.restore import (
+    decrypt_backup_inplace,
+    encrypt_backup_inplace,
+    import_backup,
+    restore_backup,
+)
+from src.core.services.backup.seekable import read_index
+from src.core.services.backup.stream_crypto import (
+    HEADER_LEN,
+    TAG_LEN,
+    DecryptingReader,
+    EncryptingWriter,
+    StreamDecryptError,
+    is_stream_encrypted,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fast_kdf(monkeypatch):
+    import src.core.services.content.crypto as crypto
+
+    monkeypatch.setattr(crypto, "KDF_ITERATIONS", 1000)
+
+
+@pytest.fixture()
+def project(tmp_path: Path) -> Path:
+    (tmp_path / ".env").write_text("CONTENT_VAULT_ENC_KEY=s3cret\n")
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(3):
+        (docs / f"f{i}.bin").write_bytes(os.urandom(400_000))
+    (docs / "readme.md").write_text("# readme\n")
+    return tmp_path
+
+
+def _write(path: Path, data: bytes, segment_size: int = 1000) -> None:
+    with EncryptingWriter(path, "s3cret", segment_size=segment_size) as out:
+        for i in range(0, len(data), 333):
+            out.write(data[i:i + 333])
+
+
+class TestStreamFormat:
+    @pytest.mark.parametrize("size", [0, 1, 999, 1000, 1001, 5432])
+    def test_roundtrip_and_seek(self, tmp_path, size):
+        data = random.Random(size).randbytes(size)
+        path = tmp_path / "x.enc"
+        _write(path, data)
+        assert is_stream_encrypted(path)
+        with DecryptingReader(path, "s3cret") as reader:
+            assert reader.size == size
+            assert reader.read() == data
+            reader.seek(size // 2)
+            assert reader.read(700) == data[size // 2:size // 2 + 700]
+
+    def test_wrong_key(self, tmp_path):
+        _write(tmp_path / "x.enc", b"secret data")
+        with pytest.raises(StreamDecryptError):
+            DecryptingReader(tmp_path / "x.enc", "wrong").read()
+
+    def test_truncation_is_detected(self, tmp_path):
+        path = tmp_path / "x.enc"
+        _write(path, os.urandom(3500))
+        # Drop the last segment: the new last segment was not sealed as last
+        data = path.read_bytes()
+        path.write_bytes(data[:HEADER_LEN + 3 * (1000 + TAG_LEN)])
+        with pytest.raises(StreamDecryptError):
+            DecryptingReader(path, "s3cret").read()
+
+    def test_tampering_is_detected(self, tmp_path):
+        path = tmp_path / "x.enc"
+        _write(path, os.urandom(3500))
+        data = bytearray(path.read_bytes())
+        data[HEADER_LEN + 1500] ^= 1
+        path.write_bytes(bytes(data))
+        with DecryptingReader(path, "s3cret") as reader:
+            assert len(reader.read(1000)) == 1000          # segment 0 still fine
+            with pytest.raises(StreamDecryptError):
+                reader.read(1)
+
+    def test_short_passphrase_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            EncryptingWriter(tmp_path / "x.enc", "abc")
+
+
+class TestEncryptedArchives:
+    def test_create_writes_only_ciphertext(self, project, monkeypatch):
+        def refuse(*args, **kwargs):
+            raise AssertionError("archive was re-encrypted after writing")
+        monkeypatch.setattr("src.core.services.content.crypto.encrypt_file", refuse)
+
+        result = create_backup(project, "docs", ["docs"], encrypt_archive_flag=True)
+        assert result["filename"].endswith(".tar.gz.enc")
+        assert sorted(p.name for p in (project / "docs" / ".backup").iterdir()) == [result["filename"]]
+        archive = project / result["full_path"]
+        assert is_stream_encrypted(archive)
+        assert b"readme" not in archive.read_bytes()
+
+        assert read_index(archive) is None
+        assert read_index(archive, passphrase="s3cret") is not None
+        assert read_manifest(archive, passphrase="s3cret")["stats"]["total_files"] == 4
+        assert list_backups(project, "docs")["backups"][0]["encrypted"]
+
+    def test_preview_restore_import_without_temp_copy(self, project, monkeypatch):
+        result = create_backup(project, "docs", ["docs"], encrypt_archive_flag=True)
+        original = (project / "docs" / "f1.bin").read_bytes()
+
+        def refuse(*args, **kwargs):
+            raise AssertionError("archive was decrypted to a temp file")
+        monkeypatch.setattr(tempfile, "mktemp", refuse)
+
+        assert preview_backup(project, result["full_path"])["total"] == 4
+
+        (project / "docs" / "f1.bin").write_bytes(b"changed")
+        restored = restore_backup(project, result["full_path"], paths=["docs/f1.bin"])
+        assert restored["restored"] == ["docs/f1.bin"]
+        assert (project / "docs" / "f1.bin").read_bytes() == original
+
+        (project / "docs" / "readme.md").unlink()
+        assert import_backup(project, result["full_path"])["imported"] == ["docs/readme.md"]
+
+    def test_wrong_key_fails_before_wipe(self, project):
+        result = create_backup(project, "docs", ["docs"], encrypt_archive_flag=True)
+        (project / ".env").write_text("CONTENT_VAULT_ENC_KEY=other-key\n")
+        restored = restore_backup(project, result["full_path"], wipe_first=True)
+        assert "decrypt" in restored["error"]
+        assert (project / "docs" / "readme.md").exists()
+
+    def test_inplace_encrypt_decrypt(self, project):
+        result = create_backup(project, "docs", ["docs"])
+        plain = (project / result["full_path"]).read_bytes()
+        enc = encrypt_backup_inplace(project, result["full_path"])
+        assert is_stream_encrypted(project / enc["full_path"])
+        dec = decrypt_backup_inplace(project, enc["full_path"])
+        assert (project / dec["full_path"]).read_bytes() == plain
+        assert not (project / enc["full_path"]).exists()
+
+
+class TestLegacyCovaultArchives:
+    def test_still_restore(self, project):
+        from src.core.services.content.crypto import encrypt_file
+
+        bak = project / "docs" / ".backup"
+        bak.mkdir()
+        plain = bak / "backup_20250101T000000.tar.gz"
+        with tarfile.open(plain, "w:gz") as tar:
+            tar.add(str(project / "docs" / "readme.md"), arcname="docs/readme.md")
+        encrypt_file(plain, "s3cret")
+        plain.unlink()
+        rel = "docs/.backup/backup_20250101T000000.tar.gz.enc"
+        assert not is_stream_encrypted(project / rel)
+
+        assert preview_backup(project, rel)["total"] == 1
+        (project / "docs" / "readme.md").write_text("changed")
+        restore_backup(project, rel)
+        assert (project / "docs" / "readme.md").read_text() == "# readme\n"
+
+    def test_decrypt_archive_handles_both_formats(self, tmp_path):
+        from src.core.services.content.crypto import encrypt_file
+
+        src = tmp_path / "a.tar.gz"
+        src.write_bytes(b"payload" * 1000)
+        legacy = encrypt_file(src, "s3cret", output_path=tmp_path / "legacy.enc")
+        stream = encrypt_archive(src, "s3cret")
+        for enc in (legacy, stream):
+            out = decrypt_archive(enc, "s3cret", output_path=tmp_path / f"{enc.name}.out")
+            assert out.read_bytes() == b"payload" * 1000
+
+
+def _disk_io() -> tuple[int, int]:
+    """(rchar, wchar): bytes this process moved through read/write syscalls."""
+    try:
+        stats = dict(line.split(": ") for line in Path("/proc/self/io").read_text().splitlines())
+    except OSError:
+        pytest.skip("/proc/self/io not available")
+    return int(stats["rchar"]), int(stats["wchar"])
+
+
+@pytest.mark.slow
+def test_benchmark_single_pass(tmp_path):
+    """Bytes moved: plaintext archive + COVAULT vs the encrypting writer."""
+    total = 512 * 1024 * 1024
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    piece = 64 * 1024 * 1024
+    for i in range(max(1, total // piece)):
+        (corpus / f"part{i:03d}.bin").write_bytes(random.Random(i).randbytes(piece))
+
+    def run(build) -> tuple[int, int]:
+        r0, w0 = _disk_io()
+        build()
+        r1, w1 = _disk_io()
+        return r1 - r0, w1 - w0
+
+    def two_pass() -> None:
+        from src.core.services.content.crypto import encrypt_file
+
+        with open_tar_gz(tmp_path / "a.tar.gz") as tar:
+            tar.add(str(corpus), arcname="corpus")
+        encrypt_file(tmp_path / "a.tar.gz", "s3cret")
+        (tmp_path / "a.tar.gz").unlink()
+
+    def one_pass() -> None:
+        with open_tar_gz(tmp_path / "b.tar.gz.enc", passphrase="s3cret") as tar:
+            tar.add(str(corpus), arcname="corpus")
+
+    two_read, two_written = run(two_pass)
+    one_read, one_written = run(one_pass)
+    assert stream_crypto.is_stream_encrypted(tmp_path / "b.tar.gz.enc")
+    assert one_read < two_read and one_written < two_written
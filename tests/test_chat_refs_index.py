@@ -0,0 +1,239 @@
+"""
+Tests for the resident @-reference autocomplete index (chat/refs_index.py).
+
+``RefIndex.search`` must return what the autocompleters' former
+per-keystroke filters returned (id prefix / case-insensitive substring,
+in source order); the sources must follow their stores incrementally.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_chat_refs_index.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.chat import refs_index
+from src.core.services.chat.refs_autocomplete import autocomplete
+from src.core.services.chat.refs_index import RefIndex, get_autocomplete_index
+
+
+def _git(repo: Path, *args: str, **kwargs) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=True,
+        **kwargs,
+    )
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(refs_index, "_indexes", {})
+    path = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    _git(path, "config", "user.name", "Index Tester")
+    _git(path, "config", "user.email", "index@test.com")
+    (path / "README.md").write_text("# Index test\n")
+    (path / "app.py").write_text("print()\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "initial import")
+    return path
+
+
+def _commit(repo: Path, message: str) -> str:
+    _git(repo, "commit", "-q", "--allow-empty", "-m", message)
+    return _git(repo, "rev-parse", "--short", "HEAD").stdout.strip()
+
+
+def _refs(result: list[dict]) -> list[str]:
+    return [r["ref"] for r in result]
+
+
+class TestRefIndex:
+    def test_matches_prefix_or_substring_in_rank_order(self):
+        rnd = random.Random(5)
+        alphabet = "abcdeXY_/."
+        for _ in range(40):
+            idx = RefIndex()
+            rows = {}
+            for i in range(rnd.randint(1, 400)):
+                key = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 8)))
+                text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+                rows[key] = (text.lower(), i)
+                idx.upsert(key, text.lower(), key, rank=i)
+            for key in rnd.sample(sorted(rows), len(rows) // 4):
+                idx.remove(key)
+                del rows[key]
+            for _ in range(30):
+                q = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 4)))
+                limit = rnd.choice([1, 5, 50])
+                prefix, sub = rnd.choice([(True, True), (True, False), (False, True)])
+                expected = [
+                    k for k, (text, _) in sorted(rows.items(), key=lambda kv: kv[1][1])
+                    if not q or (prefix and k.startswith(q)) or (sub and q.lower() in text)
+                ][:limit]
+                got = idx.search(q, limit=limit, key_prefix=prefix, substring=sub)
+                assert got == expected, (q, limit, prefix, sub)
+
+    def test_fuzzy_hits_follow_exact_ones(self):
+        idx = RefIndex()
+        for i, path in enumerate(["src/auth/session_manager.py", "docs/session.md",
+                                  "src/auth/sesion_manager_old.py"]):
+            idx.upsert(path, path, path, rank=i)
+        # typo: transposed letters — no exact hit, trigram overlap finds it
+        assert idx.search("session_mnaager", limit=5, fuzzy=True)[:1] == [
+            "src/auth/session_manager.py"]
+        assert idx.search("session_mnaager", limit=5) == []      # opt-in only
+        exact_first = idx.search("sesion_manager", limit=5, fuzzy=True)
+        assert exact_first[0] == "src/auth/sesion_manager_old.py"
+
+    def test_removals_are_compacted(self):
+        idx = RefIndex()
+        for i in range(3000):
+            idx.upsert(f"k{i}", f"text {i}", i, rank=i)
+        for i in range(2500):
+            idx.remove(f"k{i}")
+        assert len(idx) == 500
+        # compacted once past 1000 tombstones: at most 1000 dead entries remain
+        assert sum(len(p) for p in idx._grams.values()) <= (500 + 1000) * 7
+        assert idx.search("2999", limit=5) == [2999]
+
+
+class TestSources:
+    def test_code_follows_git_index(self, repo):
+        assert _refs(autocomplete("@code:app", repo)) == ["@code:app.py"]
+        (repo / "lib").mkdir()
+        (repo / "lib" / "apphelpers.py").write_text("")
+        _git(repo, "add", ".")
+        assert _refs(autocomplete("@code:app", repo)) == ["@code:app.py", "@code:lib/apphelpers.py"]
+        _git(repo, "rm", "-q", "--cached", "app.py")
+        assert _refs(autocomplete("@code:app", repo)) == ["@code:lib/apphelpers.py"]
+
+    def test_commits_catch_up_and_survive_rewrites(self, repo):
+        first = autocomplete("@commit:", repo)
+        assert [c["label"] for c in first] == ["initial import"]
+
+        short = _commit(repo, "Fix flaky deploy check")
+        result = autocomplete("@commit:", repo)
+        assert [c["label"] for c in result] == ["Fix flaky deploy check", "initial import"]
+        assert _refs(autocomplete(f"@commit:{short[:5]}", repo)) == [f"@commit:{short}"]
+        assert [c["label"] for c in autocomplete("@commit:DEPLOY", repo)] == ["Fix flaky deploy check"]
+
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")          # history rewritten
+        _commit(repo, "Rework deploy")
+        assert [c["label"] for c in autocomplete("@commit:deploy", repo)] == ["Rework deploy"]
+
+    def test_runs_appended_and_trimmed(self, repo):
+        runs = repo / ".state" / "runs.jsonl"
+        runs.parent.mkdir()
+
+        def write(entries, mode="w"):
+            with open(runs, mode, encoding="utf-8") as f:
+                for e in entries:
+                    f.write(json.dumps(e) + "\n")
+
+        write([{"run_id": "run_a", "type": "detect", "summary": "first"}])
+        assert _refs(autocomplete("@run:", repo)) == ["@run:run_a"]
+        write([{"run_id": "run_b", "type": "deploy", "summary": "second"}], mode="a")
+        assert _refs(autocomplete("@run:", repo)) == ["@run:run_b", "@run:run_a"]
+        assert _refs(autocomplete("@run:DEPLOY", repo)) == ["@run:run_b"]
+
+        write([{"run_id": "run_b", "type": "deploy", "summary": "second"},
+               {"run_id": "run_c", "type": "k8s", "subtype": "apply"}])   # trimmed
+        assert _refs(autocomplete("@run:", repo)) == ["@run:run_c", "@run:run_b"]
+
+    def test_threads_reparsed_only_when_changed(self, repo, monkeypatch):
+        from src.core.services.chat.chat_ops import create_thread
+
+        thread = create_thread(repo, "Release planning", tags=["q3"])
+        assert _refs(autocomplete("@thread:release", repo)) == [f"@thread:{thread.thread_id}"]
+
+        parsed = []
+        real = refs_index._parse_thread
+        monkeypatch.setattr(refs_index, "_parse_thread",
+                            lambda key, path: parsed.append(key) or real(key, path))
+        index = get_autocomplete_index(repo)
+        index._sources["thread"]._parse = refs_index._parse_thread
+        autocomplete("@thread:", repo)
+        assert parsed == []
+
+        f = repo / ".ledger" / "chat" / "threads" / thread.thread_id / "thread.json"
+        data = json.loads(f.read_text())
+        data["title"] = "Incident review (renamed)"
+        f.write_text(json.dumps(data))
+        assert _refs(autocomplete("@thread:incident", repo)) == [f"@thread:{thread.thread_id}"]
+        assert autocomplete("@thread:release", repo) == []
+        assert parsed == [thread.thread_id]
+
+    def test_saved_audits_newest_first(self, repo):
+        audits = repo / ".ledger" / "audits"
+        audits.mkdir(parents=True)
+        for sid in ("snap_20260101", "snap_20260301", "snap_20260201"):
+            (audits / f"{sid}.json").write_text(json.dumps(
+                {"snapshot_id": sid, "card_key": "audit:deps", "status": "ok"}))
+        saved = [r["ref"] for r in autocomplete("@audit:snap", repo)
+                 if r.get("section") == "saved"]
+        assert saved == ["@audit:snap_20260301", "@audit:snap_20260201", "@audit:snap_20260101"]
+
+        from src.core.services.ledger.ledger_ops import list_saved_audits
+
+        listed = list_saved_audits(repo, n=2)
+        assert [a["snapshot_id"] for a in listed] == ["snap_20260301", "snap_20260201"]
+        assert listed[0]["audit_type"] == "project" and listed[0]["status"] == "ok"
+
+
+def _bench_repo(path: Path, n_files: int, n_commits: int) -> None:
+    """A repo with ``n_commits`` commits whose tip tracks ``n_files`` files."""
+    rnd = random.Random(11)
+    words = ["core", "services", "audit", "scoring", "chat", "helpers", "models",
+             "routes", "cli", "k8s", "docker", "ci", "tests", "utils", "api"]
+    exts = [".py", ".ts", ".yaml", ".json", ".sh", ".go", ".md"]
+    lines = ["blob", "mark :1", "data 0", ""]
+    for i in range(n_commits):
+        ts = 1_700_000_000 + i * 60
+        msg = f"{rnd.choice(['Fix', 'Add', 'Refactor', 'Update'])} {rnd.choice(words)} " \
+              f"{rnd.choice(words)} handling #{i}"
+        lines += ["commit refs/heads/main", f"committer Dev <dev@x> {ts} +0000",
+                  f"data {len(msg.encode())}", msg]
+        if i == n_commits - 1:
+            for j in range(n_files):
+                rel = "/".join(rnd.sample(words, rnd.randint(1, 4)))
+                lines.append(f"M 100644 :1 {rel}/{rnd.choice(words)}_{j}{rnd.choice(exts)}")
+        lines.append("")
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "fast-import", "--quiet"],
+                   input="\n".join(lines) + "\n", text=True, check=True)
+    subprocess.run(["git", "-C", str(path), "read-tree", "main"], check=True)
+
+
+@pytest.mark.slow
+def test_bench_keystroke_latency(tmp_path, monkeypatch):
+    monkeypatch.setattr(refs_index, "_indexes", {})
+    repo = tmp_path / "big"
+    _bench_repo(repo, 100_000, 50_000)
+
+    get_autocomplete_index(repo).refresh()
+    stats = get_autocomplete_index(repo).stats()
+
+    def keystrokes(kind: str, word: str) -> list[str]:
+        return [f"@{kind}:{word[:i]}" for i in range(len(word) + 1)]
+
+    typed = (keystrokes("code", "scoring_4") + keystrokes("code", "helpers/api")
+             + keystrokes("commit", "refactor audit") + keystrokes("commit", "3fa"))
+    timings = []
+    for prefix in typed:
+        start = time.perf_counter()
+        autocomplete(prefix, repo)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    start = time.perf_counter()
+    subprocess.run(["git", "-C", str(repo), "ls-files"], capture_output=True, check=True)
+    ls_files_s = time.perf_counter() - start
+
+    assert stats["code"] > 0 and stats["commit"] > 0
+    assert timings[int(len(timings) * 0.95)] < ls_files_s      # a keystroke beats one ls-files
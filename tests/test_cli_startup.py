@@ -0,0 +1,131 @@
+"""
+Tests for CLI startup cost — lazy sub-command loading (src/ui/cli/lazy.py).
+
+`controlplane --help` and `controlplane status` run in a fresh
+interpreter; the domain sub-groups they do not use must not be
+imported, and their wall time must stay within a budget.
+
+The wall-time budget is ``slow`` (opt in):
+``pytest -m slow tests/test_cli_startup.py``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from src.main import _SUBCOMMANDS, cli
+
+_REPO = Path(__file__).resolve().parent.parent
+
+# Median wall time of a fresh `python -m src.main …`, generous enough
+# for a loaded CI runner (measured: ~80 ms / ~250 ms on one core).
+_HELP_BUDGET_S = 0.6
+_STATUS_BUDGET_S = 1.2
+
+
+@pytest.fixture()
+def config(tmp_path: Path) -> Path:
+    path = tmp_path / "project.yml"
+    path.write_text(textwrap.dedent("""\
+        name: startup-test
+        modules:
+          - name: api
+            path: src/api
+    """))
+    return path
+
+
+# Runs the CLI like `python -m src.main` and lists sys.modules at exit
+# (`-X importtime` does not see importlib.import_module calls).
+_RUN_AND_LIST_MODULES = """
+import atexit, runpy, sys
+atexit.register(lambda: print("\\n".join(["--modules--", *sys.modules]), file=sys.stderr))
+runpy.run_module("src.main", run_name="__main__")
+"""
+
+
+def _imports(*args: str) -> tuple[subprocess.CompletedProcess, set[str]]:
+    proc = subprocess.run(
+        [sys.executable, "-c", _RUN_AND_LIST_MODULES, *args],
+        cwd=_REPO, capture_output=True, text=True, timeout=60,
+    )
+    _, _, listing = proc.stderr.rpartition("--modules--\n")
+    return proc, set(listing.split())
+
+
+def _median_seconds(*args: str, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-m", "src.main", *args],
+                              cwd=_REPO, capture_output=True, timeout=60)
+        timings.append(time.perf_counter() - start)
+        assert proc.returncode == 0, proc.stderr
+    return statistics.median(timings)
+
+
+def _group_modules(modules: set[str]) -> set[str]:
+    groups = {path.split(":")[0] for path, _ in _SUBCOMMANDS.values()}
+    return {m for m in modules if m in groups or m.rsplit(".", 1)[0] in groups}
+
+
+class TestManifest:
+    def test_manifest_matches_groups(self):
+        for name, (_, help_text) in _SUBCOMMANDS.items():
+            cmd = cli.get_command(click.Context(cli), name)
+            assert isinstance(cmd, click.Group), name
+            assert cmd.name == name
+            assert cmd.get_short_help_str(200) == help_text, name
+
+    def test_help_lists_every_group_without_loading(self):
+        from src.ui.cli.lazy import LazyGroup
+
+        group = LazyGroup(name="root", lazy_subcommands={
+            "missing": ("src.ui.cli.does_not_exist:missing", "Never imported."),
+        })
+        out = CliRunner().invoke(group, ["--help"])
+        assert out.exit_code == 0
+        assert "missing  Never imported." in out.output
+        with pytest.raises(ModuleNotFoundError):
+            group.get_command(click.Context(group), "missing")
+
+    def test_unknown_command(self):
+        out = CliRunner().invoke(cli, ["nope"])
+        assert out.exit_code == 2 and "No such command 'nope'" in out.output
+
+
+class TestStartup:
+    def test_help_imports_no_groups(self):
+        proc, modules = _imports("--help")
+        assert proc.returncode == 0
+        for name in _SUBCOMMANDS:
+            assert f"  {name} " in proc.stdout
+        assert _group_modules(modules) == set()
+        assert "pydantic" not in modules
+
+    def test_status_imports_no_groups(self, config):
+        proc, modules = _imports("--config", str(config), "status")
+        assert proc.returncode == 0, proc.stderr
+        assert "startup-test" in proc.stdout
+        assert _group_modules(modules) == set()
+
+    def test_subgroup_imports_only_itself(self):
+        proc, modules = _imports("quality", "--help")
+        assert proc.returncode == 0
+        assert _group_modules(modules) == {"src.ui.cli.quality"}
+
+    @pytest.mark.slow
+    def test_startup_budget(self, config):
+        help_s = _median_seconds("--help")
+        status_s = _median_seconds("--config", str(config), "status")
+        assert help_s < _HELP_BUDGET_S, f"--help took {help_s * 1000:.0f} ms"
+        assert status_s < _STATUS_BUDGET_S, f"status took {status_s * 1000:.0f} ms"
@@ -0,0 +1,103 @@
+"""
+Tests for the content directory aggregate index and the listings built on it.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.services.content import dir_index, file_ops
+from src.core.services.content.listing import _scan_folder, list_folder_contents
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index(monkeypatch):
+    monkeypatch.setattr(dir_index, "_index", dir_index.DirIndex())
+    monkeypatch.setattr(file_ops, "_audit", lambda *a, **kw: None)
+
+
+def _tree(root: Path) -> Path:
+    media = root / "media"
+    (media / "a" / "b").mkdir(parents=True)
+    (media / "a" / ".large").mkdir()
+    (media / ".backup").mkdir()
+    (media / "top.md").write_text("x" * 10)
+    (media / "a" / "one.png").write_bytes(b"1" * 100)
+    (media / "a" / "b" / "two.mp4").write_bytes(b"2" * 1000)
+    (media / "a" / ".large" / "big.mp4").write_bytes(b"3" * 5000)
+    (media / "a" / ".large" / "big.mp4.release.json").write_text("{}")
+    (media / "a" / ".hidden").write_text("h")
+    (media / ".backup" / "old.tar.gz").write_bytes(b"0" * 777)
+    return media
+
+
+class TestDirIndex:
+    def test_bottom_up_aggregates(self, tmp_path):
+        media = _tree(tmp_path)
+        agg = dir_index.dir_stats(media)
+        assert agg.file_count == 4
+        assert agg.total_bytes == 10 + 100 + 1000 + 5000
+        assert agg.categories == {"document": 1, "image": 1, "video": 2}
+        a = dir_index.dir_stats(media / "a")
+        assert (a.file_count, a.total_bytes) == (3, 6100)
+
+    def test_refresh_propagates_to_ancestors(self, tmp_path):
+        media = _tree(tmp_path)
+        dir_index.dir_stats(media)
+
+        target = media / "a" / "b" / "two.mp4"
+        target.write_bytes(b"2" * 10)  # in-place shrink: dir mtime unchanged
+        dir_index.refresh_dir_index(target.parent)
+
+        assert dir_index.dir_stats(media / "a" / "b").total_bytes == 10
+        assert dir_index.dir_stats(media).total_bytes == 10 + 100 + 10 + 5000
+
+    def test_directory_mtime_change_is_detected(self, tmp_path):
+        media = _tree(tmp_path)
+        dir_index.dir_stats(media)
+
+        extra = media / "a" / "new.txt"
+        extra.write_text("abc")
+        st = os.stat(media / "a")
+        os.utime(media / "a", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert dir_index.dir_stats(media / "a").file_count == 4
+        assert dir_index.dir_stats(media).file_count == 5
+
+    def test_deleted_subtree_is_subtracted(self, tmp_path):
+        media = _tree(tmp_path)
+        dir_index.dir_stats(media)
+
+        result = file_ops.delete_content_file(tmp_path, "media/a")
+        assert result["success"]
+        agg = dir_index.dir_stats(media)
+        assert (agg.file_count, agg.total_bytes) == (1, 10)
+
+
+class TestListingsUseIndex:
+    def test_subfolder_entry_counts(self, tmp_path, monkeypatch):
+        media = _tree(tmp_path)
+
+        def no_rglob(self, pattern):
+            raise AssertionError("listing must not walk subtrees")
+
+        monkeypatch.setattr(Path, "rglob", no_rglob)
+        entries = {e["name"]: e for e in list_folder_contents(media, tmp_path)}
+        assert entries["a"]["is_dir"] is True
+        assert entries["a"]["file_count"] == 3
+        assert entries["a"]["size"] == 6100
+        assert ".backup" not in entries
+
+        summary = _scan_folder(media, tmp_path)
+        assert summary["file_count"] == 4
+        assert summary["total_size"] == 6110
+
+    def test_upload_updates_counts(self, tmp_path):
+        media = _tree(tmp_path)
+        before = dir_index.dir_stats(media).file_count
+
+        file_ops.upload_content_file(tmp_path, "media/a/b", "note.bin", b"\x00" * 5)
+        assert dir_index.dir_stats(media).file_count == before + 1
@@ -0,0 +1,132 @@
+"""
+Tests for the cached dashboard shell, its script bundles and the
+separately served dashboard state.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import re
+from pathlib import Path
+
+import pytest
+from flask.testing import FlaskClient
+
+from src.ui.web import dashboard_shell
+from src.ui.web.dashboard_shell import _script_blocks
+from src.ui.web.server import create_app
+
+
+@pytest.fixture()
+def app(tmp_path: Path):
+    stack_dir = tmp_path / "stacks" / "python"
+    stack_dir.mkdir(parents=True)
+    (stack_dir / "stack.yml").write_text("name: python\ncapabilities: []\n")
+    app = create_app(project_root=tmp_path, mock_mode=True)
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture()
+def client(app) -> FlaskClient:
+    return app.test_client()
+
+
+def _bundle_urls(html: bytes) -> list[str]:
+    return [u.decode() for u in re.findall(rb'<script src="(/bundles/[^"]+)"', html)]
+
+
+class TestScriptBlocks:
+    def test_comments_and_whitespace_are_dropped(self):
+        html = "<!-- raw JS, no <script> tags -->\n<script>\nconst a = 1;\n</script>\n"
+        assert _script_blocks(html) == ["\nconst a = 1;\n"]
+
+    def test_multiple_blocks(self):
+        assert _script_blocks("<script>a()</script><script>b()</script>") == ["a()", "b()"]
+
+    def test_markup_stays_inline(self):
+        assert _script_blocks("<div></div><script>a()</script>") is None
+        assert _script_blocks('<script src="x.js"></script>') is None
+
+
+class TestDashboardShell:
+    def test_scripts_are_external_bundles(self, client):
+        resp = client.get("/")
+        assert resp.status_code == 200
+        assert b"<script>" not in resp.data
+        assert b'src="/dashboard/state.js"' in resp.data
+        assert resp.headers["Cache-Control"] == "no-cache"
+
+        urls = _bundle_urls(resp.data)
+        assert len(urls) > 40
+        bundle = client.get(urls[0])
+        assert bundle.status_code == 200
+        assert bundle.mimetype == "application/javascript"
+        assert "immutable" in bundle.headers["Cache-Control"]
+        assert b"</script>" not in bundle.data
+
+    def test_etag_and_not_modified(self, client):
+        first = client.get("/")
+        etag = first.headers["ETag"]
+        again = client.get("/", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.data == b""
+
+    def test_gzip_variant(self, client):
+        plain = client.get("/")
+        resp = client.get("/", headers={"Accept-Encoding": "gzip, deflate"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert resp.headers["Vary"] == "Accept-Encoding"
+        assert resp.headers["ETag"] != plain.headers["ETag"]
+        assert gzip.decompress(resp.data) == plain.data
+
+    def test_unknown_bundle_404(self, client):
+        assert client.get("/bundles/nope.0000.js").status_code == 404
+
+    def test_rebuilds_only_when_templates_change(self, app, client, monkeypatch):
+        shell = app.config["DASHBOARD_SHELL"]
+        monkeypatch.setattr(dashboard_shell, "_CHECK_INTERVAL_S", 0.0)
+        renders = []
+        real_render = shell._render
+        monkeypatch.setattr(shell, "_render", lambda sig: renders.append(sig) or real_render(sig))
+
+        client.get("/")
+        client.get("/")
+        assert len(renders) == 1
+
+        old_urls = _bundle_urls(client.get("/").data)
+        real_sig = shell._signature
+        monkeypatch.setattr(shell, "_signature", lambda: (*real_sig(), ("touched", 1)))
+        client.get("/")
+        assert len(renders) == 2
+        # Pages loaded before the rebuild can still fetch their bundles
+        assert client.get(old_urls[0]).status_code == 200
+
+
+class TestDashboardState:
+    def test_state_payload(self, client):
+        resp = client.get("/dashboard/state.js")
+        assert resp.status_code == 200
+        assert resp.data.startswith(b"window._dcp = {")
+        assert b"window.__INITIAL_STATE__ = " in resp.data
+        assert b'"name": "python"' in resp.data
+
+    def test_memoized_until_stacks_change(self, app, tmp_path, monkeypatch):
+        import src.core.config.stack_loader as stack_loader
+
+        calls = []
+        real = stack_loader.discover_stacks
+        monkeypatch.setattr(
+            stack_loader, "discover_stacks", lambda d: calls.append(d) or real(d),
+        )
+        state = app.config["DASHBOARD_STATE"]
+        first = state.context()
+        assert state.context() is first
+        assert len(calls) == 1
+
+        stack_yml = tmp_path / "stacks" / "python" / "stack.yml"
+        st = stack_yml.stat()
+        os.utime(stack_yml, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        state.context()
+        assert len(calls) == 2
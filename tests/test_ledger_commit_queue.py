@@ -0,0 +1,263 @@
+"""
+Tests for the ledger commit queue (ledger/commit_queue.py): write
+coalescing, batch messages with per-write trailers, and the three
+durability modes.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_ledger_commit_queue.py``
+— a 1,000-message chat burst per durability mode.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.ledger import commit_queue, worktree
+from src.core.services.ledger.commit_queue import (
+    LedgerCommitQueue,
+    flush_ledger_writes,
+    get_commit_queue,
+)
+from src.core.services.ledger.worktree import GitIdentityError, ensure_worktree
+
+
+def _init_test_repo(path: Path) -> Path:
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    subprocess.run(["git", "-C", str(path), "config", "user.name", "Queue Tester"], check=True)
+    subprocess.run(["git", "-C", str(path), "config", "user.email", "q@test.com"], check=True)
+    (path / "README.md").write_text("# Queue\n")
+    subprocess.run(["git", "-C", str(path), "add", "."], check=True)
+    subprocess.run(["git", "-C", str(path), "commit", "-q", "-m", "initial"], check=True)
+    return path
+
+
+def _ledger_log(repo: Path) -> list[str]:
+    r = subprocess.run(
+        ["git", "-C", str(repo / ".ledger"), "log", "--format=%B%x00"],
+        capture_output=True, text=True, check=True,
+    )
+    return [m.strip() for m in r.stdout.split("\x00") if m.strip()]
+
+
+def _ledger_dirty(repo: Path) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo / ".ledger"), "status", "--porcelain"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+
+
+@pytest.fixture()
+def repo(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(commit_queue, "_queues", {})
+    path = _init_test_repo(tmp_path / "repo")
+    ensure_worktree(path)
+    return path
+
+
+def _write(repo: Path, rel: str, line: str) -> str:
+    f = repo / ".ledger" / rel
+    f.parent.mkdir(parents=True, exist_ok=True)
+    with f.open("a", encoding="utf-8") as fh:
+        fh.write(line + "\n")
+    return rel
+
+
+@pytest.fixture()
+def slow_commits(monkeypatch):
+    """Make each commit take ≥50 ms so concurrent writes pile up."""
+    real = worktree._commit_paths
+
+    def slow(project_root, paths, message):
+        time.sleep(0.05)
+        return real(project_root, paths, message)
+
+    monkeypatch.setattr(worktree, "_commit_paths", slow)
+
+
+class TestBatchMessage:
+    def test_single_write_keeps_its_message(self):
+        w = commit_queue._Write(["a"], "chat: message in t1")
+        assert commit_queue._batch_message([w]) == "chat: message in t1"
+
+    def test_summary_and_trailers(self):
+        batch = [commit_queue._Write(["a"], m) for m in (
+            "chat: message in t1", "audit: security s_1", "chat: message\nin t2")]
+        assert commit_queue._batch_message(batch) == (
+            "ledger: 3 writes (chat ×2, audit ×1)\n\n"
+            "Ledger-Write: chat: message in t1\n"
+            "Ledger-Write: audit: security s_1\n"
+            "Ledger-Write: chat: message in t2"
+        )
+
+
+class TestCommitQueue:
+    def test_single_group_write_commits_immediately(self, repo):
+        before = len(_ledger_log(repo))
+        ok = worktree.ledger_add_and_commit(
+            repo, paths=[_write(repo, "chat/a.jsonl", "x")], message="chat: message in a",
+        )
+        assert ok
+        log = _ledger_log(repo)
+        assert len(log) == before + 1 and log[0] == "chat: message in a"
+        assert _ledger_dirty(repo) == ""
+
+    def test_concurrent_group_writes_share_commits(self, repo, slow_commits):
+        queue = get_commit_queue(repo)
+        before = len(_ledger_log(repo))
+        writes0, commits0 = queue.writes, queue.commits
+        results: list[bool] = []
+
+        def writer(i: int):
+            for j in range(5):
+                rel = _write(repo, f"chat/t{i}.jsonl", f"m{j}")
+                results.append(worktree.ledger_add_and_commit(
+                    repo, paths=[rel], message=f"chat: message in t{i}"))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [True] * 40
+        commits = queue.commits - commits0
+        assert queue.writes - writes0 == 40 and commits < 20
+        assert len(_ledger_log(repo)) - before == commits
+        assert _ledger_dirty(repo) == ""
+
+    def test_async_defers_until_flush(self, repo, monkeypatch):
+        monkeypatch.setattr(commit_queue, "_FLUSHER_IDLE_S", 0.1)
+        queue = get_commit_queue(repo)
+        queue.window_s = 0.2
+        before = len(_ledger_log(repo))
+        for i in range(20):
+            assert worktree.ledger_add_and_commit(
+                repo, paths=[_write(repo, "chat/a.jsonl", f"m{i}")],
+                message="chat: message in a", durability="async",
+            )
+        assert len(_ledger_log(repo)) == before            # still in the window
+        flush_ledger_writes(repo)
+        log = _ledger_log(repo)
+        assert len(log) == before + 1
+        assert log[0].startswith("ledger: 20 writes (chat ×20)")
+        assert log[0].count("Ledger-Write: chat: message in a") == 20
+        assert _ledger_dirty(repo) == ""
+
+    def test_async_flusher_commits_in_background(self, repo, monkeypatch):
+        monkeypatch.setattr(commit_queue, "_FLUSHER_IDLE_S", 0.1)
+        before = len(_ledger_log(repo))
+        worktree.ledger_add_and_commit(
+            repo, paths=[_write(repo, "audits/s1.json", "{}")],
+            message="audit: deps s1", durability="async",
+        )
+        deadline = time.time() + 10
+        while get_commit_queue(repo).pending() or _ledger_dirty(repo):
+            assert time.time() < deadline
+            time.sleep(0.02)
+        assert len(_ledger_log(repo)) == before + 1
+
+    def test_sync_write_carries_pending_async_writes(self, repo):
+        queue = get_commit_queue(repo)
+        queue.window_s = 5.0                  # the flusher would wait a long time
+        worktree.ledger_add_and_commit(
+            repo, paths=[_write(repo, "chat/a.jsonl", "x")],
+            message="chat: message in a", durability="async",
+        )
+        assert worktree.ledger_add_and_commit(
+            repo, paths=[_write(repo, "audits/s1.json", "{}")],
+            message="audit: deps s1", durability="sync",
+        )
+        assert _ledger_log(repo)[0].startswith("ledger: 2 writes")
+        assert queue.pending() == 0
+
+    def test_identity_error_reaches_every_waiter(self, repo, monkeypatch):
+        def no_identity(project_root, paths, message):
+            time.sleep(0.05)
+            raise GitIdentityError("no identity")
+
+        monkeypatch.setattr(worktree, "_commit_paths", no_identity)
+        errors: list[Exception] = []
+
+        def writer():
+            try:
+                worktree.ledger_add_and_commit(repo, paths=[], message="chat: x")
+            except GitIdentityError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(errors) == 4
+
+    def test_chat_message_surfaces_identity_error(self, repo, monkeypatch):
+        from src.core.services.chat.chat_ops import create_thread, send_message
+
+        thread = create_thread(repo, "Identity")
+
+        def no_identity(project_root, paths, message):
+            raise GitIdentityError("no identity")
+
+        monkeypatch.setattr(worktree, "_commit_paths", no_identity)
+        with pytest.raises(GitIdentityError):
+            send_message(repo, "hello", user="dev", thread_id=thread.thread_id)
+        assert get_commit_queue(repo).pending() == 0
+
+    def test_unknown_mode_rejected(self, repo):
+        with pytest.raises(ValueError):
+            worktree.ledger_add_and_commit(repo, paths=[], message="x", durability="eventual")
+        with pytest.raises(ValueError):
+            LedgerCommitQueue(repo, durability="eventual")
+        with pytest.raises(ValueError):
+            get_commit_queue(repo, durability="eventual")
+
+    def test_get_commit_queue_configures_window(self, repo):
+        queue = get_commit_queue(repo, durability="async", window_s=0.5)
+        assert (queue.durability, queue.window_s) == ("async", 0.5)
+        assert get_commit_queue(repo) is queue
+        assert get_commit_queue(repo, window_s=0.0).window_s == 0.0
+        assert queue.durability == "async"
+        with pytest.raises(ValueError):
+            get_commit_queue(repo, window_s=-1)
+
+
+@pytest.mark.slow
+def test_bench_chat_burst(tmp_path, monkeypatch):
+    from src.core.services.chat import chat_ops
+    from src.core.services.chat.chat_ops import create_thread, send_message
+
+    n_messages, n_senders = 1000, 8
+    commits: dict[str, int] = {}
+    for mode in ("sync", "group", "async"):
+        monkeypatch.setattr(commit_queue, "_queues", {})
+        repo = _init_test_repo(tmp_path / mode)
+        thread = create_thread(repo, "Burst")
+        queue = get_commit_queue(repo, durability=mode)
+        start_commits = queue.commits
+        monkeypatch.setattr(chat_ops, "ledger_add_and_commit",
+                            lambda root, paths, message, durability=None, mode=mode:
+                            worktree.ledger_add_and_commit(root, paths, message, durability=mode))
+
+        def sender(k: int, repo: Path = repo, thread_id: str = thread.thread_id):
+            for i in range(k, n_messages, n_senders):
+                send_message(repo, f"message {i}", user="bench", thread_id=thread_id)
+
+        threads = [threading.Thread(target=sender, args=(k,)) for k in range(n_senders)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        flush_ledger_writes(repo)
+
+        commits[mode] = queue.commits - start_commits
+        assert _ledger_dirty(repo) == ""
+        lines = (repo / ".ledger" / "chat" / "threads" / thread.thread_id
+                 / "messages.jsonl").read_text().splitlines()
+        assert len(lines) == n_messages
+
+    assert commits["async"] < commits["group"] <= commits["sync"] <= n_messages
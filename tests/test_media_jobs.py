@@ -0,0 +1,151 @@
+"""
+Tests for the background media optimization queue and the ffprobe cache.
+
+ffmpeg is never invoked — ``optimize_media`` and ``_probe_media`` are
+monkeypatched so the tests exercise the queue, persistence and
+cancellation logic only.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.content import file_ops, media_jobs, optimize, optimize_video
+
+
+def _wait_for(root: Path, job_id: str, statuses: set[str], timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = media_jobs.get_media_job(root, job_id)
+        if job and job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+
+@pytest.fixture(autouse=True)
+def _quiet_audit(monkeypatch):
+    monkeypatch.setattr(file_ops, "_audit", lambda *a, **kw: None)
+    monkeypatch.setattr(media_jobs, "_audit", lambda *a, **kw: None)
+
+
+class TestMediaJobQueue:
+    def test_background_upload_returns_job_and_completes(self, tmp_path, monkeypatch):
+        def fake_optimize(data, mime, name, **opts):
+            opts["on_progress"]({"status": "encoding", "time": "00:00:01"})
+            return data[:4], "video/mp4", ".mp4", True
+
+        monkeypatch.setattr(optimize, "optimize_media", fake_optimize)
+
+        result = file_ops.upload_content_file(
+            tmp_path, "media", "clip.mov", b"x" * 64, background=True,
+        )
+        assert result["success"] is True
+        assert result["status"] == "queued"
+
+        job = _wait_for(tmp_path, result["job_id"], {"done", "failed"})
+        assert job["status"] == "done"
+        assert job["result"]["name"] == "clip.mp4"
+        assert (tmp_path / "media" / "clip.mp4").read_bytes() == b"xxxx"
+        # Input is dropped once the job is finished
+        assert not (tmp_path / ".state" / "media_jobs" / f"{job['job_id']}.input").exists()
+
+    def test_non_media_upload_stays_synchronous(self, tmp_path):
+        result = file_ops.upload_content_file(
+            tmp_path, "docs", "notes.txt", b"hello", background=True,
+        )
+        assert "job_id" not in result
+        assert (tmp_path / "docs" / "notes.txt").read_bytes() == b"hello"
+
+    def test_cancel_queued_job(self, tmp_path, monkeypatch):
+        gate = threading.Event()
+
+        def blocking_optimize(data, mime, name, **opts):
+            gate.wait(5)
+            return data, mime, ".mp4", False
+
+        monkeypatch.setattr(optimize, "optimize_media", blocking_optimize)
+        monkeypatch.setattr(media_jobs, "_pool", media_jobs._MediaJobPool(1))
+
+        first = media_jobs.enqueue_media_job(tmp_path, "m", "a.mp4", b"a", "video/mp4")
+        second = media_jobs.enqueue_media_job(tmp_path, "m", "b.mp4", b"b", "video/mp4")
+
+        res = media_jobs.cancel_media_job(tmp_path, second["job_id"])
+        assert res["success"] is True
+        gate.set()
+
+        assert _wait_for(tmp_path, first["job_id"], {"done"})["status"] == "done"
+        job = _wait_for(tmp_path, second["job_id"], {"cancelled"})
+        assert job["status"] == "cancelled"
+        assert not (tmp_path / "m" / "b.mp4").exists()
+
+    def test_cancel_unknown_job(self, tmp_path):
+        res = media_jobs.cancel_media_job(tmp_path, "media_nope")
+        assert res["_status"] == 404
+
+    def test_resume_requeues_unfinished(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            optimize, "optimize_media",
+            lambda data, mime, name, **opts: (data, mime, ".mp3", False),
+        )
+        jobs_dir = tmp_path / ".state" / "media_jobs"
+        jobs_dir.mkdir(parents=True)
+        media_jobs._write_record(tmp_path, {
+            "job_id": "media_1_left", "status": "running", "folder": "a",
+            "original_name": "song.mp3", "mime": "audio/mpeg", "created_at": 1,
+        })
+        (jobs_dir / "media_1_left.input").write_bytes(b"abc")
+        monkeypatch.setattr(media_jobs, "_resumed", set())
+
+        assert media_jobs.resume_media_jobs(tmp_path) == 1
+        assert _wait_for(tmp_path, "media_1_left", {"done"})["status"] == "done"
+        assert media_jobs.resume_media_jobs(tmp_path) == 0
+
+    def test_web_app_start_resumes(self, tmp_path, monkeypatch):
+        from src.ui.web.server import create_app
+
+        calls = []
+        monkeypatch.setattr(media_jobs, "resume_media_jobs", calls.append)
+        create_app(project_root=tmp_path, mock_mode=True)
+        assert calls == [tmp_path]
+
+    def test_resume_without_jobs_creates_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(media_jobs, "_resumed", set())
+        assert media_jobs.resume_media_jobs(tmp_path) == 0
+        assert not (tmp_path / ".state" / "media_jobs").exists()
+
+
+class TestProbeCache:
+    def test_probe_runs_once_per_content(self, tmp_path, monkeypatch):
+        calls: list[Path] = []
+
+        def fake_probe(path):
+            calls.append(path)
+            return {"streams": [{"codec_type": "video", "height": 2160}]}
+
+        monkeypatch.setattr(optimize_video, "_probe_media", fake_probe)
+        monkeypatch.setattr(optimize_video, "_probe_cache", type(optimize_video._probe_cache)())
+
+        a = tmp_path / "a.mp4"
+        b = tmp_path / "b.mp4"
+        a.write_bytes(b"same")
+        b.write_bytes(b"same")
+
+        p1 = optimize_video.probe_media_cached(a)
+        p2 = optimize_video.probe_media_cached(b)
+        assert p1 is p2
+        assert len(calls) == 1
+
+    def test_scale_filter_reuses_probe(self, tmp_path, monkeypatch):
+        def boom(*a, **kw):
+            raise AssertionError("ffprobe must not run")
+
+        monkeypatch.setattr(optimize_video.subprocess, "run", boom)
+        probe = {"streams": [{"codec_type": "video", "height": 2160}]}
+        assert optimize_video._build_scale_filter(tmp_path, 1080, probe) == "scale=-2:1080"
+        probe["streams"][0]["height"] = 720
+        assert optimize_video._build_scale_filter(tmp_path, 1080, probe) is None
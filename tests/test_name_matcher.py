@@ -0,0 +1,168 @@
+"""
+Tests for the Aho-Corasick name matcher and peek's index-driven scan.
+
+The scan must return exactly what the previous per-name loop
+(``name in content`` for every ``file_map`` / ``dir_map`` key) returned.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_name_matcher.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from src.core.services import peek, project_index
+from src.core.services.name_matcher import NameMatcher
+from src.core.services.project_index import ProjectIndex
+
+
+def _naive_scan(idx: ProjectIndex, content: str, doc_path: str, found: set[str]) -> list:
+    """The index-driven scan before the matcher (one ``in`` per name)."""
+    doc_dir = str(Path(doc_path).parent)
+    doc_dir = "" if doc_dir == "." else doc_dir
+    out, seen = [], set(found)
+    for name, paths in idx.dir_map.items():
+        if not name.endswith("/") or name in seen:
+            continue
+        if not any(not doc_dir or p.startswith(doc_dir + "/") for p in paths):
+            continue
+        if name in content:
+            seen.add(name)
+            out.append((name, "T2"))
+    for name, paths in idx.file_map.items():
+        if name in seen or not peek._has_known_ext(name):
+            continue
+        if not any(not doc_dir or p.startswith(doc_dir) for p in paths):
+            continue
+        if name in content:
+            seen.add(name)
+            out.append((name, "T6"))
+    return out
+
+
+def _synthetic_index(n_paths: int, seed: int = 7) -> ProjectIndex:
+    rnd = random.Random(seed)
+    words = ["core", "services", "audit", "scoring", "peek", "helpers", "models",
+             "routes", "cli", "k8s", "docker", "ci", "tests", "utils", "docs", "api"]
+    exts = [".py", ".md", ".yaml", ".json", ".ts", ".sh", ".toml"]
+    idx = ProjectIndex()
+    for _ in range(n_paths):
+        dirs = rnd.sample(words, rnd.randint(1, 4))
+        rel_dir = "/".join(dirs)
+        name = f"{rnd.choice(words)}_{rnd.randint(0, 20000)}{rnd.choice(exts)}"
+        idx.file_map.setdefault(name, []).append(f"{rel_dir}/{name}")
+        for depth in range(1, len(dirs) + 1):
+            rel = "/".join(dirs[:depth])
+            for key in (dirs[depth - 1], dirs[depth - 1] + "/"):
+                if rel not in idx.dir_map.setdefault(key, []):
+                    idx.dir_map[key].append(rel)
+    idx.ready = True
+    return idx
+
+
+def _corpus(idx: ProjectIndex, n_docs: int, seed: int = 3) -> list[str]:
+    rnd = random.Random(seed)
+    names = list(idx.file_map)
+    prose = ("The scoring pipeline reads the config, then the audit service "
+             "renders a report. See the helpers for details. ")
+    docs = []
+    for _ in range(n_docs):
+        parts = []
+        for _ in range(120):
+            parts.append(prose)
+            if rnd.random() < 0.3:
+                parts.append(f"`{rnd.choice(names)}` and src/{rnd.choice(['core', 'k8s', 'ci'])}/ ")
+        docs.append("".join(parts))
+    return docs
+
+
+@pytest.fixture()
+def index(monkeypatch):
+    idx = _synthetic_index(2000)
+    monkeypatch.setattr(project_index, "_index", idx)
+    return idx
+
+
+class TestNameMatcher:
+    def test_matches_substring_semantics(self):
+        rnd = random.Random(1)
+        for _ in range(300):
+            names = ["".join(rnd.choice("ab/.") for _ in range(rnd.randint(1, 5)))
+                     for _ in range(rnd.randint(1, 30))]
+            text = "".join(rnd.choice("ab/.x") for _ in range(rnd.randint(0, 60)))
+            m = NameMatcher(names)
+            assert set(m.find_names(text)) == {n for n in m.names if n in text}
+
+    def test_overlapping_and_nested_names(self):
+        m = NameMatcher(["config.yaml", "app-config.yaml", "k8s/", "s/", "ünï.md"])
+        assert m.find_names("see app-config.yaml in k8s/ and ünï.md") == [
+            "config.yaml", "app-config.yaml", "k8s/", "s/", "ünï.md",
+        ]
+        assert m.find_names("") == []
+
+
+class TestIndexDrivenScan:
+    @pytest.mark.parametrize("doc_path", ["README.md", "core/README.md", "k8s/ci/notes.md"])
+    def test_same_candidates_as_per_name_loop(self, index, doc_path):
+        for doc in _corpus(index, 5):
+            found = {"core/"}
+            got = peek._index_driven_scan(doc, doc_path, Path("/nonexistent"), found)
+            assert [(c.text, c.type) for c in got] == _naive_scan(index, doc, doc_path, found)
+
+    def test_matcher_compiled_once_per_name_generation(self, index, tmp_path):
+        peek._index_driven_scan("x", "README.md", tmp_path, set())
+        first = peek._index_names_cache[2]
+        peek._index_driven_scan("y", "README.md", tmp_path, set())
+        assert peek._index_names_cache[2] is first
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "brand_new.py").write_text("")
+        project_index._build_file_index(tmp_path, index)
+        got = peek._index_driven_scan("uses brand_new.py", "README.md", tmp_path, set())
+        assert [c.text for c in got] == ["brand_new.py"]
+        rebuilt = peek._index_names_cache[2]
+        assert rebuilt is not first
+
+        project_index._build_file_index(tmp_path, index)     # same names
+        peek._index_driven_scan("z", "README.md", tmp_path, set())
+        assert peek._index_names_cache[2] is rebuilt
+
+    def test_generation_bumped_after_names_are_published(self, tmp_path):
+        class Watched(ProjectIndex):
+            seen: ClassVar[list] = []
+
+            def __setattr__(self, name, value):
+                if name == "name_generation":
+                    # what a concurrent peek would compile for this generation
+                    self.seen.append("new.py" in self.file_map)
+                super().__setattr__(name, value)
+
+        idx = Watched()
+        (tmp_path / "new.py").write_text("")
+        project_index._build_file_index(tmp_path, idx)
+        assert Watched.seen[-1] is True
+
+
+@pytest.mark.slow
+def test_bench_scan_throughput(monkeypatch):
+    idx = _synthetic_index(50_000)
+    monkeypatch.setattr(project_index, "_index", idx)
+    docs = _corpus(idx, 20)
+    peek._index_name_matcher(idx)
+
+    start = time.perf_counter()
+    for doc in docs:
+        _naive_scan(idx, doc, "README.md", set())
+    naive = len(docs) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for doc in docs:
+        peek._index_driven_scan(doc, "README.md", Path("."), set())
+    compiled = len(docs) / (time.perf_counter() - start)
+
+    assert compiled > naive
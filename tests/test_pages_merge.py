@@ -0,0 +1,184 @@
+"""
+Tests for incremental segment merging (link/copy manifest) and the
+incremental gh-pages deploy.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.core.services.pages import engine
+from src.core.services.pages.merge import merge_tree
+
+
+def _project(tmp_path: Path, root_segment: str | None = None) -> Path:
+    """Project with two 'built' segments (build.json + output dir)."""
+    root = tmp_path / "proj"
+    ws = root / ".pages"
+    pages = {
+        "segments": [
+            {"name": "docs", "source": "docs", "builder": "raw", "path": "/docs"},
+            {"name": "blog", "source": "blog", "builder": "raw", "path": "/blog"},
+        ],
+    }
+    if root_segment:
+        pages["root_segment"] = root_segment
+    root.mkdir()
+    (root / "project.yml").write_text(yaml.dump({"pages": pages}))
+
+    for name, files in {
+        "docs": {"index.html": "docs", "assets/big.bin": "B" * 4096, ".nojekyll": ""},
+        "blog": {"index.html": "blog", "post.html": "p1"},
+    }.items():
+        out = ws / name / "build"
+        for rel, content in files.items():
+            (out / rel).parent.mkdir(parents=True, exist_ok=True)
+            (out / rel).write_text(content)
+        (ws / name / "build.json").write_text(json.dumps({"output_dir": str(out)}))
+    return root
+
+
+class TestMergeTree:
+    def test_unchanged_changed_and_pruned(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "a.txt").write_text("a")
+        (src / "b.txt").write_text("b")
+        dest = tmp_path / "dest"
+        manifest = tmp_path / "merge.json"
+        plan = {"x/a.txt": src / "a.txt", "x/b.txt": src / "b.txt"}
+
+        r1 = merge_tree(plan, dest, manifest_path=manifest)
+        assert r1.full
+        assert r1.linked + r1.reflinked + r1.copied == 2
+
+        (src / "b.txt").unlink()
+        (src / "b.txt").write_text("b2")  # new inode, new content
+        (dest / "stray.txt").write_text("left over")
+        r2 = merge_tree({"x/b.txt": src / "b.txt"}, dest, manifest_path=manifest)
+        assert not r2.full
+        assert r2.linked + r2.reflinked + r2.copied == 1
+        assert r2.removed == 2
+        assert (dest / "x" / "b.txt").read_text() == "b2"
+        assert not (dest / "x" / "a.txt").exists()
+
+    def test_link_disabled_copies_bytes(self, tmp_path):
+        src = tmp_path / "f.bin"
+        src.write_bytes(b"z" * 100)
+        dest = tmp_path / "dest"
+        r = merge_tree({"f.bin": src}, dest, manifest_path=tmp_path / "m.json", link=False)
+        assert (r.copied, r.bytes_copied, r.bytes_linked) == (1, 100, 0)
+        assert os.stat(dest / "f.bin").st_ino != os.stat(src).st_ino
+
+    def test_touch_without_content_change_is_reused(self, tmp_path):
+        src = tmp_path / "f.txt"
+        src.write_text("same")
+        dest = tmp_path / "dest"
+        manifest = tmp_path / "m.json"
+        merge_tree({"f.txt": src}, dest, manifest_path=manifest, link=False)
+
+        st = src.stat()
+        os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        r = merge_tree({"f.txt": src}, dest, manifest_path=manifest, link=False)
+        assert (r.copied, r.unchanged) == (0, 1)
+
+
+class TestMergeSegments:
+    def test_second_merge_reuses_everything(self, tmp_path):
+        root = _project(tmp_path)
+        first = engine.merge_segments(root)
+        assert first["ok"] and first["segments_merged"] == ["docs", "blog"]
+        merged = Path(first["merged_dir"])
+        assert (merged / "docs" / "assets" / "big.bin").is_file()
+        assert (merged / "docs" / ".nojekyll").is_file()
+        assert "Documentation Hub" in (merged / "index.html").read_text()
+        assert not (root / ".pages" / "_merged" / ".merge.json").exists()
+
+        second = engine.merge_segments(root)
+        assert second["report"]["unchanged"] == 5
+        assert second["report"]["bytes_copied"] == 0
+        assert second["report"]["removed"] == 0
+        assert (merged / "index.html").is_file()
+
+    def test_rebuild_replaces_only_changed_and_prunes(self, tmp_path):
+        root = _project(tmp_path)
+        engine.merge_segments(root)
+
+        out = root / ".pages" / "blog" / "build"
+        shutil.rmtree(out)
+        out.mkdir()
+        (out / "index.html").write_text("blog v2")
+
+        r = engine.merge_segments(root)["report"]
+        merged = root / ".pages" / "_merged"
+        assert (merged / "blog" / "index.html").read_text() == "blog v2"
+        assert not (merged / "blog" / "post.html").exists()
+        assert r["removed"] == 1
+        assert r["unchanged"] == 3
+
+    def test_hub_page_never_writes_through_links(self, tmp_path):
+        root = _project(tmp_path, root_segment="docs")
+        engine.merge_segments(root)
+        merged = root / ".pages" / "_merged"
+        assert (merged / "index.html").read_text() == "docs"
+        assert (merged / "blog" / "post.html").is_file()
+
+    def test_non_incremental_starts_fresh(self, tmp_path):
+        root = _project(tmp_path)
+        engine.merge_segments(root)
+        r = engine.merge_segments(root, incremental=False)["report"]
+        assert r["full"] is True and r["unchanged"] == 0
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestDeployIncremental:
+    @pytest.fixture(autouse=True)
+    def _git_identity(self, monkeypatch):
+        for var, value in {
+            "GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t", "GIT_COMMITTER_EMAIL": "t@example.com",
+        }.items():
+            monkeypatch.setenv(var, value)
+
+    def _remote(self, tmp_path: Path, root: Path) -> Path:
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(["git", "remote", "add", "origin", str(remote)], cwd=root, check=True)
+        return remote
+
+    def _remote_log(self, remote: Path) -> list[str]:
+        r = subprocess.run(
+            ["git", "--git-dir", str(remote), "log", "--format=%H", "gh-pages"],
+            capture_output=True, text=True, check=True,
+        )
+        return r.stdout.split()
+
+    def test_pushes_only_when_changed(self, tmp_path):
+        root = _project(tmp_path)
+        remote = self._remote(tmp_path, root)
+        engine.merge_segments(root)
+
+        first = engine.deploy_to_ghpages(root)
+        assert first["ok"], first
+        assert first["changed"] == 6
+        assert not (root / ".pages" / "_merged" / ".git").exists()
+
+        again = engine.deploy_to_ghpages(root)
+        assert again["ok"] and again["changed"] == 0 and again["commit"] is None
+
+        (root / ".pages" / "blog" / "build" / "post.html").unlink()
+        (root / ".pages" / "blog" / "build" / "post.html").write_text("p2")
+        engine.merge_segments(root)
+        third = engine.deploy_to_ghpages(root)
+        assert third["ok"] and third["changed"] == 1
+
+        # Deploys stack on the remote branch instead of replacing it
+        assert self._remote_log(remote) == [third["commit"], first["commit"]]
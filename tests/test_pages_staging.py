@@ -0,0 +1,125 @@
+"""
+Tests for incremental page-builder staging (manifest-driven copy/transform).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from src.core.services.pages_builders import (
+    SegmentConfig,
+    get_builder,
+    run_pipeline,
+    stage_incremental,
+)
+
+
+def _source(tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    (src / "guide").mkdir(parents=True)
+    (src / ".git").mkdir()
+    (src / "intro.md").write_text("# Intro\n")
+    (src / "guide" / "setup.md").write_text(":::note\nInstall it\n:::\n")
+    (src / "logo.png").write_bytes(b"\x89PNG")
+    (src / ".git" / "HEAD").write_text("ref")
+    return src
+
+
+def _upper(src_file: Path, rel: str):
+    if not rel.endswith(".md"):
+        return None
+    return rel[:-3] + ".txt", src_file.read_bytes().upper()
+
+
+class TestStageIncremental:
+    def test_first_run_is_full_then_unchanged(self, tmp_path):
+        src = _source(tmp_path)
+        dest = tmp_path / "out"
+        manifest = tmp_path / "ws" / ".staging" / "source.json"
+
+        r1 = stage_incremental(src, dest, manifest_path=manifest, transform=_upper)
+        assert r1.full and (r1.copied, r1.transformed) == (1, 2)
+        assert (dest / "guide" / "setup.txt").read_bytes().startswith(b":::NOTE")
+        assert not (dest / ".git").exists()
+
+        r2 = stage_incremental(src, dest, manifest_path=manifest, transform=_upper)
+        assert not r2.full
+        assert (r2.copied, r2.transformed, r2.unchanged, r2.removed) == (0, 0, 3, 0)
+
+    def test_changed_removed_and_untracked_files(self, tmp_path):
+        src = _source(tmp_path)
+        dest = tmp_path / "out"
+        manifest = tmp_path / ".staging.json"
+        stage_incremental(src, dest, manifest_path=manifest, transform=_upper)
+
+        (src / "intro.md").write_text("# Changed\n")
+        (src / "logo.png").unlink()
+        (dest / "generated.md").write_text("left over from a later stage")
+
+        r = stage_incremental(src, dest, manifest_path=manifest, transform=_upper)
+        assert (r.transformed, r.unchanged, r.removed) == (1, 1, 2)
+        assert (dest / "intro.txt").read_text() == "# CHANGED\n"
+        assert not (dest / "logo.png").exists()
+        assert not (dest / "generated.md").exists()
+
+    def test_touch_without_content_change_is_reused(self, tmp_path):
+        src = _source(tmp_path)
+        dest = tmp_path / "out"
+        manifest = tmp_path / ".staging.json"
+        stage_incremental(src, dest, manifest_path=manifest)
+
+        st = (src / "intro.md").stat()
+        os.utime(src / "intro.md", ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        r = stage_incremental(src, dest, manifest_path=manifest)
+        assert (r.copied, r.unchanged) == (0, 3)
+
+    def test_transform_version_change_restages_everything(self, tmp_path):
+        src = _source(tmp_path)
+        dest = tmp_path / "out"
+        manifest = tmp_path / ".staging.json"
+        stage_incremental(src, dest, manifest_path=manifest, transform=_upper, transform_version="1")
+        r = stage_incremental(src, dest, manifest_path=manifest, transform=_upper, transform_version="2")
+        assert r.full and r.unchanged == 0
+
+
+class TestBuilderStaging:
+    def test_raw_builder_reports_detail(self, tmp_path):
+        src = _source(tmp_path)
+        ws = tmp_path / "ws"
+        segment = SegmentConfig(name="site", source=str(src))
+        builder = get_builder("raw")
+
+        first = run_pipeline(builder, segment, ws)
+        assert first.ok and first.stages[0].detail["copied"] == 3
+
+        second = run_pipeline(builder, segment, ws)
+        assert second.stages[0].detail["unchanged"] == 3
+        assert sorted(p.name for p in (ws / "build").rglob("*.md")) == ["intro.md", "setup.md"]
+
+    def test_clean_flag_forces_full_restage(self, tmp_path):
+        src = _source(tmp_path)
+        ws = tmp_path / "ws"
+        builder = get_builder("raw")
+        run_pipeline(builder, SegmentConfig(name="s", source=str(src)), ws)
+
+        result = run_pipeline(
+            builder, SegmentConfig(name="s", source=str(src), config={"clean": True}), ws,
+        )
+        assert result.stages[0].detail["full"] is True
+        assert result.stages[0].detail["copied"] == 3
+
+    def test_docusaurus_stages_mdx_directly(self, tmp_path):
+        src = _source(tmp_path)
+        ws = tmp_path / "ws"
+        segment = SegmentConfig(name="docs", source=str(src), builder="docusaurus")
+        builder = get_builder("docusaurus")
+
+        list(builder.run_stage("source", segment, ws))
+        docs = ws / "docs"
+        assert (docs / "guide" / "setup.mdx").is_file()
+        assert not (docs / "guide" / "setup.md").exists()
+
+        (src / "intro.md").write_text("# Intro v2\n")
+        lines = list(builder.run_stage("source", segment, ws))
+        assert any("1 transformed, 2 unchanged" in line for line in lines)
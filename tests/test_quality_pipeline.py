@@ -0,0 +1,261 @@
+"""
+Tests for the concurrent, cached quality pipeline (quality/pipeline.py).
+
+The tools are small Python scripts put first on PATH: ``ruff`` flags
+lines containing ``BAD`` (``check``) or files containing ``UGLY``
+(``format --check``), ``mypy`` sleeps and passes.  Each invocation is
+logged so tests can see which files were actually checked.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_quality_pipeline.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services import tool_inventory
+from src.core.services.quality import ops as quality_ops
+from src.core.services.quality.ops import quality_run
+
+_FAKE_RUFF = r'''#!{python}
+import os, sys, time
+args = sys.argv[1:]
+if args == ["--version"]:
+    print(os.environ.get("FAKE_RUFF_VERSION", "ruff 0.0-test"))
+    sys.exit(0)
+mode = "format" if args[0] == "format" else "check"
+files = [a for a in args[1:] if not a.startswith("-")]
+if files == ["."]:
+    files = sorted(os.path.join(d, f)[2:] for d, _, fs in os.walk(".") for f in fs
+                   if f.endswith(".py") and ".state" not in d)
+with open(os.environ["FAKE_TOOL_LOG"], "a") as log:
+    log.write(mode + " " + " ".join(files) + "\n")
+time.sleep(float(os.environ.get("FAKE_STARTUP", "0")) + float(os.environ.get("FAKE_PER_FILE", "0")) * len(files))
+if any(f.endswith("crash.py") for f in files):
+    print("error: internal panic", file=sys.stderr)
+    sys.exit(2)
+bad = False
+for f in files:
+    text = open(f).read()
+    if mode == "check":
+        for n, line in enumerate(text.splitlines(), 1):
+            if "BAD" in line:
+                print(f"{{f}}:{{n}}:1: E999 bad line")
+                bad = True
+    elif "UGLY" in text:
+        print(f"Would reformat: {{f}}")
+        bad = True
+sys.exit(1 if bad else 0)
+'''
+
+_FAKE_MYPY = r'''#!{python}
+import os, sys, time
+if sys.argv[1:] == ["--version"]:
+    print("mypy 0.0-test")
+    sys.exit(0)
+with open(os.environ["FAKE_TOOL_LOG"], "a") as log:
+    log.write("mypy\n")
+time.sleep(float(os.environ.get("FAKE_MYPY_SECONDS", "0")))
+print("Success: no issues found")
+'''
+
+
+@pytest.fixture()
+def tools(tmp_path: Path, monkeypatch) -> Path:
+    """Fake ruff + mypy on PATH; returns the invocation log."""
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    for name, body in (("ruff", _FAKE_RUFF), ("mypy", _FAKE_MYPY)):
+        script = bindir / name
+        script.write_text(body.format(python=sys.executable))
+        script.chmod(0o755)
+    log = tmp_path / "tools.log"
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_TOOL_LOG", str(log))
+    tool_inventory.invalidate()
+    yield log
+    tool_inventory.invalidate()
+
+
+@pytest.fixture()
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    root.mkdir()
+    _write(root, {
+        "app/__init__.py": "",
+        "app/core.py": "x = 1\n",
+        "app/views.py": "y = BAD\n",
+        "app/ui.js": "let BAD;\n",
+        "pyproject.toml": "[tool.ruff]\n",
+    })
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    return root
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, content in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def _calls(log: Path) -> list[str]:
+    calls = log.read_text().splitlines() if log.exists() else []
+    log.write_text("")
+    return calls
+
+
+class TestCachedRuns:
+    def test_findings_are_cached_per_file(self, project, tools):
+        first = quality_run(project, tool="ruff")["results"][0]
+        assert not first["passed"] and first["exit_code"] == 1
+        assert first["stdout"].splitlines() == ["app/views.py:1:1: E999 bad line",
+                                                "1 file(s) with findings"]
+        assert first["files"] == {"total": 3, "checked": 3, "cached": 0}
+        assert _calls(tools) == ["check app/__init__.py app/core.py app/views.py"]
+
+        again = quality_run(project, tool="ruff")["results"][0]
+        assert _calls(tools) == []                                  # no process at all
+        assert again["files"] == {"total": 3, "checked": 0, "cached": 3}
+        assert again["stdout"] == first["stdout"] and not again["passed"]
+
+        _write(project, {"app/views.py": "y = 2\n"})
+        fixed = quality_run(project, tool="ruff")["results"][0]
+        assert _calls(tools) == ["check app/views.py"]
+        assert fixed["passed"] and fixed["files"]["checked"] == 1
+
+    def test_config_and_version_invalidate(self, project, tools, monkeypatch):
+        quality_run(project, tool="ruff")
+        _calls(tools)
+        _write(project, {"pyproject.toml": "[tool.ruff]\nline-length = 80\n"})
+        assert quality_run(project, tool="ruff")["results"][0]["files"]["checked"] == 3
+
+        monkeypatch.setenv("FAKE_RUFF_VERSION", "ruff 9.9")
+        tool_inventory.invalidate()
+        cache_file = project / ".state/quality_cache.json"
+        cache = json.loads(cache_file.read_text())
+        cache["versions"] = {}                         # forget the probed version
+        cache_file.write_text(json.dumps(cache))
+        tool_inventory._probes.clear()
+        assert quality_run(project, tool="ruff")["results"][0]["files"]["checked"] == 3
+
+    def test_deleted_files_drop_out(self, project, tools):
+        quality_run(project, tool="ruff")
+        (project / "app/views.py").unlink()
+        result = quality_run(project, tool="ruff")["results"][0]
+        assert result["passed"] and result["files"]["total"] == 2
+
+    def test_crash_is_reported_and_not_cached(self, project, tools):
+        _write(project, {"app/crash.py": ""})
+        result = quality_run(project, tool="ruff")["results"][0]
+        assert not result["passed"] and result["exit_code"] == 2
+        assert "internal panic" in result["stderr"]
+        cache = json.loads((project / ".state/quality_cache.json").read_text())
+        assert "app/crash.py" not in cache["tools"]["ruff"]["files"]
+        _calls(tools)
+        quality_run(project, tool="ruff")
+        assert len(_calls(tools)) == 1                          # retried
+
+    def test_no_cache_and_fix_run_the_whole_tree(self, project, tools):
+        quality_run(project, tool="ruff")
+        _calls(tools)
+        quality_run(project, tool="ruff", cache=False)
+        assert _calls(tools) == ["check app/__init__.py app/core.py app/views.py"]
+        result = quality_run(project, tool="ruff", fix=True)["results"][0]
+        assert "files" not in result
+
+
+class TestConcurrency:
+    def test_tools_run_concurrently_within_budget(self, project, tools, monkeypatch):
+        from src.core.services.quality.pipeline import run_tools
+
+        monkeypatch.setenv("FAKE_MYPY_SECONDS", "0.6")
+        monkeypatch.setenv("FAKE_STARTUP", "0.6")
+        specs = [(t, quality_ops._QUALITY_TOOLS[t]) for t in ("ruff", "ruff-format", "mypy")]
+        start = time.perf_counter()
+        results = run_tools(project, specs, jobs=3, use_cache=False)
+        parallel = time.perf_counter() - start
+        start = time.perf_counter()
+        run_tools(project, specs, jobs=1, use_cache=False)
+        serial = time.perf_counter() - start
+        assert [r["tool"] for r in results] == ["ruff", "ruff-format", "mypy"]
+        assert parallel < serial * 0.6, (parallel, serial)
+
+    def test_exclusive_jobs_hold_the_whole_budget(self):
+        import threading
+
+        from src.core.services.quality.pipeline import _CpuBudget
+
+        budget = _CpuBudget(4)
+        assert budget.acquire(10) == 4           # clamped to the budget
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(budget.acquire(1)))
+        waiter.start()
+        waiter.join(0.2)
+        assert got == []                         # blocked behind the exclusive job
+        budget.release(4)
+        waiter.join(2)
+        assert got == [1]
+
+
+class TestCli:
+    def test_check_shows_files_checked(self, project, tools):
+        from click.testing import CliRunner
+
+        from src.ui.cli.quality import quality
+
+        runner = CliRunner()
+        obj = {"config_path": project / "project.yml"}
+        out = runner.invoke(quality, ["check", "-t", "ruff"], obj=obj)
+        assert "Ruff (lint, 3/3 files checked)" in out.output
+        out = runner.invoke(quality, ["check", "-t", "ruff", "-j", "2"], obj=obj)
+        assert "Ruff (lint, 0/3 files checked)" in out.output
+        assert "app/views.py:1:1: E999 bad line" in out.output
+
+
+def _bench_tree(root: Path, n: int) -> None:
+    for i in range(n):
+        p = root / f"pkg{i % 40}" / f"mod{i}.py"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(f"VALUE = {i}\n" + ("y = BAD\n" if i % 97 == 0 else ""))
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+
+
+@pytest.mark.slow
+def test_bench_quality_pipeline(tmp_path, tools, monkeypatch):
+    # ~a real linter's shape: fixed startup + per-file cost; mypy is whole-tree
+    monkeypatch.setenv("FAKE_STARTUP", "0.15")
+    monkeypatch.setenv("FAKE_PER_FILE", "0.001")
+    monkeypatch.setenv("FAKE_MYPY_SECONDS", "2")
+    root = tmp_path / "tree"
+    root.mkdir()
+    n = 5_000
+    _bench_tree(root, n)
+
+    from src.core.services.quality.pipeline import run_tools
+
+    specs = [(t, quality_ops._QUALITY_TOOLS[t]) for t in ("ruff", "ruff-format", "mypy")]
+
+    def timed(**kwargs) -> float:
+        start = time.perf_counter()
+        run_tools(root, specs, **kwargs)
+        return time.perf_counter() - start
+
+    serial_s = timed(jobs=1, use_cache=False)           # the old behaviour
+    cold_s = timed(jobs=4)
+    specs = specs[:2]                                    # file-capable tools only
+    warm_s = timed(jobs=4)
+    _write(root, {"pkg3/mod3.py": "VALUE = 3\ny = BAD\n"})
+    one_s = timed(jobs=4)
+
+    assert cold_s < serial_s
+    assert warm_s < cold_s and one_s < cold_s
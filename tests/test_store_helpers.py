@@ -0,0 +1,49 @@
+"""
+Tests for the shared ``.state/`` store helpers (services/store_helpers.py).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from src.core.services.store_helpers import per_project, run_git, write_json_atomic
+
+
+class TestWriteJsonAtomic:
+    def test_replaces_file_without_leftovers(self, tmp_path: Path):
+        path = tmp_path / ".state" / "store.json"
+        assert write_json_atomic(path, {"v": 1}, what="store")
+        assert write_json_atomic(path, {"v": 2}, what="store")
+        assert json.loads(path.read_text()) == {"v": 2}
+        assert [p.name for p in path.parent.iterdir()] == ["store.json"]
+
+    def test_failure_keeps_old_file(self, tmp_path: Path):
+        path = tmp_path / "store.json"
+        path.write_text('{"v": 1}')
+        assert not write_json_atomic(path, {"bad": object()}, what="store")
+        assert json.loads(path.read_text()) == {"v": 1}
+        assert [p.name for p in tmp_path.iterdir()] == ["store.json"]
+
+
+class TestRunGit:
+    def test_missing_directory_is_a_failed_result(self, tmp_path: Path):
+        r = run_git(tmp_path / "missing", "status")
+        assert r.returncode == 1 and r.stdout == ""
+
+
+class TestPerProject:
+    def test_one_instance_per_resolved_root(self, tmp_path: Path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        registry: dict[str, list] = {}
+        made: list[Path] = []
+
+        def factory(root: Path) -> list:
+            made.append(root)
+            return [root]
+
+        lock = threading.Lock()
+        first = per_project(registry, lock, Path("."), factory)
+        assert per_project(registry, lock, tmp_path, factory) is first
+        assert made == [Path(".")] and list(registry) == [str(tmp_path.resolve())]
@@ -0,0 +1,262 @@
+"""
+Tests for test impact selection and sharded runs (testing/impact.py).
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/test_testing_impact.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services.audit import import_graph
+from src.core.services.testing import impact
+from src.core.services.testing.impact import (
+    _coverage_map,
+    _split_durations,
+    plan_shards,
+    run_tests_stream,
+    select_tests,
+)
+from src.core.services.testing.run import run_tests
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, content in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(content)
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(import_graph, "_graphs", {})
+    _write(tmp_path, {
+        "conftest.py": "",
+        "src/__init__.py": "",
+        "src/a.py": "def one():\n    return 1\n",
+        "src/b.py": "from src.a import one\n\ndef two():\n    return one() + 1\n",
+        "src/c.py": "def three():\n    return 3\n",
+        "tests/test_a.py": "from src.a import one\n\ndef test_one():\n    assert one() == 1\n",
+        "tests/test_b.py": ("from src.b import two\n\ndef test_two():\n    assert two() == 2\n\n"
+                            "def test_two_again():\n    assert two() == 2\n"),
+        "tests/test_c.py": "from src.c import three\n\ndef test_three():\n    assert three() == 3\n",
+        ".gitignore": ".state/\n__pycache__/\n",
+    })
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    return tmp_path
+
+
+class TestPlanShards:
+    def test_balances_by_duration(self):
+        durations = {"t1": 8.0, "t2": 5.0, "t3": 4.0, "t4": 3.0, "t5": 2.0}
+        plan = plan_shards(sorted(durations), durations, 2)
+        assert [s["files"] for s in plan] == [["t1", "t4"], ["t2", "t3", "t5"]]
+        assert [s["expected_seconds"] for s in plan] == [11.0, 11.0]
+
+    def test_unknown_files_weigh_the_median(self):
+        plan = plan_shards(["new", "x", "y", "z"], {"x": 1.0, "y": 2.0, "z": 9.0}, 2)
+        assert {tuple(s["files"]) for s in plan} == {("z",), ("new", "x", "y")}
+
+    def test_never_more_shards_than_files(self):
+        assert len(plan_shards(["a", "b"], {}, 8)) == 2
+        assert plan_shards([], {}, 4) == []
+
+
+class TestMeasurements:
+    def test_split_durations(self):
+        output = "\n".join([
+            "..F",
+            "============================= slowest durations ==============================",
+            "0.20s call     tests/test_a.py::TestX::test_one",
+            "0.01s setup    tests/test_a.py::TestX::test_one",
+            "0.05s call     tests/test_b.py::test_two[1-2]",
+            "",
+            "(3 durations < 0.005s hidden.  Use -vv to show these durations.)",
+            "FAILED tests/test_b.py::test_two[1-2] - assert 1 == 2",
+            "1 failed, 2 passed in 0.31s",
+        ])
+        durations, rest = _split_durations(output)
+        assert durations == {"tests/test_a.py::TestX::test_one": 0.21,
+                             "tests/test_b.py::test_two[1-2]": 0.05}
+        assert rest.splitlines() == ["..F", "FAILED tests/test_b.py::test_two[1-2] - assert 1 == 2",
+                                     "1 failed, 2 passed in 0.31s"]
+
+    def test_coverage_map_from_contexts(self, tmp_path):
+        db = tmp_path / ".coverage"
+        conn = sqlite3.connect(db)
+        conn.executescript("""
+            CREATE TABLE file (id INTEGER PRIMARY KEY, path TEXT);
+            CREATE TABLE context (id INTEGER PRIMARY KEY, context TEXT);
+            CREATE TABLE line_bits (file_id INTEGER, context_id INTEGER, numbits BLOB);
+        """)
+        root = str(tmp_path.resolve())
+        conn.executemany("INSERT INTO file VALUES (?, ?)", [
+            (1, f"{root}/src/a.py"), (2, f"{root}/tests/test_a.py"), (3, "/usr/lib/x.py")])
+        conn.executemany("INSERT INTO context VALUES (?, ?)", [
+            (1, ""), (2, "tests/test_a.py::test_one|run"), (3, "tests/test_a.py::test_two|setup")])
+        conn.executemany("INSERT INTO line_bits VALUES (?, ?, x'01')",
+                         [(1, 1), (1, 2), (2, 2), (3, 3), (1, 3)])
+        conn.commit()
+        conn.close()
+        assert _coverage_map(db, tmp_path) == {"tests/test_a.py": {"src/a.py"}}
+
+
+class TestSelection:
+    def test_imports_are_followed_transitively(self, project):
+        selection = select_tests(project, ["src/a.py"])
+        assert selection["tests"] == ["tests/test_a.py", "tests/test_b.py"]
+        assert selection["reasons"]["tests/test_b.py"] == "imports src/a.py"
+        assert not selection["all"]
+
+    def test_changed_test_and_global_files(self, project):
+        assert select_tests(project, ["tests/test_c.py"])["tests"] == ["tests/test_c.py"]
+        everything = select_tests(project, ["conftest.py"])
+        assert everything["all"] and len(everything["tests"]) == 3
+
+    def test_deleted_module_still_selects_its_importers(self, project, monkeypatch):
+        select_tests(project, ["src/c.py"])               # graph stored on disk
+        monkeypatch.setattr(import_graph, "_graphs", {})  # as in a new process
+        (project / "src" / "c.py").unlink()
+        selection = select_tests(project, ["src/c.py"])
+        assert selection["tests"] == ["tests/test_c.py"]
+        assert selection["reasons"]["tests/test_c.py"] == "imports src/c.py"
+
+    def test_deleted_module_unknown_to_graph_runs_everything(self, project):
+        (project / "src" / "c.py").unlink()
+        selection = select_tests(project, ["src/c.py"])
+        assert selection["all"] and len(selection["tests"]) == 3
+
+    def test_base_must_resolve_to_a_commit(self, project, tmp_path_factory):
+        out = tmp_path_factory.mktemp("out") / "diff.txt"
+        for base in (f"--output={out}", "no-such-ref"):
+            with pytest.raises(ValueError):
+                impact.changed_files(project, base)
+        assert not out.exists()
+        assert impact.changed_files(project, "HEAD") == []
+
+        result = run_tests(project, impacted=True, base=f"--output={out}")
+        assert "Unknown base commit" in result["error"]
+        assert not out.exists()
+
+    def test_recorded_coverage_is_used(self, project):
+        impact._save(project, {"version": 1, "durations": {},
+                               "coverage": {"tests/test_c.py": ["data/fixture.json"]}})
+        assert select_tests(project, ["data/fixture.json"])["tests"] == ["tests/test_c.py"]
+
+
+class TestShardedRun:
+    def test_stream_events_and_recorded_durations(self, project):
+        events = list(run_tests_stream(project, shards=2))
+        assert [e["type"] for e in events] == ["plan", "shard", "shard", "done"]
+        done = events[-1]
+        assert done["ok"] and done["passed"] == 4 and done["selected"] == 3
+        assert sorted(f for e in events[1:3] for f in e["files"]) == [
+            "tests/test_a.py", "tests/test_b.py", "tests/test_c.py"]
+        assert "slowest durations" not in events[1]["output"]
+
+        store = json.loads((project / ".state/test_impact.json").read_text())
+        assert store["overhead"] > 0
+        stored = store["durations"]
+        assert set(stored) == {"tests/test_a.py::test_one", "tests/test_b.py::test_two",
+                               "tests/test_b.py::test_two_again", "tests/test_c.py::test_three"}
+
+    def test_failures_are_reported_per_shard(self, project):
+        _write(project, {"src/c.py": "def three():\n    return 4\n"})
+        result = run_tests(project, impacted=True)
+        assert not result["ok"]
+        assert (result["selected"], result["passed"], result["failed"]) == (1, 0, 1)
+        assert result["failures"][0]["name"].startswith("tests/test_c.py::test_three")
+        assert "── shard 0 ──" in result["output"]
+
+    def test_nothing_impacted(self, project):
+        result = run_tests(project, impacted=True, shards=4)
+        assert result["ok"] and result["selected"] == 0 and result["shards"] == []
+
+    def test_timed_out_shard_keeps_history(self, project, monkeypatch):
+        impact._save(project, {"version": 1, "coverage": {},
+                               "durations": {"tests/test_a.py::test_one": 0.5}})
+        _write(project, {"tests/test_a.py": "import time\n\ndef test_one():\n    time.sleep(5)\n"})
+        events = list(run_tests_stream(project, impacted=True, timeout=1))
+        assert events[1]["error"] == "Shard timed out after 1 seconds"
+        assert not events[-1]["ok"]
+        assert impact.file_durations(project) == {"tests/test_a.py": 0.5}
+
+    def test_cli_streams_shards(self, project):
+        from click.testing import CliRunner
+
+        from src.ui.cli.testing import testing
+
+        _write(project, {"src/a.py": "def one():\n    return 1\n\n# touched\n"})
+        out = CliRunner().invoke(testing, ["run", "--impacted", "--shards", "2"],
+                                 obj={"config_path": project / "project.yml"})
+        assert out.exit_code == 0, out.output
+        assert "Running 2 impacted test file(s) in 2 shard(s)" in out.output
+        assert out.output.count("✅ shard") == 2 and "3 passed" in out.output
+
+    def test_cli_rejects_record_coverage_with_json_or_file(self, project):
+        from click.testing import CliRunner
+
+        from src.ui.cli.testing import testing
+
+        for extra in (["--json"], ["--file", "tests/test_a.py"]):
+            out = CliRunner().invoke(testing, ["run", "--record-coverage", *extra],
+                                     obj={"config_path": project / "project.yml"})
+            assert out.exit_code == 2
+            assert "--record-coverage cannot be combined" in out.output
+
+
+def _bench_suite(root: Path, files: int = 100, per_file: int = 50) -> None:
+    """``files × per_file`` tests over 50 modules; every tenth file is slow."""
+    _write(root, {"conftest.py": "", "src/__init__.py": "", ".gitignore": ".state/\n__pycache__/\n"})
+    for m in range(50):
+        _write(root, {f"src/mod{m}.py": f"def value():\n    return {m}\n"})
+    for f in range(files):
+        sleep = 0.004 if f % 10 == 0 else 0.0005
+        body = "".join(
+            f"def test_{t}():\n    time.sleep({sleep})\n    assert value() == {f % 50}\n\n"
+            for t in range(per_file)
+        )
+        _write(root, {f"tests/test_f{f}.py": f"import time\n\nfrom src.mod{f % 50} import value\n\n{body}"})
+    _git(root, "init", "-q")
+    _git(root, "add", ".")
+    _git(root, "commit", "-qm", "suite")
+
+
+@pytest.mark.slow
+def test_bench_sharded_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(import_graph, "_graphs", {})
+    _bench_suite(tmp_path)
+
+    def timed(**kwargs) -> tuple[float, dict]:
+        start = time.perf_counter()
+        result = run_tests(tmp_path, **kwargs)
+        return time.perf_counter() - start, result
+
+    mono_s, mono = timed()
+    assert mono["passed"] == 5000
+    _, first = timed(shards=4)                        # no history yet: equal weights
+    _, balanced = timed(shards=4)                     # balanced on recorded durations
+    assert first["passed"] == balanced["passed"] == 5000
+
+    _write(tmp_path, {"src/mod7.py": "def value():\n    return 7\n\n# touched\n"})
+    impacted_s, impacted = timed(shards=4, impacted=True)
+    assert impacted["passed"] == 100 and impacted["selected"] == 2
+
+    assert max(s["wall_seconds"] for s in balanced["shards"]) < mono_s
+    assert impacted_s < mono_s
@@ -0,0 +1,110 @@
+"""
+Tests for the shared tool inventory (cached PATH lookups and version probes).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.services import tool_inventory
+
+_SLEEP = shutil.which("sleep")
+
+
+@pytest.fixture()
+def bindir(tmp_path: Path, monkeypatch) -> Path:
+    d = tmp_path / "bin"
+    d.mkdir()
+    monkeypatch.setenv("PATH", str(d))
+    tool_inventory.invalidate()
+    yield d
+    tool_inventory.invalidate()
+
+
+def _tool(bindir: Path, name: str, version: str, *, delay: float = 0) -> Path:
+    """Fake CLI printing ``<name> <version>`` and logging each run."""
+    path = bindir / name
+    path.write_text(
+        "#!/bin/sh\n"
+        f"echo run >> '{bindir / (name + '.log')}'\n"
+        + (f"{_SLEEP} {delay}\n" if delay else "")
+        + f"echo '{name} {version}'\n"
+    )
+    path.chmod(0o755)
+    return path
+
+
+def _runs(bindir: Path, name: str) -> int:
+    log = bindir / f"{name}.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+class TestWhich:
+    def test_lookup_and_new_binary_invalidates(self, bindir):
+        assert tool_inventory.which("fake") is None
+        _tool(bindir, "fake", "1.0.0")
+        assert tool_inventory.which("fake") == str(bindir / "fake")
+
+    def test_path_change_invalidates(self, bindir, tmp_path, monkeypatch):
+        other = tmp_path / "other"
+        other.mkdir()
+        _tool(other, "fake", "1.0.0")
+        assert tool_inventory.which("fake") is None
+        monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{other}")
+        assert tool_inventory.which("fake") == str(other / "fake")
+
+    def test_non_executable_is_skipped(self, bindir):
+        (bindir / "data").write_text("x")
+        assert tool_inventory.which_many(["data", "missing"]) == {"data": None, "missing": None}
+
+
+class TestProbes:
+    def test_version_is_cached_per_binary(self, bindir):
+        _tool(bindir, "fake", "1.2.3")
+        for _ in range(3):
+            assert tool_inventory.probe_version(["fake"], r"fake (\S+)") == "1.2.3"
+        assert _runs(bindir, "fake") == 1
+
+    def test_upgraded_binary_is_reprobed(self, bindir):
+        path = _tool(bindir, "fake", "1.2.3")
+        assert tool_inventory.probe_version(["fake"], r"fake (\S+)") == "1.2.3"
+        _tool(bindir, "fake", "2.0.0")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert tool_inventory.probe_version(["fake"], r"fake (\S+)") == "2.0.0"
+
+    def test_missing_tool(self, bindir):
+        assert tool_inventory.probe(["nope", "--version"]) is None
+
+    def test_probes_run_concurrently(self, bindir):
+        specs = {}
+        for i in range(4):
+            _tool(bindir, f"slow{i}", f"{i}.0.0", delay=0.5)
+            specs[f"slow{i}"] = ([f"slow{i}"], rf"slow{i} (\S+)")
+        start = time.perf_counter()
+        versions = tool_inventory.probe_versions(specs)
+        assert time.perf_counter() - start < 1.5
+        assert versions == {f"slow{i}": f"{i}.0.0" for i in range(4)}
+
+
+class TestCallers:
+    def test_has_cmd(self, bindir):
+        from src.core.services.project_probes import has_cmd
+
+        _tool(bindir, "fake", "1.0.0")
+        assert has_cmd("fake")
+        assert not has_cmd("nope")
+
+    def test_detect_clis(self, bindir):
+        from src.core.services.k8s.detect import _detect_clis
+
+        path = _tool(bindir, "helm", "v3.14.0")
+        assert _detect_clis(["helm", "kind"]) == {
+            "helm": {"available": True, "version": "v3.14.0"},
+            "kind": {"available": False, "version": None},
+        }
+        assert tool_inventory.which("helm") == str(path)
@@ -0,0 +1,228 @@
+"""
+Tests for the content-addressed artifact store and download manager,
+against a local HTTP server (Range / If-Range support, fault injection).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.core.services.tool_install.execution import artifact_store, offline_cache
+from src.core.services.tool_install.execution.artifact_store import ArtifactStore
+
+
+class _Server:
+    """Serves ``files`` with Range support; records requests."""
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.etags: dict[str, str] = {}
+        self.cut_after: dict[str, int] = {}    # path → drop connection after N bytes (once)
+        self.delay = 0.0
+        self.requests: list[tuple[str, str | None]] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.path, self.headers.get("Range")))
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    self._serve()
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _serve(self):
+                body = server.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = server.etags.get(self.path, '"v1"')
+                start = 0
+                rng = self.headers.get("Range")
+                if rng and self.headers.get("If-Range", etag) == etag:
+                    start = int(rng.split("=")[1].split("-")[0])
+                    if start >= len(body):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body) - start))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                if server.delay:
+                    time.sleep(server.delay)
+                payload = body[start:]
+                cut = server.cut_after.pop(self.path, None)
+                if cut is not None:
+                    self.wfile.write(payload[:cut])
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+                    return
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(
+            target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True,
+        ).start()
+
+    def add(self, path: str, body: bytes) -> str:
+        self.files[path] = body
+        return self.base + path
+
+
+@pytest.fixture()
+def server():
+    srv = _Server()
+    yield srv
+    srv.httpd.shutdown()
+    srv.httpd.server_close()
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> ArtifactStore:
+    return ArtifactStore(tmp_path / "store")
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+BODY = bytes(range(256)) * 4096          # 1 MiB
+
+
+class TestFetch:
+    def test_streams_hash_into_content_address(self, server, store):
+        url = server.add("/tool.tar.gz", BODY)
+        result = store.fetch(url, checksum=f"sha256:{_sha(BODY)}")
+        assert result.ok and result.sha256 == _sha(BODY)
+        assert Path(result.path) == store.blob_path(_sha(BODY))
+        assert Path(result.path).read_bytes() == BODY
+
+    def test_known_checksum_skips_network(self, server, store):
+        url = server.add("/tool.tar.gz", BODY)
+        store.fetch(url)
+        again = store.fetch(url + "?mirror", checksum=f"sha256:{_sha(BODY)}")
+        assert again.ok and again.from_store
+        assert len(server.requests) == 1
+
+    def test_same_bytes_from_two_urls_stored_once(self, server, store):
+        a = store.fetch(server.add("/a", BODY))
+        b = store.fetch(server.add("/b", BODY))
+        assert a.path == b.path
+        assert len(list((store.root / "sha256").rglob("*"))) == 2   # fan-out dir + blob
+
+    def test_checksum_mismatch(self, server, store):
+        result = store.fetch(server.add("/x", BODY), checksum="sha256:" + "0" * 64)
+        assert not result.ok and "Checksum mismatch" in result.error
+        assert not list((store.root / "partial").iterdir())
+        assert not (store.root / "sha256").exists()
+
+    def test_other_algorithms(self, server, store):
+        md5 = hashlib.md5(BODY).hexdigest()
+        assert store.fetch(server.add("/x", BODY), checksum=f"md5:{md5}").ok
+
+
+class TestResume:
+    def test_interrupted_download_resumes_with_range(self, server, store):
+        url = server.add("/big", BODY)
+        server.cut_after["/big"] = 300_000
+        first = store.fetch(url)
+        assert not first.ok
+
+        second = store.fetch(url, checksum=f"sha256:{_sha(BODY)}")
+        assert second.ok and second.resumed_from == 300_000
+        assert server.requests[-1] == ("/big", "bytes=300000-")
+        assert Path(second.path).read_bytes() == BODY
+
+    def test_changed_upstream_restarts(self, server, store):
+        url = server.add("/big", BODY)
+        server.cut_after["/big"] = 300_000
+        store.fetch(url)
+
+        new_body = BODY[::-1]
+        server.files["/big"] = new_body
+        server.etags["/big"] = '"v2"'
+        result = store.fetch(url)
+        assert result.ok and result.resumed_from == 0
+        assert result.sha256 == _sha(new_body)
+
+
+class TestFetchMany:
+    def test_concurrent_with_per_host_limit(self, server, store):
+        server.delay = 0.3
+        reqs = [{"url": server.add(f"/f{i}", bytes([i]) * 1000)} for i in range(6)]
+        start = time.perf_counter()
+        results = store.fetch_many(reqs, per_host=2)
+        elapsed = time.perf_counter() - start
+        assert all(r.ok for r in results)
+        assert [Path(r.path).read_bytes()[0] for r in results] == list(range(6))
+        assert server.max_active == 2
+        assert elapsed < 6 * 0.3
+
+
+class TestOfflineCache:
+    def test_cache_plan_then_offline_install(self, server, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        cache = tmp_path / "cache"
+        monkeypatch.setenv("DEVOPS_INSTALL_CACHE", str(cache))
+        plan = {"tool": "trivy", "steps": [
+            {"id": "db", "type": "download", "url": server.add("/db.tar.gz", BODY),
+             "checksum": f"sha256:{_sha(BODY)}"},
+            {"id": "extra", "type": "download", "url": server.add("/extra.bin", b"x" * 10)},
+        ]}
+        result = offline_cache.cache_plan(plan, cache_dir=cache)
+        assert result["ok"] and result["cached"] == 2
+        assert offline_cache.cache_status(cache)["store"]["files"] == 2
+
+        from src.core.services.tool_install.execution.step_executors import (
+            _execute_download_step,
+        )
+
+        artifacts = offline_cache.load_cached_artifacts("trivy", cache)
+        step = offline_cache.install_from_cache(
+            {"type": "download", "url": plan["steps"][1]["url"],
+             "dest": str(tmp_path / "out" / "extra.bin")},
+            artifacts["extra"],
+        )
+        server.httpd.shutdown()                       # no network from here on
+        out = _execute_download_step(step)
+        assert out["ok"], out
+        assert (tmp_path / "out" / "extra.bin").read_bytes() == b"x" * 10
+
+    def test_live_download_step_resumes(self, server, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        monkeypatch.setattr(
+            artifact_store, "default_store", lambda: ArtifactStore(tmp_path / "store"),
+        )
+        from src.core.services.tool_install.execution.step_executors import (
+            _execute_download_step,
+        )
+
+        url = server.add("/pack", BODY)
+        server.cut_after["/pack"] = 500_000
+        step = {"type": "download", "url": url, "dest": str(tmp_path / "pack.bin"),
+                "checksum": f"sha256:{_sha(BODY)}"}
+        assert not _execute_download_step(step)["ok"]
+        out = _execute_download_step(step)
+        assert out["ok"] and out["size_bytes"] == len(BODY)
+        assert server.requests[-1][1] == "bytes=500000-"
+        assert (tmp_path / "pack.bin").read_bytes() == BODY
@@ -0,0 +1,203 @@
+"""
+Tests for the DAG install scheduler: dispatch on dependency completion,
+critical-path priority, package-manager locking and package batching.
+
+Steps are executed by a fake ``execute_plan_step`` that sleeps for the
+step's ``estimated_seconds`` and records what ran.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.core.services.tool_install.domain.dag import (
+    _add_implicit_deps,
+    _coalesce_package_steps,
+    _critical_path_priority,
+    _merge_package_steps,
+)
+from src.core.services.tool_install.orchestration import orchestrator
+
+
+class _Recorder:
+    def __init__(self, fail: tuple[str, ...] = ()):
+        self.fail = set(fail)
+        self.calls: list[dict] = []
+        self.order: list[str] = []
+        self.active: dict[str, int] = {}
+        self.max_active: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, step: dict, *, sudo_password: str = "", **kwargs) -> dict:
+        pm = step.get("package_manager") or "-"
+        with self._lock:
+            self.calls.append(step)
+            self.order.append(step["id"])
+            self.active[pm] = self.active.get(pm, 0) + 1
+            self.max_active[pm] = max(self.max_active.get(pm, 0), self.active[pm])
+        time.sleep(step.get("estimated_seconds", 0.0))
+        with self._lock:
+            self.active[pm] -= 1
+        if step["id"] in self.fail:
+            return {"ok": False, "error": "boom"}
+        return {"ok": True}
+
+
+@pytest.fixture()
+def recorder(monkeypatch):
+    rec = _Recorder()
+    monkeypatch.setattr(orchestrator, "execute_plan_step", rec)
+    monkeypatch.setattr(orchestrator, "save_plan_state", lambda state: None)
+    return rec
+
+
+def _step(sid: str, deps: list[str], seconds: float = 0.0, **extra) -> dict:
+    return {"id": sid, "type": "tool", "depends_on": deps,
+            "estimated_seconds": seconds, **extra}
+
+
+def _pkg(sid: str, deps: list[str], packages: list[str], pm: str = "apt", **extra) -> dict:
+    return _step(sid, deps, 0.05, type="packages", packages=packages,
+                 package_manager=pm, needs_sudo=True, **extra)
+
+
+class TestDomain:
+    def test_critical_path_priority(self):
+        steps = [
+            _step("a", [], 1), _step("b", ["a"], 5), _step("c", ["a"], 1),
+            _step("d", ["b", "c"], 2),
+        ]
+        prio = _critical_path_priority(steps)
+        assert prio == {"a": 8.0, "b": 7.0, "c": 3.0, "d": 2.0}
+
+    def test_chain_of_package_steps_is_fused(self):
+        steps = _add_implicit_deps([
+            {"type": "packages", "packages": ["gcc"], "package_manager": "apt"},
+            {"type": "packages", "packages": ["make", "gcc"], "package_manager": "apt"},
+            {"type": "packages", "packages": ["jq"], "package_manager": "apt"},
+            {"type": "tool", "command": ["make"]},
+        ])
+        fused = _coalesce_package_steps(steps)
+        assert [s["id"] for s in fused] == ["step_0", "step_3"]
+        assert fused[0]["packages"] == ["gcc", "make", "jq"]
+        assert fused[0]["batch"] == ["step_0", "step_1", "step_2"]
+        assert fused[1]["depends_on"] == ["step_0"]
+
+    def test_not_fused_across_managers_or_fan_out(self):
+        steps = [
+            _pkg("a", [], ["x"]),
+            _pkg("b", ["a"], ["y"], pm="snap"),
+            _pkg("c", ["b"], ["z"], pm="snap"),
+            _step("d", ["b"]),
+        ]
+        assert [s["id"] for s in _coalesce_package_steps(steps)] == ["a", "b", "c", "d"]
+
+    def test_not_fused_across_binaries(self):
+        steps = _add_implicit_deps([
+            {"type": "packages", "packages": ["gcc"], "command": ["yum", "install", "-y", "gcc"]},
+            {"type": "packages", "packages": ["jq"], "command": ["dnf", "install", "-y", "jq"]},
+            {"type": "packages", "packages": ["git"], "command": ["yum", "install", "-y", "git"]},
+        ])
+        fused = _coalesce_package_steps(steps)
+        assert [s["id"] for s in fused] == ["step_0", "step_1", "step_2"]
+
+    def test_merged_step_keeps_binary_and_combines_safeguards(self):
+        merged = _merge_package_steps([
+            {"id": "a", "type": "packages", "packages": ["gcc"], "risk": "low",
+             "command": ["yum", "install", "-y", "gcc"]},
+            {"id": "b", "type": "packages", "packages": ["kmod"], "risk": "high",
+             "backup_before": ["/etc/modprobe.d"], "command": ["yum", "install", "-y", "kmod"]},
+            {"id": "c", "type": "packages", "packages": ["jq"], "risk": "medium",
+             "backup_before": ["/etc/yum.conf"], "command": ["yum", "install", "-y", "jq"]},
+        ])
+        assert merged["command"][0] == "yum" and "package_manager" not in merged
+        assert merged["risk"] == "high"
+        assert merged["backup_before"] == ["/etc/modprobe.d", "/etc/yum.conf"]
+        assert merged["batch"] == ["a", "b", "c"]
+
+
+class TestScheduler:
+    def test_dispatches_on_own_dependencies_not_waves(self, recorder):
+        # a(0.3) → c(0.05);  b(0.05) → d(0.3).  Waves: 0.3 + 0.3; DAG: ~0.35
+        plan = {"tool": "t", "steps": [
+            _step("a", [], 0.3), _step("b", [], 0.05),
+            _step("c", ["a"], 0.05), _step("d", ["b"], 0.3),
+        ]}
+        result = orchestrator.execute_plan_dag(plan)
+        assert result["ok"]
+        t = result["timings"]
+        assert t["d"]["start_ms"] < t["a"]["end_ms"]
+        assert result["makespan_ms"] < 500
+
+    def test_critical_path_goes_first(self, recorder):
+        plan = {"tool": "t", "steps": [
+            _step("short", [], 0.01), _step("long", [], 0.01),
+            _step("tail", ["long"], 0.2),
+        ]}
+        orchestrator.execute_plan_dag(plan, max_workers=1)
+        # once "long" is done, "tail" (0.2s to go) outranks "short"
+        assert recorder.order == ["long", "tail", "short"]
+
+    def test_same_package_manager_never_overlaps(self, recorder):
+        plan = {"tool": "t", "steps": [
+            _step("a", [], 0.1, command=["apt-get", "install", "-y", "x"]),
+            _step("b", [], 0.1, command=["apt-get", "install", "-y", "y"]),
+            _step("c", [], 0.1),
+        ]}
+        for s in plan["steps"][:2]:
+            s["package_manager"] = "apt"
+        result = orchestrator.execute_plan_dag(plan)
+        assert result["ok"]
+        assert recorder.max_active["apt"] == 1
+        t = result["timings"]
+        assert t["c"]["start_ms"] < t["a"]["end_ms"]
+
+    def test_ready_package_siblings_are_batched(self, recorder):
+        events: list[tuple[str, str]] = []
+        plan = {"tool": "t", "steps": [
+            _step("fetch", [], 0.0),
+            _pkg("p1", ["fetch"], ["libssl-dev"]),
+            _pkg("p2", ["fetch"], ["zlib1g-dev"]),
+            _step("build", ["p1", "p2"], 0.0),
+        ]}
+        result = orchestrator.execute_plan_dag(
+            plan, on_progress=lambda sid, status: events.append((sid, status)),
+        )
+        assert result["ok"]
+        batched = [c for c in recorder.calls if c.get("batch")]
+        assert len(batched) == 1
+        assert batched[0]["packages"] == ["libssl-dev", "zlib1g-dev"]
+        assert result["results"]["p2"]["batched_with"] == ["p1", "p2"]
+        assert ("p1", "done") in events and ("p2", "done") in events
+        assert set(result["completed"]) == {"fetch", "p1", "p2", "build"}
+
+    def test_failure_skips_transitive_dependents_only(self, recorder):
+        recorder.fail.add("a")
+        plan = {"tool": "t", "steps": [
+            _step("a", []), _step("b", ["a"]), _step("c", ["b"]), _step("x", []),
+        ]}
+        result = orchestrator.execute_plan_dag(plan)
+        assert not result["ok"]
+        assert set(result["failed"]) == {"a", "b", "c"}
+        assert result["results"]["c"]["skipped"]
+        assert result["completed"] == ["x"]
+
+    def test_restart_required_pauses_after_running_steps(self, recorder):
+        plan = {"tool": "t", "steps": [
+            _step("grub", [], 0.0, restart_required="system"),
+            _step("slow", [], 0.1),
+            _step("after", ["grub"]),
+        ]}
+        result = orchestrator.execute_plan_dag(plan)
+        assert result["paused"] and result["pause_reason"] == "system"
+        assert "after" not in recorder.order
+        assert set(result["completed"]) == {"grub", "slow"}
+
+    def test_invalid_plan(self, recorder):
+        result = orchestrator.execute_plan_dag(
+            {"tool": "t", "steps": [_step("a", ["a"])]},
+        )
+        assert not result["ok"] and "cycle" in result["error"]
@@ -0,0 +1,152 @@
+"""
+Tests for the compiled failure classifier behind handler matching.
+
+The corpus is every handler's ``example_stderr`` — each is run against
+every handler, and the compiled + prefiltered path must agree with a
+plain ``re.search`` on all of them.
+
+Benchmark (``slow``, opt in): ``pytest -m slow tests/tool_install/test_failure_classifier.py``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+
+import pytest
+
+from src.core.services.tool_install.data.remediation_handlers import (
+    BOOTSTRAP_HANDLERS,
+    INFRA_HANDLERS,
+    METHOD_FAMILY_HANDLERS,
+)
+from src.core.services.tool_install.data.tool_failure_handlers import (
+    TOOL_FAILURE_HANDLERS,
+)
+from src.core.services.tool_install.domain import failure_classifier as fc
+from src.core.services.tool_install.domain.handler_matching import (
+    _collect_all_options,
+    _matches,
+)
+
+ALL_HANDLERS = [
+    *BOOTSTRAP_HANDLERS,
+    *INFRA_HANDLERS,
+    *(h for hs in METHOD_FAMILY_HANDLERS.values() for h in hs),
+    *(h for hs in TOOL_FAILURE_HANDLERS.values() for h in hs),
+]
+CORPUS = [h["example_stderr"] for h in ALL_HANDLERS if h.get("example_stderr")]
+
+# ~2 MB of compiler noise around the real error
+_NOISE = "".join(
+    f"[{i}/9000] Building CXX object src/CMakeFiles/core.dir/unit_{i}.cc.o\n"
+    for i in range(30000)
+)
+
+
+def _naive(handler: dict, stderr: str, exit_code: int) -> bool:
+    """The matching rule before the classifier (full stderr, no prefilter)."""
+    handler_exit = handler.get("exit_code")
+    if handler_exit is not None and handler_exit != exit_code:
+        return False
+    pattern = handler.get("pattern", "")
+    if not pattern:
+        return handler_exit is not None
+    try:
+        return bool(re.search(pattern, stderr, re.IGNORECASE))
+    except re.error:
+        return False
+
+
+class TestCorpus:
+    @pytest.mark.parametrize(
+        "handler", ALL_HANDLERS, ids=lambda h: h.get("failure_id", "?"),
+    )
+    def test_handler_matches_its_example(self, handler):
+        exit_code = handler.get("example_exit_code", handler.get("exit_code", 1))
+        assert _matches(handler, handler["example_stderr"], exit_code)
+
+    def test_agrees_with_plain_search_on_whole_corpus(self):
+        for sample in CORPUS:
+            text = fc.FailureText(sample)
+            for handler in ALL_HANDLERS:
+                assert _matches(handler, text, 1) == _naive(handler, sample, 1), (
+                    handler.get("failure_id"), sample,
+                )
+
+    def test_every_pattern_compiles(self):
+        assert fc.warm_up() == len({h["pattern"] for h in ALL_HANDLERS if h["pattern"]})
+        for h in ALL_HANDLERS:
+            if h["pattern"]:
+                assert fc.compile_pattern(h["pattern"]).regex is not None
+
+
+class TestLiterals:
+    def test_one_literal_per_alternative(self):
+        assert fc.required_literals(r"curl:\s*command not found|/bin/sh:\s*not found") == (
+            "command not found", "not found",
+        )
+
+    def test_optional_and_grouped_parts_are_skipped(self):
+        assert fc.required_literals(r"libfoo?bar|x(?:yz)+lib\.so\.1|[abc]{2}error") == (
+            "libfo", "lib.so.1", "error",
+        )
+
+    def test_unfilterable_patterns(self):
+        assert fc.required_literals(r"E\d+|fatal") is None
+        assert fc.required_literals(r"(?x) spaced out") is None
+        assert fc.required_literals(r"\x41bcd") is None
+
+    def test_prefilter_rejects_without_regex(self):
+        text = fc.FailureText("error: linker `cc` not found")
+        assert not text.search(r"No space left on device")
+        assert text._seen == {"no space left on device": False}
+        assert text.search(r"linker\s+.cc.\s+not found")
+
+    def test_case_folding_matches_ignorecase(self):
+        # U+212A KELVIN SIGN and U+0131 DOTLESS I match k / i under re.IGNORECASE
+        assert fc.FailureText("Killed").search(r"killed")
+        assert fc.FailureText("permıssıon denied").search(r"permission denied")
+
+
+class TestWindow:
+    def test_short_stderr_is_untouched(self):
+        assert fc.failure_window("boom\n") == "boom\n"
+
+    def test_long_stderr_keeps_head_and_tail_lines(self):
+        stderr = "bash: make: command not found\n" + _NOISE + "error: linker `cc` not found\n"
+        window = fc.failure_window(stderr)
+        assert len(window) <= fc.HEAD_WINDOW + fc.TAIL_WINDOW + 1
+        assert window.startswith("bash: make: command not found\n")
+        assert window.endswith("error: linker `cc` not found\n")
+        assert all(line.startswith(("[", "bash", "error")) for line in window.splitlines() if line)
+
+    def test_cascade_on_large_log(self):
+        stderr = _NOISE + "error: linker `cc` not found\n"
+        _, small = _collect_all_options("cargo-audit", "cargo", "error: linker `cc` not found", 1)
+        _, large = _collect_all_options("cargo-audit", "cargo", stderr, 1)
+        assert [o["id"] for o in large] == [o["id"] for o in small]
+        assert small
+
+
+@pytest.mark.slow
+def test_bench_classifications_per_second():
+    samples = {
+        "corpus": CORPUS,
+        "2MB log": [_NOISE + s for s in CORPUS[:3]],
+    }
+    fc.warm_up()
+    for stderrs in samples.values():
+        reps = 20 if stderrs is CORPUS else 1
+        start = time.perf_counter()
+        for _ in range(reps):
+            for s in stderrs:
+                [h for h in ALL_HANDLERS if _naive(h, s, 1)]
+        naive = reps * len(stderrs) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(reps):
+            for s in stderrs:
+                text = fc.FailureText(s)
+                [h for h in ALL_HANDLERS if _matches(h, text, 1)]
+        compiled = reps * len(stderrs) / (time.perf_counter() - start)
+        assert compiled > naive
@@ -0,0 +1,107 @@
+"""
+Tests for the installed-package index (package databases read directly).
+
+Fixture databases live in ``tests/fixtures/pkgdb/<distro>/`` laid out
+as a filesystem root.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.services.tool_install.detection import pkg_index, system_deps
+from src.core.services.tool_install.detection.pkg_index import installed_packages
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "pkgdb"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    pkg_index.clear_cache()
+    yield
+    pkg_index.clear_cache()
+
+
+@pytest.fixture()
+def debian_root(tmp_path: Path) -> Path:
+    root = tmp_path / "debian"
+    shutil.copytree(FIXTURES / "debian", root)
+    return root
+
+
+class TestParsers:
+    def test_dpkg_status_and_journal(self):
+        names = installed_packages("apt", root=FIXTURES / "debian")
+        assert {"libssl-dev", "libssl-dev:amd64", "build-essential"} <= names
+        assert "libffi-dev" not in names           # deinstall ok config-files
+        assert "pkg-config" in names               # half-configured, fixed by updates/0001
+
+    def test_apk_installed(self):
+        assert installed_packages("apk", root=FIXTURES / "alpine") == {
+            "musl", "build-base", "openssl-dev",
+        }
+
+    def test_pacman_local(self):
+        assert installed_packages("pacman", root=FIXTURES / "arch") == {
+            "base-devel", "openssl", "python-pip",
+        }
+
+    def test_missing_database(self, tmp_path):
+        assert installed_packages("apt", root=tmp_path) is None
+        assert installed_packages("brew", root=FIXTURES / "debian") is None
+
+
+class TestCaching:
+    def test_reparsed_only_when_database_changes(self, debian_root):
+        status = debian_root / "var/lib/dpkg/status"
+        with patch.object(pkg_index, "parse_dpkg_status", wraps=pkg_index.parse_dpkg_status) as parse:
+            installed_packages("apt", root=debian_root)
+            installed_packages("apt", root=debian_root)
+            assert parse.call_count == 1
+
+            status.write_text(status.read_text() + "\nPackage: zlib1g-dev\nStatus: install ok installed\n")
+            st = status.stat()
+            os.utime(status, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert "zlib1g-dev" in installed_packages("apt", root=debian_root)
+            assert parse.call_count == 2
+
+
+class TestSystemDeps:
+    def test_batch_check_does_not_fork(self, debian_root, monkeypatch):
+        real = pkg_index.installed_packages
+        monkeypatch.setattr(
+            system_deps, "installed_packages", lambda pm: real(pm, root=debian_root),
+        )
+
+        def no_fork(*args, **kwargs):
+            raise AssertionError(f"forked: {args[0]}")
+        monkeypatch.setattr(subprocess, "run", no_fork)
+
+        result = system_deps.check_system_deps(
+            ["libssl-dev", "libffi-dev", "build-essential", "zlib1g-dev"], "apt",
+        )
+        assert result == {
+            "installed": ["libssl-dev", "build-essential"],
+            "missing": ["libffi-dev", "zlib1g-dev"],
+        }
+        assert system_deps._is_pkg_installed("libssl-dev:amd64", "apt")
+
+    def test_falls_back_to_package_manager_without_database(self, monkeypatch):
+        monkeypatch.setattr(system_deps, "installed_packages", lambda pm: None)
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0 if cmd[-1] == "musl" else 1, b"", b"")
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+        assert system_deps.check_system_deps(["musl", "nope"], "apk") == {
+            "installed": ["musl"], "missing": ["nope"],
+        }
+        assert calls == [["apk", "info", "-e", "musl"], ["apk", "info", "-e", "nope"]]
@@ -0,0 +1,139 @@
+"""
+Tests for the lazily loaded, precompiled recipe / handler registries.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.services.tool_install.data import snapshot_registry
+from src.core.services.tool_install.data.snapshot_registry import SnapshotRegistry
+
+
+@pytest.fixture()
+def source(tmp_path: Path) -> Path:
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "tools.py").write_text("")
+    return pkg
+
+
+def _registry(source: Path, calls: list, data: dict | None = None, **kwargs) -> SnapshotRegistry:
+    def load() -> dict:
+        calls.append(1)
+        return dict(data or {"a": {"cli": "a", "tags": ["x"]}, "b": {"cli": "b"}})
+    return SnapshotRegistry("tools", source, load, **kwargs)
+
+
+class TestLazyLoad:
+    def test_nothing_runs_until_first_access(self, source):
+        calls: list = []
+        reg = _registry(source, calls)
+        assert calls == []
+        assert reg["a"]["cli"] == "a"
+        assert calls == [1]
+        assert reg.snapshot_path.exists()
+
+    def test_snapshot_serves_next_process_without_importing(self, source):
+        _registry(source, []).get("a")
+        calls: list = []
+        reg = _registry(source, calls)
+        assert reg.get("b") == {"cli": "b"}
+        assert "a" in reg and "zzz" not in reg
+        assert calls == []
+        # Only the looked-up entry was decoded
+        assert isinstance(reg._entries["a"], snapshot_registry._Packed)
+        assert list(reg.items()) == [("a", {"cli": "a", "tags": ["x"]}), ("b", {"cli": "b"})]
+
+    def test_source_change_rebuilds(self, source):
+        _registry(source, []).get("a")
+        mod = source / "tools.py"
+        mod.write_text("# edited\n")
+        calls: list = []
+        reg = _registry(source, calls, data={"c": {}})
+        assert list(reg) == ["c"]
+        assert calls == [1]
+
+    def test_unwritable_snapshot_falls_back_to_sources(self, source, monkeypatch):
+        def fail(*args, **kwargs):
+            raise OSError("read-only")
+        monkeypatch.setattr(Path, "write_bytes", fail)
+        calls: list = []
+        reg = _registry(source, calls)
+        assert reg["a"]["cli"] == "a"
+        assert not reg.snapshot_path.exists()
+
+    def test_unmarshallable_entry_falls_back_to_sources(self, source):
+        calls: list = []
+        check = lambda version: version >= (1, 0)       # noqa: E731
+        reg = _registry(source, calls, data={"a": {"check": check}})
+        assert reg["a"]["check"] is check
+        assert calls == [1]
+        assert not reg.snapshot_path.exists()
+
+    def test_interpreter_path_is_resolved_per_process(self, source, monkeypatch):
+        import sys
+
+        pip = [sys.executable, "-m", "pip", "install", "ruff"]
+        _registry(source, [], data={"ruff": {"install": {"pip": pip}}}).get("ruff")
+        assert sys.executable.encode() not in _registry(source, []).snapshot_path.read_bytes()
+
+        monkeypatch.setattr(sys, "executable", "/other/venv/bin/python3")
+        calls: list = []
+        reg = _registry(source, calls)
+        assert reg["ruff"]["install"]["pip"][0] == "/other/venv/bin/python3"
+        assert calls == []                         # served from the snapshot
+
+
+class TestMutation:
+    def test_dict_protocol(self, source):
+        _registry(source, []).get("a")
+        reg = _registry(source, [])
+        original = reg["a"]
+        reg["a"] = {"cli": "patched"}
+        reg["new"] = {}
+        assert reg["a"] == {"cli": "patched"} and len(reg) == 3
+        reg["a"] = original
+        assert reg.pop("new") == {} and len(reg) == 2
+        assert {**reg}["a"] is original
+
+
+class TestValidation:
+    def test_errors_are_logged_once_and_data_still_served(self, source, caplog):
+        def validate(entries):
+            return {"b": ["missing field 'label'"]}
+        calls: list = []
+        with caplog.at_level(logging.WARNING):
+            reg = _registry(source, calls, validate=validate)
+            assert reg.get("b") == {"cli": "b"}
+            assert _registry(source, [], validate=validate).get("b") == {"cli": "b"}
+        assert [r.getMessage() for r in caplog.records] == [
+            "tools: 1 entries fail schema validation: b",
+        ]
+
+    def test_build_returns_errors(self, source):
+        reg = _registry(source, [], validate=lambda e: {})
+        assert reg.build() == {}
+        assert os.path.getsize(reg.snapshot_path) > 0
+
+
+class TestRealRegistries:
+    def test_recipes_match_merged_sources(self):
+        from src.core.services.tool_install.data.recipes import TOOL_RECIPES, _merge_recipes
+
+        merged = _merge_recipes()
+        assert list(TOOL_RECIPES) == list(merged)
+        assert dict(TOOL_RECIPES.items()) == merged
+
+    def test_failure_handlers_match_merged_sources(self):
+        from src.core.services.tool_install.data.tool_failure_handlers import (
+            TOOL_FAILURE_HANDLERS,
+            _merge_handlers,
+        )
+
+        assert dict(TOOL_FAILURE_HANDLERS.items()) == _merge_handlers()